@@ -4,6 +4,11 @@ import { prisma, getOrCreateUser } from '../../../lib/database.js';
 import { personaAI } from '../../../lib/ai.js';
 import { strategyAI } from '../../../lib/strategy-ai.js';
 import { getCurrentUser, canAccessWorkspace, hasPermission, PERMISSIONS } from '../../../lib/auth-utils.js';
+import { withDbStats } from '../../../lib/db-stats.js';
+import { withCompression } from '../../../lib/compression.js';
+import { withETag } from '../../../lib/etag.js';
+import { jobQueue } from '../../../lib/job-queue.js';
+import { MemoCache } from '../../../lib/memo-cache.js';
 import { 
   validateSegmentForm, 
   validateCultureForm, 
@@ -52,7 +57,87 @@ async function getCurrentUserOrMock(request) {
   }
 }
 
-// GET /api/workspaces - Get all workspaces for user
+// Fields GET /api/workspaces can return (?fields=id,name,...); segments are not expanded,
+// only counted - the tree of one workspace comes from GET /api/workspaces/:id/segments
+const WORKSPACE_FIELDS = {
+  id: true,
+  name: true,
+  ownerId: true,
+  createdAt: true,
+  owner: { select: { id: true, name: true, email: true } },
+  members: {
+    select: {
+      id: true,
+      userId: true,
+      role: true,
+      user: { select: { id: true, name: true, email: true } }
+    }
+  },
+  counts: { _count: { select: { segments: true, members: true } } }
+};
+const DEFAULT_WORKSPACE_FIELDS = ['id', 'name', 'ownerId', 'createdAt', 'owner', 'counts'];
+const WORKSPACE_PAGE_SIZE = 50;
+const MAX_WORKSPACE_PAGE_SIZE = 200;
+
+function parseWorkspaceQuery(searchParams) {
+  const fields = searchParams.get('fields')
+    ? searchParams.get('fields').split(',').map(field => field.trim()).filter(Boolean)
+    : DEFAULT_WORKSPACE_FIELDS;
+  const unknown = fields.filter(field => !WORKSPACE_FIELDS[field]);
+  if (unknown.length) {
+    return { error: `Unknown field: ${unknown.join(', ')}. Available: ${Object.keys(WORKSPACE_FIELDS).join(', ')}` };
+  }
+
+  const cursor = searchParams.get('cursor');
+  if (cursor && !/^[a-f0-9]{24}$/.test(cursor)) {
+    return { error: 'Invalid cursor' };
+  }
+
+  const limit = Math.min(
+    Math.max(parseInt(searchParams.get('limit'), 10) || WORKSPACE_PAGE_SIZE, 1),
+    MAX_WORKSPACE_PAGE_SIZE
+  );
+  return { fields, cursor, limit };
+}
+
+function workspaceSelect(fields) {
+  const select = { id: true };
+  for (const field of fields) {
+    if (field === 'counts') {
+      Object.assign(select, WORKSPACE_FIELDS.counts);
+    } else {
+      select[field] = WORKSPACE_FIELDS[field];
+    }
+  }
+  return select;
+}
+
+// Flatten Prisma's _count into segmentCount / memberCount
+function shapeWorkspace({ _count, ...workspace }) {
+  return _count
+    ? { ...workspace, segmentCount: _count.segments, memberCount: _count.members }
+    : workspace;
+}
+
+// Apply a field list to the mock workspace served in demo mode
+function projectMockWorkspace(workspace, fields) {
+  const projected = { id: workspace.id };
+  for (const field of fields) {
+    if (field === 'counts') {
+      projected.segmentCount = 0;
+      projected.memberCount = workspace.members.length;
+    } else {
+      projected[field] = workspace[field];
+    }
+  }
+  return projected;
+}
+
+// GET /api/workspaces - Workspaces the user owns or belongs to, one page at a time.
+// ?limit= (50, max 200), ?cursor= (nextCursor of the previous page), ?fields= (see WORKSPACE_FIELDS).
+// Pages are ordered by ID. Owned workspaces and memberships are each read as an index
+// range starting after the cursor, so a page costs the same however many workspaces
+// the user has.
 async function getWorkspaces(request) {
   try {
     const user = await getCurrentUserOrMock(request);
@@ -63,6 +148,10 @@ async function getWorkspaces(request) {
     // Check if demo mode or DB error - return mock workspace
     const url = new URL(request.url);
     const isDemoMode = url.searchParams.get('demo') === 'true';
+    const query = parseWorkspaceQuery(url.searchParams);
+    if (query.error) {
+      return NextResponse.json({ error: query.error }, { status: 400 });
+    }
     
     if (isDemoMode || user.id === 'demo-user-id') {
       // Return mock workspace for demo mode
@@ -70,7 +159,8 @@ async function getWorkspaces(request) {
         id: '68ee7d6a5d192f23f7922f8b',
         name: 'Demo Workspace',
         ownerId: user.id,
-        createdAt: new Date(),
+        // Fixed (the ObjectId's own timestamp) so the list's ETag holds between requests
+        createdAt: new Date('2025-10-14T16:42:18Z'),
         owner: {
           id: user.id,
           name: user.name,
@@ -78,7 +168,6 @@ async function getWorkspaces(request) {
         },
         members: [{
           id: 'demo-member-1',
-          workspaceId: '68ee7d6a5d192f23f7922f8b',
           userId: user.id,
           role: 'admin',
           user: {
@@ -86,40 +175,52 @@ async function getWorkspaces(request) {
             name: user.name,
             email: user.email
           }
-        }],
-        segments: []
+        }]
       };
       
-      return NextResponse.json({ workspaces: [mockWorkspace] });
+      return NextResponse.json({
+        workspaces: query.cursor ? [] : [projectMockWorkspace(mockWorkspace, query.fields)],
+        nextCursor: null,
+        hasMore: false
+      });
     }
 
     // Try to fetch from database for authenticated users
     try {
-      const workspaces = await prisma.workspace.findMany({
-        where: {
-          OR: [
-            { ownerId: user.id },
-            { members: { some: { userId: user.id } } }
-          ]
-        },
-        include: {
-          owner: { select: { id: true, name: true, email: true } },
-          members: {
-            include: { 
-              user: { select: { id: true, name: true, email: true } }
-            }
-          },
-          segments: {
-            include: {
-              cultureProfile: true,
-              economicProfile: true,
-              personas: { select: { id: true, name: true } }
-            }
-          }
-        }
-      });
+      const after = query.cursor ? { gt: query.cursor } : undefined;
+      const [owned, memberships] = await Promise.all([
+        prisma.workspace.findMany({
+          where: { ownerId: user.id, ...(after ? { id: after } : {}) },
+          select: { id: true },
+          orderBy: { id: 'asc' },
+          take: query.limit + 1
+        }),
+        prisma.workspaceMember.findMany({
+          where: { userId: user.id, ...(after ? { workspaceId: after } : {}) },
+          select: { workspaceId: true },
+          orderBy: { workspaceId: 'asc' },
+          take: query.limit + 1
+        })
+      ]);
+
+      // Same-length hex ObjectIds sort in ID order
+      const ids = [...new Set([...owned.map(w => w.id), ...memberships.map(m => m.workspaceId)])]
+        .sort()
+        .slice(0, query.limit + 1);
+      const hasMore = ids.length > query.limit;
+      const pageIds = ids.slice(0, query.limit);
+
+      const workspaces = pageIds.length ? await prisma.workspace.findMany({
+        where: { id: { in: pageIds } },
+        select: workspaceSelect(query.fields),
+        orderBy: { id: 'asc' }
+      }) : [];
       
-      return NextResponse.json({ workspaces });
+      return NextResponse.json({
+        workspaces: workspaces.map(shapeWorkspace),
+        nextCursor: hasMore ? pageIds[pageIds.length - 1] : null,
+        hasMore
+      });
     } catch (dbError) {
       console.error('Database error, falling back to mock:', dbError);
       // Fallback to mock workspace
@@ -133,11 +234,14 @@ async function getWorkspaces(request) {
           name: user.name,
           email: user.email
         },
-        members: [],
-        segments: []
+        members: []
       };
       
-      return NextResponse.json({ workspaces: [mockWorkspace] });
+      return NextResponse.json({
+        workspaces: [projectMockWorkspace(mockWorkspace, query.fields)],
+        nextCursor: null,
+        hasMore: false
+      });
     }
   } catch (error) {
     console.error('Error fetching workspaces:', error);
@@ -653,77 +757,76 @@ async function updateEconomicProfile(request, profileId) {
   }
 }
 
-// POST /api/personas/generate - Generate persona using AI
-async function generatePersona(request) {
+// Load the inputs for persona generation, falling back to mock data when the database is unavailable.
+// The segment is fetched with its culture and economic profiles included, so the usual
+// case is a single query; a profile from another segment (any pairing is allowed) is
+// fetched separately, concurrently with the other. `sequential` runs the three lookups
+// one after another as they used to be, for harness/persona_db_bench.py to compare.
+async function loadPersonaInputs(segmentId, cultureProfileId, economicProfileId, { sequential = false } = {}) {
   try {
-    const { segmentId, cultureProfileId, economicProfileId } = await request.json();
-    const user = await getCurrentUserOrMock(request);
-    
-    if (!user) {
-      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
-    }
-    
-    // Try to fetch from database, use mock data on failure
-    let segment, cultureProfile, economicProfile;
-    
-    try {
-      segment = await prisma.segment.findUnique({
+    if (sequential) {
+      const segment = await prisma.segment.findUnique({
         where: { id: segmentId }
       });
       
-      cultureProfile = cultureProfileId ? await prisma.cultureProfile.findUnique({
+      const cultureProfile = cultureProfileId ? await prisma.cultureProfile.findUnique({
         where: { id: cultureProfileId }
       }) : null;
       
-      economicProfile = economicProfileId ? await prisma.economicProfile.findUnique({
+      const economicProfile = economicProfileId ? await prisma.economicProfile.findUnique({
         where: { id: economicProfileId }
       }) : null;
-    } catch (dbError) {
-      console.error('Database error fetching data, using mock:', dbError);
-      // Create mock data for generation
-      segment = {
+
+      return { segment, cultureProfile, economicProfile };
+    }
+
+    const result = await prisma.segment.findUnique({
+      where: { id: segmentId },
+      include: {
+        cultureProfile: Boolean(cultureProfileId),
+        economicProfile: Boolean(economicProfileId)
+      }
+    });
+    if (!result) {
+      return { segment: null, cultureProfile: null, economicProfile: null };
+    }
+
+    // Keep the segment itself free of the included relations; it feeds the AI cache key
+    const { cultureProfile: includedCulture, economicProfile: includedEconomic, ...segment } = result;
+    const resolve = (model, id, included) => {
+      if (!id) return null;
+      if (included?.id === id) return included;
+      return model.findUnique({ where: { id } });
+    };
+    const [cultureProfile, economicProfile] = await Promise.all([
+      resolve(prisma.cultureProfile, cultureProfileId, includedCulture),
+      resolve(prisma.economicProfile, economicProfileId, includedEconomic)
+    ]);
+
+    return { segment, cultureProfile, economicProfile };
+  } catch (dbError) {
+    console.error('Database error fetching data, using mock:', dbError);
+    // Create mock data for generation
+    return {
+      segment: {
         id: segmentId,
         name: 'Demo Segment',
         product: 'Demo Product',
         values: [],
         emotions: [],
         fears: []
-      };
-      cultureProfile = null;
-      economicProfile = null;
-    }
-    
-    if (!segment) {
-      return NextResponse.json({ error: 'Segment not found' }, { status: 404 });
-    }
-    
-    // Generate persona using AI
-    const personaData = await personaAI.generatePersona(segment, cultureProfile, economicProfile);
-    
-    // Try to save to database, fallback to mock
-    try {
-      const persona = await prisma.persona.create({
-        data: {
-          segmentId,
-          cultureProfileId,
-          economicProfileId,
-          name: personaData.name,
-          positioning: personaData.positioning,
-          culturalCues: personaData.cultural_cues,
-          economicCues: personaData.economic_cues,
-          generalizations: personaData.generalizations,
-          pillars: personaData.pillars,
-          exportSnapshot: personaData.export_snapshot,
-          createdBy: user.id
-        }
-      });
-      
-      return NextResponse.json({ persona: { ...persona, ...personaData } });
-    } catch (dbError) {
-      console.error('Database error saving persona, using mock:', dbError);
-      // Return mock persona
-      const mockPersona = {
-        id: `persona-${Date.now()}`,
+      },
+      cultureProfile: null,
+      economicProfile: null
+    };
+  }
+}
+
+// Save a generated persona, returning a mock record when the database is unavailable
+async function savePersona(user, { segmentId, cultureProfileId, economicProfileId }, personaData) {
+  try {
+    const persona = await prisma.persona.create({
+      data: {
         segmentId,
         cultureProfileId,
         economicProfileId,
@@ -733,20 +836,121 @@ async function generatePersona(request) {
         economicCues: personaData.economic_cues,
         generalizations: personaData.generalizations,
         pillars: personaData.pillars,
-        messagingPillars: personaData.pillars,
         exportSnapshot: personaData.export_snapshot,
-        createdBy: user.id,
-        createdAt: new Date()
-      };
-      
-      return NextResponse.json({ persona: mockPersona });
+        createdBy: user.id
+      }
+    });
+    
+    return { ...persona, ...personaData };
+  } catch (dbError) {
+    console.error('Database error saving persona, using mock:', dbError);
+    // Return mock persona
+    return {
+      id: `persona-${Date.now()}`,
+      segmentId,
+      cultureProfileId,
+      economicProfileId,
+      name: personaData.name,
+      positioning: personaData.positioning,
+      culturalCues: personaData.cultural_cues,
+      economicCues: personaData.economic_cues,
+      generalizations: personaData.generalizations,
+      pillars: personaData.pillars,
+      messagingPillars: personaData.pillars,
+      exportSnapshot: personaData.export_snapshot,
+      createdBy: user.id,
+      createdAt: new Date()
+    };
+  }
+}
+
+// POST /api/personas/generate - Generate persona using AI
+async function generatePersona(request) {
+  try {
+    const ids = await request.json();
+    const user = await getCurrentUserOrMock(request);
+    
+    if (!user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+    
+    const { searchParams } = new URL(request.url);
+    const { segment, cultureProfile, economicProfile } = await loadPersonaInputs(
+      ids.segmentId, ids.cultureProfileId, ids.economicProfileId,
+      { sequential: searchParams.get('loader') === 'sequential' }
+    );
+    
+    if (!segment) {
+      return NextResponse.json({ error: 'Segment not found' }, { status: 404 });
     }
+    
+    // Generate persona using AI
+    const personaData = await personaAI.generatePersona(segment, cultureProfile, economicProfile);
+    
+    const persona = await savePersona(user, ids, personaData);
+    return NextResponse.json({ persona });
   } catch (error) {
     console.error('Error generating persona:', error);
     return NextResponse.json({ error: 'Failed to generate persona' }, { status: 500 });
   }
 }
 
+// POST /api/personas/generate?stream=sse|ndjson - Stream the persona section by section.
+// Events: `started` once the inputs are loaded, one `section` per persona field as the
+// model produces it, then `persona` with the saved record (or `error`). Each carries
+// elapsed_ms since the request arrived. SSE uses the event name as the `event:` field;
+// NDJSON puts it in an `event` key.
+async function streamPersonaGeneration(request, format) {
+  const receivedAt = Date.now();
+  const ids = await request.json();
+  const user = await getCurrentUserOrMock(request);
+  if (!user) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+  }
+
+  const { segment, cultureProfile, economicProfile } = await loadPersonaInputs(
+    ids.segmentId, ids.cultureProfileId, ids.economicProfileId
+  );
+  if (!segment) {
+    return NextResponse.json({ error: 'Segment not found' }, { status: 404 });
+  }
+
+  const encoder = new TextEncoder();
+  const encode = (event, data) => {
+    const payload = { ...data, elapsed_ms: Date.now() - receivedAt };
+    return encoder.encode(format === 'sse'
+      ? `event: ${event}\ndata: ${JSON.stringify(payload)}\n\n`
+      : JSON.stringify({ event, ...payload }) + '\n');
+  };
+
+  const stream = new ReadableStream({
+    async start(controller) {
+      controller.enqueue(encode('started', {}));
+      try {
+        const personaData = {};
+        for await (const [section, value] of personaAI.streamPersona(segment, cultureProfile, economicProfile)) {
+          personaData[section] = value;
+          controller.enqueue(encode('section', { section, value }));
+        }
+        const persona = await savePersona(user, ids, personaData);
+        controller.enqueue(encode('persona', { persona }));
+      } catch (error) {
+        console.error('Error streaming persona:', error);
+        controller.enqueue(encode('error', { error: 'Failed to generate persona' }));
+      }
+      controller.close();
+    }
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': format === 'sse' ? 'text/event-stream' : 'application/x-ndjson',
+      'Cache-Control': 'no-cache, no-transform',
+      'X-Accel-Buffering': 'no'
+    }
+  });
+}
+
 // DELETE /api/personas/:id - Delete persona
 async function deletePersona(request, personaId) {
   try {
@@ -782,6 +986,95 @@ async function deletePersona(request, personaId) {
 }
 
 // Strategy endpoints
+// Generated strategies are stored as numbered versions per persona and type; the
+// generator output keys are the snake_case column names of each strategy table.
+const STRATEGY_MODELS = {
+  positioning: {
+    model: 'positioningStrategy',
+    relation: 'positioningStrategies',
+    fields: ['positioning_statement', 'competitive_frame', 'category_entry_points', 'reasons_to_believe',
+      'anti_positioning', 'elevator_pitch_1s', 'elevator_pitch_10s', 'elevator_pitch_30s', 'assumptions_vs_facts']
+  },
+  messaging: {
+    model: 'messagingStrategy',
+    relation: 'messagingStrategies',
+    fields: ['messaging_pillars', 'tone_of_voice', 'objections', 'channel_plan', 'content_themes',
+      'content_calendar', 'localization_options', 'asset_templates', 'assumptions_vs_facts']
+  },
+  pricing: {
+    model: 'pricingStrategy',
+    relation: 'pricingStrategies',
+    fields: ['pricing_tiers', 'payment_options', 'monetization_hypotheses', 'value_metrics',
+      'competitive_pricing', 'discount_strategy', 'assumptions_vs_facts']
+  }
+};
+
+// Two concurrent saves can pick the same next version; the unique index rejects one
+const SAVE_STRATEGY_ATTEMPTS = 3;
+const LATEST_VERSION = { orderBy: { version: 'desc' }, take: 1 };
+
+const columnName = field => field.replace(/_([a-z0-9])/g, (_, c) => c.toUpperCase());
+
+// A stored strategy row in the shape the generators return, plus its version
+function strategyRecord(type, row) {
+  if (!row) return null;
+  const record = { id: row.id, version: row.version, status: row.status, created_at: row.createdAt };
+  for (const field of STRATEGY_MODELS[type].fields) {
+    record[field] = row[columnName(field)] ?? null;
+  }
+  return record;
+}
+
+// Include for the latest stored version of every strategy type
+function latestStrategies(select) {
+  return Object.fromEntries(Object.values(STRATEGY_MODELS).map(({ relation }) => (
+    [relation, select ? { ...LATEST_VERSION, select } : LATEST_VERSION]
+  )));
+}
+
+// { strategies, versions } from a persona loaded with latestStrategies()
+function latestStrategyRecords(persona) {
+  const strategies = {};
+  const versions = {};
+  for (const [type, { relation }] of Object.entries(STRATEGY_MODELS)) {
+    const [latest] = persona[relation];
+    strategies[type] = strategyRecord(type, latest);
+    versions[type] = latest?.version ?? 0;
+  }
+  return { strategies, versions };
+}
+
+async function saveStrategy(user, persona, type, strategy) {
+  const { model, fields } = STRATEGY_MODELS[type];
+  const data = {
+    personaId: persona.id,
+    createdBy: user.id,
+    inputs: {
+      segmentId: persona.segmentId,
+      cultureProfileId: persona.cultureProfileId,
+      economicProfileId: persona.economicProfileId
+    }
+  };
+  for (const field of fields) {
+    data[columnName(field)] = strategy[field];
+  }
+
+  // Only a lost race for the next version number is retried; anything else is the
+  // caller's to report, so a strategy is never answered as generated but silently unsaved
+  for (let attempt = 1; ; attempt++) {
+    const latest = await prisma[model].findFirst({
+      where: { personaId: persona.id },
+      orderBy: { version: 'desc' },
+      select: { version: true }
+    });
+    try {
+      return await prisma[model].create({ data: { ...data, version: (latest?.version ?? 0) + 1 } });
+    } catch (error) {
+      if (error.code !== 'P2002' || attempt >= SAVE_STRATEGY_ATTEMPTS) throw error;
+    }
+  }
+}
+
 async function getPersonaStrategies(request, personaId) {
   try {
     const user = await getCurrentUserOrMock(request);
@@ -789,22 +1082,40 @@ async function getPersonaStrategies(request, personaId) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
     }
 
-    // For now, return empty strategies since we're storing them as JSON
-    // In a full implementation, this would fetch from strategy tables
-    return NextResponse.json({ 
-      strategies: {
-        positioning: null,
-        messaging: null,
-        pricing: null
-      },
-      versions: {}
+    if (user.id === 'demo-user-id') {
+      // Demo personas are never stored, so there is nothing generated to list
+      return NextResponse.json({ 
+        strategies: {
+          positioning: null,
+          messaging: null,
+          pricing: null
+        },
+        versions: {}
+      });
+    }
+
+    const persona = await prisma.persona.findUnique({
+      where: { id: personaId },
+      select: { id: true, ...latestStrategies() }
     });
+
+    if (!persona) {
+      return NextResponse.json({ error: 'Persona not found' }, { status: 404 });
+    }
+
+    return NextResponse.json(latestStrategyRecords(persona));
   } catch (error) {
     console.error('Error fetching persona strategies:', error);
     return NextResponse.json({ error: 'Failed to fetch strategies' }, { status: 500 });
   }
 }
 
+const STRATEGY_GENERATORS = {
+  positioning: (...inputs) => strategyAI.generatePositioningStrategy(...inputs),
+  messaging: (...inputs) => strategyAI.generateMessagingStrategy(...inputs),
+  pricing: (...inputs) => strategyAI.generatePricingStrategy(...inputs)
+};
+
 async function generatePersonaStrategy(request, personaId, strategyType) {
   try {
     const user = await getCurrentUserOrMock(request);
@@ -826,35 +1137,181 @@ async function generatePersonaStrategy(request, personaId, strategyType) {
       return NextResponse.json({ error: 'Persona not found' }, { status: 404 });
     }
 
-    let strategy;
-    
-    switch (strategyType) {
-      case 'positioning':
-        strategy = await strategyAI.generatePositioningStrategy(
-          persona, persona.segment, persona.cultureProfile, persona.economicProfile
-        );
-        break;
-      case 'messaging':
-        strategy = await strategyAI.generateMessagingStrategy(
-          persona, persona.segment, persona.cultureProfile, persona.economicProfile
-        );
-        break;
-      case 'pricing':
-        strategy = await strategyAI.generatePricingStrategy(
-          persona, persona.segment, persona.cultureProfile, persona.economicProfile
-        );
-        break;
-      default:
-        return NextResponse.json({ error: 'Invalid strategy type' }, { status: 400 });
-    }
-
-    return NextResponse.json({ strategy });
+    const generate = STRATEGY_GENERATORS[strategyType];
+    if (!generate) {
+      return NextResponse.json({ error: 'Invalid strategy type' }, { status: 400 });
+    }
+
+    const strategy = await generate(
+      persona, persona.segment, persona.cultureProfile, persona.economicProfile
+    );
+    let saved;
+    try {
+      saved = await saveStrategy(user, persona, strategyType, strategy);
+    } catch (dbError) {
+      console.error('Database error saving strategy:', dbError);
+      return NextResponse.json({ error: 'Failed to save strategy' }, { status: 500 });
+    }
+
+    return NextResponse.json({ strategy, version: saved.version });
   } catch (error) {
     console.error('Error generating strategy:', error);
     return NextResponse.json({ error: 'Failed to generate strategy' }, { status: 500 });
   }
 }
 
+// Generate several strategies for one persona: the persona is loaded once and the
+// generators run concurrently, so wall time is that of the slowest strategy. Each
+// strategy is stored as a new version as soon as it is generated.
+// Body (optional): { types: ['positioning', 'messaging', 'pricing'] }.
+// With ?stream=ndjson each strategy is written as its own line as soon as it is ready.
+async function generateAllPersonaStrategies(request, personaId) {
+  try {
+    const user = await getCurrentUserOrMock(request);
+    if (!user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+
+    const body = await request.json().catch(() => ({}));
+    const types = body?.types?.length ? body.types : Object.keys(STRATEGY_GENERATORS);
+    const invalid = types.filter(type => !STRATEGY_GENERATORS[type]);
+    if (invalid.length) {
+      return NextResponse.json({ error: `Invalid strategy type: ${invalid.join(', ')}` }, { status: 400 });
+    }
+
+    const persona = await prisma.persona.findUnique({
+      where: { id: personaId },
+      include: {
+        segment: true,
+        cultureProfile: true,
+        economicProfile: true
+      }
+    });
+
+    if (!persona) {
+      return NextResponse.json({ error: 'Persona not found' }, { status: 404 });
+    }
+
+    const startedAt = Date.now();
+    const runs = types.map(type => STRATEGY_GENERATORS[type](
+      persona, persona.segment, persona.cultureProfile, persona.economicProfile
+    ).then(
+      async strategy => {
+        try {
+          const saved = await saveStrategy(user, persona, type, strategy);
+          return { type, strategy, version: saved.version, elapsed_ms: Date.now() - startedAt };
+        } catch (dbError) {
+          console.error(`Database error saving ${type} strategy:`, dbError);
+          return { type, error: 'Failed to save strategy', elapsed_ms: Date.now() - startedAt };
+        }
+      },
+      error => ({ type, error: error.message, elapsed_ms: Date.now() - startedAt })
+    ));
+
+    const { searchParams } = new URL(request.url);
+    if (searchParams.get('stream') === 'ndjson') {
+      const encoder = new TextEncoder();
+      const stream = new ReadableStream({
+        async start(controller) {
+          await Promise.all(runs.map(run => run.then(result => {
+            controller.enqueue(encoder.encode(JSON.stringify(result) + '\n'));
+          })));
+          controller.enqueue(encoder.encode(JSON.stringify({ done: true, elapsed_ms: Date.now() - startedAt }) + '\n'));
+          controller.close();
+        }
+      });
+      return new Response(stream, {
+        headers: { 'Content-Type': 'application/x-ndjson', 'Cache-Control': 'no-cache' }
+      });
+    }
+
+    const results = await Promise.all(runs);
+    const strategies = {};
+    const versions = {};
+    const errors = {};
+    for (const result of results) {
+      if (result.error) {
+        errors[result.type] = result.error;
+      } else {
+        strategies[result.type] = result.strategy;
+        versions[result.type] = result.version;
+      }
+    }
+
+    if (!Object.keys(strategies).length) {
+      return NextResponse.json({ error: 'Failed to generate strategies', errors }, { status: 500 });
+    }
+    return NextResponse.json({
+      strategies,
+      versions,
+      ...(Object.keys(errors).length ? { errors } : {}),
+      elapsed_ms: Date.now() - startedAt
+    });
+  } catch (error) {
+    console.error('Error generating strategies:', error);
+    return NextResponse.json({ error: 'Failed to generate strategies' }, { status: 500 });
+  }
+}
+
+// Job mode for the generation routes (?mode=async): the request is queued on the
+// bounded worker pool in lib/job-queue.js and answered with 202 and a job ID straight
+// away. The queued job runs the same handler on a copy of the request; its JSON
+// response becomes the job result, available from GET /api/jobs/:id.
+async function submitGenerationJob(request, kind, handler) {
+  const user = await getCurrentUserOrMock(request);
+  if (!user) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+  }
+
+  const { searchParams } = new URL(request.url);
+  if (searchParams.get('stream')) {
+    return NextResponse.json({ error: 'Streaming is not available in async mode' }, { status: 400 });
+  }
+
+  const jobRequest = request.clone();
+  const job = jobQueue.submit(kind, user.id, async () => {
+    const response = await handler(jobRequest);
+    return { status: response.status, body: await response.json().catch(() => null) };
+  });
+
+  if (!job) {
+    return NextResponse.json(
+      { error: 'Generation queue is full', queue: jobQueue.stats() },
+      { status: 503, headers: { 'Retry-After': '5' } }
+    );
+  }
+
+  return NextResponse.json(
+    { job: jobQueue.view(job), queue: jobQueue.stats() },
+    { status: 202, headers: { Location: `/api/jobs/${job.id}` } }
+  );
+}
+
+// GET /api/jobs/:id - Job status; ?wait=<seconds> (up to 30) long-polls until it finishes
+async function getJob(request, jobId) {
+  try {
+    const user = await getCurrentUserOrMock(request);
+    if (!user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+
+    const job = jobQueue.get(jobId);
+    if (!job || job.ownerId !== user.id) {
+      return NextResponse.json({ error: 'Job not found' }, { status: 404 });
+    }
+
+    const { searchParams } = new URL(request.url);
+    const wait = Math.min(Math.max(parseFloat(searchParams.get('wait')) || 0, 0), 30);
+    await jobQueue.wait(job, wait * 1000);
+
+    return NextResponse.json({ job: jobQueue.view(job), queue: jobQueue.stats() });
+  } catch (error) {
+    console.error('Error fetching job:', error);
+    return NextResponse.json({ error: 'Failed to fetch job' }, { status: 500 });
+  }
+}
+
+// GET /api/personas/:id/strategies/:type/export - The latest stored version, or ?version=<n>
 async function exportPersonaStrategy(request, personaId, strategyType) {
   try {
     const user = await getCurrentUserOrMock(request);
@@ -862,24 +1319,98 @@ async function exportPersonaStrategy(request, personaId, strategyType) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
     }
 
-    // For now, return a mock export
-    const exportData = {
+    if (user.id === 'demo-user-id') {
+      return NextResponse.json({
+        persona_id: personaId,
+        strategy_type: strategyType,
+        exported_at: new Date().toISOString(),
+        data: {
+          message: `${strategyType} strategy export placeholder`,
+          note: 'Demo mode stores no strategies; sign in to export generated versions'
+        }
+      });
+    }
+
+    const strategyModel = STRATEGY_MODELS[strategyType];
+    if (!strategyModel) {
+      return NextResponse.json({ error: 'Invalid strategy type' }, { status: 400 });
+    }
+
+    const { searchParams } = new URL(request.url);
+    const version = parseInt(searchParams.get('version'), 10);
+    const row = await prisma[strategyModel.model].findFirst({
+      where: { personaId, ...(version > 0 ? { version } : {}) },
+      orderBy: { version: 'desc' }
+    });
+
+    if (!row) {
+      return NextResponse.json({ error: `No stored ${strategyType} strategy` }, { status: 404 });
+    }
+
+    return NextResponse.json({
       persona_id: personaId,
       strategy_type: strategyType,
+      version: row.version,
       exported_at: new Date().toISOString(),
-      data: {
-        message: `${strategyType} strategy export placeholder`,
-        note: 'This would contain the actual strategy data in a full implementation'
-      }
-    };
-
-    return NextResponse.json(exportData);
+      data: strategyRecord(strategyType, row)
+    });
   } catch (error) {
     console.error('Error exporting strategy:', error);
     return NextResponse.json({ error: 'Failed to export strategy' }, { status: 500 });
   }
 }
 
+class StrategyExportNotFound extends Error {}
+
+// Everything export-all returns except the export time, or null if the persona is gone
+async function readStrategyExport(personaId) {
+  const persona = await prisma.persona.findUnique({
+    where: { id: personaId },
+    include: {
+      segment: true,
+      cultureProfile: true,
+      economicProfile: true,
+      ...latestStrategies()
+    }
+  });
+  if (!persona) return null;
+
+  const { strategies, versions } = latestStrategyRecords(persona);
+  return {
+    persona: {
+      id: persona.id,
+      name: persona.name,
+      positioning: persona.positioning
+    },
+    segment: persona.segment,
+    culture_profile: persona.cultureProfile,
+    economic_profile: persona.economicProfile,
+    strategies,
+    strategy_versions: versions,
+    version: '1.0.0'
+  };
+}
+
+// Assembled exports keyed by persona, the latest version of each strategy and the
+// update times of the persona and its inputs: any new version or edit changes the key,
+// so entries never need invalidating and every server instance agrees on them.
+const strategyExportCache = new MemoCache({
+  maxEntries: process.env.STRATEGY_EXPORT_CACHE_MAX ? parseInt(process.env.STRATEGY_EXPORT_CACHE_MAX, 10) : 500
+});
+
+function strategyExportKey(personaId, probe) {
+  return [
+    personaId,
+    ...Object.values(STRATEGY_MODELS).map(({ relation }) => probe[relation][0]?.version ?? 0),
+    ...[probe, probe.segment, probe.cultureProfile, probe.economicProfile].map(
+      record => record?.updatedAt?.toISOString() ?? null
+    )
+  ].join(':');
+}
+
+// GET /api/personas/:id/strategies/export-all - Persona, inputs and latest strategies.
+// A small version probe decides the cache key; on a miss the export is read with one
+// query that includes the latest row of each strategy table.
 async function exportAllPersonaStrategies(request, personaId) {
   try {
     const user = await getCurrentUserOrMock(request);
@@ -887,38 +1418,51 @@ async function exportAllPersonaStrategies(request, personaId) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
     }
 
-    const persona = await prisma.persona.findUnique({
+    const updatedAt = { select: { updatedAt: true } };
+    const probe = await prisma.persona.findUnique({
       where: { id: personaId },
-      include: {
-        segment: true,
-        cultureProfile: true,
-        economicProfile: true
+      select: {
+        updatedAt: true,
+        segment: updatedAt,
+        cultureProfile: updatedAt,
+        economicProfile: updatedAt,
+        ...latestStrategies({ version: true })
       }
     });
 
-    if (!persona) {
+    if (!probe) {
       return NextResponse.json({ error: 'Persona not found' }, { status: 404 });
     }
 
-    const exportData = {
-      persona: {
-        id: persona.id,
-        name: persona.name,
-        positioning: persona.positioning
-      },
-      segment: persona.segment,
-      culture_profile: persona.cultureProfile,
-      economic_profile: persona.economicProfile,
-      strategies: {
-        positioning: null, // Would fetch actual strategy data
-        messaging: null,
-        pricing: null
-      },
-      exported_at: new Date().toISOString(),
-      version: '1.0.0'
-    };
+    // Only exports with stored strategies are cached: one without any is about to
+    // change, and a missing persona must not be remembered as such
+    const hasStrategies = Object.values(STRATEGY_MODELS).some(({ relation }) => probe[relation].length);
+    let cache = 'bypass';
+    let exportData;
+    if (hasStrategies) {
+      cache = 'hit';
+      exportData = await strategyExportCache.memoize('strategy-export', [strategyExportKey(personaId, probe)], async () => {
+        cache = 'miss';
+        const data = await readStrategyExport(personaId);
+        // Deleted since the probe: throwing keeps the miss out of the cache
+        if (!data) throw new StrategyExportNotFound();
+        return data;
+      }).catch(error => {
+        if (error instanceof StrategyExportNotFound) return null;
+        throw error;
+      });
+    } else {
+      exportData = await readStrategyExport(personaId);
+    }
 
-    return NextResponse.json(exportData);
+    if (!exportData) {
+      return NextResponse.json({ error: 'Persona not found' }, { status: 404 });
+    }
+
+    return NextResponse.json(
+      { ...exportData, exported_at: new Date().toISOString() },
+      { headers: { 'X-Export-Cache': cache } }
+    );
   } catch (error) {
     console.error('Error exporting all strategies:', error);
     return NextResponse.json({ error: 'Failed to export strategies' }, { status: 500 });
@@ -973,25 +1517,27 @@ async function exportPersona(personaId, request) {
 }
 
 // Route handlers
-export async function GET(request) {
+async function handleGet(request) {
   const { pathname } = new URL(request.url);
   const segments = pathname.split('/').filter(Boolean);
   
   try {
     if (segments[1] === 'workspaces') {
       if (segments.length === 2) {
-        return await getWorkspaces(request);
+        return await withETag(request, await getWorkspaces(request));
       } else if (segments[3] === 'segments') {
         return await getSegments(segments[2], request);
       }
     } else if (segments[1] === 'segments' && segments.length === 3) {
-      return await getSegmentById(segments[2], request);
+      return await withETag(request, await getSegmentById(segments[2], request));
+    } else if (segments[1] === 'jobs' && segments.length === 3) {
+      return await getJob(request, segments[2]);
     } else if (segments[1] === 'personas') {
       if (segments[3] === 'export') {
         return await exportPersona(segments[2], request);
       } else if (segments[3] === 'strategies') {
         if (segments.length === 4) {
-          return await getPersonaStrategies(request, segments[2]);
+          return await withETag(request, await getPersonaStrategies(request, segments[2]));
         } else if (segments[4] === 'export-all') {
           return await exportAllPersonaStrategies(request, segments[2]);
         } else if (segments[5] === 'export') {
@@ -1007,9 +1553,13 @@ export async function GET(request) {
   }
 }
 
-export async function POST(request) {
-  const { pathname } = new URL(request.url);
+async function handlePost(request) {
+  const { pathname, searchParams } = new URL(request.url);
   const segments = pathname.split('/').filter(Boolean);
+  // Generation routes either run inline or, with ?mode=async, as a queued job
+  const generate = (kind, handler) => searchParams.get('mode') === 'async'
+    ? submitGenerationJob(request, kind, handler)
+    : handler(request);
   
   try {
     if (segments[1] === 'workspaces' && segments.length === 2) {
@@ -1022,10 +1572,16 @@ export async function POST(request) {
       return await createEconomicProfile(request);
     } else if (segments[1] === 'personas') {
       if (segments[2] === 'generate') {
-        return await generatePersona(request);
+        // Streaming goes through generate too, so ?mode=async rejects it like the strategy routes do
+        const stream = searchParams.get('stream');
+        return await generate('persona', req => stream === 'sse' || stream === 'ndjson'
+          ? streamPersonaGeneration(req, stream)
+          : generatePersona(req));
       } else if (segments[3] === 'strategies') {
-        if (segments[5] === 'generate') {
-          return await generatePersonaStrategy(request, segments[2], segments[4]);
+        if (segments.length === 5 && segments[4] === 'generate') {
+          return await generate('strategies', req => generateAllPersonaStrategies(req, segments[2]));
+        } else if (segments[5] === 'generate') {
+          return await generate(`strategy:${segments[4]}`, req => generatePersonaStrategy(req, segments[2], segments[4]));
         }
       }
     }
@@ -1037,7 +1593,7 @@ export async function POST(request) {
   }
 }
 
-export async function PUT(request) {
+async function handlePut(request) {
   const { pathname } = new URL(request.url);
   const segments = pathname.split('/').filter(Boolean);
   
@@ -1059,7 +1615,7 @@ export async function PUT(request) {
   }
 }
 
-export async function DELETE(request) {
+async function handleDelete(request) {
   const { pathname } = new URL(request.url);
   const segments = pathname.split('/').filter(Boolean);
   
@@ -1077,4 +1633,9 @@ export async function DELETE(request) {
     console.error('DELETE request error:', error);
     return NextResponse.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
\ No newline at end of file
+}
+
+export const GET = withCompression(withDbStats(handleGet));
+export const POST = withCompression(withDbStats(handlePost));
+export const PUT = withCompression(withDbStats(handlePut));
+export const DELETE = withCompression(withDbStats(handleDelete));
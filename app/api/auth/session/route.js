@@ -1,8 +1,9 @@
 import { NextResponse } from 'next/server';
 import { cookies } from 'next/headers';
 import { prisma } from '@/lib/database';
+import { withDbStats } from '@/lib/db-stats';
 
-export async function POST(request) {
+async function createSession(request) {
   try {
     const { session_id } = await request.json();
     
@@ -89,4 +90,6 @@ export async function POST(request) {
     console.error('Session validation error:', error);
     return NextResponse.json({ error: 'Authentication failed' }, { status: 500 });
   }
-}
\ No newline at end of file
+}
+
+export const POST = withDbStats(createSession);
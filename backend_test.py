@@ -4,72 +4,23 @@ Comprehensive Backend API Testing for Enhanced Human-Rooted Segmentation Studio
 Tests authentication, validation, permissions, and all CRUD operations as specified in the review request.
 """
 
-import requests
-import json
 import sys
 import time
 import uuid
 from datetime import datetime
 
-# Get base URL from environment
-BASE_URL = "https://rooted-personas.preview.emergentagent.com/api"
-DEMO_MODE = True  # Test with demo mode fallback
+from harness.core import HarnessTester, harness_test
 
-class EnhancedBackendTester:
-    def __init__(self):
-        self.base_url = BASE_URL
-        self.session = requests.Session()
-        self.test_results = []
+class EnhancedBackendTester(HarnessTester):
+    def __init__(self, base_url=None):
+        super().__init__(base_url)
         self.workspace_id = None
         self.segment_id = None
         self.culture_profile_id = None
         self.economic_profile_id = None
         self.persona_id = None
         
-    def log_result(self, test_name, success, message, response_data=None):
-        """Log test result"""
-        result = {
-            'test': test_name,
-            'success': success,
-            'message': message,
-            'timestamp': datetime.now().isoformat(),
-            'response_data': response_data
-        }
-        self.test_results.append(result)
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name} - {message}")
-        if response_data and not success:
-            print(f"   Response: {json.dumps(response_data, indent=2)}")
-
-    def make_request(self, method, endpoint, data=None, params=None):
-        """Make HTTP request with demo mode support"""
-        url = f"{self.base_url}{endpoint}"
-        
-        # Add demo mode parameter if enabled
-        if DEMO_MODE:
-            if params is None:
-                params = {}
-            params['demo'] = 'true'
-            
-        headers = {'Content-Type': 'application/json'}
-        
-        try:
-            if method.upper() == 'GET':
-                response = self.session.get(url, params=params, headers=headers)
-            elif method.upper() == 'POST':
-                response = self.session.post(url, json=data, params=params, headers=headers)
-            elif method.upper() == 'PUT':
-                response = self.session.put(url, json=data, params=params, headers=headers)
-            elif method.upper() == 'DELETE':
-                response = self.session.delete(url, params=params, headers=headers)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
-            return response
-        except Exception as e:
-            print(f"Request failed: {e}")
-            return None
-    
+    @harness_test('smoke', 'auth')
     def test_authentication_system(self):
         """Test 1: Authentication System - NextAuth.js integration and demo mode fallback"""
         print("\n=== Testing Authentication System ===")
@@ -94,6 +45,7 @@ class EnhancedBackendTester:
             self.log_result("Demo Mode Authentication", False, f"Connection error: {str(e)}")
             return False
     
+    @harness_test('crud', 'workspaces')
     def test_workspace_crud_operations(self):
         """Test 2: Enhanced Workspace API Endpoints with validation"""
         print("\n=== Testing Workspace CRUD Operations ===")
@@ -181,6 +133,7 @@ class EnhancedBackendTester:
 
         return True
     
+    @harness_test('smoke', 'validation')
     def test_validation_system(self):
         """Test 3: Validation System - Test blocked terms and ethical compliance"""
         print("\n=== Testing Validation System ===")
@@ -215,10 +168,13 @@ class EnhancedBackendTester:
         
         return success_count > 0
 
+    @harness_test('crud', 'segments')
     def test_segment_crud_operations(self):
         """Test 4: Enhanced Segment API Endpoints with validation"""
         print("\n=== Testing Segment CRUD Operations ===")
         
+        if not self.workspace_id:
+            self.workspace_id = self.first_workspace_id()
         if not self.workspace_id:
             self.log_result("Segment CRUD Setup", False, "No workspace ID available for segment testing")
             return False
@@ -321,6 +277,7 @@ class EnhancedBackendTester:
 
         return True
     
+    @harness_test('permissions')
     def test_permissions_system(self):
         """Test 5: Permissions System - Test workspace access control"""
         print("\n=== Testing Permissions System ===")
@@ -361,6 +318,7 @@ class EnhancedBackendTester:
         
         return False
     
+    @harness_test('crud', 'profiles')
     def test_culture_economic_profiles(self):
         """Test 6: Culture and Economic Profile Operations"""
         print("\n=== Testing Culture and Economic Profile Operations ===")
@@ -437,6 +395,7 @@ class EnhancedBackendTester:
 
         return True
 
+    @harness_test('personas', 'generation', 'slow')
     def test_persona_operations(self):
         """Test 7: Persona Operations - Create personas for strategy testing"""
         print("\n=== Testing Persona Operations ===")
@@ -472,6 +431,7 @@ class EnhancedBackendTester:
 
         return True
 
+    @harness_test('strategies', 'generation', 'slow')
     def test_strategy_generation_endpoints(self):
         """Test 8: Strategy Generation API Endpoints - Phase 2 & 3 Strategy Testing"""
         print("\n=== Testing Strategy Generation Endpoints ===")
@@ -540,6 +500,7 @@ class EnhancedBackendTester:
 
         return success_count == len(strategy_types)
 
+    @harness_test('strategies')
     def test_strategy_get_all_endpoint(self):
         """Test 9: Get All Strategies Endpoint"""
         print("\n=== Testing Get All Strategies Endpoint ===")
@@ -575,6 +536,7 @@ class EnhancedBackendTester:
             self.log_result("GET /api/personas/strategies", False, f"Error: {str(e)}")
             return False
 
+    @harness_test('strategies', 'export')
     def test_strategy_export_endpoints(self):
         """Test 10: Strategy Export Endpoints"""
         print("\n=== Testing Strategy Export Endpoints ===")
@@ -627,6 +589,7 @@ class EnhancedBackendTester:
 
         return success_count >= 3  # At least 3 successful exports (individual types or export-all)
 
+    @harness_test('workflow', 'generation', 'slow')
     def test_end_to_end_strategy_workflow(self):
         """Test 11: End-to-End Strategy Workflow - Complete persona to strategy pipeline"""
         print("\n=== Testing End-to-End Strategy Workflow ===")
@@ -737,6 +700,7 @@ class EnhancedBackendTester:
         
         return True
 
+    @harness_test('personas', 'export')
     def test_persona_export_functionality(self):
         """Test 12: Persona Export Functionality"""
         print("\n=== Testing Persona Export Functionality ===")
@@ -776,6 +740,7 @@ class EnhancedBackendTester:
             self.log_result("GET /api/personas/export", False, f"Error: {str(e)}")
             return False
     
+    @harness_test('errors')
     def test_error_handling(self):
         """Test 7: Error Handling - Test proper error responses"""
         print("\n=== Testing Error Handling ===")
@@ -808,6 +773,7 @@ class EnhancedBackendTester:
             self.log_result("Invalid UUID Handling", False, f"Error: {str(e)}")
             return False
     
+    @harness_test('cleanup')
     def test_cleanup_operations(self):
         """Test 8: Cleanup - Test DELETE operations"""
         print("\n=== Testing Cleanup Operations ===")
@@ -894,25 +860,7 @@ class EnhancedBackendTester:
             # Small delay between tests
             time.sleep(0.5)
         
-        # Print summary
-        print(f"\n{'='*80}")
-        print(f"🏁 ENHANCED TEST SUMMARY")
-        print(f"{'='*80}")
-        print(f"✅ Passed: {passed}")
-        print(f"❌ Failed: {failed}")
-        print(f"📊 Success Rate: {(passed/(passed+failed)*100):.1f}%")
-        print(f"⏰ Test completed at: {datetime.now().isoformat()}")
-        
-        if failed > 0:
-            print(f"\n🔍 FAILED TESTS:")
-            for result in self.test_results:
-                if not result['success']:
-                    print(f"   • {result['test']}: {result['message']}")
-        
-        print(f"\n✅ PASSED TESTS:")
-        for result in self.test_results:
-            if result['success']:
-                print(f"   • {result['test']}")
+        self.print_summary("ENHANCED TEST SUMMARY", passed, failed)
         
         return failed == 0
 
@@ -922,17 +870,7 @@ def main():
     success = tester.run_all_tests()
     
     # Save detailed results to file
-    with open('/app/enhanced_backend_test_results.json', 'w') as f:
-        json.dump({
-            'summary': {
-                'total_tests': len(tester.test_results),
-                'passed': sum(1 for r in tester.test_results if r['success']),
-                'failed': sum(1 for r in tester.test_results if not r['success']),
-                'success_rate': sum(1 for r in tester.test_results if r['success']) / len(tester.test_results) * 100 if tester.test_results else 0,
-                'test_completed_at': datetime.now().isoformat()
-            },
-            'detailed_results': tester.test_results
-        }, f, indent=2)
+    tester.save_results('/app/enhanced_backend_test_results.json')
     
     return 0 if success else 1
 
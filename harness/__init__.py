@@ -0,0 +1,3 @@
+"""
+Shared tooling for the backend test harness.
+"""
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Harness CLI - run individual tests by name or tag
+
+    python -m harness                       # the 'smoke' tag (pre-deploy check)
+    python -m harness -k quick_test.test_validation
+    python -m harness -t validation -t auth
+    python -m harness --list
+    python -m harness --startup-bench 10    # measure cold start of the CLI itself
+"""
+
+import argparse
+import fnmatch
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+from harness import core
+
+# Cold start budget for `python -m harness --list`, interpreter included
+STARTUP_BUDGET_MS = 250
+
+
+class TestCase:
+    def __init__(self, name, tags, func, owner=None):
+        self.name = name
+        self.tags = tags
+        self.func = func
+        self.owner = owner
+
+
+def modules_for(names):
+    """Only import the modules a -k selection can match, when that is knowable"""
+    if names and all('.' in n and not any(c in n.split('.', 1)[0] for c in '*?[') for n in names):
+        wanted = {n.split('.', 1)[0] for n in names}
+        return [m for m in core.TEST_MODULES if m in wanted]
+    return list(core.TEST_MODULES)
+
+
+def discover(module_names):
+    core.ensure_repo_on_path()
+    cases = []
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        for attr, obj in vars(module).items():
+            if isinstance(obj, type):
+                if issubclass(obj, core.HarnessTester) and obj.__module__ == module_name:
+                    for method_name, member in vars(obj).items():
+                        if hasattr(member, 'harness_tags'):
+                            cases.append(TestCase(f"{module_name}.{method_name}", member.harness_tags, member, obj))
+            elif callable(obj) and hasattr(obj, 'harness_tags'):
+                cases.append(TestCase(f"{module_name}.{attr}", obj.harness_tags, obj))
+    return cases
+
+
+def select(cases, names, tags):
+    def name_matches(case):
+        return any(fnmatch.fnmatch(case.name, n) if any(c in n for c in '*?[') else n in case.name
+                   for n in names)
+
+    def tag_matches(case):
+        return any(t in case.tags for t in tags)
+
+    if not names and not tags:
+        tags = ['smoke']
+    return [c for c in cases if (names and name_matches(c)) or (tags and tag_matches(c))]
+
+
+def run(cases, base_url):
+    """Run selected tests; class-based tests share one tester instance per class"""
+    instances = {}
+    function_tester = core.HarnessTester(base_url)
+    passed = failed = 0
+
+    for case in cases:
+        if case.owner:
+            if case.owner not in instances:
+                instances[case.owner] = case.owner(base_url)
+            tester = instances[case.owner]
+        else:
+            tester = function_tester
+        try:
+            ok = bool(case.func(tester))
+        except Exception as e:
+            print(f"❌ CRITICAL ERROR in {case.name}: {str(e)}")
+            ok = False
+        if ok:
+            passed += 1
+        else:
+            failed += 1
+        if not case.owner:
+            tester.log_result(case.name, ok, 'passed' if ok else 'failed')
+
+    testers = [function_tester] + list(instances.values())
+    return passed, failed, testers
+
+
+def startup_bench(runs):
+    """Time cold starts of `python -m harness --list` in fresh interpreters"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'harness', '--list', '-t', 'smoke'],
+                       stdout=subprocess.DEVNULL, check=True,
+                       cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    median = timings[len(timings) // 2]
+    print(f"⚡ Cold start over {runs} runs: median {median:.0f} ms, "
+          f"min {timings[0]:.0f} ms, max {timings[-1]:.0f} ms (budget {STARTUP_BUDGET_MS} ms)")
+    if median > STARTUP_BUDGET_MS:
+        print(f"⚠️  Cold start is over budget - check `python -X importtime -m harness --list`")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m harness', description='Run harness tests by name or tag')
+    parser.add_argument('-k', '--name', action='append', default=[],
+                        help='Test name substring or glob, e.g. quick_test.test_validation')
+    parser.add_argument('-t', '--tag', action='append', default=[], help="Tag to select (default: 'smoke')")
+    parser.add_argument('--list', action='store_true', help='List matching tests without running them')
+    parser.add_argument('--base-url', default=core.BASE_URL)
+    parser.add_argument('--output', help='Write detailed results JSON to this path')
+    parser.add_argument('--startup-bench', type=int, metavar='RUNS', help='Measure CLI cold start')
+    parser.add_argument('--setup-cache', action='store_true', help='Serve setup GETs from the shared setup cache')
+    parser.add_argument('--quiet', action='store_true', help='Only print failed tests while running')
+    parser.add_argument('--profile', action='store_true', help='Sample the harness itself with a profiler')
+    args = parser.parse_args(argv)
+    if args.quiet:
+        core.QUIET = True
+
+    if args.startup_bench:
+        return startup_bench(args.startup_bench)
+
+    cases = select(discover(modules_for(args.name)), args.name, args.tag)
+    if args.list:
+        for case in cases:
+            print(f"{case.name}  [{', '.join(case.tags)}]")
+        return 0
+    if not cases:
+        print("❌ No tests matched the selection")
+        return 2
+
+    if args.setup_cache:
+        from harness.cache import enable_setup_cache
+        enable_setup_cache()
+    if args.profile:
+        from harness.overhead import enable_profiling
+        enable_profiling()
+
+    run_start = time.perf_counter()
+    startup = core.process_uptime()
+    passed, failed, testers = run(cases, args.base_url)
+    wall = time.perf_counter() - run_start
+
+    results = [r for t in testers for r in t.test_results]
+    summary = core.HarnessTester(args.base_url)
+    summary.test_results = results
+    summary.request_samples = [s for t in testers for s in t.request_samples]
+    summary.overhead = next((t.overhead for t in testers if t.overhead is not None), None)
+    summary.print_summary("HARNESS RUN SUMMARY", passed, failed)
+
+    request_count = sum(t.request_count for t in testers)
+    request_seconds = sum(t.request_seconds for t in testers)
+    overhead = max(0.0, wall - request_seconds)
+    startup_text = f"startup {startup * 1000:.0f} ms + " if startup is not None else ""
+    print(f"\n⚡ Client overhead: {startup_text}{overhead * 1000:.0f} ms run "
+          f"({request_count} requests, {request_seconds * 1000:.0f} ms waiting on the server)")
+    if args.setup_cache:
+        from harness.cache import print_cache_summary, setup_cache
+        print_cache_summary(setup_cache())
+
+    if args.profile and summary.overhead is not None:
+        print(f"🔬 Folded stacks written to {summary.overhead.write_profile()}")
+
+    if args.output:
+        summary.save_results(args.output)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
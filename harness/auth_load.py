@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Authenticated Session Load - exercises the real auth path instead of ?demo=true
+Provisions many synthetic users through POST /api/auth/session, backed by a local stand-in
+for the Emergent session-data exchange, then drives GET /auth/me and GET /workspaces with
+each user's own session_token cookie. Runs in stages of growing session-table size and
+reports login cost, per-request auth overhead (authenticated vs demo GET /workspaces) and
+how session lookups scale with the number of stored sessions.
+
+Start the app against the stand-in so /api/auth/session never leaves the machine:
+
+    EMERGENT_BACKEND_URL=http://127.0.0.1:8902 yarn dev
+    python -m harness.auth_load --users 5000 --stub-port 8902
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import requests
+from requests.cookies import RequestsCookieJar
+
+from harness.core import BASE_URL, normalize_endpoint, percentile
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+
+DEMO_USER_ID = 'demo-user-id'
+DEFAULT_STAGES = (100, 500, 1000, 2500, 5000)
+
+
+def synthetic_user(session_id):
+    """Deterministic user data for a session id, as the session-data exchange returns it"""
+    digest = hashlib.sha1(session_id.encode('utf-8')).hexdigest()
+    return {
+        'id': digest[:24],
+        'email': f"{session_id}@loadtest.harness.local",
+        'name': f"Load Test {session_id}",
+        'picture': None,
+        'session_token': f"harness-{digest}"
+    }
+
+
+class SessionDataStub:
+    """Local stand-in for ${EMERGENT_BACKEND_URL}/auth/v1/env/oauth/session-data
+
+    Any X-Session-ID is accepted and mapped to a stable synthetic user, so the same
+    virtual user always logs in as the same account across runs.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.exchanges = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread and return the base URL"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_json(self, status, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path == '/auth/v1/env/oauth/session-data':
+                    session_id = self.headers.get('X-Session-ID')
+                    if not session_id:
+                        return self.send_json(401, {'error': 'Missing X-Session-ID'})
+                    with stub.lock:
+                        stub.exchanges += 1
+                    return self.send_json(200, synthetic_user(session_id))
+                if path == '/auth/v1/env/user':
+                    token = self.headers.get('Authorization', '').replace('Bearer ', '', 1)
+                    if not token.startswith('harness-'):
+                        return self.send_json(401, {'error': 'Unknown session'})
+                    user = {'id': token[8:32], 'email': None, 'name': 'Load Test User'}
+                    return self.send_json(200, user)
+                if path == '/health':
+                    return self.send_json(200, {'status': 'ok', 'exchanges': stub.exchanges})
+                self.send_json(404, {'error': 'Not found'})
+
+        return Handler
+
+
+class VirtualUser:
+    """A synthetic account with its own cookie jar"""
+
+    def __init__(self, index, prefix):
+        self.index = index
+        self.session_id = f"{prefix}-{index}"
+        self.cookies = RequestsCookieJar()
+        self.logged_in = False
+
+
+class AuthLoadRunner:
+    """Provisions users in stages and measures authenticated requests at each table size
+
+    Thousands of users share `concurrency` worker sessions for connection reuse; before
+    each request a worker swaps in the user's cookie jar, so Set-Cookie responses land in
+    that user's jar and connections stay bounded.
+    """
+
+    def __init__(self, base_url=BASE_URL, users=1000, stages=DEFAULT_STAGES, concurrency=32,
+                 requests_per_stage=500, prefix='harness-user', seed=None, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.users = [VirtualUser(i, prefix) for i in range(users)]
+        self.stages = sorted({s for s in stages if s < users} | {users})
+        self.concurrency = concurrency
+        self.requests_per_stage = requests_per_stage
+        self.rng = random.Random(seed)
+        self.timeout = timeout
+        self.samples = []
+        self.samples_lock = threading.Lock()
+        self.local = threading.local()
+        self.pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    def worker_session(self):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        return session
+
+    def request(self, user, test, method, path, params=None, body=None, **fields):
+        """One request with the user's cookies; extra keyword fields are stored on the sample"""
+        session = self.worker_session()
+        session.cookies = user.cookies if user else RequestsCookieJar()
+        sample = {'test': test, 'method': method, 'endpoint': normalize_endpoint(path),
+                  'vu': user.index if user else None, 'started_at': time.time(),
+                  'status': None, 'bytes': 0, 'success': False, 'message': '', **fields}
+        start = time.perf_counter()
+        try:
+            response = session.request(method, f"{self.base_url}{path}", params=params, json=body,
+                                       timeout=self.timeout)
+        except requests.RequestException as e:
+            sample['latency_ms'] = (time.perf_counter() - start) * 1000
+            sample['message'] = f"Request failed: {e.__class__.__name__}"
+            self.record(sample)
+            return None, sample
+        sample['latency_ms'] = (time.perf_counter() - start) * 1000
+        sample['status'] = response.status_code
+        sample['bytes'] = len(response.content)
+        sample['success'] = response.status_code == 200
+        self.record(sample)
+        return response, sample
+
+    def record(self, sample):
+        with self.samples_lock:
+            self.samples.append(sample)
+
+    def login(self, user, sessions=None):
+        response, _ = self.request(user, 'auth_login', 'POST', '/auth/session',
+                                   body={'session_id': user.session_id}, sessions=sessions)
+        user.logged_in = bool(response is not None and response.status_code == 200
+                              and user.cookies.get('session_token'))
+
+    def authenticated_round(self, user, sessions):
+        self.request(user, 'auth_me', 'GET', '/auth/me', sessions=sessions)
+        response, sample = self.request(user, 'workspaces_authenticated', 'GET', '/workspaces',
+                                        sessions=sessions)
+        if response is not None and response.status_code == 200:
+            try:
+                workspaces = response.json().get('workspaces', [])
+            except ValueError:
+                workspaces = []
+            if any(w.get('ownerId') == DEMO_USER_ID for w in workspaces):
+                sample['message'] = 'Served the demo workspace - cookie was not resolved'
+                sample['mock_fallback'] = True
+
+    def demo_round(self, sessions):
+        self.request(None, 'workspaces_demo', 'GET', '/workspaces', params={'demo': 'true'}, sessions=sessions)
+
+    def run(self):
+        provisioned = 0
+        levels = []
+        for stage in self.stages:
+            print(f"👥 Provisioning sessions {provisioned + 1}-{stage}")
+            list(self.pool.map(lambda u: self.login(u, stage), self.users[provisioned:stage]))
+            provisioned = stage
+
+            active = [u for u in self.users[:stage] if u.logged_in]
+            if not active:
+                print(f"❌ No user logged in - is EMERGENT_BACKEND_URL pointing at the stub?")
+                break
+            picks = [self.rng.choice(active) for _ in range(self.requests_per_stage)]
+            futures = [self.pool.submit(self.authenticated_round, u, stage) for u in picks]
+            futures += [self.pool.submit(self.demo_round, stage) for _ in picks]
+            for future in futures:
+                future.result()
+            levels.append(self.level_summary(stage))
+            print(f"   {stage:>6} sessions: /auth/me p50 {levels[-1]['auth_me']['p50_ms']:.0f} ms, "
+                  f"auth overhead {levels[-1]['auth_overhead_ms']:+.1f} ms")
+        self.pool.shutdown()
+        return levels
+
+    def level_summary(self, sessions):
+        def stats(test):
+            samples = [s for s in self.samples if s['test'] == test and s['sessions'] == sessions]
+            latencies = sorted(s['latency_ms'] for s in samples if s['success'])
+            return {
+                'count': len(samples),
+                'failed': sum(1 for s in samples if not s['success']),
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99)
+            }
+
+        level = {test: stats(test) for test in
+                 ('auth_login', 'auth_me', 'workspaces_authenticated', 'workspaces_demo')}
+        level['sessions'] = sessions
+        level['auth_overhead_ms'] = (level['workspaces_authenticated']['p50_ms']
+                                     - level['workspaces_demo']['p50_ms'])
+        level['mock_fallbacks'] = sum(1 for s in self.samples
+                                      if s.get('mock_fallback') and s['sessions'] == sessions)
+        return level
+
+
+def print_levels(levels):
+    print(f"\n{'='*80}")
+    print(f"🏁 AUTHENTICATED SESSION LOAD SUMMARY")
+    print(f"{'='*80}")
+    print(f"{'sessions':>9}{'login p50':>11}{'login p95':>11}{'me p50':>9}{'me p95':>9}"
+          f"{'ws auth':>9}{'ws demo':>9}{'overhead':>10}{'errors':>8}")
+    for level in levels:
+        errors = sum(level[t]['failed'] for t in
+                     ('auth_login', 'auth_me', 'workspaces_authenticated', 'workspaces_demo'))
+        print(f"{level['sessions']:>9}{level['auth_login']['p50_ms']:>11.0f}{level['auth_login']['p95_ms']:>11.0f}"
+              f"{level['auth_me']['p50_ms']:>9.0f}{level['auth_me']['p95_ms']:>9.0f}"
+              f"{level['workspaces_authenticated']['p50_ms']:>9.0f}{level['workspaces_demo']['p50_ms']:>9.0f}"
+              f"{level['auth_overhead_ms']:>+9.1f}ms{errors:>8}")
+    if len(levels) > 1 and levels[0]['auth_me']['p50_ms']:
+        growth = levels[-1]['auth_me']['p50_ms'] / levels[0]['auth_me']['p50_ms']
+        size = levels[-1]['sessions'] / levels[0]['sessions']
+        print(f"\n📈 /auth/me p50 grew {growth:.2f}x while the session table grew {size:.0f}x")
+    fallbacks = sum(level['mock_fallbacks'] for level in levels)
+    if fallbacks:
+        print(f"⚠️  {fallbacks} authenticated /workspaces calls were served the demo workspace")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the cookie-based auth path with synthetic users')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--users', type=int, default=1000, help='Total synthetic users to provision')
+    parser.add_argument('--stages', default=','.join(str(s) for s in DEFAULT_STAGES),
+                        help='Session-table sizes to measure at, comma-separated')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests-per-stage', type=int, default=500)
+    parser.add_argument('--prefix', default='harness-user', help='Session id prefix; change it for fresh accounts')
+    parser.add_argument('--stub-host', default='127.0.0.1')
+    parser.add_argument('--stub-port', type=int, default=8902)
+    parser.add_argument('--no-stub', action='store_true', help='The session-data stand-in is already running')
+    parser.add_argument('--serve-stub', action='store_true', help='Only run the session-data stand-in')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--output', default='auth_load_results.json')
+    args = parser.parse_args(argv)
+
+    stub = None if args.no_stub else SessionDataStub(args.stub_host, args.stub_port)
+    if args.serve_stub:
+        print(f"🔐 Session-data stand-in listening on {stub.base_url}")
+        print(f"👉 Start the app with EMERGENT_BACKEND_URL={stub.base_url}")
+        try:
+            stub.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stub.httpd.server_close()
+        return 0
+
+    stages = [int(s) for s in args.stages.split(',') if s.strip()]
+    runner = AuthLoadRunner(args.base_url, args.users, stages, args.concurrency,
+                            args.requests_per_stage, args.prefix, args.seed, args.timeout)
+    print(f"🚀 Authenticated session load: {args.users} users, {args.concurrency} workers")
+    print(f"📍 Base URL: {runner.base_url}")
+    if stub:
+        stub.start()
+        print(f"🔐 Session-data stand-in: {stub.base_url} (app needs EMERGENT_BACKEND_URL={stub.base_url})")
+    monitor = OverheadMonitor().start()
+    try:
+        levels = runner.run()
+    finally:
+        if stub:
+            stub.stop()
+    overhead = finish(monitor, runner.samples)
+    print_levels(levels)
+    print_overhead(overhead)
+
+    failed = sum(1 for s in runner.samples if not s['success'])
+    payload = {
+        'summary': {
+            'users': args.users,
+            'logged_in': sum(1 for u in runner.users if u.logged_in),
+            'total_requests': len(runner.samples),
+            'failed': failed,
+            'levels': levels,
+            'session_exchanges': stub.exchanges if stub else None,
+            'client_overhead': overhead,
+            'test_completed_at': datetime.now().isoformat()
+        },
+        'samples': runner.samples
+    }
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'auth_load')
+    return 0 if failed == 0 and levels else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Setup response cache - LRU + TTL, ETag revalidation and in-flight coalescing for GETs
+Only requests made as setup (pulling workspace/segment/persona IDs before the measured
+part of a test) go through it; measured requests always hit the server. Enabled with
+HARNESS_SETUP_CACHE=1 or --setup-cache, and shared by every tester and virtual user in
+the process so multi-scenario runs fetch each setup resource once.
+
+Revalidation works against routes that send validators: GET /workspaces, /segments/:id
+and /personas/:id/strategies carry a body-hash ETag (lib/etag.js) and answer 304 when it
+still matches. Other routes send none, so a stale entry for them is simply refetched.
+A 304 still costs a round trip, so revalidations are not counted as served locally.
+
+    HARNESS_SETUP_CACHE_TTL       seconds an entry is served without revalidation (30)
+    HARNESS_SETUP_CACHE_ENTRIES   LRU capacity (256)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+class CacheEntry:
+    def __init__(self, response, ttl):
+        self.response = response
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        self.ttl = ttl
+        self.stored_at = time.monotonic()
+
+    def fresh(self):
+        return time.monotonic() - self.stored_at < self.ttl
+
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class Flight:
+    """A GET in progress that identical concurrent lookups wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class ResponseCache:
+    """Thread-safe cache for idempotent setup GETs made through a requests.Session"""
+
+    def __init__(self, max_entries=256, ttl=30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'coalesced': 0, 'evictions': 0}
+
+    @staticmethod
+    def key(session, url, params):
+        # Cookies are part of the key so authenticated users never share entries
+        return (url, tuple(sorted((params or {}).items())), tuple(sorted(session.cookies.items())))
+
+    def get(self, session, url, params=None, headers=None, timeout=None):
+        """Return (response, network) - network is False when no request reached the server"""
+        key = self.key(session, url, params)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.fresh():
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry.response, False
+            flight = self.inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.inflight[key] = Flight()
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.response, False
+
+        try:
+            flight.response = self.fetch(session, url, params, headers, timeout, key, entry)
+            return flight.response, True
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.inflight[key]
+            flight.done.set()
+
+    def fetch(self, session, url, params, headers, timeout, key, entry):
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.validators())
+        response = session.get(url, params=params, headers=request_headers, timeout=timeout)
+
+        with self.lock:
+            if response.status_code == 304 and entry is not None:
+                entry.stored_at = time.monotonic()
+                self.entries[key] = entry
+                self.entries.move_to_end(key)
+                self.stats['revalidated'] += 1
+                return entry.response
+            self.stats['misses'] += 1
+            if response.status_code == 200:
+                self.entries[key] = CacheEntry(response, self.ttl)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    self.stats['evictions'] += 1
+            else:
+                self.entries.pop(key, None)
+        return response
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self.entries)
+        lookups = stats['hits'] + stats['misses'] + stats['revalidated'] + stats['coalesced']
+        saved = stats['hits'] + stats['coalesced']
+        stats['lookups'] = lookups
+        stats['hit_rate'] = saved / lookups if lookups else 0.0
+        return stats
+
+
+def setup_cache():
+    """The process-wide setup cache, or None when it is not enabled"""
+    global _shared
+    if _shared is None and os.environ.get('HARNESS_SETUP_CACHE', '').lower() in ('1', 'true', 'yes'):
+        with _shared_lock:
+            if _shared is None:
+                _shared = ResponseCache(int(os.environ.get('HARNESS_SETUP_CACHE_ENTRIES', 256)),
+                                        float(os.environ.get('HARNESS_SETUP_CACHE_TTL', 30)))
+    return _shared
+
+
+def enable_setup_cache():
+    """Turn the shared cache on for this process (what --setup-cache does)"""
+    os.environ['HARNESS_SETUP_CACHE'] = '1'
+    return setup_cache()
+
+
+def print_cache_summary(cache):
+    if cache is None:
+        return
+    stats = cache.summary()
+    print(f"🗃️  Setup cache: {stats['hit_rate'] * 100:.0f}% served locally "
+          f"({stats['hits']} hits, {stats['coalesced']} coalesced, {stats['revalidated']} revalidated, "
+          f"{stats['misses']} misses, {stats['entries']} entries)")
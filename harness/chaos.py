@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Chaos Proxy - fault injection between the harness and the API
+A local asyncio HTTP proxy put in front of BASE_URL. Requests whose path matches a rule
+get the rule's faults: added latency (with jitter), a bandwidth cap on the response,
+connection resets (the request still reaches the API, the client never sees the answer)
+and partial responses (headers plus half the body, then the connection closes).
+
+Faults are only active inside a window of the run, so the report can compare goodput
+before, during and after, and measure how long the API and the client take to recover
+once the faults stop.
+
+    python -m harness.chaos harness/scenarios/browse_heavy.toml --duration 60 \\
+        --fault-after 15 --fault-for 20 \\
+        --rule '/api/personas/*/generate:latency=2000,jitter=500,reset=0.1' \\
+        --rule '/api/workspaces*:bandwidth=32,partial=0.05'
+
+Rules are `[METHOD ]path-glob:key=value,...` with keys latency/jitter (ms), bandwidth
+(KB/s), reset and partial (probability per request). The first matching rule wins.
+Every proxied request uses its own upstream connection (Connection: close).
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import random
+import ssl
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+from harness.core import BASE_URL, percentile
+from harness.history import record_run
+from harness.load import LoadRunner, print_summary
+from harness.scenario import ScenarioError, load_scenario
+
+HOP_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'proxy-authorization', 'te', 'upgrade'}
+FAULT_KEYS = {'latency': float, 'jitter': float, 'bandwidth': float, 'reset': float, 'partial': float}
+
+
+class FaultRule:
+    def __init__(self, pattern, method=None, latency=0.0, jitter=0.0, bandwidth=0.0, reset=0.0, partial=0.0):
+        self.pattern = pattern
+        self.method = method.upper() if method else None
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.reset = reset
+        self.partial = partial
+        if reset + partial > 1:
+            raise ValueError(f"reset + partial must be at most 1 for {pattern}")
+
+    @classmethod
+    def parse(cls, text):
+        """'POST /api/personas/*:latency=500,reset=0.1' -> FaultRule"""
+        target, _, spec = text.partition(':')
+        method, _, pattern = target.strip().rpartition(' ')
+        faults = {}
+        for item in filter(None, (part.strip() for part in spec.split(','))):
+            key, _, value = item.partition('=')
+            if key not in FAULT_KEYS:
+                raise ValueError(f"Unknown fault '{key}' in rule {text!r} (use {', '.join(FAULT_KEYS)})")
+            faults[key] = FAULT_KEYS[key](value)
+        return cls(pattern, method or None, **faults)
+
+    def matches(self, method, path):
+        return (self.method is None or self.method == method) and fnmatch.fnmatchcase(path, self.pattern)
+
+    def describe(self):
+        faults = ', '.join(f"{key}={getattr(self, key):g}" for key in FAULT_KEYS if getattr(self, key))
+        return f"{self.method + ' ' if self.method else ''}{self.pattern}: {faults or 'no faults'}"
+
+
+class ChaosProxy:
+    """HTTP/1.1 proxy on a background event loop; start() returns the proxied base URL"""
+
+    def __init__(self, upstream, rules=(), host='127.0.0.1', port=0, seed=None, fault_after=0.0,
+                 fault_for=None):
+        parsed = urlparse(upstream)
+        self.upstream_host = parsed.hostname
+        self.upstream_https = parsed.scheme == 'https'
+        self.upstream_port = parsed.port or (443 if self.upstream_https else 80)
+        self.upstream_path = parsed.path.rstrip('/')
+        self.rules = list(rules)
+        self.host = host
+        self.port = port
+        self.rng = random.Random(seed)
+        self.fault_after = fault_after
+        self.fault_for = fault_for
+        self.started_at = None
+        self.stats = {'requests': 0, 'faulted': 0, 'delayed': 0, 'throttled': 0, 'resets': 0, 'partials': 0,
+                      'upstream_errors': 0}
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}{self.upstream_path}"
+
+    def fault_window(self):
+        """(start, end) of the fault window as epoch seconds"""
+        start = self.started_at + self.fault_after
+        return start, None if self.fault_for is None else start + self.fault_for
+
+    def faults_active(self):
+        start, end = self.fault_window()
+        now = time.time()
+        return now >= start and (end is None or now < end)
+
+    def start(self):
+        self.thread = threading.Thread(target=self._serve, name='chaos-proxy', daemon=True)
+        self.thread.start()
+        self.ready.wait(10)
+        self.started_at = time.time()
+        return self.base_url
+
+    def stop(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _serve(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self.handle, self.host, self.port, limit=1 << 20))
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            self.loop.run_until_complete(self.server.wait_closed())
+            self.loop.close()
+
+    def pick_fault(self, method, path):
+        """(rule, 'reset' | 'partial' | None) for one request"""
+        if not self.faults_active():
+            return None, None
+        rule = next((r for r in self.rules if r.matches(method, path)), None)
+        if rule is None:
+            return None, None
+        roll = self.rng.random()
+        if roll < rule.reset:
+            return rule, 'reset'
+        if roll < rule.reset + rule.partial:
+            return rule, 'partial'
+        return rule, None
+
+    async def handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+            request_line, headers = parse_head(head)
+            method, target, _ = request_line.split(' ', 2)
+            length = int(headers.get('content-length', 0))
+            body = await reader.readexactly(length) if length else b''
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            writer.close()
+            return
+
+        self.stats['requests'] += 1
+        rule, outcome = self.pick_fault(method, target.split('?', 1)[0])
+        if rule is not None:
+            self.stats['faulted'] += 1
+            delay = max(0.0, rule.latency + self.rng.uniform(-rule.jitter, rule.jitter)) / 1000
+            if delay:
+                self.stats['delayed'] += 1
+                await asyncio.sleep(delay)
+
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(
+                self.upstream_host, self.upstream_port,
+                ssl=ssl.create_default_context() if self.upstream_https else None,
+                server_hostname=self.upstream_host if self.upstream_https else None)
+        except OSError:
+            self.stats['upstream_errors'] += 1
+            await send_simple(writer, 502, 'Bad Gateway')
+            return
+
+        try:
+            headers['host'] = self.upstream_host if self.upstream_port in (80, 443) \
+                else f"{self.upstream_host}:{self.upstream_port}"
+            upstream_writer.write(build_head(request_line, headers) + body)
+            await upstream_writer.drain()
+
+            response_head = await upstream_reader.readuntil(b'\r\n\r\n')
+            if outcome == 'reset':
+                self.stats['resets'] += 1
+                writer.transport.abort()
+                return
+
+            status_line, response_headers = parse_head(response_head)
+            writer.write(build_head(status_line, response_headers))
+            cutoff = None
+            if outcome == 'partial':
+                self.stats['partials'] += 1
+                cutoff = int(response_headers.get('content-length', 2)) // 2
+            await self.relay(upstream_reader, writer, rule, cutoff)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+            self.stats['upstream_errors'] += 1
+            writer.transport.abort()
+            return
+        finally:
+            upstream_writer.close()
+        await close(writer)
+
+    async def relay(self, upstream, writer, rule, cutoff):
+        """Copy the response body, throttled to the rule's bandwidth and cut at `cutoff` bytes"""
+        rate = rule.bandwidth * 1024 if rule is not None and rule.bandwidth else None
+        if rate:
+            self.stats['throttled'] += 1
+        chunk_size = max(512, int(rate / 20)) if rate else 65536
+        sent = 0
+        while cutoff is None or sent < cutoff:
+            chunk = await upstream.read(chunk_size if cutoff is None else min(chunk_size, cutoff - sent))
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+            sent += len(chunk)
+            if rate:
+                await asyncio.sleep(len(chunk) / rate)
+
+
+def parse_head(head):
+    lines = head.decode('latin-1').split('\r\n')
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers
+
+
+def build_head(first_line, headers):
+    lines = [first_line] + [f"{name}: {value}" for name, value in headers.items() if name not in HOP_HEADERS]
+    lines.append('connection: close')
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+async def send_simple(writer, status, reason):
+    body = json.dumps({'error': reason}).encode('utf-8')
+    writer.write(f"HTTP/1.1 {status} {reason}\r\ncontent-type: application/json\r\n"
+                 f"content-length: {len(body)}\r\nconnection: close\r\n\r\n".encode('latin-1') + body)
+    await close(writer)
+
+
+async def close(writer):
+    try:
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+
+def phase_stats(samples, start, end):
+    """Throughput, goodput and latency for samples started in [start, end)"""
+    window = [s for s in samples if start <= s['started_at'] < end]
+    seconds = max(end - start, 1e-9)
+    good = [s for s in window if s['success']]
+    latencies = sorted(s['latency_ms'] for s in good)
+    return {
+        'requests': len(window),
+        'throughput_rps': len(window) / seconds,
+        'goodput_rps': len(good) / seconds,
+        'goodput_bytes_per_s': sum(s['bytes'] for s in good) / seconds,
+        'error_rate': (len(window) - len(good)) / len(window) * 100 if window else 0.0,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95)
+    }
+
+
+def recovery_time(samples, fault_end, run_end, baseline, bucket=1.0, stable=3, slack=1.5):
+    """Seconds after the faults stop until `stable` consecutive buckets look like the baseline
+
+    A bucket looks healthy when its error rate is within one point of the baseline and its
+    successful-request p95 is within `slack` x the baseline p95. None if it never recovers.
+    """
+    buckets = []
+    t = fault_end
+    while t < run_end:
+        stats = phase_stats(samples, t, min(t + bucket, run_end))
+        healthy = stats['requests'] > 0 and stats['error_rate'] <= baseline['error_rate'] + 1 and \
+            (not baseline['p95_ms'] or stats['p95_ms'] <= baseline['p95_ms'] * slack)
+        buckets.append((t, healthy))
+        t += bucket
+    for i in range(len(buckets) - stable + 1):
+        if all(healthy for _, healthy in buckets[i:i + stable]):
+            return buckets[i][0] - fault_end
+    return None
+
+
+def analyze(samples, run_start, run_end, fault_start, fault_end):
+    fault_end = min(fault_end or run_end, run_end)
+    phases = {
+        'before': phase_stats(samples, run_start, fault_start),
+        'during': phase_stats(samples, fault_start, fault_end),
+        'after': phase_stats(samples, fault_end, run_end)
+    }
+    baseline = phases['before'] if phases['before']['requests'] else None
+    recovered = recovery_time(samples, fault_end, run_end, baseline) if baseline and fault_end < run_end else None
+    return {
+        'fault_window_s': [fault_start - run_start, fault_end - run_start],
+        'phases': phases,
+        'goodput_drop_pct': (1 - phases['during']['goodput_rps'] / baseline['goodput_rps']) * 100
+        if baseline and baseline['goodput_rps'] else None,
+        'recovery_s': recovered,
+        'recovered': recovered is not None
+    }
+
+
+def print_chaos(chaos, proxy_stats):
+    print(f"\n{'='*80}")
+    print(f"🌪️  FAULT INJECTION - window {chaos['fault_window_s'][0]:.0f}s-{chaos['fault_window_s'][1]:.0f}s")
+    print(f"{'='*80}")
+    print(f"🔌 Proxy: {proxy_stats['requests']} requests, {proxy_stats['faulted']} faulted "
+          f"({proxy_stats['delayed']} delayed, {proxy_stats['throttled']} throttled, {proxy_stats['resets']} resets, "
+          f"{proxy_stats['partials']} partial), {proxy_stats['upstream_errors']} upstream errors")
+    print(f"{'phase':<10}{'req':>7}{'rps':>8}{'good/s':>8}{'good KB/s':>11}{'err%':>7}{'p50':>8}{'p95':>8}")
+    for name, stats in chaos['phases'].items():
+        print(f"{name:<10}{stats['requests']:>7}{stats['throughput_rps']:>8.1f}{stats['goodput_rps']:>8.1f}"
+              f"{stats['goodput_bytes_per_s'] / 1024:>11.1f}{stats['error_rate']:>7.1f}"
+              f"{stats['p50_ms']:>8.0f}{stats['p95_ms']:>8.0f}")
+    if chaos['goodput_drop_pct'] is not None:
+        print(f"📉 Goodput drop during faults: {chaos['goodput_drop_pct']:.0f}%")
+    if chaos['recovered']:
+        print(f"🩹 Recovered {chaos['recovery_s']:.1f}s after the faults stopped")
+    else:
+        print(f"⚠️  Did not return to baseline before the run ended")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a scenario through a fault-injecting proxy')
+    parser.add_argument('scenario', nargs='?', help='Path to a .toml/.yaml scenario file')
+    parser.add_argument('--base-url', default=BASE_URL, help='Upstream API the proxy forwards to')
+    parser.add_argument('--rule', action='append', default=[], help="'[METHOD ]glob:key=value,...' (repeatable)")
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=60)
+    parser.add_argument('--fault-after', type=float, default=15, help='Seconds of clean traffic first')
+    parser.add_argument('--fault-for', type=float, default=20, help='Seconds the faults stay on')
+    parser.add_argument('--port', type=int, default=0, help='Proxy port (random by default)')
+    parser.add_argument('--serve', action='store_true', help='Only run the proxy, with faults always on')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--output', default='chaos_results.json')
+    args = parser.parse_args(argv)
+    if not args.scenario and not args.serve:
+        parser.error('a scenario is required unless --serve is given')
+
+    try:
+        rules = [FaultRule.parse(text) for text in args.rule]
+        scenario = None if args.serve else load_scenario(args.scenario)
+    except (ValueError, ScenarioError) as e:
+        print(f"❌ {e}")
+        return 2
+
+    if args.serve:
+        proxy = ChaosProxy(args.base_url, rules, port=args.port, seed=args.seed)
+        print(f"🌪️  Chaos proxy for {args.base_url} on {proxy.start()} (Ctrl+C to stop)")
+        for rule in rules:
+            print(f"   • {rule.describe()}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            proxy.stop()
+        return 0
+
+    proxy = ChaosProxy(args.base_url, rules, port=args.port, seed=args.seed,
+                       fault_after=args.fault_after, fault_for=args.fault_for)
+    with proxy:
+        print(f"🚀 Chaos run: {scenario.name} via {proxy.base_url} -> {args.base_url}")
+        for rule in rules:
+            print(f"   • {rule.describe()}")
+        print(f"⏰ Test started at: {datetime.now().isoformat()}")
+        runner = LoadRunner(scenario, base_url=proxy.base_url, users=args.users, duration=args.duration,
+                            seed=args.seed, timeout=args.timeout)
+        summary = runner.run()
+
+    fault_start, fault_end = proxy.fault_window()
+    summary['chaos'] = analyze(runner.samples, runner.started_at, runner.finished_at, fault_start, fault_end)
+    summary['chaos']['rules'] = [rule.describe() for rule in rules]
+    summary['chaos']['proxy'] = dict(proxy.stats)
+    print_summary(summary)
+    print_chaos(summary['chaos'], proxy.stats)
+
+    payload = {'summary': summary, 'samples': runner.samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Samples written to {args.output}")
+    record_run(payload, f"chaos:{scenario.name}")
+    return 0 if summary['chaos']['recovered'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
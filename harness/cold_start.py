@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Cold Start - startup time and first-request penalty per route
+Starts the local Next.js server itself (`next dev` by default, `next start` with
+--mode start after a `yarn build`) and measures:
+
+    startup     spawn to the port accepting connections, and to Next's "Ready" line
+    cold        the first request to every route in ROUTES, which pays route
+                compilation (dev) and module initialisation
+    warm        `--warm` further requests to the same route once it is loaded
+    RSS         resident memory of the server's whole process tree, read from /proc
+                every `--rss-interval` seconds, marked at ready and after each pass
+
+The cold penalty of a route is its cold latency minus its warm p50. Routes served by the
+catch-all handler share one module, so only the first of them hit pays its compilation;
+with --isolate the server is restarted before every route so each one is measured from
+a fresh process (slower, but the penalties no longer depend on the order). --starts
+repeats the whole run to get startup and cold-latency distributions.
+
+    python -m harness.cold_start --starts 3
+    yarn build && python -m harness.cold_start --mode start --starts 5 --isolate
+
+dev mode passes NODE_OPTIONS=--max-old-space-size=512 like the `dev` script
+(--max-old-space-size 0 leaves NODE_OPTIONS alone). --command replaces the server
+command entirely; `{port}` in it is substituted.
+"""
+
+import argparse
+import json
+import os
+import re
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import requests
+
+from harness.core import JSON_HEADERS, normalize_endpoint, percentile
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEMO_WORKSPACE_ID = '68ee7d6a5d192f23f7922f8b'
+READY_LINE = re.compile(r'\bready\b', re.I)
+
+# (label, method, path, body): read-only requests, or ones the route rejects before writing
+ROUTES = (
+    ('workspaces', 'GET', '/api/workspaces?demo=true', None),
+    ('segments', 'GET', f"/api/workspaces/{DEMO_WORKSPACE_ID}/segments?demo=true", None),
+    ('job', 'GET', '/api/jobs/cold-start-probe?demo=true', None),
+    ('persona generate', 'POST', '/api/personas/generate?demo=true', {}),
+    ('auth me', 'GET', '/api/auth/me', None),
+    ('auth session', 'POST', '/api/auth/session', {}),
+    ('auth logout', 'POST', '/api/auth/logout', None),
+    ('nextauth providers', 'GET', '/api/auth/providers', None),
+    ('pricing pdf', 'POST', '/api/pricing-strategy/export', {}),
+    ('analysis pdf', 'POST', '/api/personas/export-analysis', {})
+)
+
+
+def process_tree(root_pid):
+    """PIDs of root_pid and all its descendants"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces and parentheses; fields follow the last ')'
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    return tree
+
+
+def rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+class RssSampler:
+    """Samples the summed RSS of a process tree on a background thread"""
+
+    def __init__(self, pid, started, interval=0.25):
+        self.pid = pid
+        self.started = started
+        self.interval = interval
+        self.timeline = []
+        self.marks = {}
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @staticmethod
+    def available():
+        return os.path.exists('/proc/self/status')
+
+    def sample(self):
+        pids = process_tree(self.pid)
+        point = {'t_ms': (time.perf_counter() - self.started) * 1000,
+                 'rss_mb': sum(rss_kb(pid) for pid in pids) / 1024, 'processes': len(pids)}
+        self.timeline.append(point)
+        return point
+
+    def mark(self, label):
+        self.marks[label] = self.sample()['rss_mb']
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='cold-start-rss', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def peak(self):
+        return max((point['rss_mb'] for point in self.timeline), default=0.0)
+
+
+class LocalServer:
+    """The app server as a child process in its own process group"""
+
+    def __init__(self, command, port, env, cwd=PROJECT_DIR, host='127.0.0.1'):
+        self.command = command
+        self.port = port
+        self.env = env
+        self.cwd = cwd
+        self.host = host
+        self.process = None
+        self.started = None
+        self.log_ready_ms = None
+        self.log = deque(maxlen=50)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.process = subprocess.Popen(self.command, cwd=self.cwd, env=self.env, stdout=subprocess.PIPE,
+                                        stderr=subprocess.STDOUT, text=True, errors='replace',
+                                        start_new_session=True)
+        threading.Thread(target=self._read_output, name='cold-start-log', daemon=True).start()
+        return self
+
+    def _read_output(self):
+        for line in self.process.stdout:
+            self.log.append(line.rstrip())
+            if self.log_ready_ms is None and READY_LINE.search(line):
+                self.log_ready_ms = (time.perf_counter() - self.started) * 1000
+
+    def wait_listening(self, timeout):
+        """Milliseconds from spawn until the port accepts connections"""
+        deadline = self.started + timeout
+        while time.perf_counter() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"server exited with {self.process.returncode}:\n" + '\n'.join(self.log))
+            try:
+                with socket.create_connection((self.host, self.port), timeout=0.5):
+                    return (time.perf_counter() - self.started) * 1000
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError(f"server did not listen on port {self.port} within {timeout:.0f} s")
+
+    def wait_ready_line(self, grace):
+        """Give Next up to `grace` seconds after listening to print its ready line"""
+        deadline = time.perf_counter() + grace
+        while self.log_ready_ms is None and time.perf_counter() < deadline and self.process.poll() is None:
+            time.sleep(0.05)
+        return self.log_ready_ms
+
+    def stop(self):
+        if not self.process or self.process.poll() is not None:
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait(timeout=10)
+        except ProcessLookupError:
+            pass
+
+
+class ColdStart:
+    def __init__(self, command, env, port=3100, routes=ROUTES, starts=1, warm=10, isolate=False, rss_interval=0.25,
+                 startup_timeout=180, ready_grace=5, timeout=180):
+        self.command = command
+        self.env = env
+        self.port = port
+        self.routes = routes
+        self.starts = starts
+        self.warm = warm
+        self.isolate = isolate
+        self.rss_interval = rss_interval
+        self.startup_timeout = startup_timeout
+        self.ready_grace = ready_grace
+        self.timeout = timeout
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.samples = []
+        self.boots = []
+
+    def request(self, test, route, boot):
+        label, method, path, body = route
+        sample = {'test': test, 'method': method, 'endpoint': normalize_endpoint(path.split('?')[0]),
+                  'started_at': time.time(), 'status': None, 'latency_ms': None, 'bytes': 0, 'success': False,
+                  'route': label, 'boot': boot}
+        start = time.perf_counter()
+        try:
+            # A fresh connection each time, so a cold request never rides on a warmed-up socket
+            response = requests.request(method, f"{self.base_url}{path}", headers=JSON_HEADERS,
+                                        json=body, timeout=self.timeout)
+        except requests.RequestException as e:
+            sample['latency_ms'] = (time.perf_counter() - start) * 1000
+            sample['message'] = f"Request failed: {e.__class__.__name__}"
+            self.samples.append(sample)
+            return sample
+        # Any answer short of a server error means the route loaded; the probes send no real input
+        sample.update({'latency_ms': (time.perf_counter() - start) * 1000, 'status': response.status_code,
+                       'bytes': len(response.content), 'success': response.status_code < 500})
+        self.samples.append(sample)
+        return sample
+
+    def boot(self, routes):
+        """Start the server, hit `routes` cold then warm, stop it; returns the boot record"""
+        index = len(self.boots)
+        server = LocalServer(self.command, self.port, self.env).start()
+        sampler = RssSampler(server.process.pid, server.started, self.rss_interval) if RssSampler.available() else None
+        record = {'boot': index, 'routes': [route[0] for route in routes]}
+        try:
+            if sampler:
+                sampler.start()
+            record['listen_ms'] = server.wait_listening(self.startup_timeout)
+            record['ready_line_ms'] = server.wait_ready_line(self.ready_grace)
+            if sampler:
+                sampler.mark('ready')
+            for route in routes:
+                self.request('cold_request', route, index)
+            if sampler:
+                sampler.mark('after_cold')
+            for route in routes:
+                for _ in range(self.warm):
+                    self.request('warm_request', route, index)
+            if sampler:
+                sampler.mark('after_warm')
+        finally:
+            if sampler:
+                sampler.stop()
+            server.stop()
+        if sampler:
+            record['rss'] = {'peak_mb': sampler.peak(), **{f"{k}_mb": v for k, v in sampler.marks.items()},
+                             'timeline': sampler.timeline}
+        self.boots.append(record)
+        return record
+
+    def run(self):
+        for _ in range(self.starts):
+            if self.isolate:
+                for route in self.routes:
+                    self.boot([route])
+            else:
+                self.boot(self.routes)
+        return self.summary()
+
+    def summary(self):
+        def stats(values):
+            values = sorted(v for v in values if v is not None)
+            return {'p50': percentile(values, 50), 'max': values[-1] if values else None, 'n': len(values)}
+
+        routes = []
+        for label, method, path, _ in self.routes:
+            cold = [s for s in self.samples if s['test'] == 'cold_request' and s['route'] == label and s['success']]
+            warm = sorted(s['latency_ms'] for s in self.samples
+                          if s['test'] == 'warm_request' and s['route'] == label and s['success'])
+            cold_p50 = percentile(sorted(s['latency_ms'] for s in cold), 50) if cold else None
+            warm_p50 = percentile(warm, 50) if warm else None
+            routes.append({
+                'route': label,
+                'method': method,
+                'endpoint': normalize_endpoint(path.split('?')[0]),
+                'statuses': sorted({s['status'] for s in self.samples if s['route'] == label and s['status']}),
+                'cold_p50_ms': cold_p50,
+                'cold_max_ms': max((s['latency_ms'] for s in cold), default=None),
+                'warm_p50_ms': warm_p50,
+                'warm_p95_ms': percentile(warm, 95) if warm else None,
+                'penalty_ms': cold_p50 - warm_p50 if cold_p50 is not None and warm_p50 is not None else None,
+                'penalty_x': cold_p50 / warm_p50 if cold_p50 is not None and warm_p50 else None
+            })
+
+        with_rss = [boot['rss'] for boot in self.boots if 'rss' in boot]
+        rss = None
+        if with_rss:
+            rss = {key: stats(r.get(key) for r in with_rss)
+                   for key in ('ready_mb', 'after_cold_mb', 'after_warm_mb', 'peak_mb')}
+        return {
+            'command': ' '.join(self.command),
+            'starts': self.starts,
+            'isolate': self.isolate,
+            'warm_requests': self.warm,
+            'startup': {'listen_ms': stats(boot['listen_ms'] for boot in self.boots),
+                        'ready_line_ms': stats(boot['ready_line_ms'] for boot in self.boots)},
+            'routes': routes,
+            'total_cold_penalty_ms': sum(r['penalty_ms'] for r in routes if r['penalty_ms'] is not None),
+            'rss': rss,
+            'boots': self.boots,
+            'failed': sum(1 for s in self.samples if not s['success']),
+            'total_requests': len(self.samples),
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def print_summary(summary):
+    def ms(value, fmt='.0f'):
+        return format(value, fmt) if value is not None else '-'
+
+    print(f"\n{'='*80}")
+    print(f"🏁 COLD START - {summary['starts']} start(s){', one route per process' if summary['isolate'] else ''}")
+    print(f"{'='*80}")
+    startup = summary['startup']
+    print(f"⏱️  Listening after {ms(startup['listen_ms']['p50'])} ms p50 (max {ms(startup['listen_ms']['max'])}), "
+          f"ready line after {ms(startup['ready_line_ms']['p50'])} ms p50")
+    print(f"\n{'route':<20}{'method':>7}{'status':>10}{'cold p50':>10}{'cold max':>10}{'warm p50':>10}"
+          f"{'warm p95':>10}{'penalty':>10}{'x':>7}")
+    for row in summary['routes']:
+        statuses = ','.join(str(status) for status in row['statuses']) or '-'
+        print(f"{row['route']:<20}{row['method']:>7}{statuses:>10}{ms(row['cold_p50_ms']):>10}"
+              f"{ms(row['cold_max_ms']):>10}{ms(row['warm_p50_ms'], '.1f'):>10}{ms(row['warm_p95_ms'], '.1f'):>10}"
+              f"{ms(row['penalty_ms']):>10}{ms(row['penalty_x'], '.1f'):>7}")
+    print(f"\n🧊 Cold penalty across all routes: {summary['total_cold_penalty_ms']:.0f} ms")
+    if summary['rss']:
+        rss = summary['rss']
+        print(f"🧠 RSS (process tree, p50): {ms(rss['ready_mb']['p50'])} MB at ready, "
+              f"{ms(rss['after_cold_mb']['p50'])} MB after cold pass, {ms(rss['after_warm_mb']['p50'])} MB after warm pass, "
+              f"peak {ms(rss['peak_mb']['max'])} MB")
+    else:
+        print("⚠️  /proc is not available here, RSS was not sampled")
+    if summary['failed']:
+        print(f"❌ {summary['failed']} requests failed or returned a server error")
+
+
+def server_command(args):
+    if args.command:
+        return shlex.split(args.command.format(port=args.port))
+    return ['npx', 'next', args.mode, '--hostname', '127.0.0.1', '--port', str(args.port)]
+
+
+def server_env(args):
+    env = dict(os.environ)
+    if args.mode == 'dev' and args.max_old_space_size:
+        env['NODE_OPTIONS'] = f"{env.get('NODE_OPTIONS', '')} --max-old-space-size={args.max_old_space_size}".strip()
+    return env
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure server startup and first-request latency per route')
+    parser.add_argument('--mode', choices=('dev', 'start'), default='dev', help='next dev, or next start after a build')
+    parser.add_argument('--command', help='Server command instead of npx next <mode>; {port} is substituted')
+    parser.add_argument('--port', type=int, default=3100)
+    parser.add_argument('--starts', type=int, default=1, help='Server starts to measure')
+    parser.add_argument('--warm', type=int, default=10, help='Steady-state requests per route')
+    parser.add_argument('--isolate', action='store_true', help='Restart the server before every route')
+    parser.add_argument('--routes', help='Comma-separated route labels to measure (default: all)')
+    parser.add_argument('--max-old-space-size', type=int, default=512, help='Node heap cap in MB for dev mode (0: unset)')
+    parser.add_argument('--rss-interval', type=float, default=0.25, help='Seconds between RSS samples')
+    parser.add_argument('--startup-timeout', type=float, default=180)
+    parser.add_argument('--ready-grace', type=float, default=5,
+                        help="Seconds to wait for Next's ready line once the port is open")
+    parser.add_argument('--timeout', type=float, default=180, help='Per-request timeout (cold dev compiles are slow)')
+    parser.add_argument('--output', default='cold_start_results.json')
+    args = parser.parse_args(argv)
+
+    routes = ROUTES
+    if args.routes:
+        wanted = {label.strip() for label in args.routes.split(',')}
+        routes = tuple(route for route in ROUTES if route[0] in wanted)
+        if not routes:
+            print(f"❌ No such routes; choose from: {', '.join(route[0] for route in ROUTES)}")
+            return 2
+
+    command = server_command(args)
+    check = ColdStart(command, server_env(args), args.port, routes, args.starts, args.warm, args.isolate,
+                      args.rss_interval, args.startup_timeout, args.ready_grace, args.timeout)
+    print(f"🚀 Cold start: {' '.join(command)}")
+    print(f"📍 {len(routes)} routes, {args.starts} start(s), {args.warm} warm requests each")
+    monitor = OverheadMonitor().start()
+    try:
+        summary = check.run()
+    except (OSError, RuntimeError) as e:
+        print(f"❌ Could not start the server: {e}")
+        return 2
+    summary['client_overhead'] = finish(monitor, check.samples)
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': check.samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, f"cold_start:{args.mode}")
+    return 0 if not summary['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
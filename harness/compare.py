@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Backend Comparison - runs one scenario against two base URLs side by side
+Meant for deciding between deployments that differ only in storage setup, e.g. the app
+built from prisma/schema.prisma vs prisma/schema-mongo.prisma (which drops the Session
+model and the WorkspaceMember unique index).
+
+Each virtual user drives a pair of sessions, one per target, down the same journey.
+Every step is sent to both targets back to back in a random order, so server-side drift,
+network weather and client hiccups land on both sides equally. Because requests are
+paired, the report includes the median of per-pair latency differences as well as each
+side's own distribution, error rate and payload size per endpoint.
+
+    python -m harness.compare harness/scenarios/browse_heavy.toml \\
+        --a http://localhost:3000/api --label-a schema \\
+        --b http://localhost:3001/api --label-b schema-mongo
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+from harness.cache import enable_setup_cache, print_cache_summary
+from harness.core import percentile
+from harness.history import record_run
+from harness.load import FAILURE_PAUSE_S, LoadRunner, VirtualUser
+from harness.overhead import OverheadMonitor, print_overhead
+from harness.scenario import ScenarioError, load_scenario
+
+
+class PairedUser:
+    """Two virtual users, one per target, walking the same journeys in lockstep"""
+
+    def __init__(self, comparison, index):
+        self.comparison = comparison
+        self.index = index
+        self.users = [VirtualUser(runner, index) for runner in comparison.runners]
+        self.rng = random.Random(None if comparison.seed is None else comparison.seed + index)
+
+    def run(self):
+        scenario = self.comparison.scenario
+        if not self.run_steps('setup', scenario.setup, scenario.think):
+            for runner in self.comparison.runners:
+                runner.mark_setup_failed(self.index)
+            return
+        iteration = 0
+        while not self.comparison.should_stop(iteration):
+            journey = scenario.pick_journey(self.rng)
+            data = scenario.sample_data(self.rng)
+            for user in self.users:
+                user.context['data'] = data
+                user.context['iteration'] = iteration
+            self.run_steps(journey.name, journey.steps, journey.think)
+            iteration += 1
+
+    def run_steps(self, journey_name, steps, think):
+        """Run the steps on both targets; False if either side failed one and the rest were skipped"""
+        for step in steps:
+            if self.comparison.stop_event.is_set():
+                return True
+            pair = self.comparison.next_pair()
+            order = list(range(len(self.users)))
+            self.rng.shuffle(order)
+            ok = [self.users[i].execute(journey_name, step, pair=pair, target=self.comparison.labels[i],
+                                        first=(i == order[0]))
+                  for i in order]
+            pause = (step.think or think).sample(self.rng) / 1000
+            if not all(ok):
+                pause = max(pause, FAILURE_PAUSE_S)
+            if pause:
+                self.comparison.stop_event.wait(pause)
+            if not all(ok):
+                return False  # keep both sides on the same path
+        return True
+
+
+class Comparison:
+    def __init__(self, scenario, base_urls, labels, users=10, duration=60, iterations=None,
+                 seed=None, timeout=30):
+        self.scenario = scenario
+        self.labels = labels
+        self.runners = [LoadRunner(scenario, base_url=url, users=users, seed=seed, timeout=timeout)
+                        for url in base_urls]
+        self.users = users
+        self.duration = duration
+        self.iterations = iterations
+        self.seed = seed
+        self.stop_event = threading.Event()
+        self.pairs = itertools.count()
+        self.started_at = None
+        self.overhead = None
+
+    def next_pair(self):
+        return next(self.pairs)
+
+    def should_stop(self, iteration):
+        if self.stop_event.is_set():
+            return True
+        if self.iterations is not None and iteration >= self.iterations:
+            return True
+        return self.duration is not None and time.time() - self.started_at >= self.duration
+
+    def run(self):
+        self.started_at = time.time()
+        self.overhead = OverheadMonitor().start()
+        for runner in self.runners:
+            runner.started_at = self.started_at
+            runner.stop_event = self.stop_event
+        threads = [threading.Thread(target=PairedUser(self, i).run, name=f"pair-{i}", daemon=True)
+                   for i in range(self.users)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+        for runner in self.runners:
+            runner.finished_at = time.time()
+        self.overhead.stop()
+        return self.report()
+
+    def report(self):
+        a, b = (runner.summary() for runner in self.runners)
+        rows_b = {(row['test'], row['method']): row for row in b['endpoints']}
+        paired = paired_differences(self.runners[0].samples, self.runners[1].samples)
+
+        endpoints = []
+        for row_a in a['endpoints']:
+            key = (row_a['test'], row_a['method'])
+            row_b = rows_b.get(key)
+            if not row_b:
+                continue
+            diffs = sorted(paired.get(key, []))
+            endpoints.append({
+                'test': row_a['test'],
+                'method': row_a['method'],
+                'pairs': len(diffs),
+                'a': row_a,
+                'b': row_b,
+                'p50_delta_pct': pct_change(row_a['p50_ms'], row_b['p50_ms']),
+                'p99_delta_pct': pct_change(row_a['p99_ms'], row_b['p99_ms']),
+                'paired_median_diff_ms': percentile(diffs, 50),
+                'b_faster_share': sum(1 for d in diffs if d < 0) / len(diffs) if diffs else None,
+                'bytes_delta_pct': pct_change(row_a['bytes_avg'], row_b['bytes_avg'])
+            })
+        return {
+            'scenario': self.scenario.name,
+            'labels': self.labels,
+            'base_urls': [runner.base_url for runner in self.runners],
+            'users': self.users,
+            'totals': {label: {k: s[k] for k in ('total_requests', 'failed', 'rps', 'elapsed_s',
+                                                 'setup_failed_users')}
+                       for label, s in zip(self.labels, (a, b))},
+            'endpoints': endpoints,
+            # Both targets are driven by this one process, so overhead is reported once for the pair
+            'client_overhead': self.overhead.summary(sum(len(r.samples) for r in self.runners))
+            if self.overhead else None,
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def paired_differences(samples_a, samples_b):
+    """B minus A latency for every pair where both sides got a response"""
+    by_pair = {s['pair']: s for s in samples_a if s['latency_ms'] is not None}
+    diffs = {}
+    for sample in samples_b:
+        other = by_pair.get(sample['pair'])
+        if other and sample['latency_ms'] is not None:
+            key = (sample['test'], sample['method'])
+            diffs.setdefault(key, []).append(sample['latency_ms'] - other['latency_ms'])
+    return diffs
+
+
+def pct_change(a, b):
+    return (b - a) / a * 100 if a else None
+
+
+def fmt_pct(value):
+    return f"{value:+.0f}%" if value is not None else "n/a"
+
+
+def print_report(report):
+    label_a, label_b = report['labels']
+    print(f"\n{'='*80}")
+    print(f"🏁 BACKEND COMPARISON - {report['scenario']}: {label_a} (A) vs {label_b} (B)")
+    print(f"{'='*80}")
+    for label, url in zip(report['labels'], report['base_urls']):
+        totals = report['totals'][label]
+        print(f"📍 {label}: {url} - {totals['total_requests']} requests, {totals['failed']} failed")
+    setup_failed = report['totals'][label_a]['setup_failed_users']
+    if setup_failed:
+        print(f"⚠️  {setup_failed} of {report['users']} users failed setup and ran no journeys")
+    print(f"\n{'step':<26}{'pairs':>6}{'A p50':>8}{'B p50':>8}{'Δp50':>7}{'A p99':>8}{'B p99':>8}{'Δp99':>7}"
+          f"{'pair Δ':>9}{'B wins':>8}{'A err%':>8}{'B err%':>8}{'Δbytes':>8}")
+    for row in report['endpoints']:
+        wins = f"{row['b_faster_share'] * 100:.0f}%" if row['b_faster_share'] is not None else "n/a"
+        print(f"{row['test'][:25]:<26}{row['pairs']:>6}{row['a']['p50_ms']:>8.0f}{row['b']['p50_ms']:>8.0f}"
+              f"{fmt_pct(row['p50_delta_pct']):>7}{row['a']['p99_ms']:>8.0f}{row['b']['p99_ms']:>8.0f}"
+              f"{fmt_pct(row['p99_delta_pct']):>7}{row['paired_median_diff_ms']:>+8.1f}ms{wins:>7}"
+              f"{row['a']['error_rate']:>8.1f}{row['b']['error_rate']:>8.1f}{fmt_pct(row['bytes_delta_pct']):>8}")
+    print(f"\n'pair Δ' is the median of B-minus-A latency over paired requests; "
+          f"'B wins' is the share of pairs where B answered faster.")
+    if report.get('client_overhead'):
+        print_overhead(report['client_overhead'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run one scenario against two base URLs, interleaved')
+    parser.add_argument('scenario', help='Path to a .toml/.yaml scenario file')
+    parser.add_argument('--a', required=True, help='Base URL of deployment A')
+    parser.add_argument('--b', required=True, help='Base URL of deployment B')
+    parser.add_argument('--label-a', default='schema')
+    parser.add_argument('--label-b', default='schema-mongo')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to run (ignored with --iterations)')
+    parser.add_argument('--iterations', type=int, help='Journeys per virtual user')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--setup-cache', action='store_true', help='Serve setup GETs from the shared setup cache')
+    parser.add_argument('--output', default='compare_results.json')
+    args = parser.parse_args(argv)
+    if args.setup_cache:
+        enable_setup_cache()
+
+    try:
+        scenario = load_scenario(args.scenario)
+    except ScenarioError as e:
+        print(f"❌ {e}")
+        return 2
+
+    labels = [args.label_a, args.label_b]
+    comparison = Comparison(scenario, [args.a, args.b], labels, users=args.users,
+                            duration=None if args.iterations else args.duration,
+                            iterations=args.iterations, seed=args.seed, timeout=args.timeout)
+    print(f"🚀 Comparing {labels[0]} vs {labels[1]} with scenario {scenario.name}")
+    print(f"⏰ Test started at: {datetime.now().isoformat()}")
+    report = comparison.run()
+    print_report(report)
+    print_cache_summary(comparison.runners[0].cache)
+
+    samples = [s for runner in comparison.runners for s in runner.samples]
+    payload = {'summary': report, 'samples': samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    for label, runner in zip(labels, comparison.runners):
+        record_run({'summary': runner.summary(), 'samples': runner.samples}, f"compare:{scenario.name}:{label}")
+
+    failed = sum(totals['failed'] for totals in report['totals'].values())
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
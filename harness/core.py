@@ -0,0 +1,367 @@
+"""
+Shared harness core: result logging, request helpers, input provisioning, summary printing
+and test tags
+Heavy modules (requests, json) are imported on first use so that listing or selecting a
+single quick check does not pay for them at startup.
+"""
+
+import os
+import re
+import sys
+import time
+
+BASE_URL = os.environ.get('HARNESS_BASE_URL', "https://rooted-personas.preview.emergentagent.com/api")
+DEMO_MODE = os.environ.get('HARNESS_DEMO_MODE', 'true').lower() != 'false'
+# Only failures are printed by log_result; keeps stdout off the hot path at high request rates
+QUIET = os.environ.get('HARNESS_QUIET', '').lower() in ('1', 'true', 'yes')
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+DEMO_PARAMS = {'demo': 'true'}
+
+# Path segments that are IDs, collapsed so samples group by route
+ID_SEGMENT = re.compile(r'/(?:[0-9a-fA-F]{24}|[0-9a-fA-F-]{36}|(?:seg|culture|economic|persona)-\d+|invalid-uuid)(?=/|$)')
+
+# Modules whose tagged tests are discoverable from the CLI (python -m harness)
+TEST_MODULES = ('quick_test', 'backend_test', 'strategy_workflow_test')
+
+
+def harness_test(*tags):
+    """Mark a function or tester method as a CLI-selectable test with the given tags"""
+    def mark(func):
+        func.harness_tags = tuple(tags)
+        return func
+    return mark
+
+
+class HarnessTester:
+    """Base class holding the request/result plumbing every harness script shares"""
+
+    def __init__(self, base_url=None):
+        self.base_url = base_url or BASE_URL
+        self.test_results = []
+        self.request_samples = []
+        self.request_count = 0
+        self.request_seconds = 0.0
+        self._session = None
+        self._unattributed = []
+        self.overhead = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            from harness.overhead import process_monitor
+            self._session = requests.Session()
+            self._session.headers.update(JSON_HEADERS)
+            self.overhead = process_monitor()
+        return self._session
+
+    def log_result(self, test_name, success, message, response_data=None):
+        """Log test result"""
+        from datetime import datetime
+        result = {
+            'test': test_name,
+            'success': success,
+            'message': message,
+            'timestamp': datetime.now().isoformat(),
+            'response_data': response_data
+        }
+        self.test_results.append(result)
+        for sample in self._unattributed:
+            sample['test'] = test_name
+        self._unattributed = []
+        if success and QUIET:
+            return
+        status = "✅ PASS" if success else "❌ FAIL"
+        line = f"{status}: {test_name} - {message}\n"
+        if response_data and not success:
+            import json
+            line += f"   Response: {json.dumps(response_data, indent=2)}\n"
+        sys.stdout.write(line)
+
+    def make_request(self, method, endpoint, data=None, params=None):
+        """Make HTTP request with demo mode support"""
+        url = f"{self.base_url}{endpoint}"
+
+        # Add demo mode parameter if enabled
+        if DEMO_MODE:
+            params = DEMO_PARAMS if params is None else {**params, **DEMO_PARAMS}
+
+        session = self.session
+        response = None
+        error = None
+        start = time.perf_counter()
+        started_at = time.time()
+        try:
+            method = method.upper()
+            if method in ('POST', 'PUT'):
+                response = session.request(method, url, json=data, params=params)
+            elif method in ('GET', 'DELETE'):
+                response = session.request(method, url, params=params)
+            else:
+                raise ValueError(f"Unsupported method: {method}")
+
+            return response
+        except Exception as e:
+            print(f"Request failed: {e}")
+            error = e.__class__.__name__
+            return None
+        finally:
+            elapsed = time.perf_counter() - start
+            self.request_count += 1
+            self.request_seconds += elapsed
+            self.record_sample(method, endpoint, response, elapsed, started_at, error)
+
+    def setup_get(self, endpoint, params=None):
+        """GET made only to pull IDs; goes through the shared setup cache when enabled"""
+        from harness.cache import setup_cache
+        cache = setup_cache()
+        if cache is None:
+            return self.make_request('GET', endpoint, params=params)
+
+        if DEMO_MODE:
+            params = {**(params or {}), **DEMO_PARAMS}
+        session = self.session
+        response = None
+        network = False
+        start = time.perf_counter()
+        started_at = time.time()
+        try:
+            response, network = cache.get(session, f"{self.base_url}{endpoint}", params=params)
+            return response
+        except Exception as e:
+            print(f"Request failed: {e}")
+            return None
+        finally:
+            if network or response is None:
+                elapsed = time.perf_counter() - start
+                self.request_count += 1
+                self.request_seconds += elapsed
+                self.record_sample('GET', endpoint, response, elapsed, started_at)
+
+    def first_workspace_id(self):
+        """ID of the caller's first workspace, for tests selected without the workspace tests"""
+        response = self.setup_get('/workspaces')
+        if response is not None and response.status_code == 200:
+            workspaces = response.json().get('workspaces') or []
+            if workspaces:
+                return workspaces[0]['id']
+        return None
+
+    def record_sample(self, method, endpoint, response, elapsed, started_at, error=None):
+        """Keep one per-request sample; the test name is filled in by the next log_result"""
+        sample = {
+            'test': None,
+            'method': method.upper(),
+            'endpoint': normalize_endpoint(endpoint),
+            'status': response.status_code if response is not None else None,
+            'latency_ms': elapsed * 1000,
+            'bytes': len(response.content) if response is not None else 0,
+            'success': response is not None and response.status_code < 400,
+            'started_at': started_at
+        }
+        if error:
+            sample['message'] = f"Request failed: {error}"
+        self.request_samples.append(sample)
+        self._unattributed.append(sample)
+
+    def overhead_summary(self):
+        """Client CPU, scheduler lag and GC pauses while this tester's requests ran"""
+        if self.overhead is None:
+            return None
+        latencies = sorted(s['latency_ms'] for s in self.request_samples)
+        return self.overhead.summary(len(self.request_samples), percentile(latencies, 50) or None)
+
+    def results_summary(self):
+        from datetime import datetime
+        passed = sum(1 for r in self.test_results if r['success'])
+        total = len(self.test_results)
+        return {
+            'total_tests': total,
+            'passed': passed,
+            'failed': total - passed,
+            'success_rate': passed / total * 100 if total else 0,
+            'client_overhead': self.overhead_summary(),
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+    def print_summary(self, title, passed, failed, passed_label='Passed', failed_label='Failed'):
+        """Print the run summary followed by failed and passed test names"""
+        from datetime import datetime
+        print(f"\n{'='*80}")
+        print(f"🏁 {title}")
+        print(f"{'='*80}")
+        print(f"✅ {passed_label}: {passed}")
+        print(f"❌ {failed_label}: {failed}")
+        print(f"📊 Success Rate: {(passed/(passed+failed)*100) if passed + failed else 0:.1f}%")
+        print(f"⏰ Test completed at: {datetime.now().isoformat()}")
+
+        if failed > 0:
+            print(f"\n🔍 FAILED TESTS:")
+            for result in self.test_results:
+                if not result['success']:
+                    print(f"   • {result['test']}: {result['message']}")
+
+        print(f"\n✅ PASSED TESTS:")
+        for result in self.test_results:
+            if result['success']:
+                print(f"   • {result['test']}")
+
+        if self.overhead is not None:
+            from harness.overhead import print_overhead
+            print()
+            print_overhead(self.overhead_summary())
+
+    def save_results(self, path, history=True):
+        """Write the summary and detailed results as JSON, and append the run to history"""
+        import json
+        payload = {
+            'summary': self.results_summary(),
+            'detailed_results': self.test_results,
+            'request_samples': self.request_samples
+        }
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2)
+        if history:
+            from harness.history import record_run
+            record_run(payload, os.path.basename(path))
+
+
+def record_request(session, base_url, test, method, path, samples, body=None, params=None, timeout=None,
+                   lock=None, setup=False, success=None, **fields):
+    """Send one request and append its sample to `samples`; returns (response or None, sample)
+
+    The sample carries the fields every tool records plus `fields`. It counts as a
+    success on a 200 unless `success(status)` says otherwise. With `setup=True` a GET goes
+    through the shared setup cache and is only recorded when it reached the server. Pass
+    `lock` when threads share `samples`.
+    """
+    import requests
+    sample = {'test': test, 'method': method, 'endpoint': normalize_endpoint(path), 'started_at': time.time(),
+              'status': None, 'latency_ms': None, 'bytes': 0, 'success': False, **fields}
+    url = f"{base_url}{path}"
+    network = True
+    start = time.perf_counter()
+    try:
+        if setup and method == 'GET':
+            response, network = setup_fetch(session, url, params=params, timeout=timeout)
+        else:
+            response = session.request(method, url, params=params, json=body, timeout=timeout)
+    except requests.RequestException as e:
+        response = None
+        sample['message'] = f"Request failed: {e.__class__.__name__}"
+    sample['latency_ms'] = (time.perf_counter() - start) * 1000
+    if response is not None:
+        sample.update({'status': response.status_code, 'bytes': len(response.content),
+                       'success': success(response.status_code) if success else response.status_code == 200})
+    if network:
+        if lock is None:
+            samples.append(sample)
+        else:
+            with lock:
+                samples.append(sample)
+    return response, sample
+
+
+def setup_fetch(session, url, params=None, timeout=None):
+    """GET made only to pull IDs, served by the shared setup cache when it is enabled;
+    returns (response, network) like ResponseCache.get"""
+    from harness.cache import setup_cache
+    cache = setup_cache()
+    if cache is None:
+        return session.get(url, params=params, timeout=timeout), True
+    return cache.get(session, url, params=params, timeout=timeout)
+
+
+def provision_inputs(session, base_url, samples, seed=None, count=1, params=None, timeout=None, lock=None,
+                     workspace_id=None, workspace_name='Harness'):
+    """Create `count` sets of generation inputs from harness.synth rows
+
+    Uses `workspace_id`, else the caller's first workspace (through the setup cache), else
+    a new one named `workspace_name`. Each set is a segment with its culture and economic
+    profiles, returned as a POST /personas/generate body. Setup is all or nothing: when any
+    request fails, the segments created so far are deleted and no sets are returned.
+    Returns (workspace_id, sets).
+    """
+    from harness.scenario import render
+    from harness.synth import generate
+
+    def send(method, path, body=None, test='setup', **options):
+        response, _ = record_request(session, base_url, test, method, path, samples, body=body, params=params,
+                                     timeout=timeout, lock=lock, **options)
+        return response.json() if response is not None and response.status_code == 200 else None
+
+    if workspace_id is None:
+        workspaces = (send('GET', '/workspaces', setup=True) or {}).get('workspaces') or []
+        if workspaces:
+            workspace_id = workspaces[0]['id']
+        else:
+            workspace = send('POST', '/workspaces', {'name': workspace_name})
+            if not workspace:
+                return None, []
+            workspace_id = workspace['workspace']['id']
+
+    sets = []
+    for row in generate(count, seed):
+        context = {'workspace_id': workspace_id}
+        segment = send('POST', '/segments', render(row['segment'], context))
+        if not segment:
+            break
+        context['segment_id'] = segment['segment']['id']
+        sets.append({'segmentId': context['segment_id']})
+        culture = send('POST', '/culture-profiles', render(row['culture'], context))
+        economic = send('POST', '/economic-profiles', render(row['economic'], context)) if culture else None
+        if not economic:
+            break
+        sets[-1].update({'cultureProfileId': culture['profile']['id'], 'economicProfileId': economic['profile']['id']})
+    else:
+        return workspace_id, sets
+
+    # Deleting a segment cascades to its profiles
+    for created in sets:
+        send('DELETE', f"/segments/{created['segmentId']}", test='cleanup')
+    return workspace_id, []
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def normalize_endpoint(path):
+    """'/segments/68ee7d6a5d192f23f7922f8b' -> '/segments/{id}'"""
+    return ID_SEGMENT.sub('/{id}', path.split('?', 1)[0])
+
+
+def process_uptime():
+    """Seconds since this interpreter started (Linux /proc; falls back to None)"""
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def process_rss(pid='self'):
+    """Resident set size of a local process in bytes (Linux /proc; falls back to None)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def ensure_repo_on_path():
+    """Let `python -m harness` import the root-level test scripts"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.insert(0, root)
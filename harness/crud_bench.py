@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Segment CRUD Throughput Benchmark
+Runs many concurrent create -> read -> update -> delete cycles against /segments with
+the full segmentSchema payload, and reports ops/sec per verb and how throughput scales
+from 1 to N clients. Segments carry our heaviest validated payloads, so this is the
+write-path capacity proxy.
+
+Transports:
+    requests  one keep-alive session per client, --in-flight cycles per client (threads)
+    http2     one multiplexed HTTP/2 connection per client via httpx (pip install 'httpx[http2]')
+
+Neither library pipelines HTTP/1.1 requests; with http2 the in-flight cycles of a client
+share one connection as concurrent streams. Over plain http:// httpx falls back to
+HTTP/1.1, so those cycles queue on the client's single connection instead.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from harness.core import BASE_URL, DEMO_MODE, normalize_endpoint, percentile
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+from harness.scenario import SEGMENT_BODY, render
+
+VERBS = ('create', 'read', 'update', 'delete')
+
+
+def segment_payload(workspace_id, worker, cycle):
+    body = render(SEGMENT_BODY, {'workspace_id': workspace_id})
+    body['name'] = f"CRUD Bench Segment {worker}-{cycle}"
+    return body
+
+
+class LevelResult:
+    """Samples and wall time for one concurrency level"""
+
+    def __init__(self, clients, in_flight):
+        self.clients = clients
+        self.in_flight = in_flight
+        self.samples = []
+        self.lock = threading.Lock()
+        self.wall = 0.0
+
+    def record(self, verb, method, path, status, latency, size, started_at):
+        with self.lock:
+            self.samples.append({
+                'test': f"segment_{verb}",
+                'verb': verb,
+                'method': method,
+                'endpoint': normalize_endpoint(path),
+                'status': status,
+                'latency_ms': latency * 1000,
+                'bytes': size,
+                'success': status == 200,
+                'started_at': started_at,
+                'clients': self.clients
+            })
+
+    def summary(self):
+        wall = max(self.wall, 1e-9)
+        verbs = {}
+        for verb in VERBS:
+            samples = [s for s in self.samples if s['verb'] == verb]
+            latencies = sorted(s['latency_ms'] for s in samples)
+            verbs[verb] = {
+                'count': len(samples),
+                'failed': sum(1 for s in samples if not s['success']),
+                'ops_per_sec': len(samples) / wall,
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95)
+            }
+        completed = sum(1 for s in self.samples if s['verb'] == 'delete' and s['success'])
+        return {
+            'clients': self.clients,
+            'in_flight': self.in_flight,
+            'wall_s': wall,
+            'cycles_per_sec': completed / wall,
+            'ops_per_sec': sum(1 for s in self.samples if s['verb'] in VERBS) / wall,
+            'verbs': verbs
+        }
+
+
+def update_payload(workspace_id, worker, cycle):
+    return {'name': f"CRUD Bench Segment {worker}-{cycle} (updated)", 'workspaceId': workspace_id}
+
+
+def created_path(status, body):
+    segment_id = (body or {}).get('segment', {}).get('id') if status == 200 else None
+    return f"/segments/{segment_id}" if segment_id else None
+
+
+def run_cycle(request, workspace_id, worker, cycle):
+    """One create -> read -> update -> delete chain; stops at the first failure
+
+    A segment that was created is always deleted; after a failed read or update that
+    delete is recorded as 'cleanup' rather than as a cycle's delete.
+    """
+    path = created_path(*request('create', 'POST', '/segments', segment_payload(workspace_id, worker, cycle)))
+    if not path:
+        return
+    verb = 'cleanup'
+    try:
+        if request('read', 'GET', path, None)[0] == 200:
+            if request('update', 'PUT', path, update_payload(workspace_id, worker, cycle))[0] == 200:
+                verb = 'delete'
+    finally:
+        request(verb, 'DELETE', path, None)
+
+
+async def run_cycle_async(request, workspace_id, worker, cycle):
+    """run_cycle for an awaitable request function"""
+    path = created_path(*await request('create', 'POST', '/segments', segment_payload(workspace_id, worker, cycle)))
+    if not path:
+        return
+    verb = 'cleanup'
+    try:
+        if (await request('read', 'GET', path, None))[0] == 200:
+            if (await request('update', 'PUT', path, update_payload(workspace_id, worker, cycle)))[0] == 200:
+                verb = 'delete'
+    finally:
+        await request(verb, 'DELETE', path, None)
+
+
+class CrudBenchmark:
+    def __init__(self, base_url=BASE_URL, workspace_id=None, cycles=20, in_flight=1,
+                 transport='requests', timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.workspace_id = workspace_id
+        self.cycles = cycles
+        self.in_flight = in_flight
+        self.transport = transport
+        self.timeout = timeout
+        self.params = {'demo': 'true'} if DEMO_MODE else {}
+
+    def resolve_workspace(self):
+        if self.workspace_id:
+            return self.workspace_id
+        import requests
+        response = requests.get(f"{self.base_url}/workspaces", params=self.params, timeout=self.timeout)
+        response.raise_for_status()
+        self.workspace_id = response.json()['workspaces'][0]['id']
+        return self.workspace_id
+
+    def run_level(self, clients):
+        result = LevelResult(clients, self.in_flight)
+        start = time.perf_counter()
+        if self.transport == 'http2':
+            asyncio.run(self.run_http2(clients, result))
+        else:
+            self.run_requests(clients, result)
+        result.wall = time.perf_counter() - start
+        return result
+
+    def run_requests(self, clients, result):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        def worker(index, session, slot):
+            def request(verb, method, path, body):
+                started_at = time.time()
+                t0 = time.perf_counter()
+                try:
+                    response = session.request(method, f"{self.base_url}{path}", params=self.params,
+                                               json=body, timeout=self.timeout)
+                except requests.RequestException:
+                    result.record(verb, method, path, None, time.perf_counter() - t0, 0, started_at)
+                    return None, None
+                result.record(verb, method, path, response.status_code, time.perf_counter() - t0,
+                              len(response.content), started_at)
+                try:
+                    return response.status_code, response.json()
+                except ValueError:
+                    return response.status_code, None
+
+            for cycle in range(slot, self.cycles, self.in_flight):
+                run_cycle(request, self.workspace_id, index, cycle)
+
+        sessions = []
+        for _ in range(clients):
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_maxsize=self.in_flight))
+            session.mount('https://', HTTPAdapter(pool_maxsize=self.in_flight))
+            sessions.append(session)
+        with ThreadPoolExecutor(max_workers=clients * self.in_flight) as pool:
+            futures = [pool.submit(worker, index, sessions[index], slot)
+                       for index in range(clients) for slot in range(self.in_flight)]
+            for future in futures:
+                future.result()
+        for session in sessions:
+            session.close()
+
+    async def run_http2(self, clients, result):
+        import httpx
+
+        async def worker(index, client, slot):
+            async def request(verb, method, path, body):
+                started_at = time.time()
+                t0 = time.perf_counter()
+                try:
+                    response = await client.request(method, f"{self.base_url}{path}", params=self.params,
+                                                    json=body)
+                except httpx.HTTPError:
+                    result.record(verb, method, path, None, time.perf_counter() - t0, 0, started_at)
+                    return None, None
+                result.record(verb, method, path, response.status_code, time.perf_counter() - t0,
+                              len(response.content), started_at)
+                try:
+                    return response.status_code, response.json()
+                except ValueError:
+                    return response.status_code, None
+
+            for cycle in range(slot, self.cycles, self.in_flight):
+                await run_cycle_async(request, self.workspace_id, index, cycle)
+
+        limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+        client_list = [httpx.AsyncClient(http2=True, limits=limits, timeout=self.timeout) for _ in range(clients)]
+        try:
+            await asyncio.gather(*(worker(index, client_list[index], slot)
+                                   for index in range(clients) for slot in range(self.in_flight)))
+        finally:
+            for client in client_list:
+                await client.aclose()
+
+
+def client_levels(max_clients):
+    levels, n = [], 1
+    while n < max_clients:
+        levels.append(n)
+        n *= 2
+    levels.append(max_clients)
+    return levels
+
+
+def print_levels(levels):
+    base = levels[0]['cycles_per_sec'] / levels[0]['clients'] if levels and levels[0]['cycles_per_sec'] else 0
+    print(f"\n{'clients':>8}{'cycles/s':>10}{'create/s':>10}{'read/s':>9}{'update/s':>10}"
+          f"{'delete/s':>10}{'p95 create':>12}{'errors':>8}{'scaling':>9}")
+    for level in levels:
+        verbs = level['verbs']
+        errors = sum(v['failed'] for v in verbs.values())
+        efficiency = level['cycles_per_sec'] / (base * level['clients']) * 100 if base else 0
+        print(f"{level['clients']:>8}{level['cycles_per_sec']:>10.1f}{verbs['create']['ops_per_sec']:>10.1f}"
+              f"{verbs['read']['ops_per_sec']:>9.1f}{verbs['update']['ops_per_sec']:>10.1f}"
+              f"{verbs['delete']['ops_per_sec']:>10.1f}{verbs['create']['p95_ms']:>12.0f}"
+              f"{errors:>8}{efficiency:>8.0f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Segment CRUD throughput and scaling benchmark')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--workspace-id', help='Defaults to the first workspace from GET /workspaces')
+    parser.add_argument('--max-clients', type=int, default=16)
+    parser.add_argument('--cycles', type=int, default=20, help='CRUD cycles per client')
+    parser.add_argument('--in-flight', type=int, default=4, help='Concurrent cycles per client')
+    parser.add_argument('--transport', choices=('requests', 'http2'), default='requests')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--output', default='crud_bench_results.json')
+    args = parser.parse_args(argv)
+
+    if args.transport == 'http2':
+        try:
+            import h2  # noqa: F401
+            import httpx  # noqa: F401
+        except ImportError:
+            print("❌ --transport http2 needs httpx with HTTP/2 support: pip install 'httpx[http2]'")
+            return 2
+
+    bench = CrudBenchmark(args.base_url, args.workspace_id, args.cycles, args.in_flight,
+                          args.transport, args.timeout)
+    print(f"🚀 Segment CRUD benchmark ({args.transport}, {args.in_flight} in flight per client)")
+    print(f"📍 Base URL: {bench.base_url}")
+    print(f"🗂️  Workspace: {bench.resolve_workspace()}")
+
+    levels, samples = [], []
+    monitor = OverheadMonitor().start()
+    for clients in client_levels(args.max_clients):
+        result = bench.run_level(clients)
+        level = result.summary()
+        levels.append(level)
+        samples.extend(result.samples)
+        print(f"   {clients:>3} clients: {level['cycles_per_sec']:.1f} cycles/s, {level['ops_per_sec']:.1f} ops/s")
+
+    overhead = finish(monitor, samples)
+    print_levels(levels)
+    print_overhead(overhead)
+
+    failed = sum(1 for s in samples if not s['success'])
+    payload = {
+        'summary': {
+            'total_requests': len(samples),
+            'failed': failed,
+            'transport': args.transport,
+            'levels': levels,
+            'client_overhead': overhead,
+            'test_completed_at': datetime.now().isoformat()
+        },
+        'samples': samples
+    }
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'crud_bench')
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Run History - embedded SQLite store of every harness run
+Results JSON files are overwritten on each run; this keeps every run's per-request
+samples plus precomputed per-endpoint percentiles, indexed by endpoint, commit and
+time, so trend queries stay fast over thousands of runs.
+
+    python -m harness.history ingest /app/strategy_workflow_results.json
+    python -m harness.history runs
+    python -m harness.history trend '/personas/{id}/strategies/export-all' --metric p95
+    python -m harness.history slowdown '/personas/{id}/strategies/export-all'
+    python -m harness.history drift --baseline 20 --recent 5
+    python -m harness.history worst --top 10 --source load
+
+Every tool records into the same store, so trend, slowdown and drift keep each source
+(the tool and scenario that recorded the run, e.g. load:browse-heavy) as its own series.
+--source narrows them to one source, or to every source under a prefix (--source load).
+Fault-injection and cold-start runs (chaos:*, cold_start:*) are not comparable with
+ordinary runs and are left out unless --source asks for them.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from harness.core import percentile
+
+DB_PATH = os.environ.get(
+    'HARNESS_HISTORY_DB',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'harness_history.db')
+)
+
+METRICS = ('p50', 'p90', 'p95', 'p99', 'mean', 'max', 'error_rate', 'bytes_avg')
+# Sources only included when --source names them
+EXCLUDED_SOURCES = ('chaos', 'cold_start')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    git_commit TEXT,
+    started_at REAL NOT NULL,
+    total_tests INTEGER,
+    passed INTEGER,
+    failed INTEGER,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_commit ON runs (git_commit);
+
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    method TEXT,
+    test TEXT,
+    status INTEGER,
+    latency_ms REAL,
+    bytes INTEGER,
+    success INTEGER,
+    started_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_samples_run ON samples (run_id);
+CREATE INDEX IF NOT EXISTS idx_samples_endpoint ON samples (endpoint, run_id);
+
+CREATE TABLE IF NOT EXISTS endpoint_stats (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    method TEXT NOT NULL,
+    count INTEGER,
+    p50 REAL, p90 REAL, p95 REAL, p99 REAL, mean REAL, max REAL,
+    error_rate REAL,
+    bytes_avg REAL,
+    PRIMARY KEY (endpoint, method, run_id)
+);
+CREATE INDEX IF NOT EXISTS idx_stats_run ON endpoint_stats (run_id);
+"""
+
+
+def connect(path=None):
+    conn = sqlite3.connect(path or DB_PATH)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA foreign_keys=ON')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def current_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def payload_samples(payload):
+    """Per-request samples from either results format (harness scripts or load runs)"""
+    return payload.get('request_samples') or payload.get('samples') or []
+
+
+def endpoint_stats(samples):
+    """Aggregate samples into one row per (endpoint, method)"""
+    groups = {}
+    for sample in samples:
+        groups.setdefault((sample.get('endpoint') or '?', sample.get('method') or '?'), []).append(sample)
+
+    rows = []
+    for (endpoint, method), group in groups.items():
+        latencies = sorted(s['latency_ms'] for s in group if s.get('latency_ms') is not None)
+        failures = sum(1 for s in group if not s.get('success'))
+        rows.append({
+            'endpoint': endpoint,
+            'method': method,
+            'count': len(group),
+            'p50': percentile(latencies, 50),
+            'p90': percentile(latencies, 90),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+            'max': latencies[-1] if latencies else 0.0,
+            'error_rate': failures / len(group) * 100,
+            'bytes_avg': sum(s.get('bytes') or 0 for s in group) / len(group)
+        })
+    return rows
+
+
+def ingest_payload(payload, source, conn=None, git_commit=None, started_at=None):
+    """Store one run; returns the new run id"""
+    own_conn = conn is None
+    conn = conn or connect()
+    samples = payload_samples(payload)
+    summary = payload.get('summary', {})
+    if started_at is None:
+        started_at = min((s['started_at'] for s in samples if s.get('started_at')), default=time.time())
+
+    try:
+        with conn:
+            cursor = conn.execute(
+                'INSERT INTO runs (source, git_commit, started_at, total_tests, passed, failed, summary) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (source, git_commit or current_commit(), started_at,
+                 summary.get('total_tests', summary.get('total_requests')), summary.get('passed'),
+                 summary.get('failed'), json.dumps(summary))
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                'INSERT INTO samples (run_id, endpoint, method, test, status, latency_ms, bytes, success, started_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, s.get('endpoint') or '?', s.get('method'), s.get('test'), s.get('status'),
+                  s.get('latency_ms'), s.get('bytes'), 1 if s.get('success') else 0, s.get('started_at'))
+                 for s in samples]
+            )
+            conn.executemany(
+                'INSERT INTO endpoint_stats (run_id, endpoint, method, count, p50, p90, p95, p99, mean, max, '
+                'error_rate, bytes_avg) VALUES (:run_id, :endpoint, :method, :count, :p50, :p90, :p95, :p99, '
+                ':mean, :max, :error_rate, :bytes_avg)',
+                [{**row, 'run_id': run_id} for row in endpoint_stats(samples)]
+            )
+        return run_id
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def record_run(payload, source):
+    """Best-effort ingest used by the harness scripts after saving results"""
+    try:
+        run_id = ingest_payload(payload, source)
+        print(f"🗄️  Run #{run_id} recorded in {DB_PATH}")
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️  Could not record run history: {e}")
+
+
+def source_clause(source=None, column='r.source'):
+    """SQL condition and params for the runs a query covers
+
+    With `source`, runs recorded under exactly that source or under it as a prefix
+    (`load` covers `load:browse-heavy`); without it, every source but EXCLUDED_SOURCES.
+    """
+    def matches(name):
+        return f"({column} = ? OR {column} LIKE ? ESCAPE '\\')", [name, like_escape(name) + ':%']
+
+    if source:
+        return matches(source)
+    conditions, params = [], []
+    for name in EXCLUDED_SOURCES:
+        condition, values = matches(name)
+        conditions.append(f'NOT {condition}')
+        params += values
+    return ' AND '.join(conditions), params
+
+
+def like_escape(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def trend(conn, endpoint, metric='p95', method=None, limit=50, source=None):
+    """Metric per run for one endpoint as {(source, method): rows}, oldest first
+
+    Each source and method is its own series with one value per run (endpoint_stats holds
+    one row per run, endpoint and method); `limit` is the number of latest runs per series.
+    """
+    check_metric(metric)
+    where, params = source_clause(source)
+    query = (f'SELECT * FROM (SELECT r.id, r.source, r.started_at, r.git_commit, s.method, s.count, '
+             f's.{metric} AS value, '
+             'ROW_NUMBER() OVER (PARTITION BY r.source, s.method ORDER BY r.started_at DESC) AS age '
+             f'FROM endpoint_stats s JOIN runs r ON r.id = s.run_id WHERE s.endpoint = ? AND {where}')
+    params = [endpoint, *params]
+    if method:
+        query += ' AND s.method = ?'
+        params.append(method.upper())
+    query += ') WHERE age <= ? ORDER BY source, method, started_at'
+    params.append(limit)
+    series = {}
+    for row in conn.execute(query, params):
+        series.setdefault((row['source'], row['method']), []).append(row)
+    return series
+
+
+def drift(conn, metric='p95', baseline=20, recent=5, source=None):
+    """Per source, median of the metric over its latest `recent` runs vs the `baseline` runs before them"""
+    check_metric(metric)
+    where, params = source_clause(source, column='source')
+    runs_by_source = {}
+    for row in conn.execute(f'SELECT id, source FROM runs WHERE {where} ORDER BY started_at DESC', params):
+        run_ids = runs_by_source.setdefault(row['source'], [])
+        if len(run_ids) < baseline + recent:
+            run_ids.append(row['id'])
+
+    def medians(ids):
+        placeholders = ','.join('?' * len(ids))
+        values = {}
+        for row in conn.execute(f'SELECT endpoint, method, {metric} AS value FROM endpoint_stats '
+                                f'WHERE run_id IN ({placeholders})', ids):
+            values.setdefault((row['endpoint'], row['method']), []).append(row['value'])
+        return {key: percentile(sorted(v), 50) for key, v in values.items()}
+
+    rows = []
+    for run_source, run_ids in runs_by_source.items():
+        recent_ids, baseline_ids = run_ids[:recent], run_ids[recent:]
+        if not recent_ids or not baseline_ids:
+            continue
+        before, after = medians(baseline_ids), medians(recent_ids)
+        for key in after.keys() & before.keys():
+            base, now = before[key], after[key]
+            rows.append({
+                'source': run_source,
+                'endpoint': key[0],
+                'method': key[1],
+                'baseline': base,
+                'recent': now,
+                'change_pct': (now - base) / base * 100 if base else 0.0
+            })
+    return sorted(rows, key=lambda r: r['change_pct'], reverse=True)
+
+
+def slowdown(conn, endpoint, metric='p95', factor=1.5, window=5, method=None, source=None):
+    """Per source and method, the first run whose metric exceeds `factor` x the median of the
+    preceding `window` runs, as {(source, method): (row, reference)}; series that never
+    slowed are left out"""
+    found = {}
+    for name, rows in trend(conn, endpoint, metric, method=method, limit=1000000, source=source).items():
+        for i in range(window, len(rows)):
+            reference = percentile(sorted(r['value'] for r in rows[i - window:i]), 50)
+            if reference and rows[i]['value'] > reference * factor:
+                found[name] = (rows[i], reference)
+                break
+    return found
+
+
+def check_metric(metric):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric} (choose from {', '.join(METRICS)})")
+
+
+def sparkline(values):
+    bars = '▁▂▃▄▅▆▇█'
+    if not values:
+        return ''
+    low, high = min(values), max(values)
+    span = (high - low) or 1
+    return ''.join(bars[int((v - low) / span * (len(bars) - 1))] for v in values)
+
+
+def fmt_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m harness.history', description='Query harness run history')
+    parser.add_argument('--db', default=DB_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('ingest', help='Store a results JSON file as a run')
+    p.add_argument('files', nargs='+')
+    p.add_argument('--commit')
+    p.add_argument('--source')
+
+    p = sub.add_parser('runs', help='List recent runs')
+    p.add_argument('--limit', type=int, default=20)
+    p.add_argument('--source', help='Only runs from this source or source prefix')
+
+    for name, help_text in (('trend', 'Metric per run for one endpoint'),
+                            ('slowdown', 'Find the run where an endpoint got slow')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('endpoint')
+        p.add_argument('--metric', default='p95', choices=METRICS)
+        p.add_argument('--method')
+        p.add_argument('--source', help='Only this source or source prefix (chaos/cold_start runs need it)')
+        if name == 'trend':
+            p.add_argument('--limit', type=int, default=50)
+        else:
+            p.add_argument('--factor', type=float, default=1.5)
+            p.add_argument('--window', type=int, default=5)
+
+    for name, help_text in (('drift', 'Recent vs baseline percentile per endpoint'),
+                            ('worst', 'Endpoints that regressed the most')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('--metric', default='p95', choices=METRICS)
+        p.add_argument('--baseline', type=int, default=20)
+        p.add_argument('--recent', type=int, default=5)
+        p.add_argument('--source', help='Only this source or source prefix (chaos/cold_start runs need it)')
+        if name == 'worst':
+            p.add_argument('--top', type=int, default=10)
+
+    args = parser.parse_args(argv)
+    conn = connect(args.db)
+
+    if args.command == 'ingest':
+        for path in args.files:
+            with open(path) as f:
+                payload = json.load(f)
+            run_id = ingest_payload(payload, args.source or os.path.basename(path), conn=conn,
+                                    git_commit=args.commit)
+            print(f"🗄️  {path} -> run #{run_id} ({len(payload_samples(payload))} samples)")
+
+    elif args.command == 'runs':
+        print(f"{'run':>6}  {'started':<17}{'commit':<10}{'passed':>7}{'failed':>7}  source")
+        where, params = source_clause(args.source, column='source') if args.source else ('1', [])
+        for row in conn.execute(f'SELECT * FROM runs WHERE {where} ORDER BY started_at DESC LIMIT ?',
+                                (*params, args.limit)):
+            print(f"{row['id']:>6}  {fmt_time(row['started_at']):<17}{row['git_commit'] or '-':<10}"
+                  f"{row['passed'] if row['passed'] is not None else '-':>7}"
+                  f"{row['failed'] if row['failed'] is not None else '-':>7}  {row['source']}")
+
+    elif args.command == 'trend':
+        series = trend(conn, args.endpoint, args.metric, args.method, args.limit, args.source)
+        if not series:
+            print(f"❌ No history for {args.endpoint}")
+            return 1
+        for (source, method), rows in series.items():
+            print(f"📈 {args.metric} for {method} {args.endpoint} [{source}]: "
+                  f"{sparkline([r['value'] for r in rows])}")
+            for row in rows:
+                print(f"   #{row['id']:<6}{fmt_time(row['started_at'])}  {row['git_commit'] or '-':<10}"
+                      f"{row['value']:>10.1f}  (n={row['count']})")
+
+    elif args.command == 'slowdown':
+        found = slowdown(conn, args.endpoint, args.metric, args.factor, args.window, args.method, args.source)
+        if not found:
+            print(f"✅ No run exceeded {args.factor}x the trailing {args.window}-run median for {args.endpoint}")
+        for (source, method), (row, reference) in found.items():
+            print(f"🐢 {method} {args.endpoint} [{source}] got slow in run #{row['id']} ({fmt_time(row['started_at'])}, "
+                  f"commit {row['git_commit'] or '-'}): {args.metric} {row['value']:.1f} ms "
+                  f"vs trailing median {reference:.1f} ms")
+
+    else:
+        rows = drift(conn, args.metric, args.baseline, args.recent, args.source)
+        if args.command == 'worst':
+            rows = [r for r in rows if r['change_pct'] > 0][:args.top]
+        if not rows:
+            print("❌ Not enough runs to compare")
+            return 1
+        print(f"{'source':<24}{'endpoint':<44}{'method':<8}{'baseline':>10}{'recent':>10}{'change':>9}")
+        for row in rows:
+            print(f"{row['source'][:23]:<24}{row['endpoint'][:43]:<44}{row['method']:<8}{row['baseline']:>10.1f}"
+                  f"{row['recent']:>10.1f}{row['change_pct']:>+8.1f}%")
+
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
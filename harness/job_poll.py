@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Job Poll - submit-then-poll client for the async generation API
+Submits `--jobs` generations with ?mode=async from `--concurrency` client threads and
+polls GET /jobs/{id} until each one finishes, either every `--poll-interval` seconds or
+as a long-poll (`--long-poll` seconds per request, which the server holds open until
+the job is done).
+
+Each job's time is split using the server's timestamps: queue wait (submitted until a
+worker picked it up) and execution (the generation itself). The client's end-to-end
+time minus both is what submitting and polling added. When queue wait dominates, the
+server's worker pool (JOB_WORKERS) rather than generation speed limits throughput.
+
+    python -m harness.job_poll --jobs 40 --concurrency 10 --long-poll 20
+    python -m harness.job_poll --kind strategies --poll-interval 0.5
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from harness.core import BASE_URL, DEMO_MODE, DEMO_PARAMS, JSON_HEADERS, percentile, provision_inputs, record_request
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+
+KINDS = ('persona', 'strategies', 'positioning')
+FINISHED = ('succeeded', 'failed')
+
+
+class JobPoll:
+    def __init__(self, base_url=BASE_URL, jobs=20, concurrency=5, kind='persona', poll_interval=1.0,
+                 long_poll=None, job_timeout=300, timeout=60, seed=None):
+        self.base_url = base_url.rstrip('/')
+        self.jobs = jobs
+        self.concurrency = concurrency
+        self.kind = kind
+        self.poll_interval = poll_interval
+        self.long_poll = long_poll
+        self.job_timeout = job_timeout
+        self.timeout = timeout
+        self.seed = seed
+        self.params = DEMO_PARAMS if DEMO_MODE else {}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.samples = []
+        self.records = []
+        self.segment_id = None
+        self.wall_s = 0.0
+
+    @property
+    def session(self):
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+            self.local.session.headers.update(JSON_HEADERS)
+        return self.local.session
+
+    def request(self, test, method, path, body=None, params=None, timeout=None):
+        """Send one request and record it as a sample; returns (status, payload)"""
+        response, _ = record_request(self.session, self.base_url, test, method, path, self.samples, body=body,
+                                     params={**self.params, **(params or {})}, timeout=timeout or self.timeout,
+                                     lock=self.lock, success=lambda status: status < 400)
+        if response is None:
+            return None, None
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+    def provision(self):
+        """Create the generation inputs; returns (path, body) to submit, or None"""
+        _, inputs = provision_inputs(self.session, self.base_url, self.samples, self.seed, params=self.params,
+                                     timeout=self.timeout, lock=self.lock, workspace_name='Job Poll')
+        if not inputs:
+            return None
+        persona_body = inputs[0]
+        self.segment_id = persona_body['segmentId']
+        if self.kind == 'persona':
+            return '/personas/generate', persona_body
+
+        # Strategy jobs need a persona; generate it synchronously once
+        status, persona = self.request('setup', 'POST', '/personas/generate', persona_body)
+        if status != 200:
+            return None
+        persona_id = persona['persona']['id']
+        if self.kind == 'strategies':
+            return f"/personas/{persona_id}/strategies/generate", None
+        return f"/personas/{persona_id}/strategies/{self.kind}/generate", None
+
+    def run_job(self, index, path, body):
+        record = {'index': index, 'job_id': None, 'status': None, 'polls': 0, 'submit_ms': None,
+                  'queue_wait_ms': None, 'run_ms': None, 'e2e_ms': None, 'rejected': False, 'timed_out': False}
+        start = time.perf_counter()
+        status, payload = self.request(f"submit_{self.kind}", 'POST', path, body, params={'mode': 'async'})
+        record['submit_ms'] = (time.perf_counter() - start) * 1000
+        if status != 202:
+            record['status'] = 'rejected' if status == 503 else 'submit_failed'
+            record['rejected'] = status == 503
+            return record
+
+        job = payload['job']
+        record['job_id'] = job['id']
+        deadline = start + self.job_timeout
+        while job['status'] not in FINISHED:
+            if time.perf_counter() >= deadline:
+                record['timed_out'] = True
+                break
+            if self.long_poll:
+                params = {'wait': self.long_poll}
+                timeout = self.long_poll + self.timeout
+            else:
+                time.sleep(self.poll_interval)
+                params, timeout = None, None
+            record['polls'] += 1
+            status, payload = self.request('poll_job', 'GET', f"/jobs/{job['id']}", params=params, timeout=timeout)
+            if status == 200:
+                job = payload['job']
+            elif status == 404:
+                break
+
+        record['e2e_ms'] = (time.perf_counter() - start) * 1000
+        record.update({'status': job['status'], 'queue_wait_ms': job.get('queue_wait_ms'), 'run_ms': job.get('run_ms'),
+                       'result_status': job.get('result_status')})
+        return record
+
+    def run(self):
+        target = self.provision()
+        if target is None:
+            return None
+        path, body = target
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            self.records = list(pool.map(lambda i: self.run_job(i, path, body), range(self.jobs)))
+        self.wall_s = time.perf_counter() - start
+        return self.summary()
+
+    def cleanup(self):
+        if self.segment_id:
+            self.request('cleanup', 'DELETE', f"/segments/{self.segment_id}")
+
+    def summary(self):
+        finished = [r for r in self.records if r['status'] in FINISHED]
+        succeeded = [r for r in finished if r['status'] == 'succeeded']
+
+        def stats(field, rows):
+            values = sorted(r[field] for r in rows if r[field] is not None)
+            return {'p50': percentile(values, 50), 'p95': percentile(values, 95), 'max': values[-1] if values else 0.0}
+
+        for r in finished:
+            r['client_ms'] = r['e2e_ms'] - (r['queue_wait_ms'] or 0) - (r['run_ms'] or 0)
+        queue_wait = stats('queue_wait_ms', finished)
+        execution = stats('run_ms', finished)
+        return {
+            'kind': self.kind,
+            'jobs': self.jobs,
+            'concurrency': self.concurrency,
+            'poll_mode': f"long-poll {self.long_poll:g}s" if self.long_poll else f"interval {self.poll_interval:g}s",
+            'succeeded': len(succeeded),
+            'failed': len(finished) - len(succeeded),
+            'rejected': sum(1 for r in self.records if r['rejected']),
+            'timed_out': sum(1 for r in self.records if r['timed_out']),
+            'wall_s': self.wall_s,
+            'jobs_per_s': len(succeeded) / self.wall_s if self.wall_s else 0.0,
+            'submit_ms': stats('submit_ms', self.records),
+            'queue_wait_ms': queue_wait,
+            'run_ms': execution,
+            'e2e_ms': stats('e2e_ms', finished),
+            'client_ms': stats('client_ms', finished),
+            'polls_per_job': sum(r['polls'] for r in finished) / len(finished) if finished else 0.0,
+            'queue_bound': queue_wait['p50'] > execution['p50'],
+            'total_requests': len(self.samples),
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 JOB POLL - {summary['jobs']} {summary['kind']} jobs, concurrency {summary['concurrency']}, "
+          f"{summary['poll_mode']}")
+    print(f"{'='*80}")
+    print(f"✅ Succeeded: {summary['succeeded']}   ❌ Failed: {summary['failed']}   "
+          f"🚫 Rejected: {summary['rejected']}   ⏱️  Timed out: {summary['timed_out']}")
+    print(f"📈 {summary['jobs_per_s']:.2f} jobs/s over {summary['wall_s']:.1f}s, "
+          f"{summary['polls_per_job']:.1f} polls per job")
+    print(f"\n{'phase':<22}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for label, key in (('submit', 'submit_ms'), ('queue wait', 'queue_wait_ms'), ('execution', 'run_ms'),
+                       ('submit + polling', 'client_ms'), ('end to end', 'e2e_ms')):
+        row = summary[key]
+        print(f"{label:<22}{row['p50']:>10.0f}{row['p95']:>10.0f}{row['max']:>10.0f}")
+    if summary['queue_bound']:
+        print(f"\n⚠️  Jobs wait longer in the queue than they run - the worker pool (JOB_WORKERS) is the bottleneck")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Submit generation jobs and poll them to completion')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--kind', choices=KINDS, default='persona',
+                        help='persona, all strategies for a persona, or one (positioning) strategy')
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=5, help='Client threads submitting and polling')
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls')
+    parser.add_argument('--long-poll', type=float, help='Long-poll with this wait (seconds, max 30) instead')
+    parser.add_argument('--job-timeout', type=float, default=300, help='Give up on a job after this many seconds')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--keep', action='store_true', help='Keep the created segment')
+    parser.add_argument('--output', default='job_poll_results.json')
+    args = parser.parse_args(argv)
+
+    client = JobPoll(args.base_url, args.jobs, args.concurrency, args.kind, args.poll_interval, args.long_poll,
+                     args.job_timeout, args.timeout, args.seed)
+    print(f"🚀 Job poll: {args.jobs} {args.kind} jobs, concurrency {args.concurrency}")
+    print(f"📍 Base URL: {client.base_url}")
+    monitor = OverheadMonitor().start()
+    summary = client.run()
+    if summary is None:
+        print("❌ Could not create the generation inputs")
+        return 2
+    summary['client_overhead'] = finish(monitor, client.samples)
+    if not args.keep:
+        client.cleanup()
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': client.samples, 'jobs': client.records}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, f"job_poll:{args.kind}")
+    return 0 if summary['succeeded'] == args.jobs else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
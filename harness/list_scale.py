@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+List Scale - GET /workspaces page latency as the workspace count grows
+Logs in as a real user (demo mode always lists the single mock workspace), then grows
+the user's workspaces through `--levels` (100, 1,000 and 10,000 by default). At each
+level it times:
+
+    first page   GET /workspaces?limit=50
+    deep page    the page after a cursor halfway through the user's workspaces
+    full walk    every page at --walk-limit, checking each workspace appears exactly once
+
+Cursor pagination reads an index range per page, so first- and deep-page latency and
+page size should stay flat across levels; the run fails when the p50 at the largest
+level exceeds the smallest level's by more than --tolerance.
+
+    EMERGENT_BACKEND_URL=http://127.0.0.1:8902 yarn dev
+    python -m harness.list_scale --levels 100,1000,10000
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from harness.auth_load import SessionDataStub
+from harness.core import BASE_URL, JSON_HEADERS, normalize_endpoint, percentile
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+
+PAGE_SIZE = 50
+# Latency differences below this are noise, whatever the ratio
+FLAT_SLACK_MS = 5.0
+
+
+class ListScale:
+    def __init__(self, base_url=BASE_URL, levels=(100, 1000, 10000), samples=20, walk_limit=200, workers=8,
+                 tolerance=1.5, timeout=60):
+        self.base_url = base_url.rstrip('/')
+        self.levels = sorted(levels)
+        self.samples_per_probe = samples
+        self.walk_limit = walk_limit
+        self.workers = workers
+        self.tolerance = tolerance
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(JSON_HEADERS)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.samples = []
+        self.created = []
+        self.baseline_ids = set()
+
+    def login(self, session_id):
+        response = self.session.post(f"{self.base_url}/auth/session", json={'session_id': session_id},
+                                     timeout=self.timeout)
+        return response.status_code == 200 and 'session_token' in self.session.cookies
+
+    @property
+    def worker_session(self):
+        """Per-thread session carrying the logged-in user's cookies"""
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+            self.local.session.headers.update(JSON_HEADERS)
+            self.local.session.cookies.update(self.session.cookies)
+        return self.local.session
+
+    def request(self, test, method, path, params=None, body=None, session=None, **fields):
+        sample = {'test': test, 'method': method, 'endpoint': normalize_endpoint(path), 'started_at': time.time(),
+                  'status': None, 'latency_ms': None, 'bytes': 0, 'success': False, **fields}
+        start = time.perf_counter()
+        try:
+            response = (session or self.session).request(method, f"{self.base_url}{path}", params=params, json=body,
+                                                         timeout=self.timeout)
+        except requests.RequestException as e:
+            sample['latency_ms'] = (time.perf_counter() - start) * 1000
+            sample['message'] = f"Request failed: {e.__class__.__name__}"
+            with self.lock:
+                self.samples.append(sample)
+            return None
+        sample.update({'latency_ms': (time.perf_counter() - start) * 1000, 'status': response.status_code,
+                       'bytes': len(response.content), 'success': response.status_code == 200})
+        with self.lock:
+            self.samples.append(sample)
+        return response.json() if sample['success'] else None
+
+    def create_workspace(self, index):
+        payload = self.request('seed_workspace', 'POST', '/workspaces', body={'name': f"List Scale {index}"},
+                               session=self.worker_session)
+        return payload['workspace']['id'] if payload else None
+
+    def grow_to(self, level):
+        missing = level - len(self.created)
+        if missing <= 0:
+            return
+        start = len(self.created)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            ids = list(pool.map(self.create_workspace, range(start, start + missing)))
+        self.created.extend(i for i in ids if i)
+
+    def walk(self, level):
+        """List every page; returns (pages, workspace IDs seen, page latencies)"""
+        seen, latencies, cursor, pages = [], [], None, 0
+        while True:
+            params = {'limit': self.walk_limit, 'fields': 'id'}
+            if cursor:
+                params['cursor'] = cursor
+            payload = self.request('walk_page', 'GET', '/workspaces', params=params, level=level)
+            if payload is None:
+                break
+            latencies.append(self.samples[-1]['latency_ms'])
+            pages += 1
+            seen.extend(w['id'] for w in payload.get('workspaces', []))
+            cursor = payload.get('nextCursor')
+            if not payload.get('hasMore') or not cursor:
+                break
+        return pages, seen, latencies
+
+    def probe(self, level):
+        for _ in range(self.samples_per_probe):
+            self.request('first_page', 'GET', '/workspaces', params={'limit': PAGE_SIZE}, level=level)
+        ordered = sorted(self.created)
+        middle = ordered[len(ordered) // 2]
+        for _ in range(self.samples_per_probe):
+            self.request('deep_page', 'GET', '/workspaces', params={'limit': PAGE_SIZE, 'cursor': middle}, level=level)
+        pages, seen, latencies = self.walk(level)
+        expected = set(self.created) | self.baseline_ids
+        return {
+            'pages': pages,
+            'listed': len(seen),
+            'duplicates': len(seen) - len(set(seen)),
+            'missing': len(expected - set(seen)),
+            'walk_page_p50_ms': percentile(sorted(latencies), 50)
+        }
+
+    def run(self):
+        # Workspaces the user already had also show up in every listing
+        _, seen, _ = self.walk(0)
+        self.baseline_ids = set(seen)
+        results = []
+        for level in self.levels:
+            started = time.perf_counter()
+            self.grow_to(level)
+            seeded_s = time.perf_counter() - started
+            walk = self.probe(level)
+            results.append(self.level_stats(level, seeded_s, walk))
+        return self.summary(results)
+
+    def level_stats(self, level, seeded_s, walk):
+        def stats(test):
+            samples = [s for s in self.samples if s['test'] == test and s.get('level') == level and s['success']]
+            latencies = sorted(s['latency_ms'] for s in samples)
+            return {'p50': percentile(latencies, 50), 'p95': percentile(latencies, 95),
+                    'bytes': samples[0]['bytes'] if samples else 0}
+
+        return {'level': level, 'workspaces': len(self.created) + len(self.baseline_ids), 'seed_s': seeded_s,
+                'first_page': stats('first_page'), 'deep_page': stats('deep_page'), **walk}
+
+    def cleanup(self):
+        def delete(workspace_id):
+            self.request('cleanup', 'DELETE', f"/workspaces/{workspace_id}", session=self.worker_session)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(delete, self.created))
+
+    def flat(self, results, key):
+        smallest, largest = results[0][key]['p50'], results[-1][key]['p50']
+        return largest <= smallest * self.tolerance or largest - smallest <= FLAT_SLACK_MS
+
+    def summary(self, results):
+        complete = all(r['missing'] == 0 and r['duplicates'] == 0 for r in results)
+        flat_first = self.flat(results, 'first_page')
+        flat_deep = self.flat(results, 'deep_page')
+        return {
+            'levels': results,
+            'tolerance': self.tolerance,
+            'first_page_flat': flat_first,
+            'deep_page_flat': flat_deep,
+            'pagination_complete': complete,
+            'passed': flat_first and flat_deep and complete,
+            'failed': sum(1 for s in self.samples if not s['success']),
+            'total_requests': len(self.samples),
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 LIST SCALE - GET /workspaces page latency by workspace count")
+    print(f"{'='*80}")
+    print(f"{'workspaces':>11}{'first p50':>11}{'first p95':>11}{'deep p50':>10}{'deep p95':>10}{'page B':>9}"
+          f"{'walk pages':>12}{'walk p50':>10}  listing")
+    for row in summary['levels']:
+        listing = '✅' if not row['missing'] and not row['duplicates'] else \
+            f"❌ {row['missing']} missing, {row['duplicates']} duplicated"
+        print(f"{row['workspaces']:>11}{row['first_page']['p50']:>11.1f}{row['first_page']['p95']:>11.1f}"
+              f"{row['deep_page']['p50']:>10.1f}{row['deep_page']['p95']:>10.1f}{row['first_page']['bytes']:>9}"
+              f"{row['pages']:>12}{row['walk_page_p50_ms']:>10.1f}  {listing}")
+    print()
+    for label, key in (('First page', 'first_page_flat'), ('Deep page', 'deep_page_flat')):
+        print(f"{'✅' if summary[key] else '❌'} {label} latency "
+              f"{'stays flat' if summary[key] else 'grows'} (tolerance {summary['tolerance']:g}x)")
+    if summary['failed']:
+        print(f"⚠️  {summary['failed']} requests failed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check that GET /workspaces pages stay flat as workspaces grow')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--levels', default='100,1000,10000', help='Comma-separated workspace counts')
+    parser.add_argument('--samples', type=int, default=20, help='Requests per probe and level')
+    parser.add_argument('--walk-limit', type=int, default=200, help='Page size for the full walk')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent requests while seeding')
+    parser.add_argument('--tolerance', type=float, default=1.5, help='Allowed p50 growth from the smallest level')
+    parser.add_argument('--session-id', default='harness-list-scale')
+    parser.add_argument('--stub-port', type=int, default=8902)
+    parser.add_argument('--no-stub', action='store_true', help='The session-data stand-in is already running')
+    parser.add_argument('--keep', action='store_true', help='Keep the created workspaces')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--output', default='list_scale_results.json')
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.levels.split(',')]
+    check = ListScale(args.base_url, levels, args.samples, args.walk_limit, args.workers, args.tolerance,
+                      args.timeout)
+    print(f"🚀 List scale: {', '.join(str(level) for level in check.levels)} workspaces")
+    print(f"📍 Base URL: {check.base_url}")
+    stub = None if args.no_stub else SessionDataStub(port=args.stub_port)
+    try:
+        if stub:
+            stub.start()
+        if not check.login(args.session_id):
+            print(f"❌ Login failed - is EMERGENT_BACKEND_URL pointing at the stub ({stub.base_url if stub else 'running elsewhere'})?")
+            return 2
+        monitor = OverheadMonitor().start()
+        summary = check.run()
+        summary['client_overhead'] = finish(monitor, check.samples)
+        if not args.keep:
+            check.cleanup()
+    finally:
+        if stub:
+            stub.stop()
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': check.samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'list_scale')
+    return 0 if summary['passed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
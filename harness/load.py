@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Load Engine - runs a weighted mix of scenario journeys against the API
+Each virtual user picks journeys by weight, sleeps for sampled think times between
+steps and records one sample per request, so capacity numbers reflect the real
+read/write ratio rather than a fixed test sequence.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from harness.cache import enable_setup_cache, print_cache_summary, setup_cache
+from harness.core import BASE_URL, DEMO_MODE, normalize_endpoint, percentile
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, enable_profiling, print_overhead
+from harness.scenario import WRITE_METHODS, ScenarioError, load_scenario
+
+# Least pause after a failed step, so a scenario without think times doesn't turn a
+# failing endpoint into a tight retry loop
+FAILURE_PAUSE_S = 0.25
+
+
+class VirtualUser:
+    """One simulated user with its own session, RNG and variable context"""
+
+    def __init__(self, runner, index):
+        self.runner = runner
+        self.index = index
+        self.session = requests.Session()
+        self.rng = random.Random(None if runner.seed is None else runner.seed + index)
+        self.context = {**runner.scenario.vars, 'vu': index, 'iteration': 0}
+
+    def run(self):
+        scenario = self.runner.scenario
+        if not self.run_steps('setup', scenario.setup, scenario.think):
+            # Journeys depend on setup's captures; without them they could only fail
+            self.runner.mark_setup_failed(self.index)
+            return
+        while not self.runner.should_stop(self.context['iteration']):
+            journey = scenario.pick_journey(self.rng)
+            self.context['data'] = scenario.sample_data(self.rng)
+            self.run_steps(journey.name, journey.steps, journey.think)
+            self.context['iteration'] += 1
+
+    def run_steps(self, journey_name, steps, think):
+        """Run the steps in order; False if one failed and the rest were skipped"""
+        for step in steps:
+            if self.runner.stop_event.is_set():
+                return True
+            ok = self.execute(journey_name, step)
+            pause = (step.think or think).sample(self.rng) / 1000
+            if not ok:
+                pause = max(pause, FAILURE_PAUSE_S)
+            if pause:
+                self.runner.stop_event.wait(pause)
+            if not ok:
+                return False  # later steps usually depend on this one's captures
+        return True
+
+    def execute(self, journey_name, step, **fields):
+        sample = {
+            'test': step.name,
+            'journey': journey_name,
+            'method': step.method,
+            'endpoint': step.path,
+            'vu': self.index,
+            'started_at': time.time(),
+            'status': None,
+            'latency_ms': None,
+            'bytes': 0,
+            'success': False,
+            'message': '',
+            **fields
+        }
+        try:
+            method, path, params, body = step.prepare(self.context)
+        except ScenarioError as e:
+            sample['message'] = str(e)
+            self.runner.record(sample)
+            return False
+
+        sample['endpoint'] = normalize_endpoint(path)
+        if DEMO_MODE:
+            params = {**params, 'demo': 'true'}
+
+        # Setup GETs only pull IDs, so they may be served by the shared setup cache
+        cache = self.runner.cache if journey_name == 'setup' and method == 'GET' else None
+        network = True
+        start = time.perf_counter()
+        try:
+            url = f"{self.runner.base_url}{path}"
+            if cache is not None:
+                response, network = cache.get(self.session, url, params=params, timeout=self.runner.timeout)
+            else:
+                response = self.session.request(method, url, params=params, json=body, timeout=self.runner.timeout)
+        except requests.RequestException as e:
+            sample['latency_ms'] = (time.perf_counter() - start) * 1000
+            sample['message'] = f"Request failed: {e.__class__.__name__}"
+            self.runner.record(sample)
+            return False
+
+        sample['latency_ms'] = (time.perf_counter() - start) * 1000
+        sample['status'] = response.status_code
+        sample['bytes'] = len(response.content)
+        sample['success'] = response.status_code == step.expect
+        if not sample['success']:
+            sample['message'] = f"Expected {step.expect}, got {response.status_code}"
+        if network:
+            self.runner.record(sample)
+
+        if sample['success'] and step.save:
+            try:
+                step.capture(response.json(), self.context)
+            except ValueError:
+                pass
+        return sample['success']
+
+
+class LoadRunner:
+    """Drives virtual users for a fixed duration or iteration count"""
+
+    def __init__(self, scenario, base_url=BASE_URL, users=10, duration=60, iterations=None,
+                 ramp_up=0, seed=None, timeout=30):
+        self.scenario = scenario
+        self.base_url = base_url.rstrip('/')
+        self.users = users
+        self.duration = duration
+        self.iterations = iterations
+        self.ramp_up = ramp_up
+        self.seed = seed
+        self.timeout = timeout
+        self.samples = []
+        self.samples_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.started_at = None
+        self.finished_at = None
+        self.cache = setup_cache()
+        self.overhead = None
+        self.setup_failed = set()
+
+    def record(self, sample):
+        with self.samples_lock:
+            self.samples.append(sample)
+
+    def mark_setup_failed(self, index):
+        with self.samples_lock:
+            self.setup_failed.add(index)
+
+    def should_stop(self, iteration):
+        if self.stop_event.is_set():
+            return True
+        if self.iterations is not None and iteration >= self.iterations:
+            return True
+        return self.duration is not None and time.time() - self.started_at >= self.duration
+
+    def run(self):
+        self.started_at = time.time()
+        self.overhead = OverheadMonitor().start()
+        threads = []
+        for index in range(self.users):
+            user = VirtualUser(self, index)
+            thread = threading.Thread(target=user.run, name=f"vu-{index}", daemon=True)
+            threads.append(thread)
+            thread.start()
+            if self.ramp_up and self.users > 1:
+                time.sleep(self.ramp_up / (self.users - 1))
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+        self.finished_at = time.time()
+        self.overhead.stop()
+        return self.summary()
+
+    def summary(self):
+        elapsed = max((self.finished_at or time.time()) - self.started_at, 1e-9)
+        # Setup requests are reported on their own so they do not skew the scenario mix
+        setup = [s for s in self.samples if s['journey'] == 'setup']
+        samples_run = [s for s in self.samples if s['journey'] != 'setup']
+        by_step = {}
+        for sample in samples_run:
+            by_step.setdefault((sample['test'], sample['method']), []).append(sample)
+
+        endpoints = []
+        for (name, method), samples in sorted(by_step.items()):
+            latencies = sorted(s['latency_ms'] for s in samples if s['latency_ms'] is not None)
+            failures = sum(1 for s in samples if not s['success'])
+            endpoints.append({
+                'test': name,
+                'method': method,
+                'count': len(samples),
+                'failed': failures,
+                'error_rate': failures / len(samples) * 100,
+                'rps': len(samples) / elapsed,
+                'p50_ms': percentile(latencies, 50),
+                'p90_ms': percentile(latencies, 90),
+                'p99_ms': percentile(latencies, 99),
+                'max_ms': latencies[-1] if latencies else 0.0,
+                'bytes_avg': sum(s['bytes'] for s in samples) / len(samples)
+            })
+
+        total = len(samples_run)
+        latencies = sorted(s['latency_ms'] for s in samples_run if s['latency_ms'] is not None)
+        writes = sum(1 for s in samples_run if s['method'] in WRITE_METHODS)
+        return {
+            'scenario': self.scenario.name,
+            'base_url': self.base_url,
+            'users': self.users,
+            'elapsed_s': elapsed,
+            'total_requests': total,
+            'failed': sum(1 for s in samples_run if not s['success']),
+            'rps': total / elapsed,
+            'write_ratio': writes / total if total else 0.0,
+            'expected_write_ratio': self.scenario.write_ratio(),
+            'setup': {
+                'requests': len(setup),
+                'failed': sum(1 for s in setup if not s['success']),
+                'writes': sum(1 for s in setup if s['method'] in WRITE_METHODS)
+            },
+            'setup_failed_users': len(self.setup_failed),
+            'journeys': count_by(samples_run, 'journey'),
+            'endpoints': endpoints,
+            'setup_cache': self.cache.summary() if self.cache else None,
+            'client_overhead': self.overhead.summary(total, percentile(latencies, 50) or None)
+            if self.overhead else None,
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def count_by(samples, key):
+    counts = {}
+    for sample in samples:
+        counts[sample[key]] = counts.get(sample[key], 0) + 1
+    return counts
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 LOAD TEST SUMMARY - {summary['scenario']}")
+    print(f"{'='*80}")
+    print(f"👥 Users: {summary['users']}   ⏱️  Elapsed: {summary['elapsed_s']:.1f}s")
+    print(f"📨 Requests: {summary['total_requests']} ({summary['rps']:.1f} req/s), failed: {summary['failed']}")
+    print(f"🔧 Setup: {summary['setup']['requests']} requests ({summary['setup']['writes']} writes), "
+          f"failed: {summary['setup']['failed']} - not counted above")
+    if summary['setup_failed_users']:
+        print(f"⚠️  {summary['setup_failed_users']} of {summary['users']} users failed setup and ran no journeys")
+    print(f"✍️  Write ratio: {summary['write_ratio']*100:.1f}% "
+          f"(scenario mix: {summary['expected_write_ratio']*100:.1f}%)")
+    print(f"\n{'step':<28}{'count':>7}{'err%':>7}{'rps':>8}{'p50':>9}{'p90':>9}{'p99':>9}")
+    for row in summary['endpoints']:
+        print(f"{row['test'][:27]:<28}{row['count']:>7}{row['error_rate']:>7.1f}{row['rps']:>8.2f}"
+              f"{row['p50_ms']:>9.0f}{row['p90_ms']:>9.0f}{row['p99_ms']:>9.0f}")
+    if summary.get('client_overhead'):
+        print()
+        print_overhead(summary['client_overhead'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a weighted scenario mix against the API')
+    parser.add_argument('scenario', help='Path to a .toml/.yaml scenario file')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to run (ignored with --iterations)')
+    parser.add_argument('--iterations', type=int, help='Journeys per virtual user')
+    parser.add_argument('--ramp-up', type=float, default=0, help='Seconds over which to start users')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--setup-cache', action='store_true', help='Serve setup GETs from the shared setup cache')
+    parser.add_argument('--profile', action='store_true', help='Sample the harness itself with a profiler')
+    parser.add_argument('--output', default='load_results.json')
+    args = parser.parse_args(argv)
+    if args.setup_cache:
+        enable_setup_cache()
+    if args.profile:
+        enable_profiling()
+
+    try:
+        scenario = load_scenario(args.scenario)
+    except ScenarioError as e:
+        print(f"❌ {e}")
+        return 2
+
+    print(f"🚀 Starting load run: {scenario.name}")
+    print(f"📍 Base URL: {args.base_url}")
+    print(f"⏰ Test started at: {datetime.now().isoformat()}")
+
+    runner = LoadRunner(scenario, base_url=args.base_url, users=args.users,
+                        duration=None if args.iterations else args.duration,
+                        iterations=args.iterations, ramp_up=args.ramp_up,
+                        seed=args.seed, timeout=args.timeout)
+    summary = runner.run()
+    print_summary(summary)
+    print_cache_summary(runner.cache)
+
+    payload = {'summary': summary, 'samples': runner.samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Samples written to {args.output}")
+    if args.profile:
+        print(f"🔬 Folded stacks written to {runner.overhead.write_profile()}")
+    record_run(payload, f"load:{scenario.name}")
+
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+AI Cache Check - cache-hit-ratio scenario for persona and strategy generation
+Creates `--distinct` input sets (segment + culture + economic profile, from harness.synth)
+and sends `--requests` POST /personas/generate calls over them: every set once first
+(cold), then random repeats (warm). Each generated persona then gets its positioning,
+messaging and pricing strategies generated, so strategies see the same repeat pattern.
+
+With the app started with AI_CACHE=true, warm requests should return in milliseconds
+instead of waiting on the model (1000 ms per persona, 1500 ms per strategy when
+simulated). The report compares cold vs warm latency per endpoint and checks that the
+share of fast responses matches the expected hit ratio, 1 - distinct / requests.
+
+    AI_CACHE=true yarn dev
+    python -m harness.memo_check --distinct 5 --requests 40
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import datetime
+
+import requests
+
+from harness.core import BASE_URL, DEMO_MODE, DEMO_PARAMS, percentile, provision_inputs, record_request
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+
+STRATEGY_TYPES = ('positioning', 'messaging', 'pricing')
+# A warm request counts as a cache hit when it is this much faster than the cold median
+HIT_FACTOR = 0.25
+MIN_SPEEDUP = 5.0
+
+
+class MemoCheck:
+    def __init__(self, base_url=BASE_URL, distinct=5, requests_total=40, seed=None, timeout=60):
+        self.base_url = base_url.rstrip('/')
+        self.distinct = distinct
+        self.requests_total = max(requests_total, distinct)
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.timeout = timeout
+        self.params = DEMO_PARAMS if DEMO_MODE else {}
+        self.session = requests.Session()
+        self.samples = []
+        self.segment_ids = []
+
+    def request(self, test, method, path, body=None, **fields):
+        response, sample = record_request(self.session, self.base_url, test, method, path, self.samples, body=body,
+                                          params=self.params, timeout=self.timeout, **fields)
+        return response.json() if sample['success'] else None
+
+    def provision(self):
+        """Create the distinct input sets; returns generate bodies, or [] when setup failed"""
+        _, inputs = provision_inputs(self.session, self.base_url, self.samples, self.seed, count=self.distinct,
+                                     params=self.params, timeout=self.timeout, workspace_name='AI Cache Check')
+        self.segment_ids = [body['segmentId'] for body in inputs]
+        return inputs
+
+    def run(self):
+        inputs = self.provision()
+        if not inputs:
+            return None
+        order = list(range(len(inputs))) + [self.rng.randrange(len(inputs))
+                                            for _ in range(self.requests_total - len(inputs))]
+        seen = set()
+        for index in order:
+            expected = 'warm' if index in seen else 'cold'
+            seen.add(index)
+            payload = self.request('generate_persona', 'POST', '/personas/generate', inputs[index],
+                                   expected=expected, input_set=index)
+            if not payload:
+                continue
+            persona_id = payload['persona']['id']
+            for strategy_type in STRATEGY_TYPES:
+                self.request(f"generate_{strategy_type}", 'POST',
+                             f"/personas/{persona_id}/strategies/{strategy_type}/generate",
+                             expected=expected, input_set=index)
+        return self.summary()
+
+    def cleanup(self):
+        for segment_id in self.segment_ids:
+            self.request('cleanup', 'DELETE', f"/segments/{segment_id}")
+
+    def summary(self):
+        endpoints = []
+        for test in ['generate_persona'] + [f"generate_{t}" for t in STRATEGY_TYPES]:
+            samples = [s for s in self.samples if s['test'] == test and s['success']]
+            cold = sorted(s['latency_ms'] for s in samples if s['expected'] == 'cold')
+            warm = sorted(s['latency_ms'] for s in samples if s['expected'] == 'warm')
+            cold_p50, warm_p50 = percentile(cold, 50), percentile(warm, 50)
+            threshold = cold_p50 * HIT_FACTOR
+            hits = sum(1 for s in samples if s['latency_ms'] < threshold)
+            expected_ratio = len(warm) / len(samples) if samples else 0.0
+            hit_ratio = hits / len(samples) if samples else 0.0
+            speedup = cold_p50 / warm_p50 if warm_p50 else None
+            endpoints.append({
+                'test': test,
+                'count': len(samples),
+                'cold': len(cold),
+                'warm': len(warm),
+                'cold_p50_ms': cold_p50,
+                'warm_p50_ms': warm_p50,
+                'warm_p95_ms': percentile(warm, 95),
+                'speedup': speedup,
+                'expected_hit_ratio': expected_ratio,
+                'hit_ratio': hit_ratio,
+                'passed': bool(warm) and speedup is not None and speedup >= MIN_SPEEDUP
+                and hit_ratio >= expected_ratio * 0.9
+            })
+        return {
+            'distinct': self.distinct,
+            'requests': self.requests_total,
+            'total_requests': len(self.samples),
+            'failed': sum(1 for s in self.samples if not s['success']),
+            'endpoints': endpoints,
+            'passed': bool(endpoints) and all(e['passed'] for e in endpoints),
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 AI CACHE CHECK - {summary['distinct']} distinct inputs, {summary['requests']} generations")
+    print(f"{'='*80}")
+    print(f"{'endpoint':<24}{'cold':>6}{'warm':>6}{'cold p50':>10}{'warm p50':>10}{'warm p95':>10}"
+          f"{'speedup':>9}{'hits':>7}{'expected':>10}")
+    for row in summary['endpoints']:
+        speedup = f"{row['speedup']:.0f}x" if row['speedup'] else "n/a"
+        print(f"{row['test']:<24}{row['cold']:>6}{row['warm']:>6}{row['cold_p50_ms']:>10.0f}{row['warm_p50_ms']:>10.0f}"
+              f"{row['warm_p95_ms']:>10.0f}{speedup:>9}{row['hit_ratio'] * 100:>6.0f}%"
+              f"{row['expected_hit_ratio'] * 100:>9.0f}% {'✅' if row['passed'] else '❌'}")
+    if summary['passed']:
+        print(f"\n✅ Repeated generation is served from the cache")
+    else:
+        print(f"\n⚠️  Warm requests are not {MIN_SPEEDUP:.0f}x faster - is the app running with AI_CACHE=true?")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check that repeated generation hits the AI output cache')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--distinct', type=int, default=5, help='Distinct input sets')
+    parser.add_argument('--requests', type=int, default=40, help='Persona generations in total')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--keep', action='store_true', help='Keep the created segments')
+    parser.add_argument('--output', default='memo_check_results.json')
+    args = parser.parse_args(argv)
+
+    check = MemoCheck(args.base_url, args.distinct, args.requests, args.seed, args.timeout)
+    print(f"🚀 AI cache check: {args.distinct} distinct inputs, {check.requests_total} generations")
+    print(f"📍 Base URL: {check.base_url}")
+    monitor = OverheadMonitor().start()
+    summary = check.run()
+    if summary is None:
+        print("❌ Could not create any input sets")
+        return 2
+    summary['client_overhead'] = finish(monitor, check.samples)
+    if not args.keep:
+        check.cleanup()
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': check.samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'memo_check')
+    return 0 if summary['passed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Mock LLM Server - local stand-in for the Emergent LLM endpoint
+Speaks the OpenAI-style /v1/chat/completions shape used by lib/llm-client.js, with
+configurable latency distributions, token-throughput simulation and failure injection.
+
+Point the app at it with EMERGENT_LLM_BASE_URL=http://127.0.0.1:<port> so persona and
+strategy timings can be benchmarked offline and repeatably.
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Named presets for common benchmarking conditions
+PROFILES = {
+    'instant': {'latency': 'fixed:0', 'tokens_per_second': 0},
+    'fast': {'latency': 'lognormal:200:0.25', 'tokens_per_second': 200},
+    'realistic': {'latency': 'lognormal:800:0.4', 'tokens_per_second': 60},
+    'slow': {'latency': 'lognormal:2500:0.5', 'tokens_per_second': 20},
+    'flaky': {'latency': 'lognormal:800:0.4', 'tokens_per_second': 60,
+              'error_rate': 0.05, 'timeout_rate': 0.02, 'reset_rate': 0.02},
+}
+
+WORDS = ('value', 'growth', 'trust', 'price', 'clarity', 'community', 'savings', 'quality',
+         'support', 'simple', 'local', 'digital', 'family', 'secure', 'flexible', 'proven')
+
+
+class LatencyDistribution:
+    """Samples latencies in milliseconds from a spec such as 'lognormal:800:0.4'
+
+    Supported specs:
+        fixed:<ms>
+        uniform:<min_ms>:<max_ms>
+        normal:<mean_ms>:<stddev_ms>
+        lognormal:<median_ms>:<sigma>
+        exponential:<mean_ms>
+    """
+
+    KINDS = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2, 'exponential': 1}
+
+    def __init__(self, spec):
+        parts = str(spec).split(':')
+        self.kind = parts[0]
+        if self.kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution: {self.kind}")
+        if len(parts) - 1 != self.KINDS[self.kind]:
+            raise ValueError(f"Latency spec '{spec}' needs {self.KINDS[self.kind]} parameter(s)")
+        self.params = [float(p) for p in parts[1:]]
+        self.spec = spec
+
+    def sample(self, rng):
+        """Draw one latency in milliseconds (never negative)"""
+        if self.kind == 'fixed':
+            value = self.params[0]
+        elif self.kind == 'uniform':
+            value = rng.uniform(*self.params)
+        elif self.kind == 'normal':
+            value = rng.gauss(*self.params)
+        elif self.kind == 'lognormal':
+            median, sigma = self.params
+            value = rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        else:
+            mean = self.params[0]
+            value = rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        return max(0.0, value)
+
+
+class MockLLMConfig:
+    """Behaviour knobs for the mock server"""
+
+    def __init__(self, latency='lognormal:800:0.4', tokens_per_second=60, completion_tokens=256,
+                 error_rate=0.0, error_statuses=(500, 503, 429), timeout_rate=0.0, hang_seconds=120,
+                 reset_rate=0.0, seed=None):
+        self.latency = latency if isinstance(latency, LatencyDistribution) else LatencyDistribution(latency)
+        self.tokens_per_second = float(tokens_per_second)
+        self.completion_tokens = int(completion_tokens)
+        self.error_rate = float(error_rate)
+        self.error_statuses = tuple(int(s) for s in error_statuses)
+        self.timeout_rate = float(timeout_rate)
+        self.hang_seconds = float(hang_seconds)
+        self.reset_rate = float(reset_rate)
+        self.seed = seed
+
+    @classmethod
+    def from_profile(cls, name, **overrides):
+        """Build a config from one of PROFILES, with keyword overrides"""
+        if name not in PROFILES:
+            raise ValueError(f"Unknown profile: {name} (choose from {', '.join(PROFILES)})")
+        options = dict(PROFILES[name])
+        options.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**options)
+
+    def to_dict(self):
+        return {
+            'latency': self.latency.spec,
+            'tokens_per_second': self.tokens_per_second,
+            'completion_tokens': self.completion_tokens,
+            'error_rate': self.error_rate,
+            'error_statuses': list(self.error_statuses),
+            'timeout_rate': self.timeout_rate,
+            'reset_rate': self.reset_rate,
+            'seed': self.seed
+        }
+
+
+class MockLLMServer:
+    """Threaded HTTP server implementing the mock completion endpoint
+
+    Usage from a harness:
+
+        with MockLLMServer(MockLLMConfig.from_profile('realistic', seed=42)) as llm:
+            print(llm.base_url)  # export as EMERGENT_LLM_BASE_URL for the app
+    """
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        self.config = config or MockLLMConfig()
+        self.rng = random.Random(self.config.seed)
+        self.rng_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'completed': 0, 'errors': 0, 'timeouts': 0, 'resets': 0,
+                      'completion_tokens': 0, 'total_delay_ms': 0.0}
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread and return the base URL"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def record(self, **increments):
+        with self.stats_lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    def snapshot(self):
+        with self.stats_lock:
+            return dict(self.stats)
+
+    def plan(self, requested_tokens):
+        """Decide outcome, time-to-first-token and token count for one request"""
+        config = self.config
+        with self.rng_lock:
+            roll = self.rng.random()
+            first_token_ms = config.latency.sample(self.rng)
+            status = self.rng.choice(config.error_statuses) if config.error_statuses else 500
+
+        if roll < config.reset_rate:
+            outcome = 'reset'
+        elif roll < config.reset_rate + config.timeout_rate:
+            outcome = 'timeout'
+        elif roll < config.reset_rate + config.timeout_rate + config.error_rate:
+            outcome = 'error'
+        else:
+            outcome = 'ok'
+
+        tokens = int(requested_tokens or config.completion_tokens)
+        return outcome, status, first_token_ms, tokens
+
+    def generation_ms(self, tokens):
+        if self.config.tokens_per_second <= 0:
+            return 0.0
+        return tokens / self.config.tokens_per_second * 1000
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_json(self, status, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == '/health':
+                    self.send_json(200, {'status': 'ok'})
+                elif self.path == '/stats':
+                    self.send_json(200, {'stats': server.snapshot(), 'config': server.config.to_dict()})
+                elif self.path == '/v1/models':
+                    self.send_json(200, {'object': 'list', 'data': [{'id': 'mock-llm', 'object': 'model'}]})
+                else:
+                    self.send_json(404, {'error': 'Not found'})
+
+            def do_POST(self):
+                if self.path.rstrip('/') != '/v1/chat/completions':
+                    self.send_json(404, {'error': 'Not found'})
+                    return
+
+                length = int(self.headers.get('Content-Length') or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    self.send_json(400, {'error': {'message': 'Invalid JSON body'}})
+                    return
+
+                server.record(requests=1)
+                outcome, status, first_token_ms, tokens = server.plan(body.get('max_tokens'))
+
+                if outcome == 'reset':
+                    server.record(resets=1)
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+                if outcome == 'timeout':
+                    server.record(timeouts=1)
+                    time.sleep(server.config.hang_seconds)
+                    self.close_connection = True
+                    return
+
+                time.sleep(first_token_ms / 1000)
+                if outcome == 'error':
+                    server.record(errors=1, total_delay_ms=first_token_ms)
+                    self.send_json(status, {'error': {'message': 'Injected failure', 'code': status}})
+                    return
+
+                prompt_tokens = sum(len(str(m.get('content', '')).split()) for m in body.get('messages', []))
+                model = body.get('model', 'mock-llm')
+                if body.get('stream'):
+                    self.stream_completion(model, tokens)
+                else:
+                    time.sleep(server.generation_ms(tokens) / 1000)
+                    self.send_json(200, self.completion_payload(model, prompt_tokens, tokens))
+                server.record(completed=1, completion_tokens=tokens,
+                              total_delay_ms=first_token_ms + server.generation_ms(tokens))
+
+            def completion_payload(self, model, prompt_tokens, tokens):
+                return {
+                    'id': f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': model,
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': fake_text(tokens)},
+                        'finish_reason': 'stop'
+                    }],
+                    'usage': {
+                        'prompt_tokens': prompt_tokens,
+                        'completion_tokens': tokens,
+                        'total_tokens': prompt_tokens + tokens
+                    }
+                }
+
+            def stream_completion(self, model, tokens):
+                """Emit SSE chunks paced at the configured tokens/second"""
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.close_connection = True
+                self.end_headers()
+
+                completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+                per_token = server.generation_ms(1) / 1000
+                for i in range(tokens):
+                    chunk = {
+                        'id': completion_id,
+                        'object': 'chat.completion.chunk',
+                        'created': int(time.time()),
+                        'model': model,
+                        'choices': [{'index': 0, 'delta': {'content': WORDS[i % len(WORDS)] + ' '},
+                                     'finish_reason': 'stop' if i == tokens - 1 else None}]
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+                    if per_token:
+                        time.sleep(per_token)
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def fake_text(tokens):
+    """Deterministic filler text of roughly `tokens` words"""
+    return ' '.join(WORDS[i % len(WORDS)] for i in range(tokens))
+
+
+def build_config(args):
+    overrides = {
+        'latency': args.latency,
+        'tokens_per_second': args.tokens_per_second,
+        'completion_tokens': args.completion_tokens,
+        'error_rate': args.error_rate,
+        'error_statuses': [int(s) for s in args.error_statuses.split(',')] if args.error_statuses else None,
+        'timeout_rate': args.timeout_rate,
+        'hang_seconds': args.hang_seconds,
+        'reset_rate': args.reset_rate,
+        'seed': args.seed
+    }
+    return MockLLMConfig.from_profile(args.profile, **overrides)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local mock of the Emergent LLM completion endpoint')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--profile', default='realistic', choices=sorted(PROFILES))
+    parser.add_argument('--latency', help="Time-to-first-token distribution, e.g. 'lognormal:800:0.4'")
+    parser.add_argument('--tokens-per-second', type=float)
+    parser.add_argument('--completion-tokens', type=int)
+    parser.add_argument('--error-rate', type=float)
+    parser.add_argument('--error-statuses', help='Comma-separated HTTP statuses for injected errors')
+    parser.add_argument('--timeout-rate', type=float)
+    parser.add_argument('--hang-seconds', type=float)
+    parser.add_argument('--reset-rate', type=float)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer(build_config(args), host=args.host, port=args.port)
+    print(f"🤖 Mock LLM listening on {server.base_url}")
+    print(f"⚙️  Config: {json.dumps(server.config.to_dict())}")
+    print(f"👉 Start the app with EMERGENT_LLM_BASE_URL={server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"📊 Stats: {json.dumps(server.snapshot())}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+Client overhead - how much of a run the harness itself costs
+Measures the harness process while it drives requests: CPU time per request, scheduler
+lag (how late a thread that asked to wake up actually runs, which is what every worker
+thread and the chaos proxy's event loop pay before they can read a response), and
+garbage collector pauses. A run is flagged as client-saturated when those numbers are
+large enough that the server latencies it reports are inflated by the client.
+
+With HARNESS_PROFILE=1 (or --profile) a sampling profiler also records the stacks of
+all harness threads; the top functions go into the summary and folded stacks into
+HARNESS_PROFILE_OUT (harness_profile.folded) for flamegraph tools.
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from harness.core import percentile
+
+# Saturation thresholds
+CPU_UTIL_LIMIT = 0.7      # share of one core; the GIL keeps the harness on roughly one
+LAG_P99_LIMIT_MS = 20.0
+GC_SHARE_LIMIT = 0.02
+LAG_LATENCY_SHARE = 0.1   # lag p99 as a share of median request latency
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def profiling_enabled():
+    return os.environ.get('HARNESS_PROFILE', '').lower() in ('1', 'true', 'yes')
+
+
+def enable_profiling():
+    """Turn the sampling profiler on for monitors created from now on (what --profile does)"""
+    os.environ['HARNESS_PROFILE'] = '1'
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval and counts folded stacks"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='harness-profiler', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def top(self, n=15):
+        """Functions by self samples (leaf of the stack) and total samples (anywhere on it)"""
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for name in set(frames):
+                total[name] += count
+        all_samples = sum(self.stacks.values()) or 1
+        return [{'function': name, 'self_pct': count / all_samples * 100,
+                 'total_pct': total[name] / all_samples * 100}
+                for name, count in own.most_common(n)]
+
+    def write_folded(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class OverheadMonitor:
+    """CPU, scheduler lag and GC pauses of this process between start() and stop()"""
+
+    def __init__(self, lag_interval=0.02, profile=None):
+        self.lag_interval = lag_interval
+        self.profiler = SamplingProfiler() if (profiling_enabled() if profile is None else profile) else None
+        self.lags = []
+        self.gc_pauses = []
+        self._gc_started = None
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.wall_start = self.cpu_start = None
+        self.wall_end = self.cpu_end = None
+
+    def start(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        gc.callbacks.append(self._on_gc)
+        self.thread = threading.Thread(target=self._tick, name='harness-overhead', daemon=True)
+        self.thread.start()
+        if self.profiler:
+            self.profiler.start()
+        return self
+
+    def stop(self):
+        if self.wall_end is not None:
+            return self
+        self.wall_end = time.perf_counter()
+        self.cpu_end = time.process_time()
+        self.stop_event.set()
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self.profiler:
+            self.profiler.stop()
+        return self
+
+    def _tick(self):
+        interval = self.lag_interval
+        while True:
+            start = time.perf_counter()
+            if self.stop_event.wait(interval):
+                return
+            self.lags.append(max(0.0, time.perf_counter() - start - interval) * 1000)
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_started = time.perf_counter()
+        elif self._gc_started is not None:
+            self.gc_pauses.append((time.perf_counter() - self._gc_started) * 1000)
+            self._gc_started = None
+
+    def summary(self, requests, median_latency_ms=None):
+        """Overhead over the monitored window (so far, if still running)"""
+        wall = max((self.wall_end or time.perf_counter()) - self.wall_start, 1e-9)
+        cpu = (self.cpu_end or time.process_time()) - self.cpu_start
+        lags = sorted(self.lags)
+        pauses = list(self.gc_pauses)
+        cpu_ms_per_request = cpu * 1000 / requests if requests else None
+        stats = {
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'cpu_util': cpu / wall,
+            'requests': requests,
+            'cpu_ms_per_request': cpu_ms_per_request,
+            # Requests/s one core could drive at this per-request cost
+            'client_rps_ceiling': 1000 / cpu_ms_per_request if cpu_ms_per_request else None,
+            'lag_p50_ms': percentile(lags, 50),
+            'lag_p99_ms': percentile(lags, 99),
+            'lag_max_ms': lags[-1] if lags else 0.0,
+            'gc_collections': len(pauses),
+            'gc_pause_ms': sum(pauses),
+            'gc_pause_max_ms': max(pauses, default=0.0),
+            'gc_share': sum(pauses) / 1000 / wall
+        }
+        stats['warnings'] = saturation_warnings(stats, median_latency_ms)
+        stats['saturated'] = bool(stats['warnings'])
+        if self.profiler:
+            stats['profile'] = {'samples': self.profiler.samples, 'top': self.profiler.top()}
+        return stats
+
+    def write_profile(self, path=None):
+        """Write folded stacks; returns the path, or None without a profiler"""
+        if not self.profiler:
+            return None
+        path = path or os.environ.get('HARNESS_PROFILE_OUT', 'harness_profile.folded')
+        self.profiler.write_folded(path)
+        return path
+
+
+def saturation_warnings(stats, median_latency_ms=None):
+    warnings = []
+    if stats['cpu_util'] >= CPU_UTIL_LIMIT:
+        warnings.append(f"client CPU at {stats['cpu_util'] * 100:.0f}% of one core")
+    if stats['lag_p99_ms'] >= LAG_P99_LIMIT_MS:
+        warnings.append(f"scheduler lag p99 {stats['lag_p99_ms']:.0f} ms")
+    if stats['gc_share'] >= GC_SHARE_LIMIT:
+        warnings.append(f"GC pauses take {stats['gc_share'] * 100:.1f}% of the run")
+    if median_latency_ms and stats['lag_p99_ms'] >= median_latency_ms * LAG_LATENCY_SHARE:
+        warnings.append(f"lag p99 is {stats['lag_p99_ms'] / median_latency_ms * 100:.0f}% of median latency")
+    return warnings
+
+
+def finish(monitor, samples):
+    """Stop `monitor` and summarize it against a run's samples"""
+    latencies = sorted(s['latency_ms'] for s in samples if s.get('latency_ms') is not None)
+    return monitor.stop().summary(len(samples), percentile(latencies, 50) or None)
+
+
+def process_monitor():
+    """The process-wide monitor shared by HarnessTester instances, started on first use"""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = OverheadMonitor().start()
+    return _shared
+
+
+def print_overhead(stats):
+    if stats is None:
+        return
+    per_request = f"{stats['cpu_ms_per_request']:.2f} ms CPU/request" if stats['cpu_ms_per_request'] is not None \
+        else "no requests"
+    print(f"🖥️  Client: {per_request}, {stats['cpu_util'] * 100:.0f}% CPU, "
+          f"lag p50/p99 {stats['lag_p50_ms']:.1f}/{stats['lag_p99_ms']:.1f} ms, "
+          f"GC {stats['gc_collections']} pauses ({stats['gc_pause_ms']:.0f} ms, max {stats['gc_pause_max_ms']:.1f} ms)")
+    if stats['saturated']:
+        print(f"⚠️  Client saturation distorts these latencies: {'; '.join(stats['warnings'])}")
+    profile = stats.get('profile')
+    if profile:
+        print(f"🔬 Profile ({profile['samples']} samples) - top functions by self time:")
+        for row in profile['top'][:8]:
+            print(f"   {row['self_pct']:5.1f}%  {row['total_pct']:5.1f}%  {row['function']}")
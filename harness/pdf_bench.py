@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+PDF Export Benchmark
+Posts realistic persona/strategy bodies to the pdfmake-backed routes
+(POST /api/pricing-strategy/export and POST /api/personas/export-analysis) concurrently,
+measuring generation latency, PDF size and bytes/sec. Meanwhile probe clients call
+GET /workspaces, first alone (baseline) and then alongside the exports, to show how much
+PDF rendering on the Node event loop delays unrelated requests.
+
+When the Next.js server runs on this machine, pass --server-pid to also sample its RSS
+and see how much memory buffering whole documents through getBuffer costs.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from harness.core import BASE_URL, DEMO_MODE, percentile, process_rss
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+
+PDF_ROUTES = {
+    'pricing_strategy_pdf': '/pricing-strategy/export',
+    'persona_analysis_pdf': '/personas/export-analysis',
+}
+
+NAMES = ['The Pragmatist (SME Owner)', 'The Optimizer (Manager)', 'The Builder (Gig Worker)',
+         'The Connector (Student)', 'The Collaborator (Self Employed)']
+CUES = ['Prefers WhatsApp for quick updates', 'Responds to direct, fact-based messaging',
+        'Weekend purchase decisions with family input', 'Trusts peer testimonials over ads',
+        'Mobile-first, low-bandwidth friendly flows', 'Values transparent, itemised pricing',
+        'UPI preferred for small payments', 'EMI options matter above ₹10,000',
+        'Compares three alternatives before buying', 'Festival-season offers drive trials']
+PILLARS = ['Clear, actionable insights when you need them most',
+           'Simple, transparent solutions without hidden costs',
+           'Maximum impact with minimum effort and cost',
+           'Built for how Indian small businesses actually work']
+TACTICS = ['Anchor with the annual plan', 'Charm pricing at ₹999', 'Decoy mid tier',
+           'Free onboarding call', 'Money-back guarantee for 30 days']
+
+
+def persona_body(rng, scale=1):
+    """A persona as the UI sends it, with list sections scaled by `scale`"""
+    return {
+        'name': rng.choice(NAMES),
+        'positioning': ('A self-employed professional who values streamlined operations in a growing '
+                        'market. Seeks good value for money and prefers direct communication.'),
+        'segmentName': 'Tech SMB Owners - High Price Sensitivity',
+        'createdAt': datetime.now().isoformat(),
+        'culturalCues': rng.sample(CUES, 5) * scale,
+        'economicCues': rng.sample(CUES, 4) * scale,
+        'messagingPillars': PILLARS * scale,
+        'generalizations': [f"Hypothesis {i + 1}: {cue}" for i, cue in enumerate(rng.sample(CUES, 3) * scale)]
+    }
+
+
+def strategy_body(rng, scale=1):
+    """A pricing strategy as rendered by generatePricingStrategyPDF"""
+    tiers = []
+    for i, (name, price) in enumerate([('Starter', '₹499/mo'), ('Growth', '₹1,499/mo'), ('Scale', '₹3,999/mo')]):
+        tiers.append({
+            'name': name,
+            'price': price,
+            'features': [f"{cue} ({name.lower()} tier)" for cue in rng.sample(CUES, 3 + i)] * scale
+        })
+    return {
+        'pricingModel': 'Tiered subscription with annual discount',
+        'anchorPrice': '₹3,999/mo',
+        'valueMetric': 'Active users per month',
+        'tiers': tiers,
+        'psychologicalTactics': TACTICS * scale,
+        'valueProposition': 'Cost-effective automation without compromise for price-sensitive SMBs.',
+        'competitivePositioning': 'Priced below premium suites, above DIY spreadsheets.',
+        'priceJustification': 'Pays for itself after saving four hours of manual work a month.',
+        'paymentOptions': ['UPI AutoPay', 'Credit/Debit card', 'No-cost EMI', 'Net banking'] * scale,
+        'upsellCrossSell': ['Add-on seats', 'Priority support', 'Annual plan upgrade'] * scale
+    }
+
+
+class PdfBenchmark:
+    def __init__(self, base_url=BASE_URL, pdf_clients=4, probe_clients=2, probe_interval=0.2,
+                 scale=1, seed=None, timeout=120, server_pid=None):
+        self.base_url = base_url.rstrip('/')
+        self.pdf_clients = pdf_clients
+        self.probe_clients = probe_clients
+        self.probe_interval = probe_interval
+        self.scale = scale
+        self.seed = seed
+        self.timeout = timeout
+        self.server_pid = server_pid
+        self.memory = []
+        self.params = {'demo': 'true'} if DEMO_MODE else {}
+        self.samples = []
+        self.lock = threading.Lock()
+
+    def record(self, sample):
+        with self.lock:
+            self.samples.append(sample)
+
+    def timed(self, session, phase, test, method, endpoint, body=None):
+        started_at = time.time()
+        start = time.perf_counter()
+        sample = {'test': test, 'phase': phase, 'method': method, 'endpoint': endpoint,
+                  'started_at': started_at, 'status': None, 'bytes': 0, 'success': False}
+        try:
+            response = session.request(method, f"{self.base_url}{endpoint}", params=self.params,
+                                       json=body, timeout=self.timeout)
+            sample['status'] = response.status_code
+            sample['bytes'] = len(response.content)
+            if endpoint in PDF_ROUTES.values():
+                sample['success'] = response.status_code == 200 and response.content[:5] == b'%PDF-'
+            else:
+                sample['success'] = response.status_code == 200
+        except requests.RequestException as e:
+            sample['message'] = f"Request failed: {e.__class__.__name__}"
+        sample['latency_ms'] = (time.perf_counter() - start) * 1000
+        self.record(sample)
+
+    def probe(self, phase, stop):
+        session = requests.Session()
+        while not stop.is_set():
+            self.timed(session, phase, 'workspaces_probe', 'GET', '/workspaces')
+            stop.wait(self.probe_interval)
+
+    def sample_memory(self, phase, stop):
+        while not stop.is_set():
+            rss = process_rss(self.server_pid)
+            if rss is not None:
+                self.memory.append({'phase': phase, 'at': time.time(), 'rss_bytes': rss})
+            stop.wait(0.25)
+
+    def export(self, index, stop):
+        session = requests.Session()
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        routes = list(PDF_ROUTES.items())
+        i = index
+        while not stop.is_set():
+            test, endpoint = routes[i % len(routes)]
+            persona = persona_body(rng, self.scale)
+            if test == 'pricing_strategy_pdf':
+                body = {'persona': persona, 'strategy': strategy_body(rng, self.scale)}
+            else:
+                body = {'persona': persona, 'product': 'Business productivity software'}
+            self.timed(session, 'loaded', test, 'POST', endpoint, body)
+            i += 1
+
+    def run_phase(self, phase, duration, with_exports):
+        stop = threading.Event()
+        threads = [threading.Thread(target=self.probe, args=(phase, stop), daemon=True)
+                   for _ in range(self.probe_clients)]
+        if with_exports:
+            threads += [threading.Thread(target=self.export, args=(i, stop), daemon=True)
+                        for i in range(self.pdf_clients)]
+        if self.server_pid:
+            threads.append(threading.Thread(target=self.sample_memory, args=(phase, stop), daemon=True))
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    def run(self, baseline_duration, loaded_duration):
+        print(f"⏱️  Baseline: {self.probe_clients} probe client(s) for {baseline_duration:.0f}s")
+        self.run_phase('baseline', baseline_duration, with_exports=False)
+        print(f"📄 Loaded: {self.pdf_clients} PDF client(s) + probes for {loaded_duration:.0f}s")
+        start = time.perf_counter()
+        self.run_phase('loaded', loaded_duration, with_exports=True)
+        return self.summary(time.perf_counter() - start)
+
+    def summary(self, loaded_wall):
+        pdf = {}
+        for test in PDF_ROUTES:
+            samples = [s for s in self.samples if s['test'] == test]
+            ok = [s for s in samples if s['success']]
+            latencies = sorted(s['latency_ms'] for s in ok)
+            total_bytes = sum(s['bytes'] for s in ok)
+            gen_seconds = sum(s['latency_ms'] for s in ok) / 1000
+            pdf[test] = {
+                'count': len(samples),
+                'failed': len(samples) - len(ok),
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'avg_pdf_bytes': total_bytes / len(ok) if ok else 0,
+                'bytes_per_sec_per_request': total_bytes / gen_seconds if gen_seconds else 0,
+                'bytes_per_sec_total': total_bytes / loaded_wall if loaded_wall else 0,
+                'pdfs_per_sec': len(ok) / loaded_wall if loaded_wall else 0
+            }
+
+        probes = {}
+        for phase in ('baseline', 'loaded'):
+            latencies = sorted(s['latency_ms'] for s in self.samples
+                               if s['test'] == 'workspaces_probe' and s['phase'] == phase and s['success'])
+            probes[phase] = {
+                'count': len(latencies),
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99)
+            }
+        memory = {}
+        for phase in ('baseline', 'loaded'):
+            rss = [m['rss_bytes'] for m in self.memory if m['phase'] == phase]
+            if rss:
+                memory[phase] = {'avg_rss_bytes': sum(rss) / len(rss), 'peak_rss_bytes': max(rss)}
+
+        base, loaded = probes['baseline']['p95_ms'], probes['loaded']['p95_ms']
+        return {
+            'pdf_routes': pdf,
+            'workspaces_probe': probes,
+            'server_memory': memory,
+            'probe_p95_inflation': loaded / base if base else None,
+            'total_requests': len(self.samples),
+            'failed': sum(1 for s in self.samples if not s['success']),
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 PDF EXPORT BENCHMARK SUMMARY")
+    print(f"{'='*80}")
+    print(f"{'route':<24}{'count':>7}{'fail':>6}{'p50 ms':>9}{'p95 ms':>9}{'avg KB':>9}{'KB/s':>9}{'PDF/s':>8}")
+    for test, row in summary['pdf_routes'].items():
+        print(f"{test:<24}{row['count']:>7}{row['failed']:>6}{row['p50_ms']:>9.0f}{row['p95_ms']:>9.0f}"
+              f"{row['avg_pdf_bytes'] / 1024:>9.1f}{row['bytes_per_sec_per_request'] / 1024:>9.1f}"
+              f"{row['pdfs_per_sec']:>8.2f}")
+    print(f"\n🔎 GET /workspaces while exporting:")
+    for phase, row in summary['workspaces_probe'].items():
+        print(f"   {phase:<9} n={row['count']:<5} p50 {row['p50_ms']:.0f} ms  p95 {row['p95_ms']:.0f} ms  "
+              f"p99 {row['p99_ms']:.0f} ms")
+    inflation = summary['probe_p95_inflation']
+    if inflation is not None:
+        marker = "⚠️ " if inflation > 2 else "✅"
+        print(f"{marker} p95 inflation under PDF load: {inflation:.2f}x")
+    memory = summary['server_memory']
+    if 'baseline' in memory and 'loaded' in memory:
+        growth = memory['loaded']['peak_rss_bytes'] - memory['baseline']['avg_rss_bytes']
+        print(f"🧠 Server RSS: baseline {memory['baseline']['avg_rss_bytes'] / 2**20:.0f} MB, "
+              f"peak under load {memory['loaded']['peak_rss_bytes'] / 2**20:.0f} MB (+{growth / 2**20:.0f} MB)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark pdfmake export routes and their impact on other requests')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--pdf-clients', type=int, default=4)
+    parser.add_argument('--probe-clients', type=int, default=2)
+    parser.add_argument('--probe-interval', type=float, default=0.2, help='Seconds between probe requests')
+    parser.add_argument('--baseline', type=float, default=15, help='Seconds of probe-only baseline')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds of concurrent PDF load')
+    parser.add_argument('--scale', type=int, default=1, help='Multiply list sections of the bodies')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--server-pid', type=int, help='Sample RSS of a local server process')
+    parser.add_argument('--output', default='pdf_bench_results.json')
+    args = parser.parse_args(argv)
+
+    bench = PdfBenchmark(args.base_url, args.pdf_clients, args.probe_clients, args.probe_interval,
+                         args.scale, args.seed, server_pid=args.server_pid)
+    print(f"🚀 PDF export benchmark")
+    print(f"📍 Base URL: {bench.base_url}")
+    monitor = OverheadMonitor().start()
+    summary = bench.run(args.baseline, args.duration)
+    summary['client_overhead'] = finish(monitor, bench.samples)
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': bench.samples, 'memory': bench.memory}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'pdf_bench')
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
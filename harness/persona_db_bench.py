@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Persona DB Bench - database portion of persona generation, sequential vs batched lookups
+POST /personas/generate loads the segment, culture profile and economic profile before
+generating. The batched loader fetches the segment with both profiles included (one
+query); ?loader=sequential runs the three lookups one after another, as before. This
+benchmark alternates the two on the same input sets and compares the X-DB-* headers
+the app returns with DB_STATS=true: queries, summed query time and DB wall time (time
+with at least one query in flight, which is what concurrency shortens).
+
+Run against a local database, ideally with an instant model so the runs stay short:
+
+    python -m harness.mock_llm --profile instant --port 8099 &
+    DB_STATS=true EMERGENT_LLM_BASE_URL=http://127.0.0.1:8099 yarn dev
+    python -m harness.persona_db_bench --iterations 20
+
+--cross pairs every segment with the profiles of another one, which the batched loader
+cannot take from the include and fetches concurrently instead.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+
+import requests
+
+from harness.core import BASE_URL, DEMO_MODE, DEMO_PARAMS, JSON_HEADERS, percentile, provision_inputs, record_request
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+from harness.write_amp import parse_ops
+
+LOADERS = ('sequential', 'batched')
+READ_OPERATIONS = {'findUnique', 'findUniqueOrThrow', 'findFirst', 'findFirstOrThrow', 'findMany', 'count',
+                   'aggregate', 'groupBy'}
+
+
+class PersonaDbBench:
+    def __init__(self, base_url=BASE_URL, iterations=20, distinct=3, cross=False, timeout=60, seed=None):
+        self.base_url = base_url.rstrip('/')
+        self.iterations = iterations
+        self.distinct = distinct
+        self.cross = cross
+        self.timeout = timeout
+        self.seed = seed
+        self.params = DEMO_PARAMS if DEMO_MODE else {}
+        self.session = requests.Session()
+        self.session.headers.update(JSON_HEADERS)
+        self.samples = []
+        self.segment_ids = []
+
+    def request(self, test, method, path, body=None, params=None, **fields):
+        response, sample = record_request(self.session, self.base_url, test, method, path, self.samples, body=body,
+                                          params={**self.params, **(params or {})}, timeout=self.timeout, **fields)
+        if response is None:
+            return None, sample
+        if 'X-DB-Queries' in response.headers:
+            ops = parse_ops(response.headers.get('X-DB-Ops'))
+            sample['db'] = {
+                'queries': int(response.headers['X-DB-Queries']),
+                'writes': int(response.headers.get('X-DB-Writes', 0)),
+                'time_ms': float(response.headers.get('X-DB-Time-Ms', 0)),
+                'wall_ms': float(response.headers.get('X-DB-Wall-Ms', response.headers.get('X-DB-Time-Ms', 0))),
+                'reads': {key: count for key, (count, _) in ops.items() if key.rsplit('.', 1)[-1] in READ_OPERATIONS}
+            }
+        return (response.json() if sample['success'] else None), sample
+
+    def provision(self):
+        """Create the input sets; returns generate bodies, or [] when setup failed"""
+        _, sets = provision_inputs(self.session, self.base_url, self.samples, self.seed, count=self.distinct,
+                                   params=self.params, timeout=self.timeout, workspace_name='Persona DB Bench')
+        self.segment_ids = [body['segmentId'] for body in sets]
+
+        if self.cross and len(sets) > 1:
+            # Segment i with the profiles created for segment i + 1
+            return [{**sets[(i + 1) % len(sets)], 'segmentId': sets[i]['segmentId']} for i in range(len(sets))]
+        return sets
+
+    def run(self):
+        bodies = self.provision()
+        if not bodies:
+            return None
+        for i in range(self.iterations):
+            body = bodies[i % len(bodies)]
+            # Alternate which loader goes first so drift affects both equally
+            order = LOADERS if i % 2 == 0 else tuple(reversed(LOADERS))
+            for loader in order:
+                params = {'loader': 'sequential'} if loader == 'sequential' else None
+                self.request('generate_persona', 'POST', '/personas/generate', body, params=params, loader=loader)
+        return self.summary()
+
+    def cleanup(self):
+        for segment_id in self.segment_ids:
+            self.request('cleanup', 'DELETE', f"/segments/{segment_id}")
+
+    def summary(self):
+        modes = {}
+        for loader in LOADERS:
+            samples = [s for s in self.samples if s.get('loader') == loader and s['success']]
+            measured = [s['db'] for s in samples if 'db' in s]
+            reads = {}
+            for db in measured:
+                for key, count in db['reads'].items():
+                    reads[key] = reads.get(key, 0) + count
+            modes[loader] = {
+                'requests': len(samples),
+                'instrumented': len(measured),
+                'queries_per_request': sum(db['queries'] for db in measured) / len(measured) if measured else None,
+                'reads_per_request': {key: count / len(measured) for key, count in reads.items()} if measured else {},
+                'db_time_p50_ms': percentile(sorted(db['time_ms'] for db in measured), 50),
+                'db_wall_p50_ms': percentile(sorted(db['wall_ms'] for db in measured), 50),
+                'db_wall_p95_ms': percentile(sorted(db['wall_ms'] for db in measured), 95),
+                'latency_p50_ms': percentile(sorted(s['latency_ms'] for s in samples), 50)
+            }
+        before, after = modes['sequential'], modes['batched']
+        instrumented = bool(before['instrumented'] and after['instrumented'])
+        return {
+            'iterations': self.iterations,
+            'input_sets': self.distinct,
+            'cross': self.cross,
+            'instrumented': instrumented,
+            'modes': modes,
+            'queries_saved': before['queries_per_request'] - after['queries_per_request'] if instrumented else None,
+            'db_wall_saved_ms': before['db_wall_p50_ms'] - after['db_wall_p50_ms'] if instrumented else None,
+            'failed': sum(1 for s in self.samples if not s['success']),
+            'total_requests': len(self.samples),
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 PERSONA DB BENCH - {summary['iterations']} iterations per loader"
+          f"{', cross-segment profiles' if summary['cross'] else ''}")
+    print(f"{'='*80}")
+    if not summary['instrumented']:
+        print("⚠️  No X-DB-* headers in the responses - start the app with DB_STATS=true")
+    print(f"{'loader':<12}{'requests':>9}{'queries':>9}{'db sum p50':>12}{'db wall p50':>13}{'db wall p95':>13}"
+          f"{'latency p50':>13}")
+    for loader, row in summary['modes'].items():
+        queries = f"{row['queries_per_request']:.1f}" if row['queries_per_request'] is not None else "-"
+        print(f"{loader:<12}{row['requests']:>9}{queries:>9}{row['db_time_p50_ms']:>12.1f}{row['db_wall_p50_ms']:>13.1f}"
+              f"{row['db_wall_p95_ms']:>13.1f}{row['latency_p50_ms']:>13.0f}")
+        if row['reads_per_request']:
+            print(f"{'':<12}reads: " + ", ".join(f"{key} {count:g}" for key, count in row['reads_per_request'].items()))
+    if summary['instrumented']:
+        print(f"\n📉 Batched loader: {summary['queries_saved']:.1f} fewer queries, "
+              f"{summary['db_wall_saved_ms']:.1f} ms less DB wall time per generation (p50)")
+    if summary['failed']:
+        print(f"❌ {summary['failed']} requests failed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare sequential and batched input lookups in persona generation')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--iterations', type=int, default=20, help='Generations per loader')
+    parser.add_argument('--distinct', type=int, default=3, help='Input sets to rotate through')
+    parser.add_argument('--cross', action='store_true', help="Pair segments with another segment's profiles")
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--keep', action='store_true', help='Keep the created segments')
+    parser.add_argument('--output', default='persona_db_bench_results.json')
+    args = parser.parse_args(argv)
+
+    bench = PersonaDbBench(args.base_url, args.iterations, args.distinct, args.cross, args.timeout, args.seed)
+    print(f"🚀 Persona DB bench: {args.iterations} generations per loader over {args.distinct} input sets")
+    print(f"📍 Base URL: {bench.base_url}")
+    monitor = OverheadMonitor().start()
+    summary = bench.run()
+    if summary is None:
+        print("❌ Could not create any input sets")
+        return 2
+    summary['client_overhead'] = finish(monitor, bench.samples)
+    if not args.keep:
+        bench.cleanup()
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': bench.samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'persona_db_bench')
+    return 0 if summary['instrumented'] and not summary['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
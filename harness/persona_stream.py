@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Persona Stream - perceived latency of streaming persona generation
+Calls POST /personas/generate?stream=sse (or ndjson) `--requests` times and times each
+event as the client receives it: time to first byte, time to first section (what a UI
+can start rendering), gaps between sections and time to the saved persona. With
+`--baseline` (the default) the same inputs are also generated through the plain JSON
+endpoint, whose full response time is what the UI waits for without streaming.
+
+    python -m harness.persona_stream --requests 10
+    python -m harness.persona_stream --format ndjson --no-baseline
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+
+import requests
+
+from harness.core import BASE_URL, DEMO_MODE, DEMO_PARAMS, JSON_HEADERS, percentile, provision_inputs, record_request
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+
+SECTIONS = ('name', 'positioning', 'cultural_cues', 'economic_cues', 'generalizations', 'pillars', 'export_snapshot')
+
+
+def iter_lines(response):
+    """Lines of a streamed response as soon as each one is complete
+
+    requests' iter_lines waits for a full chunk (or, with chunk_size=None on a response
+    without chunked encoding, for the whole body), which would hide the timing we are
+    measuring; read1() returns whatever has arrived.
+    """
+    buffer = b''
+    while True:
+        chunk = response.raw.read1(65536)
+        if not chunk:
+            break
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            yield line.rstrip(b'\r').decode('utf-8')
+    if buffer:
+        yield buffer.decode('utf-8')
+
+
+def iter_events(response, fmt):
+    """Yield (event, data) pairs from an SSE or NDJSON response as lines arrive"""
+    event, data = None, []
+    for line in iter_lines(response):
+        if fmt == 'ndjson':
+            if line:
+                payload = json.loads(line)
+                yield payload.pop('event', None), payload
+            continue
+        if line.startswith('event:'):
+            event = line[6:].strip()
+        elif line.startswith('data:'):
+            data.append(line[5:].strip())
+        elif not line and data:
+            yield event or 'message', json.loads('\n'.join(data))
+            event, data = None, []
+
+
+class PersonaStream:
+    def __init__(self, base_url=BASE_URL, requests_total=10, fmt='sse', baseline=True, timeout=60, seed=None):
+        self.base_url = base_url.rstrip('/')
+        self.requests_total = requests_total
+        self.fmt = fmt
+        self.baseline = baseline
+        self.timeout = timeout
+        self.seed = seed
+        self.params = DEMO_PARAMS if DEMO_MODE else {}
+        self.session = requests.Session()
+        self.session.headers.update(JSON_HEADERS)
+        self.samples = []
+        self.segment_id = None
+
+    def request(self, test, method, path, body=None):
+        response, sample = record_request(self.session, self.base_url, test, method, path, self.samples, body=body,
+                                          params=self.params, timeout=self.timeout)
+        return response.json() if sample['success'] else None
+
+    def provision(self):
+        """Create one set of generation inputs; returns the generate body, or None"""
+        _, inputs = provision_inputs(self.session, self.base_url, self.samples, self.seed, params=self.params,
+                                     timeout=self.timeout, workspace_name='Persona Stream')
+        if not inputs:
+            return None
+        self.segment_id = inputs[0]['segmentId']
+        return inputs[0]
+
+    def stream_once(self, body):
+        sample = {'test': 'generate_persona_stream', 'method': 'POST', 'endpoint': '/personas/generate',
+                  'started_at': time.time(), 'status': None, 'latency_ms': None, 'bytes': 0, 'success': False,
+                  'format': self.fmt, 'ttfb_ms': None, 'ttfs_ms': None, 'sections': {}, 'gaps_ms': []}
+        start = time.perf_counter()
+        try:
+            with self.session.post(f"{self.base_url}/personas/generate", params={**self.params, 'stream': self.fmt},
+                                   json=body, stream=True, timeout=self.timeout) as response:
+                sample['ttfb_ms'] = (time.perf_counter() - start) * 1000
+                sample['status'] = response.status_code
+                if response.status_code != 200:
+                    sample['bytes'] = len(response.content)
+                else:
+                    last = None
+                    for event, data in iter_events(response, self.fmt):
+                        now = (time.perf_counter() - start) * 1000
+                        if event == 'section':
+                            sample['sections'][data['section']] = now
+                            if last is None:
+                                sample['ttfs_ms'] = now
+                            else:
+                                sample['gaps_ms'].append(now - last)
+                            last = now
+                        elif event == 'persona':
+                            sample['success'] = True
+                        elif event == 'error':
+                            sample['message'] = data.get('error')
+                    sample['bytes'] = response.raw.tell()
+        except (requests.RequestException, ValueError) as e:
+            sample['message'] = f"Request failed: {e.__class__.__name__}"
+        sample['latency_ms'] = (time.perf_counter() - start) * 1000
+        self.samples.append(sample)
+        return sample
+
+    def run(self):
+        body = self.provision()
+        if body is None:
+            return None
+        for _ in range(self.requests_total):
+            self.stream_once(body)
+            if self.baseline:
+                self.request('generate_persona', 'POST', '/personas/generate', body)
+        return self.summary()
+
+    def cleanup(self):
+        if self.segment_id:
+            self.request('cleanup', 'DELETE', f"/segments/{self.segment_id}")
+
+    def summary(self):
+        streams = [s for s in self.samples if s['test'] == 'generate_persona_stream' and s['success']]
+        baseline = sorted(s['latency_ms'] for s in self.samples if s['test'] == 'generate_persona' and s['success'])
+
+        def stats(values):
+            values = sorted(values)
+            return {'p50': percentile(values, 50), 'p95': percentile(values, 95), 'max': values[-1] if values else 0.0}
+
+        ttfs = stats(s['ttfs_ms'] for s in streams if s['ttfs_ms'] is not None)
+        baseline_stats = stats(baseline) if baseline else None
+        return {
+            'format': self.fmt,
+            'requests': self.requests_total,
+            'streamed': len(streams),
+            'failed': sum(1 for s in self.samples if s['test'] == 'generate_persona_stream' and not s['success']),
+            'ttfb_ms': stats(s['ttfb_ms'] for s in streams),
+            'ttfs_ms': ttfs,
+            'gap_ms': stats(g for s in streams for g in s['gaps_ms']),
+            'stream_total_ms': stats(s['latency_ms'] for s in streams),
+            'sections_ms': {name: percentile(sorted(s['sections'][name] for s in streams if name in s['sections']), 50)
+                            for name in SECTIONS},
+            'baseline_ms': baseline_stats,
+            # How much sooner the UI has something to show than with the plain endpoint
+            'perceived_speedup': baseline_stats['p50'] / ttfs['p50'] if baseline_stats and ttfs['p50'] else None,
+            'total_requests': len(self.samples),
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 PERSONA STREAM - {summary['streamed']}/{summary['requests']} {summary['format'].upper()} streams")
+    print(f"{'='*80}")
+    print(f"{'':<26}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    rows = [('first byte', 'ttfb_ms'), ('first section', 'ttfs_ms'), ('between sections', 'gap_ms'),
+            ('stream complete', 'stream_total_ms'), ('non-streaming response', 'baseline_ms')]
+    for label, key in rows:
+        row = summary[key]
+        if row:
+            print(f"{label:<26}{row['p50']:>10.0f}{row['p95']:>10.0f}{row['max']:>10.0f}")
+    print(f"\n📋 Section arrival (p50): " +
+          ", ".join(f"{name} {ms:.0f}" for name, ms in summary['sections_ms'].items()))
+    if summary['perceived_speedup']:
+        print(f"⚡ First section arrives {summary['perceived_speedup']:.1f}x sooner than the full JSON response")
+    if summary['failed']:
+        print(f"❌ {summary['failed']} streams failed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure time to first section of streamed persona generation')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--requests', type=int, default=10)
+    parser.add_argument('--format', choices=('sse', 'ndjson'), default='sse')
+    parser.add_argument('--no-baseline', dest='baseline', action='store_false',
+                        help='Skip the non-streaming comparison requests')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--keep', action='store_true', help='Keep the created segment')
+    parser.add_argument('--output', default='persona_stream_results.json')
+    args = parser.parse_args(argv)
+
+    client = PersonaStream(args.base_url, args.requests, args.format, args.baseline, args.timeout, args.seed)
+    print(f"🚀 Persona stream: {args.requests} {args.format} generations")
+    print(f"📍 Base URL: {client.base_url}")
+    monitor = OverheadMonitor().start()
+    summary = client.run()
+    if summary is None:
+        print("❌ Could not create the generation inputs")
+        return 2
+    summary['client_overhead'] = finish(monitor, client.samples)
+    if not args.keep:
+        client.cleanup()
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': client.samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, f"persona_stream:{args.format}")
+    return 0 if not summary['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
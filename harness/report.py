@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+HTML Report - self-contained report from a run's per-request samples
+Reads results JSON files (any harness script or load run) or runs stored in the history
+database and writes one HTML file with no external assets: a latency-over-time heatmap
+per endpoint, percentile tables, a throughput curve, an error timeline and drill-downs
+of the slowest requests with the test name they were logged under.
+
+Aggregation is column-wise. With numpy installed every statistic is computed with a few
+vectorized passes (one sort for all percentiles, one bincount per chart), so millions of
+samples render in seconds; otherwise an equivalent pure-Python path is used.
+
+    python -m harness.report load_results.json -o report.html
+    python -m harness.report --run 42 --run 43          # from harness_history.db
+"""
+
+import argparse
+import bisect
+import html
+import json
+import math
+import os
+import sys
+from datetime import datetime
+
+from harness.core import percentile
+from harness.history import DB_PATH, connect, payload_samples
+
+PERCENTILES = (50, 90, 95, 99)
+ERROR_CLASSES = ('network', '4xx', '5xx')
+
+
+class Columns:
+    """Samples stored as parallel columns, with (endpoint, method) dictionary-encoded"""
+
+    def __init__(self):
+        self.groups = []
+        self.group_index = {}
+        self.sources = []
+        self.group = []
+        self.source = []
+        self.test = []
+        self.status = []
+        self.latency = []
+        self.bytes = []
+        self.ok = []
+        self.started_at = []
+        self.summaries = []
+
+    def __len__(self):
+        return len(self.group)
+
+    def add_source(self, name, rows):
+        """rows: iterables of (endpoint, method, test, status, latency_ms, bytes, success, started_at)"""
+        source = len(self.sources)
+        self.sources.append(name)
+        nan = float('nan')
+        for endpoint, method, test, status, latency, size, success, started_at in rows:
+            key = (endpoint or '?', method or '?')
+            code = self.group_index.get(key)
+            if code is None:
+                code = self.group_index[key] = len(self.groups)
+                self.groups.append(key)
+            self.group.append(code)
+            self.source.append(source)
+            self.test.append(test)
+            self.status.append(status or 0)
+            self.latency.append(nan if latency is None else latency)
+            self.bytes.append(size or 0)
+            self.ok.append(bool(success))
+            self.started_at.append(nan if started_at is None else started_at)
+
+
+def load_file(columns, path):
+    with open(path) as f:
+        payload = json.load(f)
+    columns.add_source(os.path.basename(path), (
+        (s.get('endpoint'), s.get('method'), s.get('test'), s.get('status'), s.get('latency_ms'),
+         s.get('bytes'), s.get('success'), s.get('started_at'))
+        for s in payload_samples(payload)))
+    columns.summaries.append((columns.sources[-1], payload.get('summary') or {}))
+
+
+def load_run(columns, conn, run_id):
+    run = conn.execute('SELECT source, summary FROM runs WHERE id = ?', (run_id,)).fetchone()
+    if run is None:
+        raise ValueError(f"No run #{run_id} in history")
+    cursor = conn.execute('SELECT endpoint, method, test, status, latency_ms, bytes, success, started_at '
+                          'FROM samples WHERE run_id = ?', (run_id,))
+    columns.add_source(f"#{run_id} {run['source']}", (tuple(row) for row in cursor))
+    columns.summaries.append((columns.sources[-1], json.loads(run['summary'] or '{}')))
+
+
+def error_class(status):
+    if not status:
+        return 0
+    return 2 if status >= 500 else 1
+
+
+def aggregate(columns, time_bins=60, latency_bins=24, top=25, backend='auto'):
+    """Everything the report shows, as plain lists/dicts"""
+    if backend in ('auto', 'numpy'):
+        try:
+            import numpy
+        except ImportError:
+            if backend == 'numpy':
+                raise
+        else:
+            return aggregate_numpy(numpy, columns, time_bins, latency_bins, top)
+    return aggregate_python(columns, time_bins, latency_bins, top)
+
+
+def time_axis(starts, time_bins):
+    finite = [t for t in starts if not math.isnan(t)]
+    if not finite:
+        return 0.0, 1.0, 1
+    t0, t1 = min(finite), max(finite)
+    bins = max(1, min(time_bins, int((t1 - t0) * 10) + 1))
+    return t0, max((t1 - t0) / bins, 1e-3), bins
+
+
+def latency_edges(latencies, latency_bins):
+    """Log-spaced bucket edges covering the observed latencies"""
+    finite = [v for v in latencies if not math.isnan(v)]
+    low = max(min((v for v in finite if v > 0), default=1.0), 0.1)
+    high = max(max(finite, default=1.0), low * 1.01)
+    step = (math.log(high) - math.log(low)) / latency_bins
+    return [math.exp(math.log(low) + i * step) for i in range(latency_bins)] + [high * 1.0001]
+
+
+def aggregate_numpy(np, columns, time_bins, latency_bins, top):
+    n_groups = len(columns.groups)
+    group = np.asarray(columns.group, dtype=np.int64)
+    status = np.asarray(columns.status, dtype=np.int64)
+    latency = np.asarray(columns.latency, dtype=float)
+    size = np.asarray(columns.bytes, dtype=float)
+    ok = np.asarray(columns.ok, dtype=bool)
+    starts = np.asarray(columns.started_at, dtype=float)
+
+    totals = np.bincount(group, minlength=n_groups)
+    valid = ~np.isnan(latency)
+    valid_idx = np.flatnonzero(valid)
+    order = valid_idx[np.lexsort((latency[valid], group[valid]))]
+    sorted_latency = latency[order]
+    counts = np.bincount(group[valid], minlength=n_groups)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    last = max(len(sorted_latency) - 1, 0)
+
+    def at_rank(rank):
+        if not len(sorted_latency):
+            return np.zeros(n_groups)
+        return np.where(counts > 0, sorted_latency[np.minimum(offsets + rank, last)], 0.0)
+
+    pcts = {p: at_rank(np.clip(np.round(p / 100 * counts).astype(np.int64) - 1, 0, np.maximum(counts - 1, 0)))
+            for p in PERCENTILES}
+    maxima = at_rank(np.maximum(counts - 1, 0))
+    sums = np.bincount(group[valid], weights=latency[valid], minlength=n_groups)
+    failures = np.bincount(group, weights=~ok, minlength=n_groups)
+    byte_sums = np.bincount(group, weights=size, minlength=n_groups)
+
+    table = []
+    for g, (endpoint, method) in enumerate(columns.groups):
+        table.append({
+            'endpoint': endpoint, 'method': method, 'count': int(totals[g]),
+            **{f"p{p}": float(pcts[p][g]) for p in PERCENTILES},
+            'max': float(maxima[g]),
+            'mean': float(sums[g] / counts[g]) if counts[g] else 0.0,
+            'error_rate': float(failures[g] / totals[g] * 100) if totals[g] else 0.0,
+            'bytes_avg': float(byte_sums[g] / totals[g]) if totals[g] else 0.0
+        })
+
+    t0, width, n_time = time_axis(columns.started_at, time_bins)
+    timed = ~np.isnan(starts)
+    bucket = np.zeros(len(group), dtype=np.int64)
+    bucket[timed] = np.clip(((starts[timed] - t0) / width).astype(np.int64), 0, n_time - 1)
+
+    edges = latency_edges(columns.latency, latency_bins)
+    cells = valid & timed
+    lat_bucket = np.clip(np.searchsorted(np.asarray(edges), latency[cells], side='right') - 1, 0, latency_bins - 1)
+    flat = (group[cells] * n_time + bucket[cells]) * latency_bins + lat_bucket
+    heat = np.bincount(flat, minlength=n_groups * n_time * latency_bins).reshape(n_groups, n_time, latency_bins)
+
+    throughput = np.bincount(bucket[timed], minlength=n_time) / width
+    failed = timed & ~ok
+    classes = np.where(status == 0, 0, np.where(status >= 500, 2, 1))
+    errors = {name: np.bincount(bucket[failed & (classes == i)], minlength=n_time).tolist()
+              for i, name in enumerate(ERROR_CLASSES)}
+
+    filled = np.where(valid, latency, -np.inf)
+    k = min(top, int(valid.sum()))
+    slowest = np.argpartition(-filled, k - 1)[:k] if k else np.array([], dtype=np.int64)
+    slowest = slowest[np.argsort(-filled[slowest])]
+    per_group = {g: order[offsets[g] + counts[g] - min(5, counts[g]):offsets[g] + counts[g]][::-1].tolist()
+                 for g in range(n_groups) if counts[g]}
+
+    return finish(columns, table, heat.tolist(), edges, t0, width, n_time, throughput.tolist(), errors,
+                  slowest.tolist(), per_group, failed_rows(columns, np.flatnonzero(~ok).tolist()), 'numpy')
+
+
+def aggregate_python(columns, time_bins, latency_bins, top):
+    n_groups = len(columns.groups)
+    by_group = [[] for _ in range(n_groups)]
+    for i, g in enumerate(columns.group):
+        by_group[g].append(i)
+
+    table = []
+    per_group = {}
+    for g, (endpoint, method) in enumerate(columns.groups):
+        members = by_group[g]
+        timed = sorted((columns.latency[i], i) for i in members if not math.isnan(columns.latency[i]))
+        values = [v for v, _ in timed]
+        table.append({
+            'endpoint': endpoint, 'method': method, 'count': len(members),
+            **{f"p{p}": percentile(values, p) for p in PERCENTILES},
+            'max': values[-1] if values else 0.0,
+            'mean': sum(values) / len(values) if values else 0.0,
+            'error_rate': sum(1 for i in members if not columns.ok[i]) / len(members) * 100 if members else 0.0,
+            'bytes_avg': sum(columns.bytes[i] for i in members) / len(members) if members else 0.0
+        })
+        if timed:
+            per_group[g] = [i for _, i in reversed(timed[-5:])]
+
+    t0, width, n_time = time_axis(columns.started_at, time_bins)
+    edges = latency_edges(columns.latency, latency_bins)
+    heat = [[[0] * latency_bins for _ in range(n_time)] for _ in range(n_groups)]
+    hits = [0] * n_time
+    errors = {name: [0] * n_time for name in ERROR_CLASSES}
+    for i, started in enumerate(columns.started_at):
+        if math.isnan(started):
+            continue
+        b = min(max(int((started - t0) / width), 0), n_time - 1)
+        hits[b] += 1
+        if not columns.ok[i]:
+            errors[ERROR_CLASSES[error_class(columns.status[i])]][b] += 1
+        latency = columns.latency[i]
+        if not math.isnan(latency):
+            lb = min(max(bisect.bisect_right(edges, latency) - 1, 0), latency_bins - 1)
+            heat[columns.group[i]][b][lb] += 1
+
+    ranked = sorted((i for i, v in enumerate(columns.latency) if not math.isnan(v)),
+                    key=lambda i: columns.latency[i], reverse=True)
+    return finish(columns, table, heat, edges, t0, width, n_time, [h / width for h in hits], errors,
+                  ranked[:top], per_group, failed_rows(columns, [i for i, ok in enumerate(columns.ok) if not ok]),
+                  'python')
+
+
+def failed_rows(columns, indices):
+    """Failures grouped by (endpoint, method, status) with first/last time and the tests involved"""
+    groups = {}
+    for i in indices:
+        endpoint, method = columns.groups[columns.group[i]]
+        row = groups.setdefault((endpoint, method, columns.status[i]), {
+            'endpoint': endpoint, 'method': method, 'status': columns.status[i] or None, 'count': 0,
+            'first': math.inf, 'last': -math.inf, 'tests': set()})
+        row['count'] += 1
+        started = columns.started_at[i]
+        if not math.isnan(started):
+            row['first'] = min(row['first'], started)
+            row['last'] = max(row['last'], started)
+        if columns.test[i]:
+            row['tests'].add(columns.test[i])
+    rows = sorted(groups.values(), key=lambda r: r['count'], reverse=True)
+    for row in rows:
+        row['tests'] = sorted(row['tests'])
+        row['first'] = None if row['first'] == math.inf else row['first']
+        row['last'] = None if row['last'] == -math.inf else row['last']
+    return rows
+
+
+def finish(columns, table, heat, edges, t0, width, n_time, throughput, errors, slowest, per_group, failures,
+           backend):
+    def request(i):
+        endpoint, method = columns.groups[columns.group[i]]
+        started = columns.started_at[i]
+        return {'test': columns.test[i], 'endpoint': endpoint, 'method': method,
+                'status': columns.status[i] or None, 'latency_ms': columns.latency[i],
+                'bytes': columns.bytes[i], 'offset_s': None if math.isnan(started) else started - t0,
+                'source': columns.sources[columns.source[i]]}
+
+    finite = [t for t in columns.started_at if not math.isnan(t)]
+    span = (max(finite) - min(finite)) if finite else 0.0
+    return {
+        'sources': columns.sources,
+        'backend': backend,
+        'total': len(columns),
+        'failed': sum(r['count'] for r in failures),
+        'started_at': t0 if finite else None,
+        'span_s': span,
+        'table': sorted(table, key=lambda r: r['p99'], reverse=True),
+        'heatmaps': [{'endpoint': e, 'method': m, 'grid': heat[g]} for g, (e, m) in enumerate(columns.groups)],
+        'latency_edges': edges,
+        'bucket_s': width,
+        'time_bins': n_time,
+        'throughput': throughput,
+        'errors': errors,
+        'failures': failures,
+        'summaries': columns.summaries,
+        'slowest': [request(i) for i in slowest],
+        'slowest_by_endpoint': [{'endpoint': columns.groups[g][0], 'method': columns.groups[g][1],
+                                 'requests': [request(i) for i in indices]}
+                                for g, indices in sorted(per_group.items(),
+                                                         key=lambda kv: -columns.latency[kv[1][0]])]
+    }
+
+
+# --- rendering -------------------------------------------------------------
+
+CSS = """
+body { font: 14px/1.4 -apple-system, 'Segoe UI', sans-serif; margin: 24px; color: #222; }
+h1 { font-size: 20px; } h2 { font-size: 17px; margin-top: 32px; border-bottom: 1px solid #ddd; }
+table { border-collapse: collapse; margin: 8px 0; }
+th, td { padding: 3px 10px; border-bottom: 1px solid #eee; text-align: right; white-space: nowrap; }
+th { background: #f6f6f6; } td.l, th.l { text-align: left; }
+.bad { color: #c0392b; font-weight: 600; } .muted { color: #888; }
+.grid { display: flex; flex-wrap: wrap; gap: 16px; }
+.card { border: 1px solid #e3e3e3; border-radius: 6px; padding: 8px; }
+svg text { font-size: 10px; fill: #555; }
+details { margin: 6px 0; } summary { cursor: pointer; }
+"""
+
+ERROR_COLORS = {'network': '#7f8c8d', '4xx': '#e67e22', '5xx': '#c0392b'}
+
+
+def esc(value):
+    return html.escape('' if value is None else str(value))
+
+
+def fmt_ms(value):
+    return f"{value:,.0f}" if value >= 100 else f"{value:.1f}"
+
+
+def svg_heatmap(grid, edges, bucket_s, width=560, height=200):
+    n_time, n_lat = len(grid), len(grid[0]) if grid else 0
+    peak = max((c for column in grid for c in column), default=0)
+    if not peak:
+        return '<p class="muted">No timed samples</p>'
+    left, bottom = 48, 18
+    cw, ch = (width - left) / n_time, (height - bottom) / n_lat
+    scale = math.log1p(peak)
+    parts = [f'<svg width="{width}" height="{height}" role="img">']
+    for t, column in enumerate(grid):
+        for l, count in enumerate(column):
+            if count:
+                alpha = 0.12 + 0.88 * math.log1p(count) / scale
+                parts.append(f'<rect x="{left + t * cw:.1f}" y="{height - bottom - (l + 1) * ch:.1f}" '
+                             f'width="{cw + 0.3:.1f}" height="{ch + 0.3:.1f}" fill="#c0392b" '
+                             f'fill-opacity="{alpha:.2f}"><title>{fmt_ms(edges[l])}-{fmt_ms(edges[l + 1])} ms '
+                             f'@ {t * bucket_s:.1f}s: {count}</title></rect>')
+    for l in range(0, n_lat + 1, max(1, n_lat // 4)):
+        parts.append(f'<text x="{left - 4}" y="{height - bottom - l * ch + 3:.1f}" text-anchor="end">'
+                     f'{fmt_ms(edges[l])}ms</text>')
+    parts.append(time_labels(n_time, bucket_s, left, cw, height))
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def time_labels(n_time, bucket_s, left, cw, height):
+    step = max(1, n_time // 6)
+    return ''.join(f'<text x="{left + t * cw:.1f}" y="{height - 4}">{t * bucket_s:.0f}s</text>'
+                   for t in range(0, n_time, step))
+
+
+def svg_lines(series, bucket_s, width=760, height=180, unit=''):
+    """series: [(label, color, values)] drawn as polylines over the shared time axis"""
+    n_time = max((len(values) for _, _, values in series), default=0)
+    peak = max((v for _, _, values in series for v in values), default=0)
+    if not n_time or not peak:
+        return '<p class="muted">Nothing to plot</p>'
+    left, bottom, top = 48, 18, 8
+    cw = (width - left) / max(n_time - 1, 1)
+    plot = height - bottom - top
+    parts = [f'<svg width="{width}" height="{height}" role="img">',
+             f'<text x="{left - 4}" y="{top + 3}" text-anchor="end">{peak:,.1f}{unit}</text>',
+             f'<text x="{left - 4}" y="{height - bottom}" text-anchor="end">0</text>',
+             f'<line x1="{left}" y1="{height - bottom}" x2="{width}" y2="{height - bottom}" stroke="#ccc"/>']
+    for label, color, values in series:
+        points = ' '.join(f'{left + t * cw:.1f},{height - bottom - v / peak * plot:.1f}' for t, v in enumerate(values))
+        parts.append(f'<polyline points="{points}" fill="none" stroke="{color}" stroke-width="1.5">'
+                     f'<title>{esc(label)}</title></polyline>')
+    parts.append(time_labels(n_time, bucket_s, left, cw, height))
+    parts.append('</svg>')
+    legend = ' '.join(f'<span style="color:{color}">■</span> {esc(label)}' for label, color, _ in series)
+    return ''.join(parts) + f'<div class="muted">{legend}</div>'
+
+
+def fmt_offset(seconds):
+    return '-' if seconds is None else f"{seconds:.2f}s"
+
+
+def request_table(requests):
+    rows = ''.join(
+        f'<tr><td class="l">{esc(r["test"] or "-")}</td><td class="l">{esc(r["method"])} {esc(r["endpoint"])}</td>'
+        f'<td>{esc(r["status"] or "-")}</td><td>{fmt_ms(r["latency_ms"])}</td><td>{r["bytes"]:,}</td>'
+        f'<td>{fmt_offset(r["offset_s"])}</td><td class="l">{esc(r["source"])}</td></tr>'
+        for r in requests)
+    return ('<table><tr><th class="l">test</th><th class="l">request</th><th>status</th><th>ms</th>'
+            f'<th>bytes</th><th>at</th><th class="l">source</th></tr>{rows}</table>')
+
+
+def chaos_section(source, chaos):
+    """Goodput per phase and recovery time from a harness.chaos run"""
+    start, end = chaos['fault_window_s']
+    out = [f'<h2>Fault injection - {esc(source)}</h2>',
+           f'<p>Faults on from {start:.0f}s to {end:.0f}s: {esc("; ".join(chaos.get("rules", [])) or "no rules")}</p>',
+           '<table><tr><th class="l">phase</th><th>requests</th><th>req/s</th><th>goodput req/s</th>'
+           '<th>goodput KB/s</th><th>err %</th><th>p50</th><th>p95</th></tr>']
+    for name, stats in chaos['phases'].items():
+        out.append(f'<tr><td class="l">{esc(name)}</td><td>{stats["requests"]:,}</td>'
+                   f'<td>{stats["throughput_rps"]:.1f}</td><td>{stats["goodput_rps"]:.1f}</td>'
+                   f'<td>{stats["goodput_bytes_per_s"] / 1024:.1f}</td><td>{stats["error_rate"]:.1f}</td>'
+                   f'<td>{fmt_ms(stats["p50_ms"])}</td><td>{fmt_ms(stats["p95_ms"])}</td></tr>')
+    out.append('</table>')
+    if chaos.get('goodput_drop_pct') is not None:
+        out.append(f'<p>Goodput drop during faults: {chaos["goodput_drop_pct"]:.0f}%. ')
+    else:
+        out.append('<p>')
+    out.append(f'Recovered {chaos["recovery_s"]:.1f}s after the faults stopped.</p>' if chaos['recovered']
+               else '<span class="bad">Did not return to baseline before the run ended.</span></p>')
+    return ''.join(out)
+
+
+def overhead_section(rows):
+    """Client CPU, lag and GC per source, with the saturation warnings"""
+    out = ['<h2>Client overhead</h2><table><tr><th class="l">source</th><th>CPU ms/req</th><th>CPU %</th>'
+           '<th>req/s ceiling</th><th>lag p50</th><th>lag p99</th><th>GC pauses</th><th>GC ms</th>'
+           '<th class="l">saturation</th></tr>']
+    for source, stats in rows:
+        per_request = '-' if stats['cpu_ms_per_request'] is None else f"{stats['cpu_ms_per_request']:.2f}"
+        ceiling = '-' if stats['client_rps_ceiling'] is None else f"{stats['client_rps_ceiling']:,.0f}"
+        out.append(f'<tr><td class="l">{esc(source)}</td><td>{per_request}</td><td>{stats["cpu_util"] * 100:.0f}</td>'
+                   f'<td>{ceiling}</td><td>{stats["lag_p50_ms"]:.1f}</td><td>{stats["lag_p99_ms"]:.1f}</td>'
+                   f'<td>{stats["gc_collections"]}</td><td>{stats["gc_pause_ms"]:.0f}</td>'
+                   f'<td class="l {"bad" if stats["saturated"] else ""}">'
+                   f'{esc("; ".join(stats["warnings"])) or "ok"}</td></tr>')
+    out.append('</table>')
+    return ''.join(out)
+
+
+def render_html(report, title='Harness run report'):
+    started = datetime.fromtimestamp(report['started_at']).isoformat(sep=' ', timespec='seconds') \
+        if report['started_at'] else '-'
+    error_rate = report['failed'] / report['total'] * 100 if report['total'] else 0.0
+    rps = report['total'] / report['span_s'] if report['span_s'] else 0.0
+    out = [f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{esc(title)}</title>'
+           f'<style>{CSS}</style></head><body>',
+           f'<h1>{esc(title)}</h1>',
+           f'<p>{report["total"]:,} requests from {esc(", ".join(report["sources"]))} · started {started} · '
+           f'{report["span_s"]:.1f}s · {rps:,.1f} req/s · '
+           f'<span class="{"bad" if report["failed"] else ""}">{report["failed"]:,} failed ({error_rate:.2f}%)</span></p>']
+
+    out.append('<h2>Percentiles</h2><table><tr><th class="l">endpoint</th><th class="l">method</th><th>n</th>'
+               + ''.join(f'<th>p{p}</th>' for p in PERCENTILES)
+               + '<th>max</th><th>mean</th><th>err %</th><th>bytes</th></tr>')
+    for row in report['table']:
+        out.append(f'<tr><td class="l">{esc(row["endpoint"])}</td><td class="l">{esc(row["method"])}</td>'
+                   f'<td>{row["count"]:,}</td>'
+                   + ''.join(f'<td>{fmt_ms(row[f"p{p}"])}</td>' for p in PERCENTILES)
+                   + f'<td>{fmt_ms(row["max"])}</td><td>{fmt_ms(row["mean"])}</td>'
+                   f'<td class="{"bad" if row["error_rate"] else ""}">{row["error_rate"]:.1f}</td>'
+                   f'<td>{row["bytes_avg"]:,.0f}</td></tr>')
+    out.append('</table><p class="muted">Latencies in ms, sorted by p99.</p>')
+
+    out.append('<h2>Throughput</h2>')
+    out.append(svg_lines([('requests/s', '#2980b9', report['throughput'])], report['bucket_s'], unit='/s'))
+
+    out.append('<h2>Errors over time</h2>')
+    series = [(name, ERROR_COLORS[name], counts) for name, counts in report['errors'].items() if any(counts)]
+    out.append(svg_lines(series, report['bucket_s']) if series else '<p>No failed requests.</p>')
+    if report['failures']:
+        out.append('<table><tr><th class="l">request</th><th>status</th><th>count</th><th>first</th><th>last</th>'
+                   '<th class="l">tests</th></tr>')
+        for row in report['failures']:
+            first = '-' if row['first'] is None else f"{row['first'] - report['started_at']:.1f}s"
+            last = '-' if row['last'] is None else f"{row['last'] - report['started_at']:.1f}s"
+            out.append(f'<tr><td class="l">{esc(row["method"])} {esc(row["endpoint"])}</td>'
+                       f'<td>{esc(row["status"] or "network")}</td><td>{row["count"]:,}</td><td>{first}</td>'
+                       f'<td>{last}</td><td class="l">{esc(", ".join(row["tests"][:5]))}</td></tr>')
+        out.append('</table>')
+
+    for source, summary in report['summaries']:
+        if summary.get('chaos'):
+            out.append(chaos_section(source, summary['chaos']))
+    overhead = [(source, summary['client_overhead']) for source, summary in report['summaries']
+                if summary.get('client_overhead')]
+    if overhead:
+        out.append(overhead_section(overhead))
+
+    out.append('<h2>Latency over time</h2><div class="grid">')
+    rows = {(r['endpoint'], r['method']): r for r in report['table']}
+    for heatmap in sorted(report['heatmaps'], key=lambda h: -rows[(h['endpoint'], h['method'])]['p99']):
+        out.append(f'<div class="card"><b>{esc(heatmap["method"])} {esc(heatmap["endpoint"])}</b>'
+                   f'{svg_heatmap(heatmap["grid"], report["latency_edges"], report["bucket_s"])}</div>')
+    out.append('</div>')
+
+    out.append('<h2>Slowest requests</h2>')
+    out.append(request_table(report['slowest']))
+    for group in report['slowest_by_endpoint']:
+        out.append(f'<details><summary>{esc(group["method"])} {esc(group["endpoint"])} - '
+                   f'slowest {len(group["requests"])}</summary>{request_table(group["requests"])}</details>')
+
+    out.append(f'<p class="muted">Generated {datetime.now().isoformat(timespec="seconds")} by harness.report '
+               f'({report["backend"]} aggregation).</p></body></html>')
+    return '\n'.join(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render a self-contained HTML report from harness samples')
+    parser.add_argument('files', nargs='*', help='Results JSON files')
+    parser.add_argument('--run', type=int, action='append', default=[], help='History run id (repeatable)')
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--title', default='Harness run report')
+    parser.add_argument('--time-bins', type=int, default=60)
+    parser.add_argument('--latency-bins', type=int, default=24)
+    parser.add_argument('--top', type=int, default=25, help='Rows in the slowest-requests table')
+    parser.add_argument('--backend', choices=('auto', 'numpy', 'python'), default='auto')
+    parser.add_argument('-o', '--output', default='harness_report.html')
+    args = parser.parse_args(argv)
+    if not args.files and not args.run:
+        parser.error('give at least one results file or --run')
+
+    columns = Columns()
+    try:
+        for path in args.files:
+            load_file(columns, path)
+        if args.run:
+            conn = connect(args.db)
+            try:
+                for run_id in args.run:
+                    load_run(columns, conn, run_id)
+            finally:
+                conn.close()
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 2
+    if not len(columns):
+        print("❌ No samples in the given inputs")
+        return 1
+
+    try:
+        report = aggregate(columns, args.time_bins, args.latency_bins, args.top, args.backend)
+    except ImportError:
+        print("❌ --backend numpy needs numpy: pip install numpy")
+        return 2
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(render_html(report, args.title))
+    print(f"📄 {len(columns):,} samples across {len(columns.groups)} endpoints "
+          f"({report['backend']} aggregation) -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+Scenario DSL for weighted user-journey traffic
+Scenarios are TOML (or YAML, when PyYAML is installed) files describing journeys built
+from the API's request types, with weights, think-time distributions and data
+parameterization. See harness/scenarios/*.toml for examples.
+
+    name = "browse-heavy"
+    think_time = "lognormal:1200:0.5"          # any harness.mock_llm latency spec
+
+    [data]
+    segment_names = ["Urban SME Owners", "Tier-2 Students"]
+
+    [setup]                                     # once per virtual user
+    steps = [{ request = "list_workspaces" }]
+
+    [[journeys]]
+    name = "browse"
+    weight = 70
+    steps = [{ request = "list_workspaces" }, { request = "list_segments" }]
+
+Step keys: request (a REQUEST_TYPES name) or method+path, plus optional json, params,
+save ({var = "dotted.response.path"}), vars, think, expect and name. Strings may
+reference ${var}, ${data.key}, ${vu}, ${iteration} and ${uuid}. Data values may also be
+"synth:<count>[:<seed>]" for generated persona inputs (see harness.synth).
+"""
+
+import copy
+import csv
+import json
+import os
+import re
+import uuid
+
+from harness.mock_llm import LatencyDistribution
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+SEGMENT_BODY = {
+    "name": "Tech SMB Owners - High Price Sensitivity",
+    "workspaceId": "${workspace_id}",
+    "frame": "Small business owners in technology sector",
+    "product": "Business productivity software",
+    "primaryBenefit": "Streamline operations and increase efficiency",
+    "reason": "Need to compete with larger companies while managing costs",
+    "context": "Growing tech SMB market in India with high price sensitivity",
+    "values": ["efficiency", "growth", "frugality"],
+    "emotions": ["confidence", "excitement"],
+    "fears": ["complexity", "hidden_costs"],
+    "evidence": "Market research shows 70% adoption rate among price-sensitive SMBs",
+    "notes": "Focus on cost-effective solutions and transparent pricing"
+}
+
+CULTURE_BODY = {
+    "segmentId": "${segment_id}",
+    "locale": "en-IN",
+    "communicationStyle": "low_context",
+    "formalityNorm": "mixed",
+    "region": {"country": "IN", "state": "MH", "city": "Mumbai", "cityTier": "Tier-1"},
+    "urbanicity": "urban",
+    "deviceChannelPrefs": {"whatsapp_preferred": True, "android_share_high": True},
+    "purchasingConstraints": {"cod_prevalence": True, "low_bandwidth": False}
+}
+
+ECONOMIC_BODY = {
+    "segmentId": "${segment_id}",
+    "incomeBracket": "₹1L-₹2L",
+    "profession": "SME_owner",
+    "priceSensitivity": "high",
+    "industry": "technology",
+    "employmentType": "self_employed",
+    "socioeconomicStatus": "MID",
+    "paymentBehaviour": {"upi_preferred": True, "credit_card": False, "emi_friendly": True},
+    "financialGoals": ["business_growth", "cost_optimization"],
+    "constraints": ["limited_budget", "cash_flow_management"],
+    "savingsInclination": "saver",
+    "riskAppetite": "low"
+}
+
+# Request types the harness already exercises, keyed by the name scenarios refer to
+REQUEST_TYPES = {
+    'list_workspaces': {
+        'method': 'GET', 'path': '/workspaces',
+        'save': {'workspace_id': 'workspaces.0.id'}
+    },
+    'create_workspace': {
+        'method': 'POST', 'path': '/workspaces', 'json': {'name': 'Load Test Workspace'},
+        'save': {'workspace_id': 'workspace.id'}
+    },
+    'update_workspace': {
+        'method': 'PUT', 'path': '/workspaces/${workspace_id}', 'json': {'name': 'Updated Load Test Workspace'}
+    },
+    'delete_workspace': {'method': 'DELETE', 'path': '/workspaces/${workspace_id}'},
+    'list_segments': {'method': 'GET', 'path': '/workspaces/${workspace_id}/segments'},
+    'create_segment': {
+        'method': 'POST', 'path': '/segments', 'json': SEGMENT_BODY,
+        'save': {'segment_id': 'segment.id'}
+    },
+    'get_segment': {'method': 'GET', 'path': '/segments/${segment_id}'},
+    'update_segment': {
+        'method': 'PUT', 'path': '/segments/${segment_id}',
+        'json': {'name': 'Updated Load Test Segment', 'workspaceId': '${workspace_id}'}
+    },
+    'delete_segment': {'method': 'DELETE', 'path': '/segments/${segment_id}'},
+    'create_culture_profile': {
+        'method': 'POST', 'path': '/culture-profiles', 'json': CULTURE_BODY,
+        'save': {'culture_profile_id': 'profile.id'}
+    },
+    'create_economic_profile': {
+        'method': 'POST', 'path': '/economic-profiles', 'json': ECONOMIC_BODY,
+        'save': {'economic_profile_id': 'profile.id'}
+    },
+    'generate_persona': {
+        'method': 'POST', 'path': '/personas/generate',
+        'json': {
+            'segmentId': '${segment_id}',
+            'cultureProfileId': '${culture_profile_id}',
+            'economicProfileId': '${economic_profile_id}'
+        },
+        'save': {'persona_id': 'persona.id'}
+    },
+    'delete_persona': {'method': 'DELETE', 'path': '/personas/${persona_id}'},
+    'get_strategies': {'method': 'GET', 'path': '/personas/${persona_id}/strategies'},
+    'generate_strategy': {
+        'method': 'POST', 'path': '/personas/${persona_id}/strategies/${strategy_type}/generate',
+        'vars': {'strategy_type': 'positioning'}
+    },
+    'generate_all_strategies': {'method': 'POST', 'path': '/personas/${persona_id}/strategies/generate'},
+    'export_strategy': {
+        'method': 'GET', 'path': '/personas/${persona_id}/strategies/${strategy_type}/export',
+        'vars': {'strategy_type': 'positioning'}
+    },
+    'export_all_strategies': {'method': 'GET', 'path': '/personas/${persona_id}/strategies/export-all'},
+    'export_persona': {'method': 'GET', 'path': '/personas/${persona_id}/export'},
+}
+
+PLACEHOLDER = re.compile(r'\$\{([A-Za-z0-9_.]+)\}')
+
+
+class ScenarioError(Exception):
+    """Raised for malformed scenario files or unresolvable step variables"""
+
+
+def resolve_path(data, dotted):
+    """Follow a dotted path like 'workspaces.0.id' through dicts and lists"""
+    current = data
+    for part in dotted.split('.'):
+        if isinstance(current, list):
+            try:
+                current = current[int(part)]
+            except (ValueError, IndexError):
+                return None
+        elif isinstance(current, dict):
+            current = current.get(part)
+        else:
+            return None
+        if current is None:
+            return None
+    return current
+
+
+def render(template, context):
+    """Substitute ${...} placeholders in strings, dicts and lists
+
+    A string that is exactly one placeholder keeps the referenced value's type; dict and
+    list values are rendered in turn, so data rows may carry placeholders of their own.
+    """
+    if isinstance(template, str):
+        whole = PLACEHOLDER.fullmatch(template)
+        if whole:
+            value = lookup(whole.group(1), context)
+            return render(value, context) if isinstance(value, (dict, list)) else value
+        return PLACEHOLDER.sub(lambda m: str(lookup(m.group(1), context)), template)
+    if isinstance(template, dict):
+        return {key: render(value, context) for key, value in template.items()}
+    if isinstance(template, list):
+        return [render(value, context) for value in template]
+    return template
+
+
+def lookup(name, context):
+    if name == 'uuid':
+        return uuid.uuid4().hex
+    value = resolve_path(context, name)
+    if value is None:
+        raise ScenarioError(f"Unresolved variable: ${{{name}}}")
+    return value
+
+
+class Step:
+    """One request in a journey, with request-type defaults merged in"""
+
+    def __init__(self, spec):
+        spec = dict(spec)
+        base = {}
+        if 'request' in spec:
+            if spec['request'] not in REQUEST_TYPES:
+                raise ScenarioError(f"Unknown request type: {spec['request']}")
+            base = copy.deepcopy(REQUEST_TYPES[spec['request']])
+        elif 'method' not in spec or 'path' not in spec:
+            raise ScenarioError(f"Step needs 'request' or 'method' + 'path': {spec}")
+
+        self.request = spec.get('request')
+        self.method = spec.get('method', base.get('method', 'GET')).upper()
+        self.path = spec.get('path', base.get('path'))
+        self.body = base.get('json')
+        if 'json' in spec:
+            if isinstance(self.body, dict) and isinstance(spec['json'], dict):
+                self.body = {**self.body, **spec['json']}
+            else:
+                self.body = spec['json']
+        self.params = spec.get('params', {})
+        self.save = {**base.get('save', {}), **spec.get('save', {})}
+        self.vars = {**base.get('vars', {}), **spec.get('vars', {})}
+        self.think = LatencyDistribution(spec['think']) if 'think' in spec else None
+        self.expect = spec.get('expect', 200)
+        self.name = spec.get('name') or self.request or f"{self.method} {self.path}"
+
+    @property
+    def is_write(self):
+        return self.method in WRITE_METHODS
+
+    def prepare(self, context):
+        """Render the step against a context; returns (method, path, params, body)"""
+        context = {**context, **render(self.vars, context)} if self.vars else context
+        body = render(self.body, context) if self.body is not None else None
+        return self.method, render(self.path, context), render(self.params, context), body
+
+    def capture(self, payload, context):
+        """Copy saved response fields into the context"""
+        for var, dotted in self.save.items():
+            value = resolve_path(payload, dotted) if payload is not None else None
+            if value is not None:
+                context[var] = value
+
+
+class Journey:
+    def __init__(self, spec, default_think):
+        if not spec.get('steps'):
+            raise ScenarioError(f"Journey '{spec.get('name')}' has no steps")
+        self.name = spec.get('name', 'journey')
+        self.weight = float(spec.get('weight', 1))
+        self.think = LatencyDistribution(spec['think_time']) if 'think_time' in spec else default_think
+        self.steps = [Step(step) for step in spec['steps']]
+
+
+class Scenario:
+    """A parsed scenario: setup steps, weighted journeys and parameter data"""
+
+    def __init__(self, spec, base_dir='.'):
+        self.name = spec.get('name', 'scenario')
+        self.description = spec.get('description', '')
+        self.think = LatencyDistribution(spec.get('think_time', 'fixed:0'))
+        self.vars = spec.get('vars', {})
+        self.data = {key: load_data(value, base_dir) for key, value in spec.get('data', {}).items()}
+        self.setup = [Step(step) for step in spec.get('setup', {}).get('steps', [])]
+        self.journeys = [Journey(journey, self.think) for journey in spec.get('journeys', [])]
+        if not self.journeys:
+            raise ScenarioError(f"Scenario '{self.name}' defines no journeys")
+        if sum(j.weight for j in self.journeys) <= 0:
+            raise ScenarioError(f"Scenario '{self.name}' journey weights must sum to more than 0")
+
+    def pick_journey(self, rng):
+        return rng.choices(self.journeys, weights=[j.weight for j in self.journeys])[0]
+
+    def sample_data(self, rng):
+        """Pick one value per data key for a journey iteration"""
+        return {key: rng.choice(values) for key, values in self.data.items() if values}
+
+    def write_ratio(self):
+        """Expected fraction of write requests implied by the journey weights"""
+        total = sum(j.weight * len(j.steps) for j in self.journeys)
+        writes = sum(j.weight * sum(1 for s in j.steps if s.is_write) for j in self.journeys)
+        return writes / total if total else 0.0
+
+
+def load_data(value, base_dir):
+    """Data values are inline lists, paths to .csv/.json files or 'synth:<count>[:<seed>]'"""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str) and value.startswith('synth:'):
+        from harness.synth import generate
+        try:
+            count, _, seed = value[len('synth:'):].partition(':')
+            return generate(int(count), int(seed) if seed else None)
+        except ValueError:
+            raise ScenarioError(f"Bad synth data source {value!r}; expected synth:<count>[:<seed>]")
+    if isinstance(value, str):
+        path = value if os.path.isabs(value) else os.path.join(base_dir, value)
+        if path.endswith('.csv'):
+            with open(path, newline='', encoding='utf-8') as f:
+                return list(csv.DictReader(f))
+        if path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+    raise ScenarioError(f"Unsupported data source: {value!r}")
+
+
+def load_scenario(path):
+    """Parse a .toml, .yaml or .yml scenario file"""
+    if path.endswith('.toml'):
+        import tomllib
+        with open(path, 'rb') as f:
+            spec = tomllib.load(f)
+    elif path.endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise ScenarioError("YAML scenarios require PyYAML (pip install pyyaml); use TOML otherwise")
+        with open(path, encoding='utf-8') as f:
+            spec = yaml.safe_load(f)
+    else:
+        raise ScenarioError(f"Unsupported scenario format: {path}")
+    return Scenario(spec, base_dir=os.path.dirname(os.path.abspath(path)))
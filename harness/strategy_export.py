@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Strategy Export - export-all latency as stored strategy versions accumulate
+Every generated strategy is stored as a new version for its persona. GET
+/personas/:id/strategies/export-all reads only the latest version of each type and caches
+the assembled export under the persona and those version numbers. This tool logs in as a
+real user (stored strategies record their creator), creates one persona, then regenerates
+its strategies until each of `--levels` versions is stored. At each level it times:
+
+    miss     export-all right after a new positioning version (X-Export-Cache: miss)
+    hit      export-all again with nothing new (X-Export-Cache: hit)
+    list     GET /personas/:id/strategies
+
+and checks every export carries the latest version of each strategy. Neither path should
+depend on the number of stored versions; the run fails when the p50 at the largest level
+exceeds the smallest level's by more than --tolerance, when an export is stale, or when a
+generated strategy comes back without a stored version.
+
+    EMERGENT_BACKEND_URL=http://127.0.0.1:8902 DB_STATS=true yarn dev
+    python -m harness.strategy_export --levels 1,10,100
+
+Generation waits on the model; start the app against `python -m harness.mock_llm
+--profile instant` to grow the larger levels quickly.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from harness.auth_load import SessionDataStub
+from harness.core import BASE_URL, JSON_HEADERS, percentile, provision_inputs, record_request
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+
+STRATEGY_TYPES = ('positioning', 'messaging', 'pricing')
+# Latency differences below this are noise, whatever the ratio
+FLAT_SLACK_MS = 5.0
+
+
+class StrategyExport:
+    def __init__(self, base_url=BASE_URL, levels=(1, 10, 100), samples=20, misses=5, workers=2, tolerance=1.5,
+                 timeout=60, seed=None):
+        self.base_url = base_url.rstrip('/')
+        self.levels = sorted(levels)
+        self.samples_per_probe = samples
+        self.misses = misses
+        self.workers = workers
+        self.tolerance = tolerance
+        self.timeout = timeout
+        self.seed = seed
+        self.session = requests.Session()
+        self.session.headers.update(JSON_HEADERS)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.samples = []
+        self.workspace_id = None
+        self.segment_id = None
+        self.persona_id = None
+        # Latest stored version of each type, as reported by the generate endpoints
+        self.latest = dict.fromkeys(STRATEGY_TYPES, 0)
+        # Generated strategies answered without a stored version
+        self.unsaved = 0
+
+    def login(self, session_id):
+        response = self.session.post(f"{self.base_url}/auth/session", json={'session_id': session_id},
+                                     timeout=self.timeout)
+        return response.status_code == 200 and 'session_token' in self.session.cookies
+
+    @property
+    def worker_session(self):
+        """Per-thread session carrying the logged-in user's cookies"""
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+            self.local.session.headers.update(JSON_HEADERS)
+            self.local.session.cookies.update(self.session.cookies)
+        return self.local.session
+
+    def request(self, test, method, path, body=None, session=None, **fields):
+        response, sample = record_request(session or self.session, self.base_url, test, method, path, self.samples,
+                                          body=body, timeout=self.timeout, lock=self.lock, **fields)
+        if response is None:
+            return None, sample
+        if 'X-Export-Cache' in response.headers:
+            sample['cache'] = response.headers['X-Export-Cache']
+        if 'X-DB-Queries' in response.headers:
+            sample['db_queries'] = int(response.headers['X-DB-Queries'])
+        return (response.json() if sample['success'] else None), sample
+
+    def provision(self):
+        """Create a workspace, one set of inputs and a persona; returns True when ready"""
+        payload, _ = self.request('setup', 'POST', '/workspaces', {'name': 'Strategy Export'})
+        if not payload:
+            return False
+        self.workspace_id = payload['workspace']['id']
+
+        _, inputs = provision_inputs(self.session, self.base_url, self.samples, self.seed, timeout=self.timeout,
+                                     lock=self.lock, workspace_id=self.workspace_id)
+        if not inputs:
+            return False
+        self.segment_id = inputs[0]['segmentId']
+        persona, _ = self.request('setup', 'POST', '/personas/generate', inputs[0])
+        if not persona:
+            return False
+        self.persona_id = persona['persona']['id']
+        return True
+
+    def record_versions(self, versions, types=STRATEGY_TYPES):
+        with self.lock:
+            for strategy_type in types:
+                version = (versions or {}).get(strategy_type)
+                if version:
+                    self.latest[strategy_type] = max(self.latest[strategy_type], version)
+                else:
+                    self.unsaved += 1
+
+    def generate_all(self, _=None):
+        payload, _ = self.request('generate_strategies', 'POST', f"/personas/{self.persona_id}/strategies/generate",
+                                  session=self.worker_session)
+        self.record_versions((payload or {}).get('versions'))
+
+    def grow_to(self, level):
+        missing = level - min(self.latest.values())
+        if missing <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(self.generate_all, range(missing)))
+
+    def export(self, test, level):
+        payload, sample = self.request(test, 'GET', f"/personas/{self.persona_id}/strategies/export-all", level=level)
+        if payload is not None:
+            exported = payload.get('strategy_versions') or {}
+            sample['stale'] = any(exported.get(t) != self.latest[t] for t in STRATEGY_TYPES)
+        return sample
+
+    def probe(self, level):
+        for _ in range(self.misses):
+            payload, _ = self.request('generate_strategy', 'POST',
+                                      f"/personas/{self.persona_id}/strategies/positioning/generate")
+            self.record_versions({'positioning': (payload or {}).get('version')}, ('positioning',))
+            self.export('miss', level)
+        for _ in range(self.samples_per_probe):
+            self.export('hit', level)
+        for _ in range(self.samples_per_probe):
+            self.request('list', 'GET', f"/personas/{self.persona_id}/strategies", level=level)
+
+    def run(self):
+        if not self.provision():
+            return None
+        results = []
+        for level in self.levels:
+            started = time.perf_counter()
+            self.grow_to(level)
+            grown_s = time.perf_counter() - started
+            self.probe(level)
+            results.append(self.level_stats(level, grown_s))
+        return self.summary(results)
+
+    def level_stats(self, level, grown_s):
+        def stats(test):
+            samples = [s for s in self.samples if s['test'] == test and s.get('level') == level and s['success']]
+            latencies = sorted(s['latency_ms'] for s in samples)
+            queries = [s['db_queries'] for s in samples if 'db_queries' in s]
+            return {
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'bytes': samples[0]['bytes'] if samples else 0,
+                # How the app answered: a "miss" probe served from cache means the key missed a new version
+                'cache': {value: sum(1 for s in samples if s.get('cache') == value) for value in ('hit', 'miss')},
+                'db_queries': sum(queries) / len(queries) if queries else None,
+                'stale': sum(1 for s in samples if s.get('stale'))
+            }
+
+        return {'level': level, 'versions': dict(self.latest), 'grow_s': grown_s,
+                'miss': stats('miss'), 'hit': stats('hit'), 'list': stats('list')}
+
+    def cleanup(self):
+        # Deleting the segment cascades to the persona and its stored strategies
+        if self.segment_id:
+            self.request('cleanup', 'DELETE', f"/segments/{self.segment_id}")
+        if self.workspace_id:
+            self.request('cleanup', 'DELETE', f"/workspaces/{self.workspace_id}")
+
+    def flat(self, results, key):
+        smallest, largest = results[0][key]['p50'], results[-1][key]['p50']
+        return largest <= smallest * self.tolerance or largest - smallest <= FLAT_SLACK_MS
+
+    def summary(self, results):
+        stale = sum(r[key]['stale'] for r in results for key in ('miss', 'hit'))
+        cached_correctly = all(r['miss']['cache']['hit'] == 0 and r['hit']['cache']['miss'] == 0 for r in results)
+        flat_miss = self.flat(results, 'miss')
+        flat_hit = self.flat(results, 'hit')
+        return {
+            'levels': results,
+            'tolerance': self.tolerance,
+            'miss_flat': flat_miss,
+            'hit_flat': flat_hit,
+            'stale_exports': stale,
+            'cache_keyed_by_version': cached_correctly,
+            'unsaved_strategies': self.unsaved,
+            'passed': flat_miss and flat_hit and not stale and cached_correctly and not self.unsaved,
+            'failed': sum(1 for s in self.samples if not s['success']),
+            'total_requests': len(self.samples),
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 STRATEGY EXPORT - export-all latency by stored versions")
+    print(f"{'='*80}")
+    print(f"{'versions':>9}{'miss p50':>10}{'miss p95':>10}{'hit p50':>9}{'hit p95':>9}{'list p50':>10}"
+          f"{'queries m/h':>13}{'export B':>10}  fresh")
+    for row in summary['levels']:
+        queries = '/'.join(f"{row[key]['db_queries']:.0f}" if row[key]['db_queries'] is not None else '-'
+                           for key in ('miss', 'hit'))
+        stale = row['miss']['stale'] + row['hit']['stale']
+        print(f"{min(row['versions'].values()):>9}{row['miss']['p50']:>10.1f}{row['miss']['p95']:>10.1f}"
+              f"{row['hit']['p50']:>9.1f}{row['hit']['p95']:>9.1f}{row['list']['p50']:>10.1f}{queries:>13}"
+              f"{row['hit']['bytes']:>10}  {'✅' if not stale else f'❌ {stale} stale'}")
+    print()
+    for label, key in (('Cache miss', 'miss_flat'), ('Cache hit', 'hit_flat')):
+        print(f"{'✅' if summary[key] else '❌'} {label} latency "
+              f"{'stays flat' if summary[key] else 'grows'} (tolerance {summary['tolerance']:g}x)")
+    if summary['unsaved_strategies']:
+        print(f"❌ {summary['unsaved_strategies']} generated strategies came back without a stored version")
+    if not summary['cache_keyed_by_version']:
+        print("❌ Exports were served from cache after a new version, or repeat exports missed")
+    if summary['failed']:
+        print(f"⚠️  {summary['failed']} requests failed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check that strategy export-all stays flat as versions accumulate')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--levels', default='1,10,100', help='Comma-separated stored version counts')
+    parser.add_argument('--samples', type=int, default=20, help='Cached exports and listings per level')
+    parser.add_argument('--misses', type=int, default=5, help='New versions, each followed by an export, per level')
+    parser.add_argument('--workers', type=int, default=2, help='Concurrent generations while growing')
+    parser.add_argument('--tolerance', type=float, default=1.5, help='Allowed p50 growth from the smallest level')
+    parser.add_argument('--session-id', default='harness-strategy-export')
+    parser.add_argument('--stub-port', type=int, default=8902)
+    parser.add_argument('--no-stub', action='store_true', help='The session-data stand-in is already running')
+    parser.add_argument('--keep', action='store_true', help='Keep the created persona and its strategies')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--output', default='strategy_export_results.json')
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.levels.split(',')]
+    check = StrategyExport(args.base_url, levels, args.samples, args.misses, args.workers, args.tolerance,
+                           args.timeout, args.seed)
+    print(f"🚀 Strategy export: {', '.join(str(level) for level in check.levels)} stored versions")
+    print(f"📍 Base URL: {check.base_url}")
+    stub = None if args.no_stub else SessionDataStub(port=args.stub_port)
+    try:
+        if stub:
+            stub.start()
+        if not check.login(args.session_id):
+            print(f"❌ Login failed - is EMERGENT_BACKEND_URL pointing at the stub ({stub.base_url if stub else 'running elsewhere'})?")
+            return 2
+        monitor = OverheadMonitor().start()
+        summary = check.run()
+        if summary is None:
+            print("❌ Could not create the persona")
+            return 2
+        summary['client_overhead'] = finish(monitor, check.samples)
+        if not args.keep:
+            check.cleanup()
+    finally:
+        if stub:
+            stub.stop()
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': check.samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'strategy_export')
+    return 0 if summary['passed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
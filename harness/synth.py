@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Synthetic Persona Inputs - diverse segment/culture/economic payloads from seed data
+Reads the controlled vocabularies in lib/seed-data.js (INCOME_BRACKETS, PROFESSIONS,
+INDUSTRIES, PRICE_SENSITIVITY, SES_LEVELS, LOCALES, ...) and samples thousands of valid,
+internally consistent combinations with a seeded RNG, so load and cache tests see
+realistic key diversity instead of one hot path.
+
+Sampling is column-wise: every field is drawn for all rows in one call, then rows are
+assembled. With numpy installed the draws are vectorized; otherwise the stdlib random
+module is used. Both are deterministic for a given seed, but produce different streams,
+so the backend is recorded alongside the output.
+
+Payloads keep ${workspace_id} / ${segment_id} placeholders for the scenario DSL:
+
+    [data]
+    inputs = "synth:2000:7"                    # 2000 combinations, seed 7
+
+    steps = [{ request = "create_segment", json = "${data.inputs.segment}" }, ...]
+
+    python -m harness.synth -n 5000 --seed 7 --output persona_inputs.json
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+
+SEED_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lib', 'seed-data.js')
+
+EXPORT = re.compile(r"export const (\w+) = ")
+OPTION = re.compile(r"\{ value: '([^']*)', label: '([^']*)' \}")
+CURRENCY = re.compile(r"(\w+): \[")
+
+# Region, script and payload vocabularies that seed-data.js does not carry
+LOCALE_REGIONS = {
+    'en-IN': [('IN', 'MH', 'Mumbai'), ('IN', 'KA', 'Bengaluru'), ('IN', 'DL', 'Delhi'), ('IN', 'TS', 'Hyderabad')],
+    'hi-IN': [('IN', 'UP', 'Lucknow'), ('IN', 'DL', 'Delhi'), ('IN', 'MP', 'Indore'), ('IN', 'RJ', 'Jaipur')],
+    'mr-IN': [('IN', 'MH', 'Pune'), ('IN', 'MH', 'Nagpur'), ('IN', 'MH', 'Nashik')],
+    'ta-IN': [('IN', 'TN', 'Chennai'), ('IN', 'TN', 'Coimbatore'), ('IN', 'TN', 'Madurai')],
+    'te-IN': [('IN', 'TS', 'Hyderabad'), ('IN', 'AP', 'Vijayawada'), ('IN', 'AP', 'Visakhapatnam')],
+    'kn-IN': [('IN', 'KA', 'Bengaluru'), ('IN', 'KA', 'Mysuru'), ('IN', 'KA', 'Hubballi')],
+    'gu-IN': [('IN', 'GJ', 'Ahmedabad'), ('IN', 'GJ', 'Surat'), ('IN', 'GJ', 'Vadodara')],
+    'bn-IN': [('IN', 'WB', 'Kolkata'), ('IN', 'WB', 'Siliguri'), ('IN', 'WB', 'Durgapur')],
+    'en-US': [('US', 'CA', 'San Jose'), ('US', 'TX', 'Austin'), ('US', 'NY', 'New York')],
+    'en-GB': [('GB', 'ENG', 'London'), ('GB', 'ENG', 'Manchester'), ('GB', 'SCT', 'Glasgow')],
+}
+# Income brackets are per currency; a locale is only sampled when seed-data has its currency
+CURRENCIES = {'IN': 'INR', 'US': 'USD', 'GB': 'GBP'}
+SCRIPTS = {'en': 'Latn', 'hi': 'Deva', 'mr': 'Deva', 'ta': 'Taml', 'te': 'Telu', 'kn': 'Knda',
+           'gu': 'Gujr', 'bn': 'Beng'}
+CITY_TIERS = {'urban': 'Tier-1', 'semi_urban': 'Tier-2', 'rural': 'Tier-3'}
+PRODUCTS = ['Business productivity software', 'Personal finance app', 'Online learning platform',
+            'Grocery delivery service', 'Health insurance plan', 'Two-wheeler loan',
+            'Accounting software for SMBs', 'Mobile data plan', 'Home appliance subscription']
+EMPLOYMENT_BY_PROFESSION = {
+    'student': ['student', 'part_time'],
+    'gig_worker': ['gig', 'contract'],
+    'self_employed': ['self_employed'],
+    'SME_owner': ['self_employed'],
+    'entrepreneur': ['self_employed'],
+    'retired': ['unemployed', 'part_time'],
+    'homemaker': ['unemployed', 'part_time'],
+}
+DEFAULT_EMPLOYMENT = ['full_time', 'full_time', 'full_time', 'part_time', 'contract']
+WORKWEEKS = [{'start': 'Mon', 'end': 'Fri', 'weekend': ['Sat', 'Sun']},
+             {'start': 'Mon', 'end': 'Sat', 'weekend': ['Sun']}]
+
+
+@functools.lru_cache(maxsize=None)
+def load_taxonomies(path=SEED_DATA):
+    """Parse the `{ value, label }` vocabularies out of lib/seed-data.js"""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    exports = list(EXPORT.finditer(source))
+    taxonomies = {}
+    for match, following in zip(exports, exports[1:] + [None]):
+        block = source[match.end():following.start() if following else len(source)]
+        name = match.group(1)
+        if name == 'INCOME_BRACKETS':
+            parts = CURRENCY.split(block)[1:]
+            taxonomies[name] = {currency: OPTION.findall(body) for currency, body in zip(parts[::2], parts[1::2])}
+        elif name == 'CULTURE_AXES':
+            pairs = re.findall(r"left: \{ value: '([^']*)'.*?right: \{ value: '([^']*)'", block, re.S)
+            taxonomies[name] = [f"{left}_{right}" for left, right in pairs]
+        elif name == 'BLOCKED_TERMS':
+            taxonomies[name] = re.findall(r"'([^']+)'", block)
+        else:
+            options = OPTION.findall(block)
+            if options:
+                taxonomies[name] = options
+    return taxonomies
+
+
+def concrete(options):
+    """Drop the UI's 'any' wildcard, which the API enums reject"""
+    return [option for option in options if option[0] != 'any']
+
+
+class RandomSampler:
+    """Column draws with the stdlib RNG"""
+
+    backend = 'random'
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def indices(self, k, n):
+        return self.rng.choices(range(k), k=n)
+
+    def uniform(self, n):
+        rand = self.rng.random
+        return [rand() for _ in range(n)]
+
+    def subsets(self, k, n, low, high):
+        return [self.rng.sample(range(k), self.rng.randint(low, high)) for _ in range(n)]
+
+
+class NumpySampler:
+    """Column draws with numpy's Generator, one vectorized call per field"""
+
+    backend = 'numpy'
+
+    def __init__(self, seed):
+        import numpy
+        self.rng = numpy.random.default_rng(seed)
+
+    def indices(self, k, n):
+        return self.rng.integers(0, k, size=n).tolist()
+
+    def uniform(self, n):
+        return self.rng.random(n).tolist()
+
+    def subsets(self, k, n, low, high):
+        order = self.rng.random((n, k)).argsort(axis=1)[:, :high].tolist()
+        counts = self.rng.integers(low, high + 1, size=n).tolist()
+        return [row[:count] for row, count in zip(order, counts)]
+
+
+def make_sampler(seed=None, backend='auto'):
+    if backend in ('auto', 'numpy'):
+        try:
+            return NumpySampler(seed)
+        except ImportError:
+            if backend == 'numpy':
+                raise
+    return RandomSampler(seed)
+
+
+def clean_text(text, blocked):
+    """Drop every word built on a blocked term so generated prose passes validateContent
+
+    The matcher blocks a term with its inflected and derived forms ("excluded",
+    "naturally", "racism"; see lib/term-matcher.js), so whole words containing the term,
+    or its stem without a final "e" followed by "i", are removed rather than the term alone.
+    """
+    for term in blocked:
+        roots = [re.escape(term.lower()).replace(r'\ ', r'\s+')]
+        if term.endswith('e'):
+            roots.append(re.escape(term[:-1].lower()) + 'i')
+        text = re.sub(rf"\w*(?:{'|'.join(roots)})\w*", '', text, flags=re.I)
+    return ' '.join(text.split())
+
+
+def generate(n, seed=None, backend='auto'):
+    """Return `n` dicts of {'segment', 'culture', 'economic'} request bodies"""
+    tax = load_taxonomies()
+    sampler = make_sampler(seed, backend)
+    blocked = tax['BLOCKED_TERMS']
+
+    def column(options):
+        return [options[i] for i in sampler.indices(len(options), n)]
+
+    def conditional(keys, table, default=None):
+        """Pick from table[key] per row using one uniform draw per row"""
+        picks = []
+        for key, u in zip(keys, sampler.uniform(n)):
+            options = table.get(key, default)
+            picks.append(options[int(u * len(options))])
+        return picks
+
+    def flags(options, low, high):
+        return [{options[i][0]: True for i in subset} for subset in sampler.subsets(len(options), n, low, high)]
+
+    def multi(options, low, high):
+        return [[options[i][0] for i in subset] for subset in sampler.subsets(len(options), n, low, high)]
+
+    locales = column([l for l in concrete(tax['LOCALES'])
+                      if CURRENCIES.get(LOCALE_REGIONS.get(l[0], [('',)])[0][0]) in tax['INCOME_BRACKETS']])
+    regions = conditional([l[0] for l in locales], LOCALE_REGIONS)
+    urbanicity = column(concrete(tax['URBANICITY']))
+    professions = column(concrete(tax['PROFESSIONS']))
+    industries = column(concrete(tax['INDUSTRIES']))
+    employment = conditional([p[0] for p in professions], EMPLOYMENT_BY_PROFESSION, DEFAULT_EMPLOYMENT)
+    currencies = [CURRENCIES[region[0]] for region in regions]
+    brackets = conditional(currencies, {c: concrete(b) for c, b in tax['INCOME_BRACKETS'].items()})
+    price = column(concrete(tax['PRICE_SENSITIVITY']))
+    products = column(PRODUCTS)
+    axes = {axis: [i + 1 for i in sampler.indices(5, n)] for axis in tax['CULTURE_AXES']}
+    years = [int(u * 30) for u in sampler.uniform(n)]
+
+    culture_columns = {
+        'communicationStyle': column(concrete(tax['COMMUNICATION_STYLES'])),
+        'timeOrientation': column(concrete(tax['TIME_ORIENTATIONS'])),
+        'formalityNorm': column(concrete(tax['FORMALITY_NORMS'])),
+    }
+    economic_columns = {
+        'financialBackground': column(concrete(tax['FINANCIAL_BACKGROUNDS'])),
+        'familyFinancialBackground': column(concrete(tax['FAMILY_FINANCIAL_BACKGROUNDS'])),
+        'socioeconomicStatus': column(concrete(tax['SES_LEVELS'])),
+        'purchaseFrequency': column(concrete(tax['PURCHASE_FREQUENCY'])),
+        'savingsInclination': column(concrete(tax['SAVINGS_INCLINATION'])),
+        'riskAppetite': column(concrete(tax['RISK_APPETITE'])),
+        'creditAccess': column(concrete(tax['CREDIT_ACCESS'])),
+    }
+    values = multi(tax['VALUES_LIBRARY'], 1, 4)
+    emotions = multi(tax['EMOTIONS_LIBRARY'], 1, 3)
+    fears = multi(tax['FEARS_LIBRARY'], 1, 3)
+    goals = multi(tax['FINANCIAL_GOALS'], 1, 3)
+    constraints = multi(tax['CONSTRAINTS'], 0, 2)
+    payments = flags(tax['PAYMENT_BEHAVIOURS'], 1, 3)
+    workweeks = column(WORKWEEKS)
+    bools = sampler.indices(16, n)
+
+    rows = []
+    for i in range(n):
+        locale = locales[i][0]
+        country, state, city = regions[i]
+        profession, industry = professions[i], industries[i]
+        segment = {
+            'name': clean_text(f"{profession[1]} in {industry[1]} - {city} #{i + 1}", blocked)[:100],
+            'workspaceId': '${workspace_id}',
+            'frame': clean_text(f"{profession[1]}s working in {industry[1].lower()}", blocked),
+            'product': products[i],
+            'primaryBenefit': f"{products[i]} priced for the {brackets[i][1]} income bracket"[:200],
+            'reason': clean_text(f"{price[i][1]}", blocked),
+            'context': clean_text(f"{urbanicity[i][1]} audience in {city}, {country}; "
+                                  f"{profession[1].lower()} with {economic_columns['purchaseFrequency'][i][1].lower()}",
+                                  blocked)[:1000],
+            'cultureAxes': {axis: draws[i] for axis, draws in axes.items()},
+            'values': values[i],
+            'emotions': emotions[i],
+            'fears': fears[i],
+            'evidence': f"Synthetic combination {i + 1} from seed-data taxonomies",
+            'notes': f"Generated for load testing ({sampler.backend} sampler)"
+        }
+        culture = {
+            'segmentId': '${segment_id}',
+            'locale': locale,
+            'languages': [{'code': locale[:2], 'script': SCRIPTS[locale[:2]], 'proficiency': 'primary'}],
+            'region': {'country': country, 'state': state, 'city': city,
+                       'cityTier': CITY_TIERS[urbanicity[i][0]]},
+            'urbanicity': urbanicity[i][0],
+            **{field: picks[i][0] for field, picks in culture_columns.items()},
+            'workweek': workweeks[i],
+            'purchasingConstraints': {'cod_prevalence': bool(bools[i] & 1), 'low_bandwidth': bool(bools[i] & 2)},
+            'deviceChannelPrefs': {'whatsapp_preferred': bool(bools[i] & 4), 'android_share_high': bool(bools[i] & 8)}
+        }
+        economic = {
+            'segmentId': '${segment_id}',
+            'currency': currencies[i],
+            'incomeBracket': brackets[i][0],
+            'profession': profession[0],
+            'industry': industry[0],
+            'yearsOfService': 0 if profession[0] == 'student' else years[i],
+            'employmentType': employment[i],
+            'priceSensitivity': price[i][0],
+            'paymentBehaviour': payments[i],
+            'financialGoals': goals[i],
+            'constraints': constraints[i],
+            **{field: picks[i][0] for field, picks in economic_columns.items()}
+        }
+        rows.append({'segment': segment, 'culture': culture, 'economic': economic})
+    return rows
+
+
+def combo_key(row):
+    """Stable key of the culture + economic inputs, ignoring ids and free text"""
+    inputs = {part: {k: v for k, v in row[part].items() if k != 'segmentId'} for part in ('culture', 'economic')}
+    return hashlib.sha1(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def diversity(rows):
+    """Distinct combination keys and distinct values per economic/culture field"""
+    fields = {}
+    for row in rows:
+        for part in ('culture', 'economic'):
+            for key, value in row[part].items():
+                if key != 'segmentId':
+                    fields.setdefault(f"{part}.{key}", set()).add(json.dumps(value, sort_keys=True))
+    return {
+        'rows': len(rows),
+        'distinct_combinations': len({combo_key(row) for row in rows}),
+        'distinct_per_field': {name: len(seen) for name, seen in sorted(fields.items())}
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate synthetic segment/culture/economic payloads')
+    parser.add_argument('-n', '--count', type=int, default=1000)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--backend', choices=('auto', 'numpy', 'random'), default='auto')
+    parser.add_argument('--output', default='persona_inputs.json')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        rows = generate(args.count, args.seed, args.backend)
+    except ImportError:
+        print("❌ --backend numpy needs numpy: pip install numpy")
+        return 2
+    elapsed = time.perf_counter() - start
+    stats = diversity(rows)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+    backend = make_sampler(0, args.backend).backend
+    print(f"✅ {len(rows)} combinations in {elapsed * 1000:.0f} ms "
+          f"({len(rows) / max(elapsed, 1e-9):,.0f}/s, {backend} sampler, seed {args.seed})")
+    print(f"🎲 Distinct culture+economic combinations: {stats['distinct_combinations']}")
+    print(f"💾 Written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Multi-tenant Isolation Benchmark - WorkspaceMember permission checks under load
+Logs in many synthetic users (see harness.auth_load), gives each a growing number of
+workspace memberships and hammers GET /workspaces/{id}/segments with a mix of:
+
+    allowed          one of the caller's own workspaces       -> expect 200, only its segments
+    denied_foreign   another tenant's real workspace          -> expect 403
+    denied_unknown   a well-formed id that does not exist     -> expect 403
+
+Any 200 on a denied id, or a segment from another workspace in an allowed response, is
+counted as a cross-tenant leak. Every membership level is run at every concurrency level,
+so the report shows both isolation and how permission-check latency grows with
+membership count.
+
+Memberships are created through POST /workspaces, which adds the caller as admin. The
+default workspace from a user's first login has no WorkspaceMember row and is not used.
+"""
+
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from harness.auth_load import AuthLoadRunner, SessionDataStub
+from harness.core import BASE_URL, percentile
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+from harness.scenario import SEGMENT_BODY, render
+
+KINDS = ('allowed', 'denied_foreign', 'denied_unknown')
+
+
+class TenantBenchmark(AuthLoadRunner):
+    """Grid of membership count x concurrency over authenticated tenants"""
+
+    def __init__(self, base_url=BASE_URL, users=20, memberships=(1, 5, 20), concurrency=(1, 8, 32),
+                 requests_per_cell=300, denied_ratio=0.5, segments_per_workspace=1,
+                 prefix='harness-tenant', seed=None, timeout=30):
+        super().__init__(base_url, users, stages=(users,), concurrency=max(concurrency),
+                         requests_per_stage=requests_per_cell, prefix=prefix, seed=seed, timeout=timeout)
+        self.membership_levels = sorted(memberships)
+        self.concurrency_levels = sorted(concurrency)
+        self.denied_ratio = denied_ratio
+        self.segments_per_workspace = segments_per_workspace
+        self.owned = {user.index: [] for user in self.users}
+        self.owner_of = {}
+
+    def provision(self, user, count):
+        """Top the user up to `count` workspaces, each seeded with segments"""
+        while len(self.owned[user.index]) < count:
+            n = len(self.owned[user.index]) + 1
+            response, _ = self.request(user, 'tenant_create_workspace', 'POST', '/workspaces',
+                                       body={'name': f"Tenant {user.index} Workspace {n}"}, phase='setup')
+            if response is None or response.status_code != 200:
+                return False
+            workspace_id = response.json()['workspace']['id']
+            for i in range(self.segments_per_workspace):
+                body = render(SEGMENT_BODY, {'workspace_id': workspace_id})
+                body['name'] = f"Tenant {user.index} Segment {n}-{i}"
+                self.request(user, 'tenant_create_segment', 'POST', '/segments', body=body, phase='setup')
+            self.owned[user.index].append(workspace_id)
+            self.owner_of[workspace_id] = user.index
+        return True
+
+    def plan(self, active):
+        """Pick (user, workspace id, kind) for one cell"""
+        picks = []
+        for _ in range(self.requests_per_stage):
+            user = self.rng.choice(active)
+            if self.rng.random() >= self.denied_ratio:
+                picks.append((user, self.rng.choice(self.owned[user.index]), 'allowed'))
+                continue
+            foreign = [w for u in active if u is not user for w in self.owned[u.index][:1]]
+            if foreign and self.rng.random() < 0.8:
+                picks.append((user, self.rng.choice(foreign), 'denied_foreign'))
+            else:
+                picks.append((user, '%024x' % self.rng.getrandbits(96), 'denied_unknown'))
+        return picks
+
+    def check(self, user, workspace_id, kind, memberships, concurrency):
+        response, sample = self.request(user, f"tenant_{kind}", 'GET', f"/workspaces/{workspace_id}/segments",
+                                        phase='measure', kind=kind, memberships=memberships,
+                                        concurrency=concurrency)
+        sample['leak'] = False
+        if response is None:
+            return
+        if kind == 'allowed':
+            try:
+                segments = response.json().get('segments', []) if response.status_code == 200 else []
+            except ValueError:
+                segments = []
+            strays = [s for s in segments if s.get('workspaceId') != workspace_id]
+            if strays:
+                sample['leak'] = True
+                sample['success'] = False
+                sample['message'] = f"{len(strays)} segment(s) from other workspaces"
+        else:
+            sample['success'] = response.status_code == 403
+            if response.status_code == 200:
+                sample['leak'] = True
+                owner = self.owner_of.get(workspace_id)
+                sample['message'] = f"User {user.index} read workspace of user {owner}"
+            elif not sample['success']:
+                sample['message'] = f"Expected 403, got {response.status_code}"
+
+    def run(self):
+        print(f"👥 Logging in {len(self.users)} tenants")
+        list(self.pool.map(self.login, self.users))
+        active = [u for u in self.users if u.logged_in]
+        if len(active) < 2:
+            print(f"❌ Need at least two logged-in tenants - is EMERGENT_BACKEND_URL pointing at the stub?")
+            return []
+
+        cells = []
+        for memberships in self.membership_levels:
+            print(f"🏢 Provisioning {memberships} membership(s) per tenant")
+            ready = list(self.pool.map(lambda u: self.provision(u, memberships), active))
+            active = [u for u, ok in zip(active, ready) if ok]
+            for concurrency in self.concurrency_levels:
+                picks = self.plan(active)
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    futures = [pool.submit(self.check, u, w, kind, memberships, concurrency)
+                               for u, w, kind in picks]
+                    for future in futures:
+                        future.result()
+                cells.append(self.cell_summary(memberships, concurrency))
+                cell = cells[-1]
+                marker = "❌" if cell['leaks'] else "✅"
+                print(f"   {marker} x{concurrency:<3} allowed p50 {cell['allowed']['p50_ms']:.0f} ms, "
+                      f"denied p50 {cell['denied_foreign']['p50_ms']:.0f} ms, leaks {cell['leaks']}")
+        self.pool.shutdown()
+        return cells
+
+    def cleanup(self):
+        """Delete the workspaces this run created"""
+        users = {u.index: u for u in self.users}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for workspace_id, index in self.owner_of.items():
+                pool.submit(self.request, users[index], 'tenant_delete_workspace', 'DELETE',
+                            f"/workspaces/{workspace_id}", phase='cleanup')
+
+    def cell_summary(self, memberships, concurrency):
+        samples = [s for s in self.samples if s.get('phase') == 'measure'
+                   and s['memberships'] == memberships and s['concurrency'] == concurrency]
+        cell = {'memberships': memberships, 'concurrency': concurrency, 'requests': len(samples),
+                'leaks': sum(1 for s in samples if s['leak']),
+                'failed': sum(1 for s in samples if not s['success'])}
+        for kind in KINDS:
+            latencies = sorted(s['latency_ms'] for s in samples if s['kind'] == kind)
+            cell[kind] = {
+                'count': len(latencies),
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95)
+            }
+        return cell
+
+
+def print_cells(cells):
+    print(f"\n{'='*80}")
+    print(f"🏁 MULTI-TENANT ISOLATION SUMMARY")
+    print(f"{'='*80}")
+    print(f"{'members':>8}{'conc':>6}{'reqs':>7}{'allow p50':>11}{'allow p95':>11}"
+          f"{'deny p50':>10}{'deny p95':>10}{'unknown p50':>13}{'errors':>8}{'leaks':>7}")
+    for cell in cells:
+        print(f"{cell['memberships']:>8}{cell['concurrency']:>6}{cell['requests']:>7}"
+              f"{cell['allowed']['p50_ms']:>11.0f}{cell['allowed']['p95_ms']:>11.0f}"
+              f"{cell['denied_foreign']['p50_ms']:>10.0f}{cell['denied_foreign']['p95_ms']:>10.0f}"
+              f"{cell['denied_unknown']['p50_ms']:>13.0f}{cell['failed']:>8}{cell['leaks']:>7}")
+
+    first = [c for c in cells if c['memberships'] == cells[0]['memberships']] if cells else []
+    last = [c for c in cells if c['memberships'] == cells[-1]['memberships']] if cells else []
+    if first and first[0]['allowed']['p50_ms'] and first[0]['memberships'] != last[0]['memberships']:
+        growth = last[0]['allowed']['p50_ms'] / first[0]['allowed']['p50_ms']
+        print(f"\n📈 Allowed p50 at concurrency {first[0]['concurrency']}: {growth:.2f}x from "
+              f"{first[0]['memberships']} to {last[0]['memberships']} memberships per tenant")
+    leaks = sum(c['leaks'] for c in cells)
+    total = sum(c['requests'] for c in cells)
+    if leaks:
+        print(f"❌ CROSS-TENANT LEAKAGE: {leaks} of {total} requests")
+    else:
+        print(f"✅ No cross-tenant leakage across {total} requests")
+
+
+def int_list(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Multi-tenant isolation and permission-check benchmark')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--memberships', type=int_list, default=[1, 5, 20],
+                        help='Memberships per tenant to measure at, comma-separated')
+    parser.add_argument('--concurrency', type=int_list, default=[1, 8, 32],
+                        help='Concurrency levels, comma-separated')
+    parser.add_argument('--requests', type=int, default=300, help='Requests per membership/concurrency cell')
+    parser.add_argument('--denied-ratio', type=float, default=0.5)
+    parser.add_argument('--segments-per-workspace', type=int, default=1)
+    parser.add_argument('--prefix', default='harness-tenant')
+    parser.add_argument('--stub-host', default='127.0.0.1')
+    parser.add_argument('--stub-port', type=int, default=8902)
+    parser.add_argument('--no-stub', action='store_true', help='The session-data stand-in is already running')
+    parser.add_argument('--keep', action='store_true', help='Keep the created workspaces')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--output', default='tenant_bench_results.json')
+    args = parser.parse_args(argv)
+
+    bench = TenantBenchmark(args.base_url, args.users, args.memberships, args.concurrency, args.requests,
+                            args.denied_ratio, args.segments_per_workspace, args.prefix, args.seed,
+                            args.timeout)
+    print(f"🚀 Multi-tenant isolation benchmark: {args.users} tenants")
+    print(f"📍 Base URL: {bench.base_url}")
+    stub = None if args.no_stub else SessionDataStub(args.stub_host, args.stub_port)
+    if stub:
+        stub.start()
+        print(f"🔐 Session-data stand-in: {stub.base_url} (app needs EMERGENT_BACKEND_URL={stub.base_url})")
+    monitor = OverheadMonitor().start()
+    try:
+        cells = bench.run()
+        overhead = finish(monitor, bench.samples)
+        if not args.keep:
+            bench.cleanup()
+    finally:
+        if stub:
+            stub.stop()
+    print_cells(cells)
+    print_overhead(overhead)
+
+    leaks = sum(c['leaks'] for c in cells)
+    failed = sum(c['failed'] for c in cells)
+    payload = {
+        'summary': {
+            'tenants': args.users,
+            'total_requests': len(bench.samples),
+            'failed': failed,
+            'leaks': leaks,
+            'cells': cells,
+            'client_overhead': overhead,
+            'test_completed_at': datetime.now().isoformat()
+        },
+        'samples': bench.samples
+    }
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'tenant_bench')
+    return 0 if cells and not leaks and not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Validation Fuzz - correctness and throughput of blocked-term scanning
+validateContent finds blocked terms with the Aho-Corasick matcher in lib/term-matcher.js.
+This tool drives that module in node (no app server needed):
+
+    fuzz        `--cases` random texts - terms in mixed case, glued to other words,
+                split by tabs and newlines, next to punctuation and non-ASCII
+                letters - checked against a per-term regex with the same word
+                boundaries and affixes as the reference
+    pinned      inflected and derived forms the matcher must reject ("religions",
+                "rejection", "unnatural") and words that merely contain a term
+                that it must accept ("embrace", "racing"), checked against the
+                real BLOCKED_TERMS
+    throughput  scans of `--sizes` characters of prose against the real BLOCKED_TERMS
+                and against synthetic lists of `--terms` terms, timed for the
+                matcher, a compiled alternation regex and the previous
+                lowercase-and-includes loop
+
+With --http the app's own path is timed as well: POST /segments with notes of each
+size ending in a blocked term, which validation rejects (400) before anything is
+written.
+
+    python -m harness.validation_fuzz --terms 100,1000,10000 --sizes 1000,100000,1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import requests
+
+from harness.core import BASE_URL, DEMO_MODE, DEMO_PARAMS, JSON_HEADERS
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+from harness.synth import load_taxonomies
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPLEMENTATIONS = ('automaton', 'regex', 'includes')
+FILLER = ('value', 'growth', 'trust', 'price', 'clarity', 'community', 'savings', 'quality', 'support', 'simple',
+          'local', 'digital', 'family', 'secure', 'flexible', 'proven', 'customers', 'weekly', 'budget', 'plan')
+GLUE = ('em', 'un', 'non', 'ing', 's', 'ed', 'ity', 'ion', 'ly', 'ism', 'line', 'track', '_', '1', 'é', 'ß')
+SEPARATORS = (' ', ' ', ' ', ', ', '. ', '\n', '\t', ' (', ') ', ' "', '" ', ' - ', '/')
+EXOTIC = ('é', 'ü', 'ñ', 'ø', 'ß', 'Ä', 'ğ', 'अ', '中', '𝒜', '😀')
+# Inflected and derived forms the old substring check rejected and the matcher must keep
+# rejecting (text, term reported), checked against the real BLOCKED_TERMS
+MUST_REJECT = (
+    ('Reaching families of all religions', 'religion'),
+    ('Messaging that differs across castes', 'caste'),
+    ('Support for refugees in the city', 'refugee'),
+    ('Shoppers who felt discriminated against', 'discriminate'),
+    ('Students excluded from the programme', 'exclude'),
+    ('Excluding older buyers', 'exclude'),
+    ('Rejected applicants', 'reject'),
+    ('Members of both political parties', 'political party'),
+    ('Skin colors and tones', 'skin color'),
+    ('Colours of the flag', 'colour'),
+    ('Racial superiority', 'superior'),
+    ('An inferiority complex', 'inferior'),
+    ('Fear of rejection', 'reject'),
+    ('Naturally gifted', 'natural'),
+    ('Unnatural choices', 'natural'),
+    ('A proud bloodline', 'blood'),
+    ('Genetically better', 'genetic'),
+    ('Avoidance of crowds', 'avoid'),
+    ('Casteism in hiring', 'caste'),
+    ('Racism at work', 'race'),
+)
+# Words that only contain a blocked term and must pass
+MUST_ACCEPT = ('Embrace the change', 'Racetrack fans on weekends', 'A bloodhound of a salesperson', 'Unavoidable costs',
+               'Racing fans', 'Casting call for the campaign')
+
+# Runs in node; reads the config written by run_driver and prints JSON results
+DRIVER = r"""
+import { readFileSync } from 'node:fs';
+import { pathToFileURL } from 'node:url';
+import path from 'node:path';
+
+const config = JSON.parse(readFileSync(process.env.VALIDATION_FUZZ_CONFIG, 'utf8'));
+const { TermMatcher, PREFIXES, stems } = await import(pathToFileURL(path.join(config.repo, 'lib', 'term-matcher.js')).href);
+
+const escape = term => term.toLowerCase().replace(/[.*+?^${}()|[\]\\]/g, '\\$&').replace(/\s/g, '\\s');
+const BOUNDED = body => `(?<![\\p{L}\\p{N}_])(?:${PREFIXES.join('|')})?(?:${body})(?![\\p{L}\\p{N}_])`;
+
+// A stem with its allowed endings as a regex alternative
+const stemSource = ({ stem, suffixes, bare }) =>
+  suffixes.length ? `${escape(stem)}(?:${suffixes.join('|')})${bare ? '?' : ''}` : escape(stem);
+
+function reference(terms, text) {
+  const lower = text.toLowerCase();
+  return terms.filter(term => new RegExp(BOUNDED(stems(term).map(stemSource).join('|')), 'u').test(lower));
+}
+
+function alternation(terms) {
+  const sorted = terms.flatMap(stems).sort((a, b) => b.stem.length - a.stem.length);
+  const pattern = new RegExp(BOUNDED(sorted.map(stemSource).join('|')), 'gu');
+  return text => {
+    const found = new Set();
+    for (const match of text.toLowerCase().matchAll(pattern)) found.add(match[0]);
+    return found;
+  };
+}
+
+function includesLoop(terms) {
+  return text => {
+    const lower = text.toLowerCase();
+    return terms.filter(term => lower.includes(term.toLowerCase()));
+  };
+}
+
+function time(fn, minMs) {
+  let runs = 0;
+  const start = performance.now();
+  let elapsed = 0;
+  do {
+    fn();
+    runs += 1;
+    elapsed = performance.now() - start;
+  } while (elapsed < minMs);
+  return elapsed / runs;
+}
+
+const mismatches = [];
+for (const testCase of config.cases) {
+  const matcher = new TermMatcher(testCase.terms);
+  const got = matcher.find(testCase.text);
+  const want = reference(testCase.terms, testCase.text);
+  if (JSON.stringify(got) !== JSON.stringify(want)) {
+    mismatches.push({ text: testCase.text, terms: testCase.terms, got, want });
+  }
+}
+
+const blocked = new TermMatcher(config.termLists.blocked);
+const pinned = [];
+for (const [text, term] of config.mustReject) {
+  const got = blocked.find(text);
+  if (!got.includes(term)) pinned.push({ text, got, want: [term] });
+}
+for (const text of config.mustAccept) {
+  const got = blocked.find(text);
+  if (got.length) pinned.push({ text, got, want: [] });
+}
+
+const throughput = [];
+for (const [listName, terms] of Object.entries(config.termLists)) {
+  let start = performance.now();
+  const matcher = new TermMatcher(terms);
+  const builds = { automaton: performance.now() - start };
+  start = performance.now();
+  const regex = alternation(terms);
+  builds.regex = performance.now() - start;
+  builds.includes = 0;
+  const scanners = { automaton: text => matcher.match(text), regex, includes: includesLoop(terms) };
+
+  for (const [size, text] of Object.entries(config.texts)) {
+    for (const name of config.implementations) {
+      const ms = time(() => scanners[name](text), config.minMs);
+      throughput.push({ list: listName, terms: terms.length, size: Number(size), implementation: name,
+                        build_ms: builds[name], scan_ms: ms });
+    }
+  }
+}
+
+console.log(JSON.stringify({ cases: config.cases.length, mismatches: mismatches.slice(0, 20),
+                             mismatch_count: mismatches.length, pinned, throughput }));
+"""
+
+
+def random_word(rng, low=3, high=10):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(low, high)))
+
+
+def synthetic_terms(rng, count):
+    """Distinct terms, a fifth of them two words long"""
+    terms = set()
+    while len(terms) < count:
+        word = random_word(rng, 4, 12)
+        terms.add(f"{word} {random_word(rng, 3, 8)}" if rng.random() < 0.2 else word)
+    return sorted(terms)
+
+
+def mangle(rng, term):
+    """A term as it might appear in user text"""
+    term = ''.join(c.upper() if rng.random() < 0.3 else c for c in term)
+    if ' ' in term and rng.random() < 0.3:
+        term = term.replace(' ', rng.choice(('\t', '\n', '  ', ' ')))
+    roll = rng.random()
+    if roll < 0.25:
+        term = rng.choice(GLUE) + term
+    elif roll < 0.5:
+        term += rng.choice(GLUE)
+    return term
+
+
+def fuzz_cases(rng, blocked, count):
+    cases = []
+    for _ in range(count):
+        terms = rng.sample(blocked, rng.randint(1, min(8, len(blocked))))
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            roll = rng.random()
+            if roll < 0.4:
+                parts.append(mangle(rng, rng.choice(terms)))
+            elif roll < 0.55:
+                parts.append(rng.choice(EXOTIC) + rng.choice(FILLER))
+            else:
+                parts.append(rng.choice(FILLER))
+            parts.append(rng.choice(SEPARATORS))
+        cases.append({'terms': terms, 'text': ''.join(parts)})
+    return cases
+
+
+def prose(rng, size, terms, density=0.001):
+    """Filler text of `size` characters with occasional terms mixed in"""
+    words, length = [], 0
+    while length < size:
+        word = rng.choice(terms) if terms and rng.random() < density else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)[:size]
+
+
+def run_driver(config, node='node', timeout=600):
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(config, f)
+        path = f.name
+    try:
+        result = subprocess.run([node, '--input-type=module', '-'], input=DRIVER, capture_output=True, text=True,
+                                timeout=timeout, env={**os.environ, 'VALIDATION_FUZZ_CONFIG': path})
+    finally:
+        os.unlink(path)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"node exited with {result.returncode}")
+    return json.loads(result.stdout)
+
+
+def http_probe(base_url, sizes, blocked, rng, timeout=60):
+    """Time POST /segments with large notes that validation rejects; returns samples"""
+    session = requests.Session()
+    session.headers.update(JSON_HEADERS)
+    params = DEMO_PARAMS if DEMO_MODE else {}
+    workspaces = session.get(f"{base_url}/workspaces", params=params, timeout=timeout).json().get('workspaces') or []
+    if not workspaces:
+        return []
+    samples = []
+    for size in sizes:
+        term = rng.choice(blocked)
+        notes = prose(rng, size, []) + f" {term}"
+        start = time.perf_counter()
+        sample = {'test': 'validate_segment_notes', 'method': 'POST', 'endpoint': '/segments', 'started_at': time.time(),
+                  'status': None, 'latency_ms': None, 'bytes': len(notes), 'success': False, 'size': size, 'term': term}
+        try:
+            response = session.post(f"{base_url}/segments", params=params, timeout=timeout,
+                                    json={'name': 'Validation Fuzz', 'workspaceId': workspaces[0]['id'], 'notes': notes})
+            issues = response.json().get('issues', []) if response.status_code == 400 else []
+            sample.update({'status': response.status_code,
+                           'success': any(issue.get('term') == term for issue in issues)})
+        except (requests.RequestException, ValueError) as e:
+            sample['message'] = f"Request failed: {e.__class__.__name__}"
+        sample['latency_ms'] = (time.perf_counter() - start) * 1000
+        samples.append(sample)
+    return samples
+
+
+def to_samples(throughput, started_at):
+    """Scan timings in the harness sample format, one per implementation and input"""
+    return [{'test': f"scan_{row['implementation']}", 'method': 'SCAN',
+             'endpoint': f"validateContent[{row['list']}x{row['size']}]", 'status': 200,
+             'latency_ms': row['scan_ms'], 'bytes': row['size'], 'success': True, 'started_at': started_at}
+            for row in throughput]
+
+
+def summarize(result, http_samples):
+    rows = result['throughput']
+    for row in rows:
+        row['mb_per_s'] = row['size'] / 1e6 / (row['scan_ms'] / 1000) if row['scan_ms'] else None
+    speedups = []
+    for row in rows:
+        if row['implementation'] != 'automaton':
+            continue
+        others = {r['implementation']: r['scan_ms'] for r in rows
+                  if r['list'] == row['list'] and r['size'] == row['size']}
+        speedups.append({'list': row['list'], 'terms': row['terms'], 'size': row['size'],
+                         'vs_includes': others.get('includes', 0) / row['scan_ms'] if row['scan_ms'] else None,
+                         'vs_regex': others.get('regex', 0) / row['scan_ms'] if row['scan_ms'] else None})
+    return {
+        'fuzz_cases': result['cases'],
+        'mismatches': result['mismatch_count'],
+        'mismatch_examples': result['mismatches'],
+        'pinned_cases': len(MUST_REJECT) + len(MUST_ACCEPT),
+        'pinned_failures': result['pinned'],
+        'throughput': rows,
+        'speedups': speedups,
+        'http': [{'size': s['size'], 'status': s['status'], 'latency_ms': s['latency_ms'], 'detected': s['success']}
+                 for s in http_samples],
+        'passed': result['mismatch_count'] == 0 and not result['pinned'] and all(s['success'] for s in http_samples),
+        'test_completed_at': datetime.now().isoformat()
+    }
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 VALIDATION FUZZ - blocked-term matcher")
+    print(f"{'='*80}")
+    if summary['mismatches']:
+        print(f"❌ {summary['mismatches']} of {summary['fuzz_cases']} fuzz cases disagree with the reference:")
+        for case in summary['mismatch_examples'][:5]:
+            print(f"   {case['text']!r}: got {case['got']}, want {case['want']}")
+    else:
+        print(f"✅ {summary['fuzz_cases']} fuzz cases match the reference")
+    if summary['pinned_failures']:
+        print(f"❌ {len(summary['pinned_failures'])} of {summary['pinned_cases']} pinned cases fail:")
+        for case in summary['pinned_failures']:
+            print(f"   {case['text']!r}: got {case['got']}, want {case['want']}")
+    else:
+        print(f"✅ {summary['pinned_cases']} pinned affix and word-boundary cases hold")
+
+    print(f"\n{'terms':<16}{'size':>10}" + ''.join(f"{name + ' MB/s':>18}" for name in IMPLEMENTATIONS)
+          + f"{'build ms':>10}")
+    groups = {}
+    for row in summary['throughput']:
+        groups.setdefault((row['list'], row['terms'], row['size']), {})[row['implementation']] = row
+    for (name, count, size), rows in groups.items():
+        cells = ''.join(f"{rows[impl]['mb_per_s']:>18.1f}" if impl in rows else f"{'-':>18}" for impl in IMPLEMENTATIONS)
+        build = rows.get('automaton', {}).get('build_ms', 0.0)
+        print(f"{name + f' ({count})':<16}{size:>10}{cells}{build:>10.1f}")
+    largest = max(summary['speedups'], key=lambda s: (s['terms'], s['size']), default=None)
+    if largest and largest['vs_includes']:
+        print(f"\n⚡ {largest['terms']} terms x {largest['size']} chars: automaton {largest['vs_includes']:.1f}x the "
+              f"includes loop, {largest['vs_regex']:.1f}x the alternation regex")
+    for probe in summary['http']:
+        print(f"🌐 POST /segments notes={probe['size']}: {probe['status']} in {probe['latency_ms']:.1f} ms "
+              f"{'✅' if probe['detected'] else '❌ term not reported'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fuzz and benchmark the blocked-term matcher')
+    parser.add_argument('--cases', type=int, default=2000, help='Fuzz cases')
+    parser.add_argument('--terms', default='100,1000,10000', help='Synthetic term list sizes')
+    parser.add_argument('--sizes', default='1000,100000,1000000', help='Text sizes in characters')
+    parser.add_argument('--implementations', default=','.join(IMPLEMENTATIONS))
+    parser.add_argument('--min-ms', type=float, default=200, help='Minimum timing window per measurement')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--node', default='node', help='node executable')
+    parser.add_argument('--http', action='store_true', help='Also time validation through POST /segments')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--output', default='validation_fuzz_results.json')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    blocked = load_taxonomies()['BLOCKED_TERMS']
+    sizes = [int(size) for size in args.sizes.split(',')]
+    term_lists = {'blocked': blocked}
+    for count in (int(c) for c in args.terms.split(',') if c):
+        term_lists[f"synthetic-{count}"] = synthetic_terms(rng, count)
+    all_terms = [t for terms in term_lists.values() for t in terms]
+    config = {
+        'repo': REPO,
+        'cases': fuzz_cases(rng, blocked, args.cases // 2) + fuzz_cases(rng, synthetic_terms(rng, 50), args.cases // 2),
+        'termLists': term_lists,
+        'mustReject': MUST_REJECT,
+        'mustAccept': MUST_ACCEPT,
+        'texts': {str(size): prose(rng, size, all_terms) for size in sizes},
+        'implementations': [name for name in args.implementations.split(',') if name in IMPLEMENTATIONS],
+        'minMs': args.min_ms
+    }
+
+    print(f"🚀 Validation fuzz: {args.cases} cases, term lists {', '.join(f'{k} ({len(v)})' for k, v in term_lists.items())}")
+    monitor = OverheadMonitor().start()
+    started_at = time.time()
+    try:
+        result = run_driver(config, args.node)
+    except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+        print(f"❌ Could not run the node driver: {e}")
+        return 2
+    http_samples = http_probe(args.base_url.rstrip('/'), sizes, blocked, rng) if args.http else []
+    samples = to_samples(result['throughput'], started_at) + http_samples
+    summary = summarize(result, http_samples)
+    summary['client_overhead'] = finish(monitor, http_samples)
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'validation_fuzz')
+    return 0 if summary['passed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Wire Bytes - transferred vs decoded size of the large API responses
+With API_COMPRESSION=true the API compresses JSON responses of a kilobyte or more with
+brotli or gzip, as the client's Accept-Encoding asks; ?compact=true drops fields holding
+null, '', [] or {} whether or not compression is on. This tool
+creates a persona with stored strategies, then requests the large read endpoints
+
+    GET /workspaces
+    GET /workspaces/:id/segments
+    GET /personas/:id/export
+    GET /personas/:id/strategies/export-all
+
+with each of `--encodings` (identity, gzip, br), with and without ?compact=true. Each
+sample records the bytes on the wire, the decoded bytes, the server's compression time
+(X-Compress-Ms) and the client's decode time, and the summary estimates transfer time
+over slow networks, where the savings matter most.
+
+    python -m harness.wire_bytes --requests 10
+    python -m harness.wire_bytes --encodings identity,gzip --no-compact
+
+Decoding brotli locally needs the brotli package (pip install brotli); without it the
+decoded size of br responses is taken from X-Uncompressed-Bytes and decode time is not
+measured.
+"""
+
+import argparse
+import json
+import sys
+import time
+import zlib
+from datetime import datetime
+
+import requests
+
+from harness.core import (BASE_URL, DEMO_MODE, DEMO_PARAMS, JSON_HEADERS, normalize_endpoint, percentile,
+                          provision_inputs, record_request)
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENCODINGS = ('identity', 'gzip', 'br')
+# Downlink bandwidth in bits per second (Chrome DevTools throttling presets)
+NETWORKS = {'slow 3G': 400_000, 'fast 3G': 1_600_000, '4G': 9_000_000}
+
+
+def decode(body, encoding):
+    """Decoded body and client decode time in ms; (None, None) when it cannot be decoded here"""
+    start = time.perf_counter()
+    if encoding == 'gzip':
+        decoded = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+    elif encoding == 'br':
+        if brotli is None:
+            return None, None
+        decoded = brotli.decompress(body)
+    elif encoding == 'deflate':
+        decoded = zlib.decompress(body)
+    else:
+        return body, 0.0
+    return decoded, (time.perf_counter() - start) * 1000
+
+
+class WireBytes:
+    def __init__(self, base_url=BASE_URL, requests_total=10, encodings=ENCODINGS, compact=True, timeout=60,
+                 seed=None):
+        self.base_url = base_url.rstrip('/')
+        self.requests_total = requests_total
+        self.encodings = encodings
+        self.compact_modes = (False, True) if compact else (False,)
+        self.timeout = timeout
+        self.seed = seed
+        self.params = DEMO_PARAMS if DEMO_MODE else {}
+        self.session = requests.Session()
+        self.session.headers.update(JSON_HEADERS)
+        self.samples = []
+        self.segment_id = None
+
+    def request(self, test, method, path, body=None):
+        response, sample = record_request(self.session, self.base_url, test, method, path, self.samples, body=body,
+                                          params=self.params, timeout=self.timeout)
+        return response.json() if sample['success'] else None
+
+    def provision(self):
+        """Create a persona with stored strategies; returns the paths to measure"""
+        workspace_id, inputs = provision_inputs(self.session, self.base_url, self.samples, self.seed,
+                                                params=self.params, timeout=self.timeout, workspace_name='Wire Bytes')
+        if not workspace_id:
+            return []
+        paths = ['/workspaces', f"/workspaces/{workspace_id}/segments"]
+        if not inputs:
+            return paths
+
+        self.segment_id = inputs[0]['segmentId']
+        persona = self.request('setup', 'POST', '/personas/generate', inputs[0])
+        if persona:
+            persona_id = persona['persona']['id']
+            self.request('setup', 'POST', f"/personas/{persona_id}/strategies/generate")
+            paths += [f"/personas/{persona_id}/export", f"/personas/{persona_id}/strategies/export-all"]
+        return paths
+
+    def fetch(self, path, encoding, compact):
+        params = {**self.params, **({'compact': 'true'} if compact else {})}
+        sample = {'test': 'wire_bytes', 'method': 'GET', 'endpoint': normalize_endpoint(path), 'started_at': time.time(),
+                  'status': None, 'latency_ms': None, 'bytes': 0, 'success': False, 'encoding': encoding,
+                  'compact': compact, 'content_encoding': None, 'decoded_bytes': None, 'compress_ms': None,
+                  'decode_ms': None}
+        start = time.perf_counter()
+        try:
+            with self.session.get(f"{self.base_url}{path}", params=params, headers={'Accept-Encoding': encoding},
+                                  stream=True, timeout=self.timeout) as response:
+                # The body exactly as transferred, before urllib3 would decode it
+                wire = response.raw.read(decode_content=False)
+                sample['latency_ms'] = (time.perf_counter() - start) * 1000
+                served = response.headers.get('Content-Encoding')
+                sample.update({'status': response.status_code, 'bytes': len(wire), 'content_encoding': served,
+                               'success': response.status_code == 200})
+                if 'X-Compress-Ms' in response.headers:
+                    sample['compress_ms'] = float(response.headers['X-Compress-Ms'])
+                decoded, sample['decode_ms'] = decode(wire, served)
+                if decoded is not None:
+                    sample['decoded_bytes'] = len(decoded)
+                    json.loads(decoded)
+                elif 'X-Uncompressed-Bytes' in response.headers:
+                    sample['decoded_bytes'] = int(response.headers['X-Uncompressed-Bytes'])
+        except (requests.RequestException, zlib.error, ValueError) as e:
+            sample['latency_ms'] = (time.perf_counter() - start) * 1000
+            sample['success'] = False
+            sample['message'] = f"Request failed: {e.__class__.__name__}"
+        self.samples.append(sample)
+        return sample
+
+    def run(self):
+        paths = self.provision()
+        if not paths:
+            return None
+        for _ in range(self.requests_total):
+            for path in paths:
+                for compact in self.compact_modes:
+                    for encoding in self.encodings:
+                        self.fetch(path, encoding, compact)
+        return self.summary()
+
+    def cleanup(self):
+        if self.segment_id:
+            self.request('cleanup', 'DELETE', f"/segments/{self.segment_id}")
+
+    def summary(self):
+        def median(values):
+            values = sorted(v for v in values if v is not None)
+            return percentile(values, 50) if values else None
+
+        endpoints = {}
+        for sample in self.samples:
+            if sample['test'] == 'wire_bytes':
+                endpoints.setdefault(sample['endpoint'], []).append(sample)
+
+        results = {}
+        for endpoint, samples in endpoints.items():
+            baseline = median(s['bytes'] for s in samples
+                              if s['success'] and s['encoding'] == 'identity' and not s['compact'])
+            variants = []
+            for compact in self.compact_modes:
+                for encoding in self.encodings:
+                    chosen = [s for s in samples if s['success'] and s['encoding'] == encoding and s['compact'] == compact]
+                    if not chosen:
+                        continue
+                    wire = median(s['bytes'] for s in chosen)
+                    served = {s['content_encoding'] or 'identity' for s in chosen}
+                    variants.append({
+                        'encoding': encoding,
+                        'compact': compact,
+                        'served': sorted(served),
+                        'wire_bytes': wire,
+                        'decoded_bytes': median(s['decoded_bytes'] for s in chosen),
+                        # Wire bytes relative to the plain identity response
+                        'ratio': wire / baseline if baseline else None,
+                        'compress_ms_p50': median(s['compress_ms'] for s in chosen),
+                        'decode_ms_p50': median(s['decode_ms'] for s in chosen),
+                        'latency_p50_ms': median(s['latency_ms'] for s in chosen),
+                        'transfer_ms': {name: wire * 8 / bps * 1000 for name, bps in NETWORKS.items()}
+                    })
+            results[endpoint] = {'identity_bytes': baseline, 'variants': variants}
+
+        measured = [s for s in self.samples if s['test'] == 'wire_bytes']
+        return {
+            'requests': self.requests_total,
+            'encodings': list(self.encodings),
+            'brotli_decoder': brotli is not None,
+            'endpoints': results,
+            'failed': sum(1 for s in measured if not s['success']),
+            'total_requests': len(self.samples),
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 WIRE BYTES - {summary['requests']} requests per endpoint and variant")
+    print(f"{'='*80}")
+    slow = next(iter(NETWORKS))
+    for endpoint, row in summary['endpoints'].items():
+        print(f"\n📍 {endpoint} ({row['identity_bytes'] or 0:.0f} B uncompressed)")
+        print(f"  {'variant':<18}{'served':>10}{'wire B':>9}{'decoded B':>11}{'ratio':>7}{'server ms':>11}"
+              f"{'decode ms':>11}{slow + ' ms':>13}")
+        for v in row['variants']:
+            label = f"{v['encoding']}{' +compact' if v['compact'] else ''}"
+            ratio = f"{v['ratio']:.2f}" if v['ratio'] is not None else '-'
+            server = f"{v['compress_ms_p50']:.2f}" if v['compress_ms_p50'] is not None else '-'
+            client = f"{v['decode_ms_p50']:.2f}" if v['decode_ms_p50'] is not None else '-'
+            decoded = f"{v['decoded_bytes']:.0f}" if v['decoded_bytes'] is not None else '-'
+            print(f"  {label:<18}{','.join(v['served']):>10}{v['wire_bytes']:>9.0f}{decoded:>11}{ratio:>7}"
+                  f"{server:>11}{client:>11}{v['transfer_ms'][slow]:>13.0f}")
+    served = {e for row in summary['endpoints'].values() for v in row['variants'] for e in v['served']}
+    if served <= {'identity'}:
+        print("\n⚠️  No response was compressed: start the app with API_COMPRESSION=true")
+    served_br = 'br' in served
+    if served_br and not summary['brotli_decoder']:
+        print("\n⚠️  brotli is not installed: br sizes come from X-Uncompressed-Bytes, decode time is not measured")
+    if summary['failed']:
+        print(f"❌ {summary['failed']} requests failed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure wire vs decoded bytes of the large API responses')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--requests', type=int, default=10, help='Requests per endpoint and variant')
+    parser.add_argument('--encodings', default=','.join(ENCODINGS), help='Comma-separated Accept-Encoding values')
+    parser.add_argument('--no-compact', dest='compact', action='store_false', help='Skip the ?compact=true variants')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--keep', action='store_true', help='Keep the created segment')
+    parser.add_argument('--output', default='wire_bytes_results.json')
+    args = parser.parse_args(argv)
+
+    encodings = tuple(encoding.strip() for encoding in args.encodings.split(','))
+    client = WireBytes(args.base_url, args.requests, encodings, args.compact, args.timeout, args.seed)
+    print(f"🚀 Wire bytes: {', '.join(encodings)}{' (and compact)' if args.compact else ''}")
+    print(f"📍 Base URL: {client.base_url}")
+    monitor = OverheadMonitor().start()
+    summary = client.run()
+    if summary is None:
+        print("❌ Could not create a workspace")
+        return 2
+    summary['client_overhead'] = finish(monitor, client.samples)
+    if not args.keep:
+        client.cleanup()
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': client.samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'wire_bytes')
+    return 0 if not summary['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
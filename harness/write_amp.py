@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Write Amplification - database writes per API mutation
+Runs a fixed mutation workload (workspace, segment, profiles, persona, strategies, then
+the deletes) and reads the X-DB-* headers the app adds when started with DB_STATS=true
+(lib/db-stats.js): queries, writes, bytes written, AuditLog writes and DB time for each
+request. The report shows, per endpoint, how many database writes and bytes one logical
+mutation costs, and what synchronous audit logging (one AuditLog row per mutation)
+would add on top.
+
+    DB_STATS=true EMERGENT_BACKEND_URL=http://127.0.0.1:8902 yarn dev
+    python -m harness.write_amp --iterations 20
+
+Mutations need a real user, so the run logs in through the session-data stand-in from
+harness.auth_load unless --no-auth is given.
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+
+import requests
+
+from harness.auth_load import SessionDataStub
+from harness.core import BASE_URL, normalize_endpoint
+from harness.history import record_run
+from harness.overhead import OverheadMonitor, finish, print_overhead
+from harness.scenario import ScenarioError, Step
+
+WORKLOAD = [
+    {'request': 'create_workspace'},
+    {'request': 'update_workspace'},
+    {'request': 'create_segment'},
+    {'request': 'update_segment'},
+    {'request': 'create_culture_profile'},
+    {'request': 'create_economic_profile'},
+    {'request': 'generate_persona'},
+    {'request': 'generate_strategy', 'vars': {'strategy_type': 'positioning'}, 'name': 'generate_positioning'},
+    {'request': 'generate_strategy', 'vars': {'strategy_type': 'messaging'}, 'name': 'generate_messaging'},
+    {'request': 'generate_strategy', 'vars': {'strategy_type': 'pricing'}, 'name': 'generate_pricing'},
+    {'request': 'delete_persona'},
+    {'request': 'delete_segment'},
+    {'request': 'delete_workspace'},
+]
+
+
+def parse_ops(header):
+    """'Workspace.create:1:120,WorkspaceMember.create:1:80' -> {'Workspace.create': (1, 120), ...}"""
+    ops = {}
+    for item in filter(None, (header or '').split(',')):
+        key, count, size = item.rsplit(':', 2)
+        ops[key] = (int(count), int(size))
+    return ops
+
+
+class WriteAmplification:
+    def __init__(self, base_url=BASE_URL, iterations=10, demo=False, timeout=60):
+        self.base_url = base_url.rstrip('/')
+        self.iterations = iterations
+        self.params = {'demo': 'true'} if demo else {}
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.steps = [Step(spec) for spec in WORKLOAD]
+        self.samples = []
+
+    def login(self, session_id):
+        response = self.session.post(f"{self.base_url}/auth/session", json={'session_id': session_id},
+                                     timeout=self.timeout)
+        return response.status_code == 200 and 'session_token' in self.session.cookies
+
+    def run(self):
+        for iteration in range(self.iterations):
+            context = {'iteration': iteration}
+            for step in self.steps:
+                if not self.execute(step, context, iteration):
+                    break  # the rest of the chain needs this step's IDs
+        return self.summary()
+
+    def execute(self, step, context, iteration):
+        try:
+            method, path, params, body = step.prepare(context)
+        except ScenarioError as e:
+            self.samples.append({'test': step.name, 'method': step.method, 'endpoint': step.path,
+                                 'iteration': iteration, 'status': None, 'success': False, 'message': str(e),
+                                 'latency_ms': None, 'bytes': 0, 'started_at': time.time()})
+            return False
+
+        sample = {'test': step.name, 'method': method, 'endpoint': normalize_endpoint(path),
+                  'iteration': iteration, 'started_at': time.time(), 'status': None, 'bytes': 0,
+                  'success': False, 'message': '',
+                  'request_bytes': len(json.dumps(body).encode('utf-8')) if body is not None else 0}
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", params={**params, **self.params},
+                                            json=body, timeout=self.timeout)
+        except requests.RequestException as e:
+            sample['latency_ms'] = (time.perf_counter() - start) * 1000
+            sample['message'] = f"Request failed: {e.__class__.__name__}"
+            self.samples.append(sample)
+            return False
+
+        headers = response.headers
+        sample.update({
+            'latency_ms': (time.perf_counter() - start) * 1000,
+            'status': response.status_code,
+            'bytes': len(response.content),
+            'success': response.status_code == step.expect,
+            'instrumented': 'X-DB-Writes' in headers,
+            'db_queries': int(headers.get('X-DB-Queries', 0)),
+            'db_writes': int(headers.get('X-DB-Writes', 0)),
+            'db_write_bytes': int(headers.get('X-DB-Write-Bytes', 0)),
+            'db_audit_writes': int(headers.get('X-DB-Audit-Writes', 0)),
+            'db_ms': float(headers.get('X-DB-Time-Ms', 0)),
+            'db_ops': {key: list(value) for key, value in parse_ops(headers.get('X-DB-Ops')).items()}
+        })
+        if not sample['success']:
+            sample['message'] = f"Expected {step.expect}, got {response.status_code}"
+        self.samples.append(sample)
+        if sample['success'] and step.save:
+            try:
+                step.capture(response.json(), context)
+            except ValueError:
+                pass
+        return sample['success']
+
+    def summary(self):
+        endpoints = []
+        for step in self.steps:
+            samples = [s for s in self.samples if s['test'] == step.name and s['success']]
+            n = len(samples)
+            if not n:
+                endpoints.append({'test': step.name, 'method': step.method, 'count': 0})
+                continue
+            ops = {}
+            for sample in samples:
+                for key, (count, size) in sample['db_ops'].items():
+                    total = ops.setdefault(key, [0, 0])
+                    total[0] += count
+                    total[1] += size
+            writes = sum(s['db_writes'] for s in samples) / n
+            request_bytes = sum(s['request_bytes'] for s in samples) / n
+            write_bytes = sum(s['db_write_bytes'] for s in samples) / n
+            endpoints.append({
+                'test': step.name,
+                'method': step.method,
+                'count': n,
+                'queries_per_op': sum(s['db_queries'] for s in samples) / n,
+                'writes_per_op': writes,
+                'write_bytes_per_op': write_bytes,
+                'request_bytes_per_op': request_bytes,
+                'byte_amplification': write_bytes / request_bytes if request_bytes else None,
+                'audit_writes_per_op': sum(s['db_audit_writes'] for s in samples) / n,
+                'db_ms_per_op': sum(s['db_ms'] for s in samples) / n,
+                'ops': {key: {'per_op': count / n, 'bytes_per_op': size / n} for key, (count, size) in ops.items()}
+            })
+
+        measured = [s for s in self.samples if s['success']]
+        mutations = len(measured)
+        writes = sum(s['db_writes'] for s in measured)
+        audit = sum(s['db_audit_writes'] for s in measured)
+        return {
+            'iterations': self.iterations,
+            'total_requests': len(self.samples),
+            'failed': sum(1 for s in self.samples if not s['success']),
+            'instrumented': any(s.get('instrumented') for s in measured),
+            'mutations': mutations,
+            'db_writes': writes,
+            'writes_per_mutation': writes / mutations if mutations else 0.0,
+            'audit_writes': audit,
+            'audit_share': audit / writes if writes else 0.0,
+            # One synchronous AuditLog row per mutation, if none are written today
+            'projected_writes_per_mutation_with_audit': (writes + (mutations if not audit else 0)) / mutations
+            if mutations else 0.0,
+            'endpoints': endpoints,
+            'test_completed_at': datetime.now().isoformat()
+        }
+
+
+def print_summary(summary):
+    print(f"\n{'='*80}")
+    print(f"🏁 WRITE AMPLIFICATION SUMMARY")
+    print(f"{'='*80}")
+    if not summary['instrumented']:
+        print("⚠️  No X-DB-* headers seen - start the app with DB_STATS=true")
+    print(f"{'endpoint':<24}{'n':>5}{'queries':>9}{'writes':>8}{'audit':>7}{'req B':>8}{'db B':>8}"
+          f"{'bytes x':>9}{'db ms':>8}")
+    for row in summary['endpoints']:
+        if not row['count']:
+            print(f"{row['test']:<24}{0:>5}  (no successful requests)")
+            continue
+        amp = f"{row['byte_amplification']:.2f}" if row['byte_amplification'] is not None else "n/a"
+        print(f"{row['test']:<24}{row['count']:>5}{row['queries_per_op']:>9.1f}{row['writes_per_op']:>8.1f}"
+              f"{row['audit_writes_per_op']:>7.1f}{row['request_bytes_per_op']:>8.0f}{row['write_bytes_per_op']:>8.0f}"
+              f"{amp:>9}{row['db_ms_per_op']:>8.1f}")
+        for key, op in sorted(row['ops'].items()):
+            if not key.endswith(('findUnique', 'findFirst', 'findMany', 'count')):
+                print(f"{'':<6}↳ {key:<36}{op['per_op']:>5.1f} writes  {op['bytes_per_op']:>7.0f} B")
+    print(f"\n✍️  {summary['writes_per_mutation']:.2f} DB writes per mutation "
+          f"({summary['db_writes']} writes for {summary['mutations']} mutations), "
+          f"{summary['audit_share'] * 100:.0f}% of them AuditLog")
+    print(f"📈 With one synchronous AuditLog row per mutation: "
+          f"{summary['projected_writes_per_mutation_with_audit']:.2f} writes per mutation")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure database writes per API mutation (needs DB_STATS=true)')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--iterations', type=int, default=10, help='Times to run the mutation chain')
+    parser.add_argument('--no-auth', action='store_true', help='Use ?demo=true instead of a logged-in user')
+    parser.add_argument('--session-id', default='harness-write-amp')
+    parser.add_argument('--stub-port', type=int, default=8902)
+    parser.add_argument('--no-stub', action='store_true', help='The session-data stand-in is already running')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--output', default='write_amp_results.json')
+    args = parser.parse_args(argv)
+
+    bench = WriteAmplification(args.base_url, args.iterations, demo=args.no_auth, timeout=args.timeout)
+    print(f"🚀 Write amplification: {args.iterations} x {len(WORKLOAD)} mutations")
+    print(f"📍 Base URL: {bench.base_url}")
+
+    stub = None if args.no_auth or args.no_stub else SessionDataStub(port=args.stub_port)
+    try:
+        if stub:
+            stub.start()
+        if not args.no_auth and not bench.login(args.session_id):
+            print(f"❌ Login failed - is EMERGENT_BACKEND_URL pointing at the stub ({stub.base_url if stub else 'running elsewhere'})?")
+            return 2
+        monitor = OverheadMonitor().start()
+        summary = bench.run()
+        summary['client_overhead'] = finish(monitor, bench.samples)
+    finally:
+        if stub:
+            stub.stop()
+    print_summary(summary)
+    print_overhead(summary['client_overhead'])
+
+    payload = {'summary': summary, 'samples': bench.samples}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    record_run(payload, 'write_amp')
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,41 @@
 // AI Service for Persona Generation using Emergent LLM Key
 import { config } from 'dotenv';
+import { createLLMClient } from './llm-client.js';
+import { aiCache } from './memo-cache.js';
 config();
 
+const PERSONA_SECTIONS = 7;
+// Completion length requested when streaming, so sections can be paced against it
+const PERSONA_STREAM_TOKENS = 280;
+
 // Mock AI service that simulates persona generation
 // This would normally use the emergentintegrations package
 export class PersonaAI {
   constructor(apiKey) {
     this.apiKey = apiKey;
+    this.llm = createLLMClient(apiKey);
   }
 
   async generatePersona(segmentData, cultureProfile, economicProfile) {
     try {
-      // Simulate AI processing delay
-      await new Promise(resolve => setTimeout(resolve, 1000));
-      
-      // Generate persona based on inputs
-      const persona = this.generatePersonaFromData(segmentData, cultureProfile, economicProfile);
+      const cache = aiCache();
+      if (!cache) {
+        return await this.generatePersonaUncached(segmentData, cultureProfile, economicProfile);
+      }
+
+      const persona = await cache.memoize(
+        'persona',
+        [segmentData, cultureProfile, economicProfile],
+        () => this.generatePersonaUncached(segmentData, cultureProfile, economicProfile)
+      );
+      // The cached entry may come from other records with the same content; the snapshot describes these
+      persona.export_snapshot = {
+        ...persona.export_snapshot,
+        generated_at: new Date().toISOString(),
+        segment: segmentData,
+        culture_profile: cultureProfile,
+        economic_profile: economicProfile
+      };
       return persona;
     } catch (error) {
       console.error('Error generating persona:', error);
@@ -23,33 +43,75 @@ export class PersonaAI {
     }
   }
 
+  async generatePersonaUncached(segmentData, cultureProfile, economicProfile) {
+    await this.llm.complete(
+      this.buildPersonaPrompt(segmentData, cultureProfile, economicProfile),
+      { simulatedDelayMs: 1000 }
+    );
+
+    // Generate persona based on inputs
+    return this.generatePersonaFromData(segmentData, cultureProfile, economicProfile);
+  }
+
+  buildPersonaPrompt(segment, culture, economic) {
+    return [
+      { role: 'system', content: 'Generate a marketing persona from the segment, culture and economic profiles.' },
+      { role: 'user', content: JSON.stringify({ segment, culture, economic }) }
+    ];
+  }
+
   generatePersonaFromData(segment, culture, economic) {
+    return Object.fromEntries(this.personaSections(segment, culture, economic));
+  }
+
+  // Yields [section, value] pairs in the order the persona is built
+  *personaSections(segment, culture, economic) {
     // Handle "any" values by providing generalized alternatives
     const processedCulture = this.processAnyValues(culture);
     const processedEconomic = this.processAnyValues(economic);
     
-    const name = this.generatePersonaName(processedCulture, processedEconomic);
-    const positioning = this.generatePositioning(segment, processedCulture, processedEconomic);
-    const culturalCues = this.generateCulturalCues(processedCulture);
-    const economicCues = this.generateEconomicCues(processedEconomic);
-    const generalizations = this.generateTestableHypotheses(processedCulture, processedEconomic);
-    const pillars = this.generateMessagingPillars(segment, processedCulture, processedEconomic);
+    yield ['name', this.generatePersonaName(processedCulture, processedEconomic)];
+    yield ['positioning', this.generatePositioning(segment, processedCulture, processedEconomic)];
+    yield ['cultural_cues', this.generateCulturalCues(processedCulture)];
+    yield ['economic_cues', this.generateEconomicCues(processedEconomic)];
+    yield ['generalizations', this.generateTestableHypotheses(processedCulture, processedEconomic)];
+    yield ['pillars', this.generateMessagingPillars(segment, processedCulture, processedEconomic)];
+    yield ['export_snapshot', {
+      generated_at: new Date().toISOString(),
+      segment: segment,
+      culture_profile: culture,
+      economic_profile: economic,
+      assumptions_vs_facts: this.generateAssumptionsVsFacts(processedCulture, processedEconomic)
+    }];
+  }
 
-    return {
-      name,
-      positioning,
-      cultural_cues: culturalCues,
-      economic_cues: economicCues,
-      generalizations,
-      pillars,
-      export_snapshot: {
-        generated_at: new Date().toISOString(),
-        segment: segment,
-        culture_profile: culture,
-        economic_profile: economic,
-        assumptions_vs_facts: this.generateAssumptionsVsFacts(processedCulture, processedEconomic)
+  // Streaming variant of generatePersona: yields [section, value] pairs while the model
+  // output streams in, each section once its share of the completion has arrived, so
+  // the first section is available after roughly 1/7 of the generation time. Cached
+  // personas (AI_CACHE=true) are yielded at once; a miss is generated in full first.
+  async *streamPersona(segmentData, cultureProfile, economicProfile) {
+    if (aiCache()) {
+      const persona = await this.generatePersona(segmentData, cultureProfile, economicProfile);
+      yield* Object.entries(persona);
+      return;
+    }
+
+    const sections = this.personaSections(segmentData, cultureProfile, economicProfile);
+    // Simulated streams yield one chunk per section, real ones one per token
+    const chunksPerSection = this.llm.baseUrl ? Math.ceil(PERSONA_STREAM_TOKENS / PERSONA_SECTIONS) : 1;
+    let received = 0;
+    const chunks = this.llm.stream(
+      this.buildPersonaPrompt(segmentData, cultureProfile, economicProfile),
+      { simulatedDelayMs: 1000, simulatedChunks: PERSONA_SECTIONS, maxTokens: PERSONA_STREAM_TOKENS }
+    );
+    for await (const _chunk of chunks) {
+      received += 1;
+      if (received % chunksPerSection === 0) {
+        const next = sections.next();
+        if (!next.done) yield next.value;
       }
-    };
+    }
+    yield* sections;
   }
 
   // Process "any" values to provide generalized messaging
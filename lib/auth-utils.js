@@ -1,9 +1,31 @@
 import { getServerSession } from 'next-auth';
-import { getOrCreateUser } from './database.js';
+import { prisma, getOrCreateUser } from './database.js';
+
+// Get user from the session_token cookie set by /api/auth/session
+async function getSessionTokenUser(req) {
+  const sessionToken = req?.cookies?.get?.('session_token')?.value;
+  if (!sessionToken || !prisma) {
+    return null;
+  }
+
+  const session = await prisma.session.findUnique({
+    where: { sessionToken },
+    include: { user: true }
+  });
+  if (!session || new Date() > session.expires) {
+    return null;
+  }
+  return session.user;
+}
 
 // Get user from session (server-side)
 export async function getCurrentUser(req) {
   try {
+    const tokenUser = await getSessionTokenUser(req);
+    if (tokenUser) {
+      return tokenUser;
+    }
+
     const session = await getServerSession(req);
     if (!session?.user?.email) {
       return null;
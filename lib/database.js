@@ -1,5 +1,6 @@
 // Database connection and utilities
 import { PrismaClient } from './generated/prisma/index.js';
+import { extendWithDbStats } from './db-stats.js';
 
 let prisma;
 
@@ -23,6 +24,9 @@ try {
   prisma = null;
 }
 
+// Count queries per request when DB_STATS=true (see lib/db-stats.js)
+prisma = extendWithDbStats(prisma);
+
 export { prisma };
 
 // Helper function to create default workspace for user
@@ -0,0 +1,97 @@
+// Per-request database statistics, enabled with DB_STATS=true
+// Every Prisma operation run while handling a request is counted (reads, writes, bytes
+// written, time spent) and reported back in X-DB-* response headers, so the test harness
+// can measure write amplification and query counts per endpoint without a query log.
+import { AsyncLocalStorage } from 'node:async_hooks';
+
+const storage = new AsyncLocalStorage();
+
+const WRITE_OPERATIONS = new Set([
+  'create', 'createMany', 'createManyAndReturn', 'update', 'updateMany', 'upsert', 'delete', 'deleteMany'
+]);
+
+export function dbStatsEnabled() {
+  return process.env.DB_STATS === 'true';
+}
+
+function writeBytes(operation, args = {}) {
+  const payload = operation === 'upsert'
+    ? [args.create, args.update]
+    : operation.startsWith('delete') ? args.where : args.data;
+  return payload === undefined ? 0 : Buffer.byteLength(JSON.stringify(payload));
+}
+
+function record(model, operation, args, start, end) {
+  const stats = storage.getStore();
+  if (!stats) return;
+
+  const isWrite = WRITE_OPERATIONS.has(operation);
+  const bytes = isWrite ? writeBytes(operation, args) : 0;
+  const key = `${model}.${operation}`;
+  const op = stats.ops[key] || (stats.ops[key] = { count: 0, bytes: 0 });
+  op.count += 1;
+  op.bytes += bytes;
+
+  stats.queries += 1;
+  stats.dbMs += end - start;
+  stats.intervals.push([start, end]);
+  if (isWrite) {
+    stats.writes += 1;
+    stats.writeBytes += bytes;
+    if (model === 'AuditLog') stats.auditWrites += 1;
+  }
+}
+
+// Wrap a Prisma client so every model operation is recorded against the current request
+export function extendWithDbStats(client) {
+  if (!client || !dbStatsEnabled()) return client;
+
+  return client.$extends({
+    query: {
+      $allModels: {
+        async $allOperations({ model, operation, args, query }) {
+          const start = performance.now();
+          try {
+            return await query(args);
+          } finally {
+            record(model, operation, args, start, performance.now());
+          }
+        }
+      }
+    }
+  });
+}
+
+// Wall time covered by at least one query; below dbMs when queries ran concurrently
+function wallMs(intervals) {
+  let total = 0;
+  let cursor = -Infinity;
+  for (const [start, end] of [...intervals].sort((a, b) => a[0] - b[0])) {
+    if (end <= cursor) continue;
+    total += end - Math.max(start, cursor);
+    cursor = end;
+  }
+  return total;
+}
+
+// Wrap a route handler so its response carries the request's database statistics
+export function withDbStats(handler) {
+  if (!dbStatsEnabled()) return handler;
+
+  return async (...args) => {
+    const stats = { queries: 0, writes: 0, writeBytes: 0, auditWrites: 0, dbMs: 0, intervals: [], ops: {} };
+    const response = await storage.run(stats, () => handler(...args));
+    if (response?.headers) {
+      response.headers.set('X-DB-Queries', String(stats.queries));
+      response.headers.set('X-DB-Writes', String(stats.writes));
+      response.headers.set('X-DB-Write-Bytes', String(stats.writeBytes));
+      response.headers.set('X-DB-Audit-Writes', String(stats.auditWrites));
+      response.headers.set('X-DB-Time-Ms', stats.dbMs.toFixed(2));
+      response.headers.set('X-DB-Wall-Ms', wallMs(stats.intervals).toFixed(2));
+      response.headers.set('X-DB-Ops', Object.entries(stats.ops)
+        .map(([key, op]) => `${key}:${op.count}:${op.bytes}`)
+        .join(','));
+    }
+    return response;
+  };
+}
@@ -0,0 +1,39 @@
+// Conditional GETs for read routes whose JSON is worth revalidating rather than refetching
+// The ETag is a hash of the response body, so it changes exactly when the data does and
+// needs no version column. A request whose If-None-Match lists the current tag gets a 304
+// with no body; the handler still runs, so this saves bytes on the wire, not queries.
+//
+// Tags are weak: the compression wrapper may compact or encode the body afterwards, and
+// those representations are equivalent but not byte-identical.
+import { createHash } from 'node:crypto';
+
+export function etagFor(body) {
+  return `W/"${createHash('sha1').update(body).digest('base64url')}"`;
+}
+
+// Whether an If-None-Match header matches the tag (weak comparison, as RFC 9110 asks for GETs)
+export function etagMatches(header, etag) {
+  if (!header) return false;
+  if (header.trim() === '*') return true;
+  const opaque = tag => tag.trim().replace(/^W\//, '');
+  return header.split(',').some(tag => opaque(tag) === opaque(etag));
+}
+
+// Tag a successful JSON response and answer 304 when the client already has it
+export async function withETag(request, response) {
+  if (response?.status !== 200 || !response.body) return response;
+
+  const body = Buffer.from(await response.arrayBuffer());
+  const etag = etagFor(body);
+  const headers = new Headers(response.headers);
+  headers.set('ETag', etag);
+  // Per-user data: caches may keep it but must check back before reuse
+  headers.set('Cache-Control', 'private, no-cache');
+
+  if (etagMatches(request.headers.get('If-None-Match'), etag)) {
+    headers.delete('Content-Type');
+    headers.delete('Content-Length');
+    return new Response(null, { status: 304, headers });
+  }
+  return new Response(body, { status: 200, statusText: response.statusText, headers });
+}
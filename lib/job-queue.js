@@ -0,0 +1,144 @@
+// In-process job queue for long-running generation requests
+// Submitting returns a job ID straight away; a bounded pool of workers runs the jobs
+// in submission order and clients poll (or long-poll) for the result, so slow
+// generations no longer hold HTTP connections open.
+//
+//   JOB_WORKERS      concurrent jobs (4)
+//   JOB_QUEUE_MAX    queued jobs before submissions are rejected (1000)
+//   JOB_TTL_MS       how long finished jobs stay available (10 minutes)
+import { randomUUID } from 'node:crypto';
+
+export class JobQueue {
+  constructor({ workers = 4, maxQueued = 1000, ttlMs = 10 * 60 * 1000 } = {}) {
+    this.workers = workers;
+    this.maxQueued = maxQueued;
+    this.ttlMs = ttlMs;
+    this.jobs = new Map();
+    this.pending = [];
+    this.running = 0;
+    this.waiters = new Map();
+  }
+
+  // Queue `run` (an async function returning { status, body }); null when the queue is full
+  submit(kind, ownerId, run) {
+    this.prune();
+    if (this.pending.length >= this.maxQueued) return null;
+
+    const job = {
+      id: randomUUID(),
+      kind,
+      ownerId,
+      status: 'queued',
+      createdAt: Date.now(),
+      startedAt: null,
+      finishedAt: null,
+      resultStatus: null,
+      result: null,
+      error: null,
+      run
+    };
+    this.jobs.set(job.id, job);
+    this.pending.push(job);
+    this.drain();
+    return job;
+  }
+
+  get(id) {
+    return this.jobs.get(id) || null;
+  }
+
+  position(job) {
+    return job.status === 'queued' ? this.pending.indexOf(job) : null;
+  }
+
+  // Resolve once the job has finished, or after timeoutMs, whichever comes first
+  wait(job, timeoutMs) {
+    if (job.finishedAt || timeoutMs <= 0) return Promise.resolve(job);
+    return new Promise(resolve => {
+      const waiters = this.waiters.get(job.id) || [];
+      const done = () => {
+        clearTimeout(timer);
+        resolve(job);
+      };
+      const timer = setTimeout(() => {
+        const remaining = (this.waiters.get(job.id) || []).filter(w => w !== done);
+        if (remaining.length) this.waiters.set(job.id, remaining);
+        else this.waiters.delete(job.id);
+        resolve(job);
+      }, timeoutMs);
+      waiters.push(done);
+      this.waiters.set(job.id, waiters);
+    });
+  }
+
+  drain() {
+    while (this.running < this.workers && this.pending.length) {
+      const job = this.pending.shift();
+      this.running += 1;
+      this.execute(job).finally(() => {
+        this.running -= 1;
+        this.drain();
+      });
+    }
+  }
+
+  async execute(job) {
+    job.status = 'running';
+    job.startedAt = Date.now();
+    try {
+      const { status, body } = await job.run();
+      job.resultStatus = status;
+      job.result = body;
+      job.status = status < 400 ? 'succeeded' : 'failed';
+    } catch (error) {
+      console.error(`Job ${job.id} (${job.kind}) failed:`, error);
+      job.resultStatus = 500;
+      job.error = error.message;
+      job.status = 'failed';
+    } finally {
+      job.finishedAt = Date.now();
+      job.run = null;
+      for (const notify of this.waiters.get(job.id) || []) notify();
+      this.waiters.delete(job.id);
+    }
+  }
+
+  prune() {
+    const cutoff = Date.now() - this.ttlMs;
+    for (const [id, job] of this.jobs) {
+      if (job.finishedAt && job.finishedAt < cutoff) this.jobs.delete(id);
+    }
+  }
+
+  stats() {
+    return { queued: this.pending.length, running: this.running, workers: this.workers };
+  }
+
+  // Public representation returned by the jobs API
+  view(job) {
+    return {
+      id: job.id,
+      kind: job.kind,
+      status: job.status,
+      queue_position: this.position(job),
+      created_at: new Date(job.createdAt).toISOString(),
+      started_at: job.startedAt ? new Date(job.startedAt).toISOString() : null,
+      finished_at: job.finishedAt ? new Date(job.finishedAt).toISOString() : null,
+      queue_wait_ms: job.startedAt ? job.startedAt - job.createdAt : Date.now() - job.createdAt,
+      run_ms: job.startedAt ? (job.finishedAt || Date.now()) - job.startedAt : null,
+      result_status: job.resultStatus,
+      ...(job.finishedAt ? { result: job.result, error: job.error } : {})
+    };
+  }
+}
+
+// Survive dev-server module reloads, like the Prisma client in database.js
+const globalForJobs = globalThis;
+
+export const jobQueue = globalForJobs.__jobQueue || new JobQueue({
+  workers: process.env.JOB_WORKERS ? parseInt(process.env.JOB_WORKERS, 10) : undefined,
+  maxQueued: process.env.JOB_QUEUE_MAX ? parseInt(process.env.JOB_QUEUE_MAX, 10) : undefined,
+  ttlMs: process.env.JOB_TTL_MS ? parseInt(process.env.JOB_TTL_MS, 10) : undefined
+});
+
+if (process.env.NODE_ENV !== 'production') globalForJobs.__jobQueue = jobQueue;
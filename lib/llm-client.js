@@ -0,0 +1,101 @@
+// LLM transport shared by PersonaAI and StrategyAI
+import { config } from 'dotenv';
+config();
+
+// When EMERGENT_LLM_BASE_URL is set, every generation makes a real round-trip
+// to an OpenAI-style /v1/chat/completions endpoint (e.g. the harness mock LLM
+// in harness/mock_llm.py). Otherwise the model call is simulated with a fixed
+// delay, as before.
+export class LLMClient {
+  constructor({ apiKey, baseUrl, model, timeoutMs } = {}) {
+    this.apiKey = apiKey;
+    this.baseUrl = baseUrl ? baseUrl.replace(/\/+$/, '') : null;
+    this.model = model || 'gpt-4o-mini';
+    this.timeoutMs = timeoutMs || 60000;
+  }
+
+  async complete(messages, { simulatedDelayMs = 0, maxTokens } = {}) {
+    if (!this.baseUrl) {
+      // Simulate AI processing delay
+      await new Promise(resolve => setTimeout(resolve, simulatedDelayMs));
+      return null;
+    }
+
+    const response = await fetch(`${this.baseUrl}/v1/chat/completions`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(this.apiKey ? { 'Authorization': `Bearer ${this.apiKey}` } : {})
+      },
+      body: JSON.stringify({
+        model: this.model,
+        messages,
+        ...(maxTokens ? { max_tokens: maxTokens } : {})
+      }),
+      signal: AbortSignal.timeout(this.timeoutMs)
+    });
+
+    if (!response.ok) {
+      throw new Error(`LLM request failed with status ${response.status}`);
+    }
+
+    return await response.json();
+  }
+
+  // Stream a completion, yielding content deltas as they arrive (stream: true, SSE).
+  // Simulated, the delay is spread evenly over `simulatedChunks` empty deltas.
+  async *stream(messages, { simulatedDelayMs = 0, simulatedChunks = 20, maxTokens } = {}) {
+    if (!this.baseUrl) {
+      for (let i = 0; i < simulatedChunks; i++) {
+        await new Promise(resolve => setTimeout(resolve, simulatedDelayMs / simulatedChunks));
+        yield '';
+      }
+      return;
+    }
+
+    const response = await fetch(`${this.baseUrl}/v1/chat/completions`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(this.apiKey ? { 'Authorization': `Bearer ${this.apiKey}` } : {})
+      },
+      body: JSON.stringify({
+        model: this.model,
+        messages,
+        stream: true,
+        ...(maxTokens ? { max_tokens: maxTokens } : {})
+      }),
+      signal: AbortSignal.timeout(this.timeoutMs)
+    });
+
+    if (!response.ok) {
+      throw new Error(`LLM request failed with status ${response.status}`);
+    }
+
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for await (const bytes of response.body) {
+      buffer += decoder.decode(bytes, { stream: true });
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const event = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        for (const line of event.split('\n')) {
+          if (!line.startsWith('data:')) continue;
+          const data = line.slice(5).trim();
+          if (data === '[DONE]') return;
+          yield JSON.parse(data).choices?.[0]?.delta?.content || '';
+        }
+      }
+    }
+  }
+}
+
+export function createLLMClient(apiKey) {
+  return new LLMClient({
+    apiKey,
+    baseUrl: process.env.EMERGENT_LLM_BASE_URL,
+    model: process.env.EMERGENT_LLM_MODEL,
+    timeoutMs: process.env.EMERGENT_LLM_TIMEOUT_MS ? parseInt(process.env.EMERGENT_LLM_TIMEOUT_MS, 10) : undefined
+  });
+}
@@ -0,0 +1,133 @@
+// Content-addressed memoization for PersonaAI / StrategyAI outputs, enabled with AI_CACHE=true
+// Generation output depends only on the content of the segment, culture and economic
+// profiles (and the persona, for strategies), so results are cached under a SHA-256 of
+// those inputs in canonical form: keys sorted, record identity and timestamps dropped.
+// The same inputs under a new segment ID hit the same entry.
+//
+//   AI_CACHE_MAX_ENTRIES   in-memory LRU capacity (500)
+//   AI_CACHE_TTL_MS        entry lifetime in both tiers (1 hour)
+//   AI_CACHE_DIR           optional directory for an on-disk tier shared across restarts
+import { createHash } from 'node:crypto';
+import { mkdir, readFile, writeFile } from 'node:fs/promises';
+import path from 'node:path';
+
+// Fields that identify a record rather than describe it
+const VOLATILE_FIELDS = new Set([
+  'id', 'workspaceId', 'segmentId', 'cultureProfileId', 'economicProfileId', 'createdBy',
+  'createdAt', 'updatedAt', 'workspace', 'segment_id', 'exportSnapshot', 'export_snapshot'
+]);
+
+function canonical(value) {
+  if (Array.isArray(value)) return value.map(canonical);
+  if (value instanceof Date) return value.toISOString();
+  if (value && typeof value === 'object') {
+    const out = {};
+    for (const key of Object.keys(value).sort()) {
+      if (!VOLATILE_FIELDS.has(key) && value[key] !== undefined) out[key] = canonical(value[key]);
+    }
+    return out;
+  }
+  return value;
+}
+
+export function contentHash(...inputs) {
+  return createHash('sha256').update(JSON.stringify(canonical(inputs))).digest('hex');
+}
+
+export class MemoCache {
+  constructor({ maxEntries = 500, ttlMs = 60 * 60 * 1000, diskDir = null } = {}) {
+    this.maxEntries = maxEntries;
+    this.ttlMs = ttlMs;
+    this.diskDir = diskDir;
+    this.entries = new Map();
+    this.inflight = new Map();
+    this.stats = { hits: 0, diskHits: 0, misses: 0, coalesced: 0, evictions: 0 };
+  }
+
+  // Return the cached value for the inputs, computing (once, even when called concurrently) on a miss
+  async memoize(namespace, inputs, compute) {
+    const key = contentHash(namespace, ...inputs);
+    const cached = this.getMemory(key) ?? await this.getDisk(key);
+    if (cached !== undefined) return structuredClone(cached);
+
+    const pending = this.inflight.get(key);
+    if (pending) {
+      this.stats.coalesced += 1;
+      return structuredClone(await pending);
+    }
+
+    this.stats.misses += 1;
+    const promise = compute();
+    this.inflight.set(key, promise);
+    try {
+      const value = await promise;
+      this.set(key, value);
+      return structuredClone(value);
+    } finally {
+      this.inflight.delete(key);
+    }
+  }
+
+  getMemory(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+    if (Date.now() - entry.storedAt > this.ttlMs) {
+      this.entries.delete(key);
+      return undefined;
+    }
+    // Re-insert to mark as most recently used
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.stats.hits += 1;
+    return entry.value;
+  }
+
+  async getDisk(key) {
+    if (!this.diskDir) return undefined;
+    try {
+      const entry = JSON.parse(await readFile(path.join(this.diskDir, `${key}.json`), 'utf8'));
+      if (Date.now() - entry.storedAt > this.ttlMs) return undefined;
+      this.remember(key, entry);
+      this.stats.diskHits += 1;
+      return entry.value;
+    } catch {
+      return undefined;
+    }
+  }
+
+  set(key, value) {
+    const entry = { storedAt: Date.now(), value };
+    this.remember(key, entry);
+    if (this.diskDir) {
+      mkdir(this.diskDir, { recursive: true })
+        .then(() => writeFile(path.join(this.diskDir, `${key}.json`), JSON.stringify(entry)))
+        .catch(error => console.error('AI cache disk write failed:', error));
+    }
+  }
+
+  remember(key, entry) {
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+      this.stats.evictions += 1;
+    }
+  }
+}
+
+export function aiCacheEnabled() {
+  return process.env.AI_CACHE === 'true';
+}
+
+// One cache per process, shared by PersonaAI and StrategyAI; null when disabled
+let sharedCache;
+export function aiCache() {
+  if (sharedCache === undefined) {
+    sharedCache = aiCacheEnabled() ? new MemoCache({
+      maxEntries: process.env.AI_CACHE_MAX_ENTRIES ? parseInt(process.env.AI_CACHE_MAX_ENTRIES, 10) : undefined,
+      ttlMs: process.env.AI_CACHE_TTL_MS ? parseInt(process.env.AI_CACHE_TTL_MS, 10) : undefined,
+      diskDir: process.env.AI_CACHE_DIR || null
+    }) : null;
+  }
+  return sharedCache;
+}
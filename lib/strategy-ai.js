@@ -1,18 +1,43 @@
 // Strategy AI Service for generating positioning, messaging, and pricing strategies
 import { validateContent } from './validation.js';
+import { createLLMClient } from './llm-client.js';
+import { aiCache } from './memo-cache.js';
 
 export class StrategyAI {
   constructor(apiKey) {
     this.apiKey = apiKey;
+    this.llm = createLLMClient(apiKey);
+  }
+
+  buildStrategyPrompt(strategyType, persona, segment, cultureProfile, economicProfile) {
+    return [
+      { role: 'system', content: `Generate a ${strategyType} strategy for the persona.` },
+      { role: 'user', content: JSON.stringify({ persona, segment, cultureProfile, economicProfile }) }
+    ];
+  }
+
+  // Run the LLM call and build the strategy, or reuse the result for identical inputs
+  async generateStrategy(strategyType, build, persona, segment, cultureProfile, economicProfile) {
+    const run = async () => {
+      await this.llm.complete(
+        this.buildStrategyPrompt(strategyType, persona, segment, cultureProfile, economicProfile),
+        { simulatedDelayMs: 1500 }
+      );
+      return build(persona, segment, cultureProfile, economicProfile);
+    };
+
+    const cache = aiCache();
+    if (!cache) return run();
+    return cache.memoize(`strategy:${strategyType}`, [persona, segment, cultureProfile, economicProfile], run);
   }
 
   // Generate positioning strategy
   async generatePositioningStrategy(persona, segment, cultureProfile, economicProfile) {
     try {
-      await new Promise(resolve => setTimeout(resolve, 1500)); // Simulate AI processing
-      
-      const positioning = this.generatePositioningFromData(persona, segment, cultureProfile, economicProfile);
-      return positioning;
+      return await this.generateStrategy(
+        'positioning', (...inputs) => this.generatePositioningFromData(...inputs),
+        persona, segment, cultureProfile, economicProfile
+      );
     } catch (error) {
       console.error('Error generating positioning strategy:', error);
       throw new Error('Failed to generate positioning strategy');
@@ -22,10 +47,10 @@ export class StrategyAI {
   // Generate messaging strategy
   async generateMessagingStrategy(persona, segment, cultureProfile, economicProfile) {
     try {
-      await new Promise(resolve => setTimeout(resolve, 1500));
-      
-      const messaging = this.generateMessagingFromData(persona, segment, cultureProfile, economicProfile);
-      return messaging;
+      return await this.generateStrategy(
+        'messaging', (...inputs) => this.generateMessagingFromData(...inputs),
+        persona, segment, cultureProfile, economicProfile
+      );
     } catch (error) {
       console.error('Error generating messaging strategy:', error);
       throw new Error('Failed to generate messaging strategy');
@@ -35,10 +60,10 @@ export class StrategyAI {
   // Generate pricing strategy
   async generatePricingStrategy(persona, segment, cultureProfile, economicProfile) {
     try {
-      await new Promise(resolve => setTimeout(resolve, 1500));
-      
-      const pricing = this.generatePricingFromData(persona, segment, cultureProfile, economicProfile);
-      return pricing;
+      return await this.generateStrategy(
+        'pricing', (...inputs) => this.generatePricingFromData(...inputs),
+        persona, segment, cultureProfile, economicProfile
+      );
     } catch (error) {
       console.error('Error generating pricing strategy:', error);
       throw new Error('Failed to generate pricing strategy');
@@ -0,0 +1,194 @@
+// Multi-term matcher for blocked-term scanning (Aho-Corasick)
+// The terms are compiled once into a trie with failure links, flattened into a state
+// table, so a text is scanned in a single pass - one table lookup per character -
+// whatever the number of terms. Matching is case-insensitive and on word boundaries:
+// "race" matches "race" and "Race," but not "embrace" or "racetrack". Whitespace
+// inside a term matches any single whitespace character.
+//
+// A word is still blocked when the term is its root: inflected and derived endings on
+// the term's last word ("religions", "excluded", "superiority", "rejection", "naturally",
+// "bloodline", "casteism", "racism") and a negating prefix ("unnatural") are matched
+// as the term. Only the listed affixes count, so other words that merely start with a
+// term ("racetrack", "bloodhound", "casting") still pass.
+
+const WORD_CHAR = /[\p{L}\p{N}_]/u;
+// Everything /\s/ matches
+const WHITESPACE = [9, 10, 11, 12, 13, 32, 0xa0, 0x1680, 0x2000, 0x2001, 0x2002, 0x2003, 0x2004, 0x2005, 0x2006,
+  0x2007, 0x2008, 0x2009, 0x200a, 0x2028, 0x2029, 0x202f, 0x205f, 0x3000, 0xfeff];
+
+// Whether the code point ending at (before) or starting at (after) `index` is a word character
+function wordCharBefore(text, index) {
+  if (index <= 0) return false;
+  const low = text.charCodeAt(index - 1);
+  const start = low >= 0xdc00 && low <= 0xdfff && index >= 2 ? index - 2 : index - 1;
+  return WORD_CHAR.test(String.fromCodePoint(text.codePointAt(start)));
+}
+
+function wordCharAfter(text, index) {
+  if (index >= text.length) return false;
+  return WORD_CHAR.test(String.fromCodePoint(text.codePointAt(index)));
+}
+
+export const PREFIXES = ['un', 'non'];
+// Endings after the whole term: inflections, and derivations that keep the root intact
+const SUFFIXES = ['s', 'es', 'd', 'ed', 'ing', 'ity', 'ities', 'ion', 'ions', 'ly', 'ally', 'ism', 'isms',
+  'ist', 'ists', 'ance', 'ances', 'line', 'lines'];
+// Endings that replace a final "e" (pure -> purity, race -> racism, exclude -> excluding)
+const E_SUFFIXES = ['ity', 'ities', 'ion', 'ions', 'ism', 'isms', 'ist', 'ists'];
+// -ing replaces the "e" only on longer roots: "racing" and "casting" are other words
+const E_ING_MIN_STEM = 5;
+// Endings that replace a final consonant + "y" (party -> parties)
+const Y_SUFFIXES = ['ies', 'ied', 'ily'];
+
+// The stems a term is matched by: { stem, suffixes, bare } where `bare` says whether the
+// stem is a match on its own or only with one of its suffixes
+export function stems(term) {
+  const lower = term.toLowerCase();
+  if (!/\p{L}$/u.test(lower)) return [{ stem: lower, suffixes: [], bare: true }];
+
+  const forms = [{ stem: lower, suffixes: SUFFIXES, bare: true }];
+  if (lower.endsWith('e') && lower.length > 1) {
+    const stem = lower.slice(0, -1);
+    forms.push({ stem, suffixes: stem.length >= E_ING_MIN_STEM ? ['ing', ...E_SUFFIXES] : E_SUFFIXES, bare: false });
+  } else if (/[^aeiou]y$/.test(lower)) {
+    forms.push({ stem: lower.slice(0, -1), suffixes: Y_SUFFIXES, bare: false });
+  }
+  return forms;
+}
+
+// Whether one of PREFIXES ends at `start` and begins a word
+function prefixedAt(text, start) {
+  for (const prefix of PREFIXES) {
+    const from = start - prefix.length;
+    if (from >= 0 && text.startsWith(prefix, from) && !wordCharBefore(text, from)) return true;
+  }
+  return false;
+}
+
+// Whether one of `suffixes` starts at `end` and ends the word
+function suffixedAt(text, end, suffixes) {
+  for (const suffix of suffixes) {
+    if (text.startsWith(suffix, end) && !wordCharAfter(text, end + suffix.length)) return true;
+  }
+  return false;
+}
+
+export class TermMatcher {
+  constructor(terms) {
+    this.terms = [...terms];
+    // Every stem becomes its own pattern; matches are reported as the term it came from
+    const lowered = [];
+    this.termOf = [];
+    this.suffixes = [];
+    this.bare = [];
+    this.terms.forEach((term, index) => {
+      for (const { stem, suffixes, bare } of stems(term)) {
+        lowered.push(stem);
+        this.termOf.push(index);
+        this.suffixes.push(suffixes);
+        this.bare.push(bare);
+      }
+    });
+    this.lengths = lowered.map(form => form.length);
+
+    // Alphabet: one class per code unit used by the terms, whitespace folded into one,
+    // class 0 for everything else (which can only lead back to the root)
+    this.ascii = new Uint16Array(128);
+    this.wide = new Map();
+    this.size = 1;
+    const spaceClass = this.size++;
+    for (const code of WHITESPACE) this.setClass(code, spaceClass);
+    for (const term of lowered) {
+      for (let i = 0; i < term.length; i++) {
+        const code = term.charCodeAt(i);
+        if (!this.classOf(code)) this.setClass(code, this.size++);
+      }
+    }
+
+    // Trie: node 0 is the root; children[node] maps class -> node
+    const children = [new Map()];
+    const output = [[]];
+    lowered.forEach((term, index) => {
+      let node = 0;
+      for (let i = 0; i < term.length; i++) {
+        const cls = this.classOf(term.charCodeAt(i));
+        let child = children[node].get(cls);
+        if (child === undefined) {
+          child = children.length;
+          children.push(new Map());
+          output.push([]);
+          children[node].set(cls, child);
+        }
+        node = child;
+      }
+      output[node].push(index);
+    });
+
+    // Breadth-first failure links, folded straight into the full transition table
+    const size = this.size;
+    const delta = new Int32Array(children.length * size);
+    const fail = new Int32Array(children.length);
+    const queue = [];
+    for (const [cls, child] of children[0]) {
+      delta[cls] = child;
+      queue.push(child);
+    }
+    for (let head = 0; head < queue.length; head++) {
+      const node = queue[head];
+      output[node] = output[node].concat(output[fail[node]]);
+      for (let cls = 0; cls < size; cls++) {
+        const child = children[node].get(cls);
+        if (child === undefined) {
+          delta[node * size + cls] = delta[fail[node] * size + cls];
+        } else {
+          delta[node * size + cls] = child;
+          fail[child] = delta[fail[node] * size + cls];
+          queue.push(child);
+        }
+      }
+    }
+    this.delta = delta;
+    this.output = output.map(indexes => (indexes.length ? indexes : null));
+  }
+
+  setClass(code, cls) {
+    if (code < 128) this.ascii[code] = cls;
+    else this.wide.set(code, cls);
+  }
+
+  classOf(code) {
+    return code < 128 ? this.ascii[code] : (this.wide.get(code) || 0);
+  }
+
+  // Indexes (into `terms`) of the terms found in text, in term order
+  match(text) {
+    if (!text) return [];
+
+    const lower = text.toLowerCase();
+    const { ascii, wide, delta, output, lengths, termOf, suffixes, bare, size } = this;
+    const found = new Set();
+    let node = 0;
+    for (let i = 0; i < lower.length; i++) {
+      const code = lower.charCodeAt(i);
+      const cls = code < 128 ? ascii[code] : (wide.get(code) || 0);
+      node = delta[node * size + cls];
+
+      const indexes = output[node];
+      if (indexes === null) continue;
+      for (let k = 0; k < indexes.length; k++) {
+        const pattern = indexes[k];
+        if (found.has(termOf[pattern])) continue;
+        const start = i + 1 - lengths[pattern];
+        const left = !wordCharBefore(lower, start) || prefixedAt(lower, start);
+        const right = (bare[pattern] && !wordCharAfter(lower, i + 1)) || suffixedAt(lower, i + 1, suffixes[pattern]);
+        if (left && right) found.add(termOf[pattern]);
+      }
+    }
+    return [...found].sort((a, b) => a - b);
+  }
+
+  // The matching terms themselves, as given to the constructor
+  find(text) {
+    return this.match(text).map(index => this.terms[index]);
+  }
+}
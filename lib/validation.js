@@ -1,5 +1,6 @@
 import { z } from 'zod';
 import { BLOCKED_TERMS, REWRITE_SUGGESTIONS } from './seed-data.js';
+import { TermMatcher } from './term-matcher.js';
 
 // Validation schemas
 export const segmentSchema = z.object({
@@ -73,29 +74,30 @@ export const workspaceSchema = z.object({
 });
 
 // Content validation for ethical compliance
+// Blocked terms are compiled into one matcher at load time and found in a single pass,
+// on word boundaries (see lib/term-matcher.js)
+const blockedTerms = new TermMatcher(BLOCKED_TERMS);
+
 export function validateContent(text) {
   if (!text || typeof text !== 'string') return { valid: true };
   
-  const lowerText = text.toLowerCase();
   const issues = [];
   const suggestions = [];
   
   // Check for blocked terms
-  for (const term of BLOCKED_TERMS) {
-    if (lowerText.includes(term.toLowerCase())) {
-      issues.push({
-        term,
-        type: 'blocked',
-        message: `Contains prohibited term: "${term}"`
+  for (const term of blockedTerms.find(text)) {
+    issues.push({
+      term,
+      type: 'blocked',
+      message: `Contains prohibited term: "${term}"`
+    });
+    
+    if (REWRITE_SUGGESTIONS[term]) {
+      suggestions.push({
+        original: term,
+        suggested: REWRITE_SUGGESTIONS[term],
+        message: `Consider using "${REWRITE_SUGGESTIONS[term]}" instead of "${term}"`
       });
-      
-      if (REWRITE_SUGGESTIONS[term]) {
-        suggestions.push({
-          original: term,
-          suggested: REWRITE_SUGGESTIONS[term],
-          message: `Consider using "${REWRITE_SUGGESTIONS[term]}" instead of "${term}"`
-        });
-      }
     }
   }
   
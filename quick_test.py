@@ -3,21 +3,20 @@
 Quick test of enhanced features
 """
 
-import requests
-import json
+import sys
 
-BASE_URL = "https://rooted-personas.preview.emergentagent.com/api"
+from harness.core import HarnessTester, harness_test
 
-def test_validation():
+@harness_test('smoke', 'validation')
+def test_validation(tester):
     """Test validation system"""
     print("Testing validation system...")
     
     # Test blocked term
-    response = requests.post(
-        f"{BASE_URL}/workspaces?demo=true",
-        json={"name": "Workspace with religion"},
-        headers={'Content-Type': 'application/json'}
-    )
+    response = tester.make_request('POST', '/workspaces', {"name": "Workspace with religion"})
+    if response is None:
+        print("❌ No response")
+        return False
     
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
@@ -29,58 +28,48 @@ def test_validation():
         print("❌ Validation not working")
         return False
 
-def test_workspace_crud():
+@harness_test('smoke', 'crud', 'workspaces')
+def test_workspace_crud(tester):
     """Test workspace CRUD"""
     print("\nTesting workspace CRUD...")
     
     # Create workspace
-    create_response = requests.post(
-        f"{BASE_URL}/workspaces?demo=true",
-        json={"name": "Test Workspace"},
-        headers={'Content-Type': 'application/json'}
-    )
+    create_response = tester.make_request('POST', '/workspaces', {"name": "Test Workspace"})
     
-    if create_response.status_code == 200:
+    if create_response is not None and create_response.status_code == 200:
         workspace_id = create_response.json()["workspace"]["id"]
         print(f"✅ Created workspace: {workspace_id}")
         
         # Update workspace
-        update_response = requests.put(
-            f"{BASE_URL}/workspaces/{workspace_id}?demo=true",
-            json={"name": "Updated Test Workspace"},
-            headers={'Content-Type': 'application/json'}
-        )
+        update_response = tester.make_request('PUT', f'/workspaces/{workspace_id}', {"name": "Updated Test Workspace"})
         
-        if update_response.status_code == 200:
+        if update_response is not None and update_response.status_code == 200:
             print("✅ Updated workspace")
         else:
-            print(f"❌ Failed to update workspace: {update_response.status_code}")
+            print(f"❌ Failed to update workspace: {update_response.status_code if update_response is not None else 'No response'}")
             
         # Delete workspace
-        delete_response = requests.delete(f"{BASE_URL}/workspaces/{workspace_id}?demo=true")
+        delete_response = tester.make_request('DELETE', f'/workspaces/{workspace_id}')
         
-        if delete_response.status_code == 200:
+        if delete_response is not None and delete_response.status_code == 200:
             print("✅ Deleted workspace")
             return True
         else:
-            print(f"❌ Failed to delete workspace: {delete_response.status_code}")
+            print(f"❌ Failed to delete workspace: {delete_response.status_code if delete_response is not None else 'No response'}")
             return False
     else:
-        print(f"❌ Failed to create workspace: {create_response.status_code}")
+        print(f"❌ Failed to create workspace: {create_response.status_code if create_response is not None else 'No response'}")
         return False
 
-def test_segment_crud():
+@harness_test('smoke', 'crud', 'segments')
+def test_segment_crud(tester):
     """Test segment CRUD"""
     print("\nTesting segment CRUD...")
     
     # First create a workspace
-    workspace_response = requests.post(
-        f"{BASE_URL}/workspaces?demo=true",
-        json={"name": "Test Workspace for Segments"},
-        headers={'Content-Type': 'application/json'}
-    )
+    workspace_response = tester.make_request('POST', '/workspaces', {"name": "Test Workspace for Segments"})
     
-    if workspace_response.status_code != 200:
+    if workspace_response is None or workspace_response.status_code != 200:
         print("❌ Failed to create workspace for segment test")
         return False
         
@@ -95,61 +84,54 @@ def test_segment_crud():
         "fears": ["complexity"]
     }
     
-    create_response = requests.post(
-        f"{BASE_URL}/segments?demo=true",
-        json=segment_data,
-        headers={'Content-Type': 'application/json'}
-    )
+    create_response = tester.make_request('POST', '/segments', segment_data)
     
-    if create_response.status_code == 200:
+    if create_response is not None and create_response.status_code == 200:
         segment_id = create_response.json()["segment"]["id"]
         print(f"✅ Created segment: {segment_id}")
         
         # Get segment
-        get_response = requests.get(f"{BASE_URL}/segments/{segment_id}?demo=true")
+        get_response = tester.make_request('GET', f'/segments/{segment_id}')
         
-        if get_response.status_code == 200:
+        if get_response is not None and get_response.status_code == 200:
             print("✅ Retrieved segment")
         else:
-            print(f"❌ Failed to get segment: {get_response.status_code}")
+            print(f"❌ Failed to get segment: {get_response.status_code if get_response is not None else 'No response'}")
             
         # Update segment
-        update_response = requests.put(
-            f"{BASE_URL}/segments/{segment_id}?demo=true",
-            json={"name": "Updated Test Segment", "workspaceId": workspace_id},
-            headers={'Content-Type': 'application/json'}
-        )
+        update_response = tester.make_request('PUT', f'/segments/{segment_id}', {"name": "Updated Test Segment", "workspaceId": workspace_id})
         
-        if update_response.status_code == 200:
+        if update_response is not None and update_response.status_code == 200:
             print("✅ Updated segment")
         else:
-            print(f"❌ Failed to update segment: {update_response.status_code}")
+            print(f"❌ Failed to update segment: {update_response.status_code if update_response is not None else 'No response'}")
             
         # Delete segment
-        delete_response = requests.delete(f"{BASE_URL}/segments/{segment_id}?demo=true")
+        delete_response = tester.make_request('DELETE', f'/segments/{segment_id}')
         
-        if delete_response.status_code == 200:
+        if delete_response is not None and delete_response.status_code == 200:
             print("✅ Deleted segment")
         else:
-            print(f"❌ Failed to delete segment: {delete_response.status_code}")
+            print(f"❌ Failed to delete segment: {delete_response.status_code if delete_response is not None else 'No response'}")
             
         # Cleanup workspace
-        requests.delete(f"{BASE_URL}/workspaces/{workspace_id}?demo=true")
+        tester.make_request('DELETE', f'/workspaces/{workspace_id}')
         return True
     else:
-        print(f"❌ Failed to create segment: {create_response.status_code}")
+        print(f"❌ Failed to create segment: {create_response.status_code if create_response is not None else 'No response'}")
         # Cleanup workspace
-        requests.delete(f"{BASE_URL}/workspaces/{workspace_id}?demo=true")
+        tester.make_request('DELETE', f'/workspaces/{workspace_id}')
         return False
 
 if __name__ == "__main__":
     print("🚀 Quick Enhanced Features Test")
     print("=" * 50)
     
+    tester = HarnessTester()
     results = []
-    results.append(test_validation())
-    results.append(test_workspace_crud())
-    results.append(test_segment_crud())
+    results.append(test_validation(tester))
+    results.append(test_workspace_crud(tester))
+    results.append(test_segment_crud(tester))
     
     passed = sum(results)
     total = len(results)
@@ -158,4 +140,6 @@ if __name__ == "__main__":
     if passed == total:
         print("🎉 All enhanced features working!")
     else:
-        print("⚠️  Some features need attention")
\ No newline at end of file
+        print("⚠️  Some features need attention")
+    
+    sys.exit(0 if passed == total else 1)
@@ -4,21 +4,15 @@ Strategy Building Workflow Test - Phase 2 & 3 Testing
 Tests the complete Human-Rooted Segmentation Studio strategy workflow as specified in the review request.
 """
 
-import requests
-import json
 import sys
 import time
 from datetime import datetime
 
-# Configuration
-BASE_URL = "https://rooted-personas.preview.emergentagent.com/api"
-DEMO_MODE = True
+from harness.core import HarnessTester, harness_test
 
-class StrategyWorkflowTester:
-    def __init__(self):
-        self.base_url = BASE_URL
-        self.session = requests.Session()
-        self.test_results = []
+class StrategyWorkflowTester(HarnessTester):
+    def __init__(self, base_url=None):
+        super().__init__(base_url)
         
         # Test data storage
         self.workspace_id = None
@@ -27,49 +21,7 @@ class StrategyWorkflowTester:
         self.economic_profile_id = None
         self.persona_id = None
         
-    def log_result(self, test_name, success, message, response_data=None):
-        """Log test result"""
-        result = {
-            'test': test_name,
-            'success': success,
-            'message': message,
-            'timestamp': datetime.now().isoformat(),
-            'response_data': response_data
-        }
-        self.test_results.append(result)
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name} - {message}")
-        if response_data and not success:
-            print(f"   Response: {json.dumps(response_data, indent=2)}")
-
-    def make_request(self, method, endpoint, data=None, params=None):
-        """Make HTTP request with demo mode support"""
-        url = f"{self.base_url}{endpoint}"
-        
-        if DEMO_MODE:
-            if params is None:
-                params = {}
-            params['demo'] = 'true'
-            
-        headers = {'Content-Type': 'application/json'}
-        
-        try:
-            if method.upper() == 'GET':
-                response = self.session.get(url, params=params, headers=headers)
-            elif method.upper() == 'POST':
-                response = self.session.post(url, json=data, params=params, headers=headers)
-            elif method.upper() == 'PUT':
-                response = self.session.put(url, json=data, params=params, headers=headers)
-            elif method.upper() == 'DELETE':
-                response = self.session.delete(url, params=params, headers=headers)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
-            return response
-        except Exception as e:
-            print(f"Request failed: {e}")
-            return None
-
+    @harness_test('workflow', 'workspaces')
     def step_1_basic_infrastructure(self):
         """Step 1: Basic Infrastructure Testing"""
         print("\n🔧 STEP 1: Basic Infrastructure")
@@ -91,10 +43,13 @@ class StrategyWorkflowTester:
                         f"Failed with status: {response.status_code if response else 'No response'}")
             return False
 
+    @harness_test('workflow', 'segments')
     def step_2_segment_creation(self):
         """Step 2: Segment Creation Flow"""
         print("\n📊 STEP 2: Segment Creation Flow")
         
+        if not self.workspace_id:
+            self.workspace_id = self.first_workspace_id()
         if not self.workspace_id:
             self.log_result("Segment Creation Setup", False, "No workspace ID available")
             return False
@@ -139,6 +94,7 @@ class StrategyWorkflowTester:
                         f"Failed with status: {response.status_code if response else 'No response'}")
             return False
 
+    @harness_test('workflow', 'profiles')
     def step_3_culture_profile(self):
         """Step 3: Culture Profile Flow with 'Any' options"""
         print("\n🌍 STEP 3: Culture Profile Flow")
@@ -183,6 +139,7 @@ class StrategyWorkflowTester:
                         f"Failed with status: {response.status_code if response else 'No response'}")
             return False
 
+    @harness_test('workflow', 'profiles')
     def step_4_economic_profile(self):
         """Step 4: Economic Profile Flow with 'Any' economic values"""
         print("\n💰 STEP 4: Economic Profile Flow")
@@ -230,6 +187,7 @@ class StrategyWorkflowTester:
                         f"Failed with status: {response.status_code if response else 'No response'}")
             return False
 
+    @harness_test('workflow', 'personas', 'generation', 'slow')
     def step_5_persona_generation(self):
         """Step 5: Persona Generation"""
         print("\n👤 STEP 5: Persona Generation")
@@ -261,6 +219,7 @@ class StrategyWorkflowTester:
                         f"Failed with status: {response.status_code if response else 'No response'}")
             return False
 
+    @harness_test('workflow', 'strategies', 'generation', 'slow')
     def step_6_strategy_generation(self):
         """Step 6: Strategy Generation (NEW)"""
         print("\n🎯 STEP 6: Strategy Generation")
@@ -272,77 +231,102 @@ class StrategyWorkflowTester:
         strategy_types = ['positioning', 'messaging', 'pricing']
         success_count = 0
         
+        # The per-type path, one request after another, for comparison only. It runs first:
+        # with AI_CACHE=true whichever pass comes second is served from the memo cache, so
+        # the timings are only comparable with the cache off and are reported, not asserted.
+        start = time.perf_counter()
+        serial_ok = True
         for strategy_type in strategy_types:
             response = self.make_request('POST', f'/personas/{self.persona_id}/strategies/{strategy_type}/generate')
-            if response and response.status_code == 200:
-                data = response.json()
-                if 'strategy' in data:
-                    strategy = data['strategy']
-                    
-                    # Validate strategy content based on type and persona characteristics
-                    if strategy_type == 'positioning':
-                        # Check for positioning elements
-                        required_fields = ['positioning_statement', 'competitive_frame', 'elevator_pitch_1s']
-                        if all(field in strategy for field in required_fields):
-                            self.log_result(f"Strategy Generation - {strategy_type}", True, 
-                                        f"Generated positioning strategy with competitive frame and elevator pitches")
-                            success_count += 1
-                        else:
-                            self.log_result(f"Strategy Generation - {strategy_type}", False, 
-                                        f"Missing required positioning fields")
-                    
-                    elif strategy_type == 'messaging':
-                        # Check for messaging elements and low-context adaptation
-                        required_fields = ['messaging_pillars', 'tone_of_voice']
-                        if all(field in strategy for field in required_fields):
-                            tone = strategy.get('tone_of_voice', {})
-                            # Check if tone reflects low-context communication (direct)
-                            if 'direct' in str(tone).lower():
-                                self.log_result(f"Strategy Generation - {strategy_type}", True, 
-                                            f"Generated direct messaging strategy (low-context adaptation)")
-                            else:
-                                self.log_result(f"Strategy Generation - {strategy_type}", True, 
-                                            f"Generated messaging strategy with pillars and tone")
-                            success_count += 1
-                        else:
-                            self.log_result(f"Strategy Generation - {strategy_type}", False, 
-                                        f"Missing required messaging fields")
-                    
-                    elif strategy_type == 'pricing':
-                        # Check for pricing elements and high price sensitivity adaptation
-                        required_fields = ['pricing_tiers', 'payment_options']
-                        if all(field in strategy for field in required_fields):
-                            payment_options = strategy.get('payment_options', [])
-                            pricing_tiers = strategy.get('pricing_tiers', [])
-                            
-                            # Check for UPI payment option
-                            has_upi = any('UPI' in str(option) for option in payment_options)
-                            # Check for cost-focused pricing (Starter tier or similar)
-                            has_cost_focus = any('Starter' in str(tier) or 'cost' in str(tier).lower() 
-                                               for tier in pricing_tiers)
-                            
-                            if has_upi and has_cost_focus:
-                                self.log_result(f"Strategy Generation - {strategy_type}", True, 
-                                            f"Generated cost-focused pricing with UPI options (high price sensitivity + UPI preference)")
-                            elif has_upi:
-                                self.log_result(f"Strategy Generation - {strategy_type}", True, 
-                                            f"Generated pricing strategy with UPI payment options")
-                            else:
-                                self.log_result(f"Strategy Generation - {strategy_type}", True, 
-                                            f"Generated pricing strategy with tiers and payment options")
-                            success_count += 1
-                        else:
-                            self.log_result(f"Strategy Generation - {strategy_type}", False, 
-                                        f"Missing required pricing fields")
+            if not (response and response.status_code == 200 and 'strategy' in response.json()):
+                serial_ok = False
+                print(f"   ℹ️  Serial {strategy_type}: status {response.status_code if response else 'no response'}")
+        serial_seconds = time.perf_counter() - start
+        
+        # All three strategies in one request, generated concurrently by the server
+        start = time.perf_counter()
+        response = self.make_request('POST', f'/personas/{self.persona_id}/strategies/generate')
+        batch_seconds = time.perf_counter() - start
+        batch_ok = response is not None and response.status_code == 200 and 'strategies' in response.json()
+        if batch_ok:
+            strategies = response.json()['strategies']
+            for strategy_type in strategy_types:
+                if strategy_type in strategies:
+                    if self.check_strategy(strategy_type, strategies[strategy_type]):
+                        success_count += 1
                 else:
                     self.log_result(f"Strategy Generation - {strategy_type}", False, 
-                                f"Invalid response structure")
+                                f"Missing from batch response: {response.json().get('errors', {}).get(strategy_type)}")
+        else:
+            self.log_result("POST /api/personas/{id}/strategies/generate", False, 
+                        f"Failed with status: {response.status_code if response else 'No response'}")
+        
+        if batch_ok and serial_ok:
+            print(f"   ℹ️  Batch {batch_seconds * 1000:.0f} ms vs serial {serial_seconds * 1000:.0f} ms "
+                  f"({serial_seconds / batch_seconds:.1f}x; not comparable with AI_CACHE=true)")
+        
+        return success_count == len(strategy_types)
+
+    def check_strategy(self, strategy_type, strategy):
+        """Validate one generated strategy and log the result"""
+        # Validate strategy content based on type and persona characteristics
+        if strategy_type == 'positioning':
+            # Check for positioning elements
+            required_fields = ['positioning_statement', 'competitive_frame', 'elevator_pitch_1s']
+            if all(field in strategy for field in required_fields):
+                self.log_result(f"Strategy Generation - {strategy_type}", True, 
+                            f"Generated positioning strategy with competitive frame and elevator pitches")
+                return True
             else:
                 self.log_result(f"Strategy Generation - {strategy_type}", False, 
-                            f"Failed with status: {response.status_code if response else 'No response'}")
+                            f"Missing required positioning fields")
         
-        return success_count == len(strategy_types)
+        elif strategy_type == 'messaging':
+            # Check for messaging elements and low-context adaptation
+            required_fields = ['messaging_pillars', 'tone_of_voice']
+            if all(field in strategy for field in required_fields):
+                tone = strategy.get('tone_of_voice', {})
+                # Check if tone reflects low-context communication (direct)
+                if 'direct' in str(tone).lower():
+                    self.log_result(f"Strategy Generation - {strategy_type}", True, 
+                                f"Generated direct messaging strategy (low-context adaptation)")
+                else:
+                    self.log_result(f"Strategy Generation - {strategy_type}", True, 
+                                f"Generated messaging strategy with pillars and tone")
+                return True
+            else:
+                self.log_result(f"Strategy Generation - {strategy_type}", False, 
+                            f"Missing required messaging fields")
+        
+        elif strategy_type == 'pricing':
+            # Check for pricing elements and high price sensitivity adaptation
+            required_fields = ['pricing_tiers', 'payment_options']
+            if all(field in strategy for field in required_fields):
+                payment_options = strategy.get('payment_options', [])
+                pricing_tiers = strategy.get('pricing_tiers', [])
+                
+                # Check for UPI payment option
+                has_upi = any('UPI' in str(option) for option in payment_options)
+                # Check for cost-focused pricing (Starter tier or similar)
+                has_cost_focus = any('Starter' in str(tier) or 'cost' in str(tier).lower() 
+                                   for tier in pricing_tiers)
+                
+                if has_upi and has_cost_focus:
+                    self.log_result(f"Strategy Generation - {strategy_type}", True, 
+                                f"Generated cost-focused pricing with UPI options (high price sensitivity + UPI preference)")
+                elif has_upi:
+                    self.log_result(f"Strategy Generation - {strategy_type}", True, 
+                                f"Generated pricing strategy with UPI payment options")
+                else:
+                    self.log_result(f"Strategy Generation - {strategy_type}", True, 
+                                f"Generated pricing strategy with tiers and payment options")
+                return True
+            else:
+                self.log_result(f"Strategy Generation - {strategy_type}", False, 
+                            f"Missing required pricing fields")
+        return False
 
+    @harness_test('workflow', 'export')
     def step_7_export_system(self):
         """Step 7: Export System"""
         print("\n📤 STEP 7: Export System")
@@ -423,26 +407,7 @@ class StrategyWorkflowTester:
             
             time.sleep(0.5)  # Small delay between steps
         
-        # Print summary
-        print(f"\n{'='*80}")
-        print(f"🏁 STRATEGY WORKFLOW TEST SUMMARY")
-        print(f"{'='*80}")
-        print(f"✅ Passed Steps: {passed_steps}")
-        print(f"❌ Failed Steps: {failed_steps}")
-        print(f"📊 Success Rate: {(passed_steps/(passed_steps+failed_steps)*100):.1f}%")
-        print(f"⏰ Test completed at: {datetime.now().isoformat()}")
-        
-        # Print detailed results
-        if failed_steps > 0:
-            print(f"\n🔍 FAILED TESTS:")
-            for result in self.test_results:
-                if not result['success']:
-                    print(f"   • {result['test']}: {result['message']}")
-        
-        print(f"\n✅ PASSED TESTS:")
-        for result in self.test_results:
-            if result['success']:
-                print(f"   • {result['test']}")
+        self.print_summary("STRATEGY WORKFLOW TEST SUMMARY", passed_steps, failed_steps, passed_label='Passed Steps', failed_label='Failed Steps')
         
         return failed_steps == 0
 
@@ -452,17 +417,7 @@ def main():
     success = tester.run_complete_workflow()
     
     # Save detailed results
-    with open('/app/strategy_workflow_results.json', 'w') as f:
-        json.dump({
-            'summary': {
-                'total_tests': len(tester.test_results),
-                'passed': sum(1 for r in tester.test_results if r['success']),
-                'failed': sum(1 for r in tester.test_results if not r['success']),
-                'success_rate': sum(1 for r in tester.test_results if r['success']) / len(tester.test_results) * 100 if tester.test_results else 0,
-                'test_completed_at': datetime.now().isoformat()
-            },
-            'detailed_results': tester.test_results
-        }, f, indent=2)
+    tester.save_results('/app/strategy_workflow_results.json')
     
     return 0 if success else 1
 